@@ -65,9 +65,30 @@ def create_app():
     # CSRF Protection Configuration
     app.config["WTF_CSRF_CHECK_DEFAULT"] = False
 
+    from core.monitoring.tracing import setup_tracing, span
+    from core.utils import fast_json
+    from core.database.pool import get_pool
+
     class UTF8JSONProvider(DefaultJSONProvider):
+        """jsonify(): orjson 이 있으면 orjson (출력은 기본 provider 와 동일: compact,
+        sort_keys, datetime → HTTP date), debug 의 들여쓰기 출력은 기본 provider"""
+
         ensure_ascii = False
 
+        def dumps(self, obj, **kwargs):
+            with span("json"):
+                if fast_json.ORJSON_AVAILABLE and not kwargs:
+                    return fast_json.dumps_flask(obj, sort_keys=self.sort_keys).decode("utf-8")
+                return super().dumps(obj, **kwargs)
+
+        def response(self, *args, **kwargs):
+            if not fast_json.ORJSON_AVAILABLE or self._app.debug:
+                return super().response(*args, **kwargs)
+            obj = self._prepare_response_obj(args, kwargs)
+            with span("json"):
+                body = fast_json.dumps_flask(obj, sort_keys=self.sort_keys)
+            return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
     app.json_provider_class = UTF8JSONProvider
     app.json = UTF8JSONProvider(app)
 
@@ -126,7 +147,7 @@ def ip_whitelist_rate_limit():
             app.extensions[service_name] = service_instance
 
         app.logger.info(
-            f"✅ Initialized {len(services)}/15 services via dependency injection"
+            f"✅ Initialized {len(services)}/17 services via dependency injection"
         )
     except Exception as e:
         app.logger.error(f"❌ Service initialization failed: {e}")
@@ -141,6 +162,10 @@ def generate_request_id():
         """Generate unique request ID for tracing"""
         g.request_id = str(uuid.uuid4())
 
+    # Per-stage request tracing (registered before the other after_request
+    # hooks so Server-Timing also covers security headers and compression)
+    setup_tracing(app)
+
     # Security headers middleware
     @app.after_request
     def add_security_headers(response):
@@ -188,21 +213,24 @@ def compress_response(response):
         if "gzip" not in request.headers.get("Accept-Encoding", "").lower():
             return response
 
+        # Streamed bodies (DB-side JSON) pass through; get_data() would buffer them
         if (
             response.direct_passthrough
+            or response.is_streamed
             or len(response.get_data()) < 500
             or response.status_code < 200
             or response.status_code >= 300
         ):
             return response
 
-        gzip_buffer = io.BytesIO()
-        with gzip.GzipFile(
-            mode="wb", fileobj=gzip_buffer, compresslevel=6
-        ) as gzip_file:
-            gzip_file.write(response.get_data())
+        with span("compress"):
+            gzip_buffer = io.BytesIO()
+            with gzip.GzipFile(
+                mode="wb", fileobj=gzip_buffer, compresslevel=6
+            ) as gzip_file:
+                gzip_file.write(response.get_data())
 
-        response.set_data(gzip_buffer.getvalue())
+            response.set_data(gzip_buffer.getvalue())
         response.headers["Content-Encoding"] = "gzip"
         response.headers["Vary"] = "Accept-Encoding"
         response.headers["Content-Length"] = len(response.get_data())
@@ -339,32 +367,50 @@ def compress_response(response):
     except ImportError as e:
         app.logger.warning(f"⚠️ Prometheus metrics not available: {e}")
 
+    # WebSocket (Flask-SocketIO, Redis pub/sub message queue) + shared stats snapshots
+    # Opt-in: each worker opens its own LISTEN connection outside the pool and runs two
+    # background tasks. With gunicorn APP_WORKERS > 1 this also needs sticky sessions at
+    # the proxy (Socket.IO polling handshake) and a reachable SOCKETIO_MESSAGE_QUEUE (Redis).
+    if os.getenv("WEBSOCKET_ENABLED", "false").lower() == "true":
+        try:
+            from flask_socketio import SocketIO
+            from core.routes.websocket_routes import register_websocket_handlers
+            from core.services.stats_broadcaster import StatsBroadcaster, message_queue_url
+
+            socketio = SocketIO(
+                app,
+                message_queue=message_queue_url(),
+                async_mode=os.getenv("SOCKETIO_ASYNC_MODE", "threading"),
+                cors_allowed_origins=os.getenv("SOCKETIO_CORS_ORIGINS", "*"),
+            )
+            register_websocket_handlers(socketio)
+            app.extensions["stats_broadcaster"] = StatsBroadcaster(app, socketio)
+            app.logger.info("✅ WebSocket enabled (stats broadcaster, Redis message queue)")
+        except ImportError as e:
+            app.logger.warning(f"⚠️ WebSocket not available: {e}")
+        except Exception as e:
+            app.logger.error(f"❌ WebSocket setup failed: {e}")
+
     @app.route("/health")
     def health_check():
         """Health check endpoint"""
         try:
-            conn = psycopg2.connect(
-                host=os.getenv("POSTGRES_HOST", "blacklist-postgres"),
-                port=os.getenv("POSTGRES_PORT", "5432"),
-                database=os.getenv("POSTGRES_DB", "blacklist"),
-                user=os.getenv("POSTGRES_USER", "postgres"),
-                password=os.getenv("POSTGRES_PASSWORD", "postgres"),
-            )
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT table_name FROM information_schema.tables WHERE table_schema = 'public'"
-            )
-            tables = [row[0] for row in cursor.fetchall()]
-            try:
+            # 요청마다 새 연결을 만들지 않고 공용 풀에서 대여 (health statement_timeout)
+            with get_pool().connection(use="health") as conn:
+                cursor = conn.cursor()
                 cursor.execute(
-                    "SELECT COUNT(*) FROM blacklist_ips WHERE is_active = true"
+                    "SELECT table_name FROM information_schema.tables WHERE table_schema = 'public'"
                 )
-                row = cursor.fetchone()
-                ip_count = row[0] if row else 0
-            except psycopg2.Error:
-                ip_count = 0
-            cursor.close()
-            conn.close()
+                tables = [row[0] for row in cursor.fetchall()]
+                try:
+                    cursor.execute(
+                        "SELECT COUNT(*) FROM blacklist_ips WHERE is_active = true"
+                    )
+                    row = cursor.fetchone()
+                    ip_count = row[0] if row else 0
+                except psycopg2.Error:
+                    ip_count = 0
+                cursor.close()
             return jsonify(
                 {
                     "status": "healthy",
@@ -389,15 +435,23 @@ def health_check():
     def start_background_tasks():
         """Start background tasks"""
         try:
+            stats_broadcaster = app.extensions.get("stats_broadcaster")
+            if stats_broadcaster:
+                stats_broadcaster.start()
+
             db_service = app.extensions.get("db_service")
             expiry_service = app.extensions.get("expiry_service")
             if db_service and expiry_service:
                 expiry_service.check_and_deactivate_expired_ips()
 
+            # 파티션 관리는 자동 수집 여부/REGTECH 인증 정보와 무관하게 실행
+            scheduler_service = app.extensions.get("scheduler_service")
+            if db_service and scheduler_service:
+                scheduler_service.start_maintenance()
+
             if os.getenv("DISABLE_AUTO_COLLECTION", "").lower() in ("true", "1", "yes"):
                 return
 
-            scheduler_service = app.extensions.get("scheduler_service")
             if not db_service or not scheduler_service:
                 return
 
@@ -2,21 +2,16 @@
 데이터베이스 연결 관리
 """
 
-import os
-import psycopg2
 from psycopg2.extras import RealDictCursor
 import logging
 
+from .pool import get_pool
+
 logger = logging.getLogger(__name__)
 
 
-def get_db_connection():
-    """데이터베이스 연결 생성"""
-    return psycopg2.connect(
-        host=os.getenv("POSTGRES_HOST", "blacklist-postgres"),
-        port=os.getenv("POSTGRES_PORT", "5432"),
-        database=os.getenv("POSTGRES_DB", "blacklist"),
-        user=os.getenv("POSTGRES_USER", "postgres"),
-        password=os.getenv("POSTGRES_PASSWORD", "postgres"),
-        cursor_factory=RealDictCursor,
-    )
+def get_db_connection(use=None):
+    """공용 풀에서 RealDictCursor 연결 대여 (conn.close() 로 풀 반환)"""
+    conn = get_pool().getconn(use=use)
+    conn.cursor_factory = RealDictCursor
+    return conn
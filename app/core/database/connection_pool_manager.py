@@ -10,6 +10,8 @@
 import psycopg2
 from urllib.parse import urlparse
 
+from .pool import get_pool, matches_pool_config
+
 logger = logging.getLogger(__name__)
 
 
@@ -95,6 +97,13 @@ def _log_connection_error(self, error: Exception, host: str):
 
     def get_connection(self) -> Optional[psycopg2.extensions.connection]:
         """PostgreSQL 연결 시도 (스마트 백오프 포함)"""
+        # 공용 풀과 같은 DB 면 풀에서 대여 (close() 가 풀 반환), 실패 시 호스트 fallback
+        if matches_pool_config(self.connection_params):
+            try:
+                return get_pool().getconn(use="health")
+            except Exception as e:
+                logger.debug(f"Pooled connection unavailable, trying direct hosts: {e}")
+
         hosts_to_try = [
             self.connection_params["host"],
             "blacklist-postgres",
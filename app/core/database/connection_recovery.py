@@ -8,6 +8,8 @@
 import logging
 from urllib.parse import urlparse
 
+from .pool import get_pool, matches_pool_config
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +48,13 @@ def _get_connection_params(self) -> Dict[str, Any]:
 
     def get_connection(self) -> Optional[psycopg2.extensions.connection]:
         """PostgreSQL 연결 시도 (fallback 포함)"""
+        # 공용 풀과 같은 DB 면 풀에서 대여 (close() 가 풀 반환), 실패 시 호스트 fallback
+        if matches_pool_config(self.connection_params):
+            try:
+                return get_pool().getconn(use="health")
+            except Exception as e:
+                logger.debug(f"Pooled connection unavailable, trying direct hosts: {e}")
+
         hosts_to_try = [
             self.connection_params["host"],
             "blacklist-postgres",  # Docker 컨테이너명
@@ -0,0 +1,391 @@
+"""
+Unified PostgreSQL connection pool
+DatabaseService / get_db_connection / 연결 관리자들이 모두 이 풀 하나를 통해 연결을 빌린다.
+
+- LIFO idle 목록 (최근에 쓴 연결 우선 → 오래 쉰 연결은 자연스럽게 정리)
+- 포화 시 DB_POOL_CHECKOUT_TIMEOUT 초까지 대기 후 PoolTimeout
+  (psycopg2 ThreadedConnectionPool 은 즉시 PoolError, 반환 시 minconn 초과분을 닫아 재연결 반복)
+- checkout 시 health check: 닫힌 연결은 교체, DB_POOL_HEALTHCHECK_IDLE 초 이상 쉰 연결은 SELECT 1
+- use class 별 statement_timeout (api / background / health / report), 바뀔 때만 SET
+- PooledConnection.close() 는 풀 반환 (기존 conn.close() 호출 코드가 슬롯을 새지 않도록)
+- 누수 감지: DB_POOL_LEAK_SECONDS 초 이상 반환되지 않은 연결은 대여 시점 스택을 로그로 남김
+- 연결별 prepared statement 상태 (core/database/prepared.py) 는 새 연결마다 비어 있으므로
+  재연결 후 첫 사용 시 다시 PREPARE 된다
+- Prometheus: blacklist_db_pool_* (idle/in_use/waiting, checkout 대기 시간, timeout, leak)
+
+사용 예:
+    with get_pool().connection(use="api") as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+"""
+
+import logging
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+from flask import has_request_context
+
+from ..monitoring.metrics import (
+    db_pool_checkout_timeouts_total,
+    db_pool_checkout_wait_seconds,
+    db_pool_connections,
+    db_pool_leaked_connections_total,
+    db_pool_waiting,
+)
+from ..monitoring.tracing import TracedConnection
+
+logger = logging.getLogger(__name__)
+
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN", "3"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX", "8"))
+CHECKOUT_TIMEOUT = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", "10"))
+HEALTHCHECK_IDLE = float(os.getenv("DB_POOL_HEALTHCHECK_IDLE", "30"))
+MAX_IDLE_SECONDS = float(os.getenv("DB_POOL_MAX_IDLE", "300"))
+LEAK_SECONDS = float(os.getenv("DB_POOL_LEAK_SECONDS", "60"))
+LEAK_STACK_DEPTH = int(os.getenv("DB_POOL_LEAK_STACK_DEPTH", "12"))
+CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+
+# use class → statement_timeout (ms, 0 = 무제한)
+STATEMENT_TIMEOUTS = {
+    "api": int(os.getenv("DB_STATEMENT_TIMEOUT_API_MS", "30000")),
+    "health": int(os.getenv("DB_STATEMENT_TIMEOUT_HEALTH_MS", "5000")),
+    "report": int(os.getenv("DB_STATEMENT_TIMEOUT_REPORT_MS", "300000")),
+    "background": int(os.getenv("DB_STATEMENT_TIMEOUT_BACKGROUND_MS", "0")),
+}
+
+
+class PoolTimeout(psycopg2.pool.PoolError):
+    """포화된 풀에서 CHECKOUT_TIMEOUT 안에 연결을 얻지 못함"""
+
+
+def pool_config() -> Dict[str, Any]:
+    """풀 연결 파라미터 (DatabaseService 와 같은 환경변수)"""
+    return {
+        "host": os.getenv("POSTGRES_HOST", "blacklist-postgres"),
+        "port": int(os.getenv("POSTGRES_PORT", 5432)),
+        "database": os.getenv("POSTGRES_DB", "blacklist"),
+        "user": os.getenv("POSTGRES_USER", "postgres"),
+        "password": os.getenv("POSTGRES_PASSWORD", "postgres"),
+    }
+
+
+def default_use() -> str:
+    """요청 처리 중이면 api, 그 외(스케줄러/수집기 스레드)는 background"""
+    return "api" if has_request_context() else "background"
+
+
+class PooledConnection(TracedConnection):
+    """풀에서 대여 중인 동안 close() 가 실제 종료 대신 풀 반환이 되는 연결"""
+
+    def close(self):
+        pool = self.__dict__.get("_pool")
+        if pool is not None:
+            pool.putconn(self)
+        else:
+            super().close()
+
+
+class ConnectionPool:
+    """LIFO 연결 풀 (대기 + health check + use class 별 statement_timeout + 누수 감지)"""
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        min_size: int = POOL_MIN_SIZE,
+        max_size: int = POOL_MAX_SIZE,
+        checkout_timeout: float = CHECKOUT_TIMEOUT,
+        leak_seconds: float = LEAK_SECONDS,
+    ):
+        self.config = dict(config)
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max(1, max_size)
+        self.checkout_timeout = checkout_timeout
+        self.leak_seconds = leak_seconds
+        self.closed = False
+
+        self._idle = []  # [conn], 끝이 가장 최근 반환
+        self._in_use: Dict[int, Dict[str, Any]] = {}
+        self._size = 0  # idle + in_use + 연결 중
+        self._waiting = 0
+        self._cond = threading.Condition()
+
+        for _ in range(self.min_size):
+            try:
+                conn = self._connect()
+            except Exception:
+                self.close()
+                raise
+            with self._cond:
+                self._size += 1
+            self._release(conn)
+
+        self._reaper = threading.Thread(target=self._reap, name="db-pool-reaper", daemon=True)
+        self._reaper.start()
+
+    # ------------------------------------------------------------------
+    # Checkout / return
+    # ------------------------------------------------------------------
+    def getconn(self, use: Optional[str] = None):
+        """연결 대여 (포화 시 checkout_timeout 초까지 대기)"""
+        use = use if use in STATEMENT_TIMEOUTS else default_use()
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.checkout_timeout
+        conn = None
+
+        with self._cond:
+            while True:
+                if self.closed:
+                    raise psycopg2.pool.PoolError("connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    db_pool_checkout_timeouts_total.labels(use=use).inc()
+                    raise PoolTimeout(
+                        f"no database connection available within {self.checkout_timeout:.1f}s "
+                        f"(pool max {self.max_size}, in use {len(self._in_use)})"
+                    )
+                self._waiting += 1
+                db_pool_waiting.set(self._waiting)
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                    db_pool_waiting.set(self._waiting)
+
+        try:
+            conn = self._connect() if conn is None else self._check(conn)
+            self._apply_timeout(conn, use)
+        except Exception:
+            self._discard(conn)
+            raise
+
+        conn._pool = self
+        with self._cond:
+            self._in_use[id(conn)] = {
+                "conn": conn,
+                "use": use,
+                "since": time.monotonic(),
+                "thread": threading.current_thread().name,
+                "stack": traceback.extract_stack(limit=LEAK_STACK_DEPTH)[:-1] if self.leak_seconds > 0 else None,
+                "reported": False,
+            }
+            self._update_gauges()
+        db_pool_checkout_wait_seconds.labels(use=use).observe(time.perf_counter() - started)
+        return conn
+
+    def putconn(self, conn, close: bool = False):
+        """연결 반환 (열린 트랜잭션은 롤백, 깨진 연결은 폐기)"""
+        with self._cond:
+            lease = self._in_use.pop(id(conn), None)
+        if lease is None:
+            if not isinstance(conn, PooledConnection):
+                logger.warning("Connection returned to pool was not checked out from it")
+            return  # 이미 반환됨 (close() 후 return_connection() 등)
+
+        conn._pool = None
+        if lease["reported"]:
+            held = time.monotonic() - lease["since"]
+            logger.warning(f"Leaked DB connection returned after {held:.1f}s (use={lease['use']})")
+
+        if not close and not conn.closed:
+            try:
+                status = conn.info.transaction_status
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    close = True
+                elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if conn.autocommit:
+                    conn.autocommit = False
+                conn.cursor_factory = None
+            except Exception:
+                close = True
+
+        if close or conn.closed or self.closed:
+            self._discard(conn)
+        else:
+            self._release(conn)
+
+    @contextmanager
+    def connection(self, use: Optional[str] = None, cursor_factory=None):
+        """with 블록 동안 연결 대여 (정상 종료 시 commit, 예외 시 rollback 후 반환)"""
+        conn = self.getconn(use=use)
+        if cursor_factory is not None:
+            conn.cursor_factory = cursor_factory
+        try:
+            yield conn
+            if not conn.closed:
+                conn.commit()
+        except Exception:
+            try:
+                if not conn.closed:
+                    conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            self.putconn(conn)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _connect(self):
+        """새 연결 (슬롯 계산은 호출자가 담당: 실패 시 _discard)"""
+        conn = psycopg2.connect(
+            connection_factory=PooledConnection, connect_timeout=CONNECT_TIMEOUT, **self.config
+        )
+        conn._pool = None
+        conn._statement_timeout = None
+        conn._prepared = set()  # prepared.py: 이 연결에서 PREPARE 된 statement 이름
+        return conn
+
+    def _check(self, conn):
+        """대여 직전 검사 - 실패하면 새 연결로 교체 (풀 크기는 유지)"""
+        idle_for = time.monotonic() - conn.__dict__.get("_idle_since", 0)
+        if not conn.closed and idle_for < HEALTHCHECK_IDLE:
+            return conn
+        if not conn.closed:
+            try:
+                cursor = psycopg2.extensions.cursor(conn)  # 계측 밖 (query_stats 에 남기지 않음)
+                cursor.execute("SELECT 1")
+                cursor.close()
+                conn.rollback()
+                return conn
+            except Exception as e:
+                logger.info(f"Pooled connection failed health check, reconnecting: {e}")
+        self._close_quietly(conn)
+        return self._connect()  # 같은 슬롯 재사용
+
+    @staticmethod
+    def _apply_timeout(conn, use: str):
+        timeout_ms = STATEMENT_TIMEOUTS.get(use, STATEMENT_TIMEOUTS["background"])
+        if conn.__dict__.get("_statement_timeout") == timeout_ms:
+            return
+        cursor = psycopg2.extensions.cursor(conn)
+        cursor.execute("SET statement_timeout = %s", (timeout_ms,))
+        cursor.close()
+        conn.commit()
+        conn._statement_timeout = timeout_ms
+
+    def _release(self, conn):
+        conn._idle_since = time.monotonic()
+        with self._cond:
+            self._idle.append(conn)
+            self._update_gauges()
+            self._cond.notify()
+
+    def _discard(self, conn):
+        if conn is not None:
+            self._close_quietly(conn)
+        with self._cond:
+            self._size -= 1
+            self._update_gauges()
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn._pool = None
+            conn.close()
+        except Exception:
+            pass
+
+    def _update_gauges(self):
+        db_pool_connections.labels(state="idle").set(len(self._idle))
+        db_pool_connections.labels(state="in_use").set(len(self._in_use))
+
+    def _reap(self):
+        """누수 감지 + min_size 초과 idle 연결 정리 (백그라운드 스레드)"""
+        interval = max(1.0, min(self.leak_seconds or 30.0, MAX_IDLE_SECONDS) / 4)
+        while not self.closed:
+            time.sleep(interval)
+            now = time.monotonic()
+            expired = []
+            with self._cond:
+                leaks = [
+                    lease
+                    for lease in self._in_use.values()
+                    if self.leak_seconds > 0 and not lease["reported"] and now - lease["since"] > self.leak_seconds
+                ]
+                for lease in leaks:
+                    lease["reported"] = True
+                while len(self._idle) > self.min_size and now - self._idle[0]._idle_since > MAX_IDLE_SECONDS:
+                    expired.append(self._idle.pop(0))
+            for lease in leaks:
+                db_pool_leaked_connections_total.labels(use=lease["use"]).inc()
+                stack = "".join(traceback.format_list(lease["stack"] or []))
+                logger.warning(
+                    f"DB connection held for {now - lease['since']:.1f}s "
+                    f"(use={lease['use']}, thread={lease['thread']}), checked out at:\n{stack}"
+                )
+            for conn in expired:
+                self._discard(conn)
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._cond:
+            held = [now - lease["since"] for lease in self._in_use.values()]
+            return {
+                "min_connections": self.min_size,
+                "max_connections": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "waiting": self._waiting,
+                "longest_held_seconds": round(max(held), 3) if held else 0.0,
+                "statement_timeouts_ms": dict(STATEMENT_TIMEOUTS),
+            }
+
+    def close(self):
+        """idle 연결 종료 + 이후 checkout 거부 (대여 중인 연결은 반환 시 종료)"""
+        with self._cond:
+            self.closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """프로세스 공용 풀 (첫 호출 시 생성, 생성 실패 시 다음 호출에서 재시도)"""
+    global _pool
+    pool = _pool
+    if pool is not None and not pool.closed:
+        return pool
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            _pool = ConnectionPool(pool_config())
+            logger.info(f"Database connection pool ready (min={_pool.min_size}, max={_pool.max_size})")
+        return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def matches_pool_config(params: Dict[str, Any]) -> bool:
+    """연결 관리자 파라미터가 공용 풀과 같은 DB 를 가리키는지"""
+    config = pool_config()
+    return all(str(params.get(key)) == str(config[key]) for key in ("host", "port", "database", "user"))
@@ -0,0 +1,234 @@
+"""
+Prepared statement registry
+자주 호출되는 고정 쿼리를 연결마다 한 번만 PREPARE 하고 이후에는 EXECUTE 로 실행
+(요청마다 SQL 파싱/재계획을 하지 않음)
+
+- statement(name, sql): 모듈 로드 시 등록. psycopg2 %s 자리표시자 → $1..$n 변환
+- 연결별 준비 상태: conn._prepared (이름 set, core/database/pool.py 가 연결 생성 시 초기화)
+  → 풀이 끊긴 연결을 재연결하면 새 연결 객체이므로 첫 사용 시 자동으로 다시 PREPARE
+- EXECUTE 가 "prepared statement does not exist" (DISCARD ALL 등) 또는
+  "cached plan must not change result type" (스키마 변경) 로 실패하면 트랜잭션 시작 전
+  상태였을 때만 롤백 후 다시 PREPARE 하고 1회 재시도
+- 연결 객체에 상태를 둘 수 없는 raw psycopg2 연결이나 PREPARED_STATEMENTS_ENABLED=false 이면 원문 SQL 실행
+- plan 캐시: PostgreSQL 은 처음 5회 custom plan 후 generic plan 이 충분히 싸면 이를 재사용
+  (단일 IP 조회처럼 인덱스 동등 조건이면 이후 실행에서 계획 단계가 생략됨)
+
+Benchmark (단일 IP 체크: 원문 SQL vs PREPARE/EXECUTE, planning time 포함):
+    python -m core.database.prepared --benchmark
+"""
+
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+PREPARED_ENABLED = os.getenv("PREPARED_STATEMENTS_ENABLED", "true").lower() == "true"
+
+_PLACEHOLDER_RE = re.compile(r"%(s|%)")
+_NAME_RE = re.compile(r"^[a-z_][a-z0-9_]{0,50}$")
+
+_registry: Dict[str, "PreparedStatement"] = {}
+
+
+class PreparedStatement:
+    """이름 붙은 서버 측 prepared statement 정의 (연결과 무관한 불변 정보)"""
+
+    __slots__ = ("name", "sql", "param_count", "prepare_sql", "execute_sql")
+
+    def __init__(self, name: str, sql: str):
+        if not _NAME_RE.match(name):
+            raise ValueError(f"Invalid prepared statement name: {name!r}")
+        if "%(" in sql:
+            raise ValueError(f"Named parameters are not supported in prepared statement {name!r}")
+
+        counter = iter(range(1, 1000))
+        body = _PLACEHOLDER_RE.sub(lambda m: f"${next(counter)}" if m.group(1) == "s" else "%", sql)
+
+        self.name = f"ps_{name}"
+        self.sql = sql
+        self.param_count = next(counter) - 1
+        self.prepare_sql = f"PREPARE {self.name} AS {body.strip()}"
+        if self.param_count:
+            placeholders = ", ".join(["%s"] * self.param_count)
+            self.execute_sql = f"EXECUTE {self.name} ({placeholders})"
+        else:
+            self.execute_sql = f"EXECUTE {self.name}"
+
+    def __repr__(self):
+        return f"<PreparedStatement {self.name} ({self.param_count} params)>"
+
+
+def statement(name: str, sql: str) -> PreparedStatement:
+    """prepared statement 등록 (같은 이름 + 같은 SQL 재등록은 기존 객체 반환)"""
+    stmt = PreparedStatement(name, sql)
+    existing = _registry.get(stmt.name)
+    if existing is not None:
+        if existing.sql != sql:
+            raise ValueError(f"Prepared statement {name!r} is already registered with different SQL")
+        return existing
+    _registry[stmt.name] = stmt
+    return stmt
+
+
+def registered() -> Dict[str, PreparedStatement]:
+    return dict(_registry)
+
+
+def _connection_state(conn) -> Optional[set]:
+    """연결별 준비된 statement 이름 set (상태를 둘 수 없는 연결이면 None)"""
+    attrs = getattr(conn, "__dict__", None)
+    if attrs is None:
+        return None
+    state = attrs.get("_prepared")
+    if state is None:
+        state = attrs["_prepared"] = set()
+    return state
+
+
+def _run(cursor, stmt: PreparedStatement, params, state: set):
+    if stmt.name not in state:
+        cursor.execute(stmt.prepare_sql)
+        state.add(stmt.name)
+    if stmt.param_count:
+        cursor.execute(stmt.execute_sql, params)
+    else:
+        cursor.execute(stmt.execute_sql)
+
+
+def execute(cursor, stmt: PreparedStatement, params: Optional[Sequence[Any]] = None):
+    """
+    cursor 의 연결에서 stmt 실행 (필요하면 먼저 PREPARE)
+
+    결과는 일반 execute() 와 같이 cursor.fetch*() / cursor.description 으로 읽는다.
+    """
+    params = tuple(params) if params else ()
+    if len(params) != stmt.param_count:
+        raise ValueError(f"{stmt.name} expects {stmt.param_count} parameters, got {len(params)}")
+
+    conn = cursor.connection
+    state = _connection_state(conn) if PREPARED_ENABLED else None
+    if state is None:
+        if params:
+            cursor.execute(stmt.sql, params)
+        else:
+            cursor.execute(stmt.sql.replace("%%", "%"))
+        return cursor
+
+    was_idle = conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    try:
+        _run(cursor, stmt, params, state)
+    except psycopg2.errors.InvalidSqlStatementName:
+        # 서버 쪽에서 사라진 statement (DISCARD ALL / DEALLOCATE) - 연결 상태와 다시 맞춘다
+        state.discard(stmt.name)
+        if not was_idle:
+            raise
+        conn.rollback()
+        logger.info(f"Prepared statement {stmt.name} missing on server, re-preparing")
+        _run(cursor, stmt, params, state)
+    except psycopg2.errors.FeatureNotSupported as e:
+        # 마이그레이션으로 결과 컬럼 타입이 바뀐 경우 "cached plan must not change result type"
+        if "cached plan" not in str(e) or not was_idle:
+            raise
+        conn.rollback()
+        logger.info(f"Prepared statement {stmt.name} result type changed, re-preparing")
+        cursor.execute(f"DEALLOCATE {stmt.name}")
+        state.discard(stmt.name)
+        _run(cursor, stmt, params, state)
+    return cursor
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+def _planning_ms(cursor, sql: str, params) -> float:
+    cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + sql, params or None)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return float(plan[0].get("Planning Time", 0.0))
+
+
+def benchmark_prepared(db_service: Any, checks: int = 2000) -> Dict[str, Any]:
+    """
+    단일 IP 체크 (count_whitelist_by_ip + get_blacklist_entry) 를 원문 SQL / PREPARE-EXECUTE 로
+    각각 checks 회 실행해 요청당 시간과 planning time 을 비교
+
+    IP 는 blacklist_ips 의 실제 값 절반 + 문서용 대역(203.0.113.0/24, miss) 절반.
+    읽기 전용 쿼리만 실행하며 끝나면 롤백.
+    """
+    from ..services.blacklist_repository import BLACKLIST_ENTRY, WHITELIST_COUNT
+
+    checks = max(10, int(checks))
+    statements = (WHITELIST_COUNT, BLACKLIST_ENTRY)
+
+    conn = db_service.get_connection(use="background")
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT ip_address FROM blacklist_ips LIMIT %s", (checks // 2,))
+        ips = [str(row[0]) for row in cursor.fetchall()]
+        ips += [f"203.0.113.{i % 254 + 1}" for i in range(checks - len(ips))]
+        conn.rollback()
+
+        def run_text(ip):
+            for stmt in statements:
+                cursor.execute(stmt.sql, (ip,))
+                cursor.fetchall()
+
+        def run_prepared(ip):
+            for stmt in statements:
+                execute(cursor, stmt, (ip,))
+                cursor.fetchall()
+
+        run_prepared(ips[0])  # PREPARE 비용은 연결당 1회이므로 측정에서 제외
+        timings = {}
+        for label, run in (("text", run_text), ("prepared", run_prepared)):
+            started = time.perf_counter()
+            for ip in ips:
+                run(ip)
+            timings[label] = (time.perf_counter() - started) * 1000 / len(ips)
+            conn.rollback()
+
+        # planning time: 원문은 매번 계획, prepared 는 generic plan 캐시 후 재사용
+        sample = ips[: min(len(ips), 50)]
+        planning = {"text": [], "prepared": []}
+        for ip in sample:
+            planning["text"].append(sum(_planning_ms(cursor, s.sql, (ip,)) for s in statements))
+            planning["prepared"].append(sum(_planning_ms(cursor, s.execute_sql, (ip,)) for s in statements))
+        conn.rollback()
+        cursor.close()
+    finally:
+        conn.rollback()
+        db_service.return_connection(conn)
+
+    text_plan = statistics.median(planning["text"])
+    prepared_plan = statistics.median(planning["prepared"])
+    return {
+        "checks": len(ips),
+        "text_ms_per_check": round(timings["text"], 4),
+        "prepared_ms_per_check": round(timings["prepared"], 4),
+        "saved_ms_per_check": round(timings["text"] - timings["prepared"], 4),
+        "planning_ms_text": round(text_plan, 4),
+        "planning_ms_prepared": round(prepared_plan, 4),
+        "planning_ms_saved": round(text_plan - prepared_plan, 4),
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    if "--benchmark" in sys.argv:
+        from core.services.database_service import DatabaseService
+
+        print(benchmark_prepared(DatabaseService()))
+    else:
+        print("Usage: python -m core.database.prepared --benchmark")
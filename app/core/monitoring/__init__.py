@@ -11,6 +11,9 @@
     update_entries_count,
 )
 
+# Request tracing (per-stage latency, Server-Timing)
+from .tracing import setup_tracing, span, traced
+
 # Error metrics (Phase 4: Error Monitoring)
 from .error_metrics import error_metrics, ErrorMetricsCollector
 
@@ -20,6 +23,9 @@
     "track_blacklist_query",
     "track_db_operation",
     "update_entries_count",
+    "setup_tracing",
+    "span",
+    "traced",
     "error_metrics",
     "ErrorMetricsCollector",
 ]
@@ -3,18 +3,39 @@
 Tracks cache hit/miss rates, latency, and provides monitoring capabilities
 
 Created: 2025-11-21 (Redis Query Caching - MEDIUM PRIORITY #8)
+Updated: 2026-10-18 (Low-overhead sharded collector)
 Reference: docs/108-REDIS-CACHING-IMPLEMENTATION.md
+
+Hot-path design:
+- Counters live in per-thread shards and are aggregated on read, so
+  record_* never takes a global lock.
+- Only 1 in N operations (CACHE_METRICS_SAMPLE_RATE) is kept in the
+  recent-operations window, stored as a plain tuple with a monotonic-ns
+  timestamp. ISO formatting happens lazily in get_recent_operations.
+- Latencies go into fixed-size log-linear (HDR-style) histograms instead
+  of raw latency deques.
 """
 
 import logging
+import os
+import random
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from collections import deque
 from threading import Lock
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
 
+# Record one in N operations into the recent-operations window
+DEFAULT_SAMPLE_RATE = 100
+
+# Fold dead thread shards once the registry grows past this size
+SHARD_SWEEP_THRESHOLD = 64
+
 
 @dataclass
 class CacheEvent:
@@ -27,12 +48,156 @@ class CacheEvent:
     ttl: Optional[int] = None
 
 
+class LatencyHistogram:
+    """
+    Log-linear latency histogram (HDR-style) with microsecond resolution.
+
+    Values below 2 * SUB_BUCKETS us get exact buckets; above that every
+    power of two is split into SUB_BUCKETS linear sub-buckets, bounding the
+    relative error at 1 / SUB_BUCKETS (~6%). Recording is O(1) with no
+    allocation.
+    """
+
+    SUB_BUCKET_BITS = 4
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    MAX_VALUE_US = 60_000_000  # clamp at 60 s
+
+    __slots__ = ("counts", "count", "total_us", "max_us")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (self._index(self.MAX_VALUE_US) + 1)
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    @classmethod
+    def _index(cls, value_us: int) -> int:
+        if value_us < 2 * cls.SUB_BUCKETS:
+            return value_us
+        shift = value_us.bit_length() - (cls.SUB_BUCKET_BITS + 1)
+        return (shift + 1) * cls.SUB_BUCKETS + (value_us >> shift) - cls.SUB_BUCKETS
+
+    @classmethod
+    def _upper_bound(cls, index: int) -> int:
+        """Largest microsecond value that maps to ``index``"""
+        if index < 2 * cls.SUB_BUCKETS:
+            return index
+        shift = index // cls.SUB_BUCKETS - 1
+        mantissa = index % cls.SUB_BUCKETS + cls.SUB_BUCKETS
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, latency_ms: float) -> None:
+        value_us = int(latency_ms * 1000)
+        if value_us < 0:
+            value_us = 0
+        elif value_us > self.MAX_VALUE_US:
+            value_us = self.MAX_VALUE_US
+        self.counts[self._index(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        counts = self.counts
+        for i, c in enumerate(list(other.counts)):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def mean_ms(self) -> float:
+        return (self.total_us / self.count / 1000) if self.count else 0.0
+
+    def percentile_ms(self, percentile: float) -> float:
+        if not self.count:
+            return 0.0
+        target = max(1, int(round(self.count * percentile / 100.0)))
+        seen = 0
+        for index, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(self._upper_bound(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+
+class _MetricsShard:
+    """Per-thread counters; only the owning thread writes to a shard"""
+
+    __slots__ = (
+        "thread_ref",
+        "hits",
+        "misses",
+        "sets",
+        "deletes",
+        "errors",
+        "size_bytes",
+        "hit_latency",
+        "miss_latency",
+        "endpoint_hits",
+        "endpoint_misses",
+        "prefix_hits",
+        "prefix_misses",
+        "sample_countdown",
+    )
+
+    def __init__(self, thread: Optional[threading.Thread] = None):
+        self.thread_ref = weakref.ref(thread) if thread is not None else None
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.deletes = 0
+        self.errors = 0
+        self.size_bytes = 0
+        self.hit_latency = LatencyHistogram()
+        self.miss_latency = LatencyHistogram()
+        self.endpoint_hits: Dict[str, int] = {}
+        self.endpoint_misses: Dict[str, int] = {}
+        self.prefix_hits: Dict[str, int] = {}
+        self.prefix_misses: Dict[str, int] = {}
+        self.sample_countdown = 0
+
+    def is_alive(self) -> bool:
+        if self.thread_ref is None:
+            return True
+        thread = self.thread_ref()
+        return thread is not None and thread.is_alive()
+
+    def merge_into(self, target: "_MetricsShard") -> None:
+        """Add this shard's counters to ``target``"""
+        target.hits += self.hits
+        target.misses += self.misses
+        target.sets += self.sets
+        target.deletes += self.deletes
+        target.errors += self.errors
+        target.size_bytes += self.size_bytes
+        target.hit_latency.merge(self.hit_latency)
+        target.miss_latency.merge(self.miss_latency)
+        for src, dst in (
+            (self.endpoint_hits, target.endpoint_hits),
+            (self.endpoint_misses, target.endpoint_misses),
+            (self.prefix_hits, target.prefix_hits),
+            (self.prefix_misses, target.prefix_misses),
+        ):
+            # dict.copy() is atomic under the GIL, safe against the owner
+            # thread inserting a new key concurrently
+            for key, value in src.copy().items():
+                dst[key] = dst.get(key, 0) + value
+
+
+def _key_prefix(cache_key: str) -> str:
+    """Extract key prefix (before first ':')"""
+    return cache_key.partition(':')[0]
+
+
 class CacheMetricsCollector:
     """
     Collects and tracks cache metrics for monitoring and performance analysis.
 
     Thread-safe singleton for tracking cache operations across the application.
-    Maintains a rolling window of recent operations and aggregated statistics.
+    Writers only touch their own thread's shard; readers aggregate all shards.
+    Maintains a sampled rolling window of recent operations.
     """
 
     _instance = None
@@ -52,38 +217,96 @@ def __init__(self):
 
         self._initialized = True
 
-        # Rolling window of recent cache operations (max 10000 events)
-        self._recent_operations: deque = deque(maxlen=10000)
-
-        # Cache hit/miss counters
-        self._cache_hits: int = 0
-        self._cache_misses: int = 0
-        self._cache_sets: int = 0
-        self._cache_deletes: int = 0
-        self._cache_errors: int = 0
-
-        # Latency tracking (milliseconds)
-        self._hit_latencies: deque = deque(maxlen=1000)
-        self._miss_latencies: deque = deque(maxlen=1000)
-
-        # Cache operations by endpoint
-        self._endpoint_hits: Dict[str, int] = defaultdict(int)
-        self._endpoint_misses: Dict[str, int] = defaultdict(int)
+        # Record 1 in N operations into the recent window
+        try:
+            self._sample_rate = max(
+                1, int(os.getenv("CACHE_METRICS_SAMPLE_RATE", DEFAULT_SAMPLE_RATE))
+            )
+        except ValueError:
+            self._sample_rate = DEFAULT_SAMPLE_RATE
 
-        # Cache operations by key prefix
-        self._prefix_hits: Dict[str, int] = defaultdict(int)
-        self._prefix_misses: Dict[str, int] = defaultdict(int)
+        # Sampled window of recent operations (max 10000 events).
+        # Entries: (monotonic_ns, operation, cache_key, endpoint, latency_ms, ttl)
+        self._recent_operations: deque = deque(maxlen=10000)
 
-        # Total cache sizes (approximate)
-        self._cache_size_bytes: int = 0
+        # Per-thread shards plus the folded counters of finished threads
+        self._local = threading.local()
+        self._shards: List[_MetricsShard] = []
+        self._retired = _MetricsShard()
 
-        # First operation timestamp
+        # Wall-clock anchor used to format monotonic timestamps lazily
         self._start_time: datetime = datetime.now()
-
-        # Thread safety lock for metrics updates
-        self._metrics_lock = Lock()
-
-        logger.info("Cache metrics collector initialized")
+        self._start_ns: int = time.monotonic_ns()
+
+        # Guards the shard registry only, never taken on the record path
+        self._registry_lock = Lock()
+
+        logger.info(
+            f"Cache metrics collector initialized (sample rate 1/{self._sample_rate})"
+        )
+
+    # ------------------------------------------------------------------
+    # Shard management
+    # ------------------------------------------------------------------
+
+    def _shard(self) -> _MetricsShard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            return self._new_shard()
+
+    def _new_shard(self) -> _MetricsShard:
+        local = self._local
+        shard = _MetricsShard(threading.current_thread())
+        with self._registry_lock:
+            if len(self._shards) >= SHARD_SWEEP_THRESHOLD:
+                self._sweep_dead_shards()
+            self._shards.append(shard)
+        local.shard = shard
+        return shard
+
+    def _sweep_dead_shards(self) -> None:
+        """Fold shards of finished threads into the retired shard (registry lock held)"""
+        alive = []
+        for shard in self._shards:
+            if shard.is_alive():
+                alive.append(shard)
+            else:
+                shard.merge_into(self._retired)
+        self._shards = alive
+
+    def _aggregate(self) -> _MetricsShard:
+        total = _MetricsShard()
+        with self._registry_lock:
+            self._sweep_dead_shards()
+            self._retired.merge_into(total)
+            shards = list(self._shards)
+        for shard in shards:
+            shard.merge_into(total)
+        return total
+
+    def _sample(self, shard: _MetricsShard, operation: str, cache_key: str,
+                endpoint: Optional[str] = None,
+                latency_ms: Optional[float] = None,
+                ttl: Optional[int] = None) -> None:
+        if shard.sample_countdown > 0:
+            shard.sample_countdown -= 1
+            return
+        # Randomised gap (mean N) so periodic access patterns don't alias
+        shard.sample_countdown = random.randrange(2 * self._sample_rate - 1)
+        # deque.append is atomic; no lock needed
+        self._recent_operations.append(
+            (time.monotonic_ns(), operation, cache_key, endpoint, latency_ms, ttl)
+        )
+
+    def _to_datetime(self, monotonic_ns: int) -> datetime:
+        return self._start_time + timedelta(
+            microseconds=(monotonic_ns - self._start_ns) / 1000
+        )
+
+    # ------------------------------------------------------------------
+    # Recording (hot path)
+    # ------------------------------------------------------------------
 
     def record_hit(
         self,
@@ -99,29 +322,17 @@ def record_hit(
             latency_ms: Latency in milliseconds for cache retrieval
             endpoint: Optional API endpoint path
         """
-        with self._metrics_lock:
-            # Create cache event
-            event = CacheEvent(
-                timestamp=datetime.now().isoformat(),
-                operation='hit',
-                cache_key=cache_key,
-                endpoint=endpoint,
-                latency_ms=latency_ms
-            )
+        shard = self._shard()
+        shard.hits += 1
+        shard.hit_latency.record(latency_ms)
 
-            # Add to recent operations
-            self._recent_operations.append(event)
-
-            # Update counters
-            self._cache_hits += 1
-            self._hit_latencies.append(latency_ms)
+        if endpoint:
+            shard.endpoint_hits[endpoint] = shard.endpoint_hits.get(endpoint, 0) + 1
 
-            if endpoint:
-                self._endpoint_hits[endpoint] += 1
+        prefix = _key_prefix(cache_key)
+        shard.prefix_hits[prefix] = shard.prefix_hits.get(prefix, 0) + 1
 
-            # Extract key prefix (before first ':')
-            prefix = cache_key.split(':')[0] if ':' in cache_key else cache_key
-            self._prefix_hits[prefix] += 1
+        self._sample(shard, 'hit', cache_key, endpoint, latency_ms)
 
     def record_miss(
         self,
@@ -137,29 +348,17 @@ def record_miss(
             latency_ms: Latency in milliseconds for cache lookup
             endpoint: Optional API endpoint path
         """
-        with self._metrics_lock:
-            # Create cache event
-            event = CacheEvent(
-                timestamp=datetime.now().isoformat(),
-                operation='miss',
-                cache_key=cache_key,
-                endpoint=endpoint,
-                latency_ms=latency_ms
-            )
+        shard = self._shard()
+        shard.misses += 1
+        shard.miss_latency.record(latency_ms)
 
-            # Add to recent operations
-            self._recent_operations.append(event)
-
-            # Update counters
-            self._cache_misses += 1
-            self._miss_latencies.append(latency_ms)
+        if endpoint:
+            shard.endpoint_misses[endpoint] = shard.endpoint_misses.get(endpoint, 0) + 1
 
-            if endpoint:
-                self._endpoint_misses[endpoint] += 1
+        prefix = _key_prefix(cache_key)
+        shard.prefix_misses[prefix] = shard.prefix_misses.get(prefix, 0) + 1
 
-            # Extract key prefix
-            prefix = cache_key.split(':')[0] if ':' in cache_key else cache_key
-            self._prefix_misses[prefix] += 1
+        self._sample(shard, 'miss', cache_key, endpoint, latency_ms)
 
     def record_set(
         self,
@@ -175,31 +374,19 @@ def record_set(
             ttl: Time-to-live in seconds
             size_bytes: Optional size of cached value in bytes
         """
-        with self._metrics_lock:
-            event = CacheEvent(
-                timestamp=datetime.now().isoformat(),
-                operation='set',
-                cache_key=cache_key,
-                ttl=ttl
-            )
+        shard = self._shard()
+        shard.sets += 1
 
-            self._recent_operations.append(event)
-            self._cache_sets += 1
+        if size_bytes:
+            shard.size_bytes += size_bytes
 
-            if size_bytes:
-                self._cache_size_bytes += size_bytes
+        self._sample(shard, 'set', cache_key, ttl=ttl)
 
     def record_delete(self, cache_key: str) -> None:
         """Record a cache delete operation"""
-        with self._metrics_lock:
-            event = CacheEvent(
-                timestamp=datetime.now().isoformat(),
-                operation='delete',
-                cache_key=cache_key
-            )
-
-            self._recent_operations.append(event)
-            self._cache_deletes += 1
+        shard = self._shard()
+        shard.deletes += 1
+        self._sample(shard, 'delete', cache_key)
 
     def record_error(
         self,
@@ -215,11 +402,31 @@ def record_error(
             operation: The operation that failed ('get', 'set', 'delete')
             error_message: Error message
         """
-        with self._metrics_lock:
-            self._cache_errors += 1
-            logger.warning(
-                f"Cache {operation} error for key '{cache_key}': {error_message}"
-            )
+        self._shard().errors += 1
+        logger.warning(
+            f"Cache {operation} error for key '{cache_key}': {error_message}"
+        )
+
+    # ------------------------------------------------------------------
+    # Reading (aggregates shards)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _hit_miss_breakdown(
+        hits_by_key: Dict[str, int], misses_by_key: Dict[str, int]
+    ) -> Dict[str, Dict]:
+        stats = {}
+        for key in set(hits_by_key) | set(misses_by_key):
+            hits = hits_by_key.get(key, 0)
+            misses = misses_by_key.get(key, 0)
+            total = hits + misses
+
+            stats[key] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round((hits / total * 100) if total > 0 else 0, 2)
+            }
+        return stats
 
     def get_statistics(self) -> Dict:
         """
@@ -233,79 +440,60 @@ def get_statistics(self) -> Dict:
             - hit_rate: Cache hit rate (%)
             - avg_hit_latency_ms: Average hit latency
             - avg_miss_latency_ms: Average miss latency
+            - hit_latency_ms / miss_latency_ms: p50/p95/p99/max from histograms
             - by_endpoint: Hit/miss stats by endpoint
             - by_prefix: Hit/miss stats by cache key prefix
             - uptime_hours: Hours since metrics collection started
         """
-        with self._metrics_lock:
-            total_ops = self._cache_hits + self._cache_misses
-            hit_rate = (self._cache_hits / total_ops * 100) if total_ops > 0 else 0
-
-            avg_hit_latency = (
-                sum(self._hit_latencies) / len(self._hit_latencies)
-                if self._hit_latencies else 0
-            )
-
-            avg_miss_latency = (
-                sum(self._miss_latencies) / len(self._miss_latencies)
-                if self._miss_latencies else 0
-            )
+        total = self._aggregate()
 
-            uptime = datetime.now() - self._start_time
-            uptime_hours = uptime.total_seconds() / 3600
+        total_ops = total.hits + total.misses
+        hit_rate = (total.hits / total_ops * 100) if total_ops > 0 else 0
 
-            # Build endpoint statistics
-            endpoint_stats = {}
-            all_endpoints = set(
-                list(self._endpoint_hits.keys()) +
-                list(self._endpoint_misses.keys())
-            )
-
-            for endpoint in all_endpoints:
-                hits = self._endpoint_hits.get(endpoint, 0)
-                misses = self._endpoint_misses.get(endpoint, 0)
-                total = hits + misses
-
-                endpoint_stats[endpoint] = {
-                    'hits': hits,
-                    'misses': misses,
-                    'hit_rate': round((hits / total * 100) if total > 0 else 0, 2)
-                }
-
-            # Build prefix statistics
-            prefix_stats = {}
-            all_prefixes = set(
-                list(self._prefix_hits.keys()) +
-                list(self._prefix_misses.keys())
-            )
-
-            for prefix in all_prefixes:
-                hits = self._prefix_hits.get(prefix, 0)
-                misses = self._prefix_misses.get(prefix, 0)
-                total = hits + misses
-
-                prefix_stats[prefix] = {
-                    'hits': hits,
-                    'misses': misses,
-                    'hit_rate': round((hits / total * 100) if total > 0 else 0, 2)
-                }
+        uptime = datetime.now() - self._start_time
+        uptime_hours = uptime.total_seconds() / 3600
 
+        def latency_summary(histogram: LatencyHistogram) -> Dict[str, float]:
             return {
-                'total_operations': total_ops,
-                'cache_hits': self._cache_hits,
-                'cache_misses': self._cache_misses,
-                'cache_sets': self._cache_sets,
-                'cache_deletes': self._cache_deletes,
-                'cache_errors': self._cache_errors,
-                'hit_rate': round(hit_rate, 2),
-                'avg_hit_latency_ms': round(avg_hit_latency, 2),
-                'avg_miss_latency_ms': round(avg_miss_latency, 2),
-                'by_endpoint': endpoint_stats,
-                'by_prefix': prefix_stats,
-                'uptime_hours': round(uptime_hours, 2),
-                'collection_start': self._start_time.isoformat()
+                'p50': round(histogram.percentile_ms(50), 3),
+                'p95': round(histogram.percentile_ms(95), 3),
+                'p99': round(histogram.percentile_ms(99), 3),
+                'max': round(histogram.max_us / 1000, 3),
             }
 
+        return {
+            'total_operations': total_ops,
+            'cache_hits': total.hits,
+            'cache_misses': total.misses,
+            'cache_sets': total.sets,
+            'cache_deletes': total.deletes,
+            'cache_errors': total.errors,
+            'cache_size_bytes': total.size_bytes,
+            'hit_rate': round(hit_rate, 2),
+            'avg_hit_latency_ms': round(total.hit_latency.mean_ms(), 2),
+            'avg_miss_latency_ms': round(total.miss_latency.mean_ms(), 2),
+            'hit_latency_ms': latency_summary(total.hit_latency),
+            'miss_latency_ms': latency_summary(total.miss_latency),
+            'by_endpoint': self._hit_miss_breakdown(
+                total.endpoint_hits, total.endpoint_misses
+            ),
+            'by_prefix': self._hit_miss_breakdown(
+                total.prefix_hits, total.prefix_misses
+            ),
+            'sample_rate': self._sample_rate,
+            'uptime_hours': round(uptime_hours, 2),
+            'collection_start': self._start_time.isoformat()
+        }
+
+    def _snapshot_operations(self) -> List[Tuple]:
+        # list(deque) can race with a concurrent append; retry on mutation
+        for _ in range(3):
+            try:
+                return list(self._recent_operations)
+            except RuntimeError:
+                continue
+        return []
+
     def get_recent_operations(
         self,
         limit: int = 50,
@@ -313,7 +501,7 @@ def get_recent_operations(
         endpoint: Optional[str] = None
     ) -> List[Dict]:
         """
-        Get recent cache operations with optional filtering.
+        Get recent (sampled) cache operations with optional filtering.
 
         Args:
             limit: Maximum number of operations to return
@@ -323,18 +511,27 @@ def get_recent_operations(
         Returns:
             List of cache event dictionaries
         """
-        with self._metrics_lock:
-            operations = list(self._recent_operations)
+        operations = self._snapshot_operations()
 
         # Apply filters
         if operation_type:
-            operations = [o for o in operations if o.operation == operation_type]
+            operations = [o for o in operations if o[1] == operation_type]
 
         if endpoint:
-            operations = [o for o in operations if o.endpoint == endpoint]
+            operations = [o for o in operations if o[3] == endpoint]
 
-        # Apply limit and convert to dict
-        return [asdict(o) for o in operations[-limit:]]
+        # Apply limit, then format timestamps only for what is returned
+        return [
+            asdict(CacheEvent(
+                timestamp=self._to_datetime(ts).isoformat(),
+                operation=operation,
+                cache_key=cache_key,
+                endpoint=ep,
+                latency_ms=latency_ms,
+                ttl=ttl
+            ))
+            for ts, operation, cache_key, ep, latency_ms, ttl in operations[-limit:]
+        ] if limit > 0 else []
 
     def get_cache_trends(
         self,
@@ -344,6 +541,9 @@ def get_cache_trends(
         """
         Get cache performance trends over time.
 
+        Bucket counts are estimated from the sampled window (sampled count
+        multiplied by the sample rate); hit rates are unaffected by sampling.
+
         Args:
             window_minutes: Time window to analyze (default: 60 minutes)
             bucket_minutes: Size of time buckets (default: 5 minutes)
@@ -353,52 +553,52 @@ def get_cache_trends(
             - buckets: List of time buckets with hit/miss counts
             - total_in_window: Total operations in the time window
         """
-        with self._metrics_lock:
-            operations = list(self._recent_operations)
+        operations = self._snapshot_operations()
 
-        # Calculate time boundaries
+        # Calculate time boundaries on the monotonic clock
         now = datetime.now()
+        now_ns = time.monotonic_ns()
+        window_ns = window_minutes * 60 * 1_000_000_000
+        bucket_ns = max(bucket_minutes, 1) * 60 * 1_000_000_000
+        window_start_ns = now_ns - window_ns
+        bucket_count = -(-window_ns // bucket_ns)
+
+        hits = [0] * bucket_count
+        misses = [0] * bucket_count
+        in_window = 0
+
+        for ts, operation, *_ in operations:
+            if ts < window_start_ns:
+                continue
+            in_window += 1
+            index = min((ts - window_start_ns) // bucket_ns, bucket_count - 1)
+            if operation == 'hit':
+                hits[index] += 1
+            elif operation == 'miss':
+                misses[index] += 1
+
+        rate = self._sample_rate
         window_start = now - timedelta(minutes=window_minutes)
-
-        # Filter operations within window
-        recent = [
-            o for o in operations
-            if datetime.fromisoformat(o.timestamp) >= window_start
-        ]
-
-        # Create buckets
+        bucket_size = timedelta(minutes=max(bucket_minutes, 1))
         buckets = []
-        bucket_size = timedelta(minutes=bucket_minutes)
-        current_bucket_start = window_start
-
-        while current_bucket_start < now:
-            bucket_end = current_bucket_start + bucket_size
-
-            # Count operations in this bucket
-            bucket_ops = [
-                o for o in recent
-                if current_bucket_start <= datetime.fromisoformat(o.timestamp) < bucket_end
-            ]
-
-            hits = sum(1 for o in bucket_ops if o.operation == 'hit')
-            misses = sum(1 for o in bucket_ops if o.operation == 'miss')
-            total = hits + misses
 
+        for i in range(bucket_count):
+            bucket_start = window_start + bucket_size * i
+            total = hits[i] + misses[i]
             buckets.append({
-                'start': current_bucket_start.isoformat(),
-                'end': bucket_end.isoformat(),
-                'hits': hits,
-                'misses': misses,
-                'hit_rate': round((hits / total * 100) if total > 0 else 0, 2)
+                'start': bucket_start.isoformat(),
+                'end': (bucket_start + bucket_size).isoformat(),
+                'hits': hits[i] * rate,
+                'misses': misses[i] * rate,
+                'hit_rate': round((hits[i] / total * 100) if total > 0 else 0, 2)
             })
 
-            current_bucket_start = bucket_end
-
         return {
             'buckets': buckets,
-            'total_in_window': len(recent),
+            'total_in_window': in_window * rate,
             'window_minutes': window_minutes,
-            'bucket_minutes': bucket_minutes
+            'bucket_minutes': bucket_minutes,
+            'sample_rate': rate
         }
 
     def get_top_keys(
@@ -416,43 +616,35 @@ def get_top_keys(
         Returns:
             List of top cache keys with counts
         """
-        with self._metrics_lock:
-            if by == "hits":
-                data = self._prefix_hits
-            elif by == "misses":
-                data = self._prefix_misses
-            else:
-                raise ValueError(f"Invalid 'by' parameter: {by}")
-
-            # Sort by count descending
-            sorted_items = sorted(
-                data.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:limit]
-
-            return [
-                {'prefix': prefix, 'count': count}
-                for prefix, count in sorted_items
-            ]
+        if by not in ("hits", "misses"):
+            raise ValueError(f"Invalid 'by' parameter: {by}")
+
+        total = self._aggregate()
+        data = total.prefix_hits if by == "hits" else total.prefix_misses
+
+        # Sort by count descending
+        sorted_items = sorted(
+            data.items(),
+            key=lambda x: x[1],
+            reverse=True
+        )[:limit]
+
+        return [
+            {'prefix': prefix, 'count': count}
+            for prefix, count in sorted_items
+        ]
 
     def reset_metrics(self) -> None:
         """Reset all metrics (use with caution)"""
-        with self._metrics_lock:
+        with self._registry_lock:
+            # A fresh thread-local makes every thread allocate a new shard on
+            # its next record; writes racing with the reset may be lost.
+            self._local = threading.local()
+            self._shards = []
+            self._retired = _MetricsShard()
             self._recent_operations.clear()
-            self._cache_hits = 0
-            self._cache_misses = 0
-            self._cache_sets = 0
-            self._cache_deletes = 0
-            self._cache_errors = 0
-            self._hit_latencies.clear()
-            self._miss_latencies.clear()
-            self._endpoint_hits.clear()
-            self._endpoint_misses.clear()
-            self._prefix_hits.clear()
-            self._prefix_misses.clear()
-            self._cache_size_bytes = 0
             self._start_time = datetime.now()
+            self._start_ns = time.monotonic_ns()
 
         logger.warning("Cache metrics have been reset")
 
@@ -5,6 +5,13 @@
 
 Note: Uses lazy initialization to prevent duplicate metrics registration
 when module is imported multiple times (Flask app factory pattern).
+
+Multiple worker processes (gunicorn): set PROMETHEUS_MULTIPROC_DIR before
+prometheus_client is imported (see multiprocess.py / gunicorn.conf.py);
+metrics_view() then merges every worker's values.
+
+Label values that come from requests (endpoint, error type) pass through a
+LabelGuard so unknown values collapse into "other".
 """
 import time
 import logging
@@ -19,11 +26,64 @@
     REGISTRY,
 )
 
+from .multiprocess import build_registry, multiprocess_enabled
+
 logger = logging.getLogger(__name__)
 
 # Cache for created metrics to prevent duplicate registration
 _metrics_cache = {}
 
+# Latency buckets: 100µs resolution at the low end so cached / in-memory
+# blacklist checks (well under 1ms) do not all land in the first bucket
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Modules whose exception class names are a bounded label set
+_ERROR_TYPE_MODULES = ("builtins", "core.", "werkzeug.", "psycopg2", "redis.", "requests.")
+
+
+class LabelGuard:
+    """Bound a label's value set
+
+    Values in ``allowed`` always pass; other values are admitted until
+    ``max_values`` distinct ones have been seen, after which they collapse
+    into ``other``.
+    """
+
+    def __init__(self, allowed=(), max_values=0, other="other"):
+        self.allowed = set(allowed)
+        self.max_values = max_values
+        self.other = other
+        self._admitted = set()
+
+    def __call__(self, value):
+        if value is None:
+            return self.other
+        value = str(value)
+        if value in self.allowed or value in self._admitted:
+            return value
+        if len(self._admitted) < self.max_values:
+            self._admitted.add(value)
+            return value
+        return self.other
+
+
+# Endpoints: registered Flask view names (filled by setup_metrics); no
+# match (404, unrouted) -> "other"
+endpoint_label = LabelGuard()
+
+# Error types: class names from known modules, at most 50 distinct
+error_type_label = LabelGuard(max_values=50)
+
+
+def _error_type(exception):
+    exc_type = type(exception)
+    if exc_type.__module__.startswith(_ERROR_TYPE_MODULES):
+        return error_type_label(exc_type.__name__)
+    return error_type_label.other
+
 
 def _metric_exists(name):
     """Check if metric already exists in registry (handles _total, _created suffixes)"""
@@ -110,8 +170,12 @@ def _get_or_create_histogram(name, description, labels, buckets=None):
         raise
 
 
-def _get_or_create_gauge(name, description, labels):
-    """Get existing gauge or create new one to prevent duplicates"""
+def _get_or_create_gauge(name, description, labels, multiprocess_mode="all"):
+    """Get existing gauge or create new one to prevent duplicates
+
+    multiprocess_mode: how worker values are merged in multiprocess mode
+    (all/liveall/min/max/livesum/mostrecent...)
+    """
     # Check cache first
     if name in _metrics_cache:
         return _metrics_cache[name]
@@ -125,7 +189,7 @@ def _get_or_create_gauge(name, description, labels):
 
     # Create new metric
     try:
-        metric = Gauge(name, description, labels)
+        metric = Gauge(name, description, labels, multiprocess_mode=multiprocess_mode)
         _metrics_cache[name] = metric
         return metric
     except ValueError:
@@ -151,7 +215,7 @@ def _get_or_create_gauge(name, description, labels):
     "blacklist_http_request_duration_seconds",
     "HTTP request latency in seconds",
     ["method", "endpoint"],
-    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    buckets=LATENCY_BUCKETS,
 )
 
 http_request_size_bytes = _get_or_create_histogram(
@@ -193,6 +257,14 @@ def _get_or_create_gauge(name, description, labels):
     "blacklist_entries_total",
     "Current number of entries in blacklist",
     ["category"],  # category: domain/ip/email/etc
+    multiprocess_mode="mostrecent",
+)
+
+blacklist_check_duration_seconds = _get_or_create_histogram(
+    "blacklist_check_duration_seconds",
+    "Blacklist check latency in seconds",
+    ["result"],  # result: whitelisted/cache/db/error
+    buckets=LATENCY_BUCKETS,
 )
 
 blacklist_db_operations_total = _get_or_create_counter(
@@ -205,6 +277,76 @@ def _get_or_create_gauge(name, description, labels):
     "blacklist_db_operation_duration_seconds",
     "Database operation duration in seconds",
     ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+blacklist_expiry_deactivated_total = _get_or_create_counter(
+    "blacklist_expiry_deactivated_total",
+    "Total IPs deactivated by the expiry engine",
+    ["rule", "source"],  # rule: removal_date/stale_detection
+)
+
+blacklist_expiry_chunk_duration_seconds = _get_or_create_histogram(
+    "blacklist_expiry_chunk_duration_seconds",
+    "Expiry chunk (claim + update + commit) duration in seconds",
+    ["rule"],
+)
+
+# ============================================================================
+# Database Connection Pool Metrics (core/database/pool.py)
+# ============================================================================
+
+db_pool_connections = _get_or_create_gauge(
+    "blacklist_db_pool_connections",
+    "Pooled database connections by state",
+    ["state"],  # state: idle/in_use
+    multiprocess_mode="livesum",
+)
+
+db_pool_waiting = _get_or_create_gauge(
+    "blacklist_db_pool_waiting",
+    "Threads waiting for a pooled database connection",
+    [],
+    multiprocess_mode="livesum",
+)
+
+db_pool_checkout_wait_seconds = _get_or_create_histogram(
+    "blacklist_db_pool_checkout_wait_seconds",
+    "Time to check out a pooled connection (queueing + health check + connect)",
+    ["use"],  # use: api/background/health/report
+    buckets=LATENCY_BUCKETS,
+)
+
+db_pool_checkout_timeouts_total = _get_or_create_counter(
+    "blacklist_db_pool_checkout_timeouts_total",
+    "Checkouts that gave up because the pool stayed saturated",
+    ["use"],
+)
+
+db_pool_leaked_connections_total = _get_or_create_counter(
+    "blacklist_db_pool_leaked_connections_total",
+    "Connections held longer than DB_POOL_LEAK_SECONDS",
+    ["use"],
+)
+
+fortimanager_push_total = _get_or_create_counter(
+    "fortimanager_push_total",
+    "FortiManager push attempts",
+    ["target", "result"],  # result: success/skipped/failed
+)
+
+fortimanager_push_duration_seconds = _get_or_create_histogram(
+    "fortimanager_push_duration_seconds",
+    "FortiManager push duration (DB read + upload) in seconds",
+    ["target"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+)
+
+fortimanager_push_payload_bytes = _get_or_create_histogram(
+    "fortimanager_push_payload_bytes",
+    "Uploaded external-resource payload size in bytes (plain IP list)",
+    ["target"],
+    buckets=[1e3, 1e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7],
 )
 
 # ============================================================================
@@ -215,6 +357,7 @@ def _get_or_create_gauge(name, description, labels):
     "blacklist_app_info",
     "Application information",
     ["version", "mode"],
+    multiprocess_mode="max",
 )
 
 blacklist_errors_total = _get_or_create_counter(
@@ -237,14 +380,19 @@ def setup_metrics(app):
     # Set application info
     blacklist_app_info.labels(version="1.0.0", mode="full").set(1)
 
+    # Bounded endpoint labels: every registered view (routes are registered
+    # before setup_metrics; later ones are admitted up to the same count)
+    endpoint_label.allowed.update(app.view_functions)
+    endpoint_label.max_values = len(app.view_functions)
+
     @app.before_request
     def before_request():
         """요청 시작 시간 기록"""
-        g.start_time = time.time()
+        g.start_time = time.perf_counter()
 
         # Record request size
         if request.content_length:
-            endpoint = request.endpoint or "unknown"
+            endpoint = endpoint_label(request.endpoint)
             http_request_size_bytes.labels(
                 method=request.method, endpoint=endpoint
             ).observe(request.content_length)
@@ -254,8 +402,8 @@ def after_request(response):
         """요청 완료 후 메트릭 기록"""
         # Calculate request duration
         if hasattr(g, "start_time"):
-            duration = time.time() - g.start_time
-            endpoint = request.endpoint or "unknown"
+            duration = time.perf_counter() - g.start_time
+            endpoint = endpoint_label(request.endpoint)
 
             # Record metrics
             http_requests_total.labels(
@@ -279,7 +427,7 @@ def after_request(response):
     @app.errorhandler(404)
     def handle_not_found(error):
         """404 에러 조용히 처리 (메트릭만 기록)"""
-        endpoint = request.endpoint or "unknown"
+        endpoint = endpoint_label(request.endpoint)
         blacklist_errors_total.labels(
             error_type="NotFound", endpoint=endpoint
         ).inc()
@@ -308,8 +456,8 @@ def handle_not_found(error):
     from flask import got_request_exception
 
     def log_exception(sender, exception, **extra):
-        endpoint = request.endpoint or "unknown"
-        error_type = type(exception).__name__
+        endpoint = endpoint_label(request.endpoint)
+        error_type = _error_type(exception)
         blacklist_errors_total.labels(
             error_type=error_type, endpoint=endpoint
         ).inc()
@@ -326,8 +474,10 @@ def log_exception(sender, exception, **extra):
 
 def metrics_view():
     """
-    Prometheus /metrics 엔드포인트
+    Prometheus /metrics 엔드포인트 (multiprocess 모드면 모든 워커 합산)
     """
+    if multiprocess_enabled():
+        return generate_latest(build_registry()), 200, {"Content-Type": CONTENT_TYPE_LATEST}
     return generate_latest(), 200, {"Content-Type": CONTENT_TYPE_LATEST}
 
 
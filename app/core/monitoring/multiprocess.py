@@ -0,0 +1,57 @@
+"""
+Prometheus multiprocess support
+여러 워커 프로세스(gunicorn)의 메트릭을 하나의 /metrics 응답으로 합산
+
+prometheus_client 는 import 시점에 PROMETHEUS_MULTIPROC_DIR 를 보고 값 저장소
+(프로세스 메모리 / mmap 파일)를 고르므로, 이 모듈은 prometheus_client 를 최상단에서
+import 하지 않는다. 디렉터리 준비는 워커 fork 전에 마스터에서 한 번 (gunicorn.conf.py
+on_starting), 워커 종료 시 mark_worker_dead() 로 해당 pid 의 live gauge 파일을 정리한다.
+
+단일 프로세스(python run_app.py)에서는 환경변수가 없으므로 기존 REGISTRY 를 그대로 사용.
+"""
+
+import glob
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+DEFAULT_MULTIPROC_DIR = "/tmp/prometheus_multiproc"
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get(MULTIPROC_ENV))
+
+
+def prepare_multiproc_dir(path: str = None) -> str:
+    """메트릭 디렉터리 생성 + 이전 실행의 *.db 파일 삭제 (워커 fork 전에 호출)"""
+    path = path or os.environ.get(MULTIPROC_ENV) or DEFAULT_MULTIPROC_DIR
+    os.makedirs(path, exist_ok=True)
+    stale = glob.glob(os.path.join(path, "*.db"))
+    for filename in stale:
+        os.remove(filename)
+    os.environ[MULTIPROC_ENV] = path
+    logger.info(f"📈 Prometheus multiprocess dir: {path} ({len(stale)} stale files removed)")
+    return path
+
+
+def mark_worker_dead(pid: int):
+    """종료된 워커의 live gauge 파일 정리 (counter/histogram 값은 합산에 계속 포함)"""
+    if not multiprocess_enabled():
+        return
+    try:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
+    except Exception as e:
+        logger.warning(f"Prometheus mark_process_dead({pid}) failed: {e}")
+
+
+def build_registry():
+    """모든 워커의 mmap 파일을 읽는 scrape 용 registry (요청마다 새로 생성)"""
+    from prometheus_client import CollectorRegistry, multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
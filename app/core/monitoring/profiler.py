@@ -0,0 +1,93 @@
+"""
+Sampling stack profiler (py-spy 와 유사한 in-process 샘플러)
+sys._current_frames() 로 일정 간격마다 모든 스레드의 스택을 찍어 hot path 를 집계한다.
+
+- 기본 비활성: PROFILER_ENABLED=true 일 때만 /api/monitoring/profile 이 동작
+- 한 번에 하나의 프로파일만 실행, 최대 PROFILER_MAX_SECONDS 초
+- 결과: folded stacks (flamegraph.pl / speedscope 입력 형식) + 함수별 self/total 샘플 수
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "30"))
+MIN_INTERVAL = 0.001
+
+_profile_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """다른 스레드들의 스택을 주기적으로 샘플링"""
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval = max(interval, MIN_INTERVAL)
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def _sample(self, ignore_ids):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id in ignore_ids:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            stack.reverse()
+            self.stacks[";".join(stack)] += 1
+        self.samples += 1
+
+    def run(self, seconds: float, ignore_ids=()) -> "StackSampler":
+        """seconds 동안 호출한 스레드에서 샘플링 (호출 스레드 자신은 제외)"""
+        ignore = set(ignore_ids) | {threading.get_ident()}
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self._sample(ignore)
+            time.sleep(self.interval)
+        return self
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = 30) -> Dict[str, Any]:
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]  # 맨 앞은 스레드 이름
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for label in set(frames):
+                total_counts[label] += count
+        return {
+            "samples": self.samples,
+            "interval_ms": self.interval * 1000,
+            "hot_self": [{"frame": f, "samples": c} for f, c in self_counts.most_common(top)],
+            "hot_total": [{"frame": f, "samples": c} for f, c in total_counts.most_common(top)],
+            "stacks": [
+                {"stack": s, "samples": c} for s, c in self.stacks.most_common(top)
+            ],
+        }
+
+
+def profile(seconds: float, interval: float = 0.005) -> Optional[StackSampler]:
+    """프로파일 1회 실행 → StackSampler (다른 프로파일이 실행 중이면 None)"""
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        seconds = min(max(seconds, 0.1), PROFILER_MAX_SECONDS)
+        return StackSampler(interval=interval).run(seconds)
+    finally:
+        _profile_lock.release()
@@ -0,0 +1,247 @@
+"""
+Query observability (pg_stat_statements 와 유사, Flask endpoint 별 집계)
+
+TracedCursorMixin (tracing.py) 가 execute/executemany/callproc 마다 record() 를 호출한다.
+- fingerprint: 리터럴/파라미터를 ? 로 치환하고 공백을 정규화한 문장 + 16자리 해시
+- (fingerprint, endpoint) 별 calls / total / max / rows 누적, 상한 QUERY_STATS_MAX 초과 시
+  total 시간이 가장 작은 항목부터 제거
+- SLOW_QUERY_MS 이상 걸린 SELECT/WITH 는 QUERY_EXPLAIN_SAMPLE_RATE 확률로
+  EXPLAIN (ANALYZE, BUFFERS) 를 백그라운드 스레드에서 별도 연결(READ ONLY 트랜잭션, 롤백)로 수집
+- 최근 느린 쿼리 이벤트는 ring buffer (deque) 에 보관
+
+조회: GET /api/monitoring/queries, /api/monitoring/queries/slow
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import random
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from flask import has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
+QUERY_STATS_MAX = int(os.getenv("QUERY_STATS_MAX", "500"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+EXPLAIN_SAMPLE_RATE = float(os.getenv("QUERY_EXPLAIN_SAMPLE_RATE", "0.1"))
+EXPLAIN_TIMEOUT_MS = int(os.getenv("QUERY_EXPLAIN_TIMEOUT_MS", "10000"))
+SLOW_EVENTS_MAX = 200
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str):
+    """정규화된 문장과 16자리 fingerprint id
+
+    SELECT * FROM t WHERE id IN (1, 2, 3) AND ip = '1.2.3.4'
+      → select * from t where id in (...) and ip = ?
+    """
+    text = _COMMENT_RE.sub(" ", statement)
+    text = _STRING_RE.sub("?", text)
+    text = _PARAM_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("(...)", text)
+    text = _SPACE_RE.sub(" ", text).strip().lower()
+    return hashlib.md5(text.encode("utf-8")).hexdigest()[:16], text
+
+
+def _statement_text(cursor, query) -> str:
+    if isinstance(query, str):
+        return query
+    if isinstance(query, bytes):
+        return query.decode("utf-8", "replace")
+    try:
+        return query.as_string(cursor.connection)  # psycopg2.sql.Composed
+    except Exception:
+        return str(query)
+
+
+def _endpoint() -> str:
+    if has_request_context():
+        return request.endpoint or "other"
+    return f"background:{threading.current_thread().name}"
+
+
+class QueryStatsCollector:
+    """fingerprint x endpoint 집계 + 느린 쿼리 샘플링 EXPLAIN"""
+
+    def __init__(self, max_entries: int = QUERY_STATS_MAX):
+        self.max_entries = max_entries
+        self._entries: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.slow_events: deque = deque(maxlen=SLOW_EVENTS_MAX)
+        self.started_at = datetime.now()
+
+        self._connect = None
+        self._explain_queue: "queue.Queue" = queue.Queue(maxsize=20)
+        self._explain_thread: Optional[threading.Thread] = None
+
+    def attach(self, connect):
+        """EXPLAIN 용 연결 생성 함수 등록 (DatabaseService.create_raw_connection)
+
+        풀 연결은 TracedConnection 이라 EXPLAIN 자체가 다시 집계되므로 별도 raw 연결을 쓴다.
+        """
+        self._connect = connect
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def record(self, cursor, query, duration: float, rows: int):
+        statement = _statement_text(cursor, query)
+        query_id, normalized = fingerprint(statement)
+        endpoint = _endpoint()
+        duration_ms = duration * 1000
+
+        with self._lock:
+            key = (query_id, endpoint)
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    self._evict()
+                entry = self._entries[key] = {
+                    "query_id": query_id,
+                    "endpoint": endpoint,
+                    "query": normalized,
+                    "calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "slow_calls": 0,
+                    "plan": None,
+                }
+            entry["calls"] += 1
+            entry["total_ms"] += duration_ms
+            entry["rows"] += max(rows, 0)
+            if duration_ms > entry["max_ms"]:
+                entry["max_ms"] = duration_ms
+            slow = duration_ms >= SLOW_QUERY_MS
+            if slow:
+                entry["slow_calls"] += 1
+
+        if slow:
+            self.slow_events.append(
+                {
+                    "query_id": query_id,
+                    "endpoint": endpoint,
+                    "duration_ms": round(duration_ms, 2),
+                    "rows": rows,
+                    "at": datetime.now().isoformat(),
+                }
+            )
+            if self._should_explain(normalized):
+                self._enqueue_explain(key, getattr(cursor, "query", None) or statement)
+
+    def _evict(self):
+        """total_ms 하위 10% 제거 (pg_stat_statements dealloc 과 같은 방식)"""
+        victims = sorted(self._entries, key=lambda k: self._entries[k]["total_ms"])
+        for key in victims[: max(1, len(victims) // 10)]:
+            del self._entries[key]
+
+    # ------------------------------------------------------------------
+    # EXPLAIN sampling
+    # ------------------------------------------------------------------
+    def _should_explain(self, normalized: str) -> bool:
+        return (
+            self._connect is not None
+            and normalized.startswith(("select", "with"))
+            and random.random() < EXPLAIN_SAMPLE_RATE
+        )
+
+    def _enqueue_explain(self, key, bound_query):
+        if isinstance(bound_query, bytes):
+            bound_query = bound_query.decode("utf-8", "replace")
+        try:
+            self._explain_queue.put_nowait((key, bound_query))
+        except queue.Full:
+            return
+        with self._lock:
+            if self._explain_thread is None or not self._explain_thread.is_alive():
+                self._explain_thread = threading.Thread(
+                    target=self._explain_worker, name="query-explain", daemon=True
+                )
+                self._explain_thread.start()
+
+    def _explain_worker(self):
+        conn = None
+        while True:
+            key, bound_query = self._explain_queue.get()
+            try:
+                if conn is None or conn.closed:
+                    conn = self._connect()
+                    conn.set_session(readonly=True)
+                plan = self._explain(conn, bound_query)
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        entry["plan"] = {"captured_at": datetime.now().isoformat(), "text": plan}
+            except Exception as e:
+                logger.warning(f"EXPLAIN capture failed for {key[0]}: {e}")
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                    conn = None
+
+    @staticmethod
+    def _explain(conn, bound_query: str) -> str:
+        """READ ONLY 세션에서 EXPLAIN ANALYZE 후 롤백 (쓰기 문장은 실행 불가)"""
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SET LOCAL statement_timeout = %s", (EXPLAIN_TIMEOUT_MS,))
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + bound_query)
+            return "\n".join(row[0] for row in cursor.fetchall())
+        finally:
+            conn.rollback()
+            cursor.close()
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def top(self, limit: int = 20, sort: str = "total_ms", endpoint: str = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = [dict(e) for e in self._entries.values()]
+        if endpoint:
+            entries = [e for e in entries if e["endpoint"] == endpoint]
+        for e in entries:
+            e["mean_ms"] = round(e["total_ms"] / e["calls"], 3) if e["calls"] else 0.0
+            e["total_ms"] = round(e["total_ms"], 3)
+            e["max_ms"] = round(e["max_ms"], 3)
+        entries.sort(key=lambda e: e.get(sort, 0), reverse=True)
+        return entries[:limit]
+
+    def slow(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return list(self.slow_events)[-limit:][::-1]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+        self.slow_events.clear()
+        self.started_at = datetime.now()
+
+
+query_stats = QueryStatsCollector()
+
+
+def record_query(cursor, query, duration: float):
+    """TracedCursorMixin 에서 호출 (집계 실패가 쿼리 실행에 영향을 주지 않도록 보호)"""
+    if not QUERY_STATS_ENABLED:
+        return
+    try:
+        query_stats.record(cursor, query, duration, cursor.rowcount)
+    except Exception as e:
+        logger.debug(f"Query stats record failed: {e}")
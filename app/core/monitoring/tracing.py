@@ -0,0 +1,225 @@
+"""
+Request-level latency tracing
+요청 하나의 시간을 단계(stage)별로 나눠 기록: db / redis / json / compress ...
+
+- span(stage): flask.g 에 쌓이는 구간 타이머 (요청 컨텍스트 밖에서는 no-op)
+- TracedConnection: psycopg2 connection_factory. conn.cursor() 가 어떤 cursor_factory
+  (RealDictCursor 등)를 요청하든 execute/executemany/callproc/copy_* 를 "db" span 으로 감싼
+  서브클래스를 돌려준다 (DatabaseService 풀에서 사용). 문장별 집계는 query_stats.py
+- instrument_redis(): redis.Redis.execute_command / Pipeline.execute 를 "redis" span 으로 감싼다
+- setup_tracing(app): 요청마다 trace 시작, 응답에 Server-Timing 헤더 +
+  http_request_stage_duration_seconds{endpoint, stage} 히스토그램 기록
+
+Server-Timing 예: db;dur=41.2;desc="3 calls", compress;dur=8.9, total;dur=57.3
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import psycopg2.extensions
+from flask import g, has_request_context, request
+
+from .metrics import LATENCY_BUCKETS, LabelGuard, _get_or_create_histogram, endpoint_label
+from .query_stats import record_query
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+# 자동 계측 단계 + 코드에서 추가하는 span 은 최대 20개까지, 이후 "other"
+stage_label = LabelGuard(allowed=("db", "redis", "json", "serialize", "compress"), max_values=20)
+
+http_request_stage_duration_seconds = _get_or_create_histogram(
+    "http_request_stage_duration_seconds",
+    "Time spent per request stage (db/redis/json/compress/...)",
+    ["endpoint", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def _current_trace():
+    if not has_request_context():
+        return None
+    return g.get("_trace")
+
+
+@contextmanager
+def span(stage: str):
+    """요청의 stage 구간 시간을 누적 (같은 stage 는 합산 + 호출 횟수)
+
+    중첩된 같은 stage 는 바깥 구간만 센다 (redis 호출 안의 재시도 등 이중 계산 방지).
+    """
+    trace = _current_trace()
+    if trace is None or stage in trace["active"]:
+        yield
+        return
+
+    trace["active"].add(stage)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        trace["active"].discard(stage)
+        total, count = trace["stages"].get(stage, (0.0, 0))
+        trace["stages"][stage] = (total + elapsed, count + 1)
+
+
+def traced(stage: str):
+    """함수 전체를 span(stage) 로 감싸는 데코레이터"""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ----------------------------------------------------------------------
+# psycopg2
+# ----------------------------------------------------------------------
+class TracedCursorMixin:
+    """서버 왕복이 일어나는 cursor 메서드를 "db" span 으로 측정
+
+    execute/executemany/callproc 는 문장별 시간/행 수도 query_stats 에 기록한다.
+    """
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            with span("db"):
+                return super().execute(query, vars)
+        finally:
+            record_query(self, query, time.perf_counter() - started)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            with span("db"):
+                return super().executemany(query, vars_list)
+        finally:
+            record_query(self, query, time.perf_counter() - started)
+
+    def callproc(self, procname, parameters=None):
+        started = time.perf_counter()
+        try:
+            with span("db"):
+                return super().callproc(procname, parameters)
+        finally:
+            record_query(self, f"CALL {procname}()", time.perf_counter() - started)
+
+    def copy_expert(self, sql, file, size=8192):
+        with span("db"):
+            return super().copy_expert(sql, file, size)
+
+    def copy_from(self, *args, **kwargs):
+        with span("db"):
+            return super().copy_from(*args, **kwargs)
+
+    def copy_to(self, *args, **kwargs):
+        with span("db"):
+            return super().copy_to(*args, **kwargs)
+
+
+_traced_cursor_classes = {}
+
+
+def traced_cursor_factory(base=psycopg2.extensions.cursor):
+    """base cursor 클래스의 계측 서브클래스 (클래스별 1회 생성 후 캐시)"""
+    if issubclass(base, TracedCursorMixin):
+        return base
+    traced_cls = _traced_cursor_classes.get(base)
+    if traced_cls is None:
+        traced_cls = type(f"Traced{base.__name__}", (TracedCursorMixin, base), {})
+        _traced_cursor_classes[base] = traced_cls
+    return traced_cls
+
+
+class TracedConnection(psycopg2.extensions.connection):
+    """cursor() 호출마다 요청된 cursor_factory 를 계측 서브클래스로 바꿔 생성"""
+
+    def cursor(self, *args, **kwargs):
+        if len(args) < 2:
+            base = kwargs.get("cursor_factory") or self.cursor_factory or psycopg2.extensions.cursor
+            kwargs["cursor_factory"] = traced_cursor_factory(base)
+        return super().cursor(*args, **kwargs)
+
+
+# ----------------------------------------------------------------------
+# Redis
+# ----------------------------------------------------------------------
+_redis_instrumented = False
+
+
+def instrument_redis():
+    """redis-py 명령 실행 경로를 "redis" span 으로 감싼다 (프로세스당 1회)"""
+    global _redis_instrumented
+    if _redis_instrumented:
+        return
+    try:
+        import redis
+        from redis.client import Pipeline
+    except ImportError:
+        return
+
+    redis.Redis.execute_command = traced("redis")(redis.Redis.execute_command)
+    Pipeline.execute = traced("redis")(Pipeline.execute)
+    _redis_instrumented = True
+
+
+# ----------------------------------------------------------------------
+# Flask
+# ----------------------------------------------------------------------
+def _server_timing(stages, total):
+    parts = []
+    for stage, (seconds, count) in stages.items():
+        parts.append(f'{stage};dur={seconds * 1000:.1f};desc="{count} calls"')
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def setup_tracing(app):
+    """
+    요청 단위 trace 시작/종료 훅 등록
+
+    after_request 훅은 등록 역순으로 실행되므로, compress_response 등 다른 훅보다 먼저
+    등록해야 그 시간까지 Server-Timing 에 포함된다.
+    """
+    if not TRACING_ENABLED:
+        return
+
+    instrument_redis()
+
+    @app.before_request
+    def start_trace():
+        g._trace = {"started": time.perf_counter(), "stages": {}, "active": set()}
+
+    @app.after_request
+    def finish_trace(response):
+        trace = g.pop("_trace", None)
+        if trace is None:
+            return response
+
+        total = time.perf_counter() - trace["started"]
+        stages = trace["stages"]
+        try:
+            endpoint = endpoint_label(request.endpoint)
+            for stage, (seconds, _count) in stages.items():
+                http_request_stage_duration_seconds.labels(
+                    endpoint=endpoint, stage=stage_label(stage)
+                ).observe(seconds)
+            if SERVER_TIMING_ENABLED:
+                response.headers["Server-Timing"] = _server_timing(stages, total)
+        except Exception as e:
+            logger.debug(f"Trace export failed: {e}")
+        return response
+
+    app.logger.info("✅ Request tracing enabled (Server-Timing, per-stage histograms)")
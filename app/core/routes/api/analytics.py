@@ -64,7 +64,7 @@ def get_detection_timeline():
     GET /analytics/detection-timeline?days=30&format=json
 
     Query Parameters:
-        days (int): Analysis period in days (default: 30)
+        days (int): Analysis period in days (default: 365, 0 or "all" = no date filter)
         format (str): Response format - "json" or "chart" (default: "json")
 
     Raises:
@@ -72,21 +72,11 @@ def get_detection_timeline():
         DatabaseError: Database query failed
     """
     # Get and validate query parameters
-<<<<<<< Updated upstream:app/core/routes/api/analytics.py
-    try:
-        days_back = int(request.args.get("days", 365))
-    except ValueError as e:
-        raise ValidationError(
-            message="Days parameter must be a valid integer",
-            field="days",
-            details={"error": str(e)},
-        )
-=======
-    days_param = request.args.get("days", "30")
-    
+    days_param = request.args.get("days", "365")
+
     # days=0 or days=all means no date filter (all data)
     if days_param.lower() == "all" or days_param == "0":
-        days_back = None  # No limit
+        days_back = None
     else:
         try:
             days_back = int(days_param)
@@ -96,81 +86,17 @@ def get_detection_timeline():
                 field="days",
                 details={"error": str(e)},
             )
->>>>>>> Stashed changes:app-source/core/routes/api/analytics.py
 
     format_type = request.args.get("format", "json")  # json or chart
 
     try:
-        db_service = current_app.extensions["db_service"]
-
-        conn = db_service.get_connection()
-        cursor = conn.cursor()
+        summaries = current_app.extensions["analytics_service"].summaries
 
-        # 날짜별 수집 통계 (View 사용 - 3개월 자동 비활성화 로직 적용)
-<<<<<<< Updated upstream:app/core/routes/api/analytics.py
-        query = """
-            SELECT
-                COALESCE(detection_date, created_at::date) as detection_day,
-                COUNT(*) as ip_count,
-                COUNT(DISTINCT source) as source_count,
-                STRING_AGG(DISTINCT source, ', ') as sources,
-                MIN(created_at) as first_collected,
-                MAX(created_at) as last_collected
-            FROM blacklist_ips_with_auto_inactive
-            WHERE COALESCE(detection_date, created_at::date) >= CURRENT_DATE - INTERVAL '%s days'
-            GROUP BY COALESCE(detection_date, created_at::date)
-            ORDER BY detection_day DESC
-        """
-
-        cursor.execute(query, (days_back,))
-=======
-        if days_back is None:
-            # 전체 데이터 조회 (날짜 필터 없음)
-            query = """
-                SELECT
-                    COALESCE(detection_date, created_at::date) as detection_day,
-                    COUNT(*) as ip_count,
-                    COUNT(DISTINCT source) as source_count,
-                    STRING_AGG(DISTINCT source, ', ') as sources,
-                    MIN(created_at) as first_collected,
-                    MAX(created_at) as last_collected
-                FROM blacklist_ips_with_auto_inactive
-                GROUP BY COALESCE(detection_date, created_at::date)
-                ORDER BY detection_day DESC
-            """
-            cursor.execute(query)
-        else:
-            query = """
-                SELECT
-                    COALESCE(detection_date, created_at::date) as detection_day,
-                    COUNT(*) as ip_count,
-                    COUNT(DISTINCT source) as source_count,
-                    STRING_AGG(DISTINCT source, ', ') as sources,
-                    MIN(created_at) as first_collected,
-                    MAX(created_at) as last_collected
-                FROM blacklist_ips_with_auto_inactive
-                WHERE COALESCE(detection_date, created_at::date) >= CURRENT_DATE - INTERVAL '%s days'
-                GROUP BY COALESCE(detection_date, created_at::date)
-                ORDER BY detection_day DESC
-            """
-            cursor.execute(query, (days_back,))
->>>>>>> Stashed changes:app-source/core/routes/api/analytics.py
-        results = cursor.fetchall()
+        # 날짜별 수집 통계 (analytics_daily_source 요약, 탐지일 창만 조회)
+        results, mode = summaries.fetch("detection_timeline", days=days_back)
 
-        # 컬럼명 매핑
-        columns = [
-            "detection_day",
-            "ip_count",
-            "source_count",
-            "sources",
-            "first_collected",
-            "last_collected",
-        ]
         timeline_data = []
-
-        for row in results:
-            data = dict(zip(columns, row))
-
+        for data in results:
             # 날짜 형식 변환
             if data["detection_day"]:
                 data["detection_day"] = str(data["detection_day"])
@@ -178,16 +104,20 @@ def get_detection_timeline():
                 data["first_collected"] = data["first_collected"].isoformat()
             if data["last_collected"]:
                 data["last_collected"] = data["last_collected"].isoformat()
+            timeline_data.append(data)
 
-<<<<<<< Updated upstream:app/core/routes/api/analytics.py
+        # 통계 요약
+        total_ips = sum([d["ip_count"] for d in timeline_data])
+        total_days = len(timeline_data)
+        avg_per_day = total_ips / total_days if total_days > 0 else 0
+
+        for data in timeline_data:
             # 수상한 패턴 탐지
             suspicious_patterns = []
 
             # 1. 비정상적으로 많은 IP (평균의 3배 이상)
-            if len(timeline_data) > 0:
-                avg_count = sum([d["ip_count"] for d in timeline_data]) / len(timeline_data)
-                if data["ip_count"] > avg_count * 3:
-                    suspicious_patterns.append("abnormal_volume")
+            if data["ip_count"] > avg_per_day * 3:
+                suspicious_patterns.append("abnormal_volume")
 
             # 2. 정확히 떨어지는 숫자 (1000, 5000, 10000 등)
             if data["ip_count"] % 1000 == 0 and data["ip_count"] >= 1000:
@@ -200,82 +130,20 @@ def get_detection_timeline():
             data["suspicious_patterns"] = suspicious_patterns
             data["is_suspicious"] = len(suspicious_patterns) > 0
 
-=======
->>>>>>> Stashed changes:app-source/core/routes/api/analytics.py
-            timeline_data.append(data)
-
-        # 통계 요약
-        total_ips = sum([d["ip_count"] for d in timeline_data])
-        total_days = len(timeline_data)
-        avg_per_day = total_ips / total_days if total_days > 0 else 0
-
         # 소스별 통계
-<<<<<<< Updated upstream:app/core/routes/api/analytics.py
-        cursor.execute(
-            """
-            SELECT
-                source,
-                COUNT(*) as total_ips,
-                COUNT(DISTINCT COALESCE(detection_date, created_at::date)) as active_days,
-                MIN(COALESCE(detection_date, created_at::date)) as first_detection,
-                MAX(COALESCE(detection_date, created_at::date)) as last_detection
-            FROM blacklist_ips_with_auto_inactive
-            WHERE COALESCE(detection_date, created_at::date) >= CURRENT_DATE - INTERVAL '%s days'
-            GROUP BY source
-            ORDER BY total_ips DESC
-        """,
-            (days_back,),
-        )
-=======
-        if days_back is None:
-            cursor.execute(
-                """
-                SELECT
-                    source,
-                    COUNT(*) as total_ips,
-                    COUNT(DISTINCT COALESCE(detection_date, created_at::date)) as active_days,
-                    MIN(COALESCE(detection_date, created_at::date)) as first_detection,
-                    MAX(COALESCE(detection_date, created_at::date)) as last_detection
-                FROM blacklist_ips_with_auto_inactive
-                GROUP BY source
-                ORDER BY total_ips DESC
-            """
-            )
-        else:
-            cursor.execute(
-                """
-                SELECT
-                    source,
-                    COUNT(*) as total_ips,
-                    COUNT(DISTINCT COALESCE(detection_date, created_at::date)) as active_days,
-                    MIN(COALESCE(detection_date, created_at::date)) as first_detection,
-                    MAX(COALESCE(detection_date, created_at::date)) as last_detection
-                FROM blacklist_ips_with_auto_inactive
-                WHERE COALESCE(detection_date, created_at::date) >= CURRENT_DATE - INTERVAL '%s days'
-                GROUP BY source
-                ORDER BY total_ips DESC
-            """,
-                (days_back,),
-            )
->>>>>>> Stashed changes:app-source/core/routes/api/analytics.py
-
-        source_results = cursor.fetchall()
+        source_results, _ = summaries.fetch("source_statistics", days=days_back)
         source_stats = []
         for row in source_results:
             source_data = {
-                "source": row[0],
-                "total_ips": row[1],
-                "active_days": row[2],
-                "first_detection": str(row[3]) if row[3] else None,
-                "last_detection": str(row[4]) if row[4] else None,
-                "avg_per_day": round(row[1] / row[2], 1) if row[2] > 0 else 0,
+                "source": row["source"],
+                "total_ips": row["total_ips"],
+                "active_days": row["active_days"],
+                "first_detection": str(row["first_detection"]) if row["first_detection"] else None,
+                "last_detection": str(row["last_detection"]) if row["last_detection"] else None,
+                "avg_per_day": round(row["total_ips"] / row["active_days"], 1) if row["active_days"] > 0 else 0,
             }
             source_stats.append(source_data)
 
-        cursor.close()
-        conn.close()
-
-<<<<<<< Updated upstream:app/core/routes/api/analytics.py
         # 수상한 패턴 요약
         suspicious_days = [d for d in timeline_data if d["is_suspicious"]]
         pattern_summary = {}
@@ -284,8 +152,9 @@ def get_detection_timeline():
                 pattern_summary[pattern] = pattern_summary.get(pattern, 0) + 1
 
         # 로그 출력 (탐지일 데이터 분석)
+        period_str = "전체" if days_back is None else f"{days_back}일"
         logger.info("📊 탐지일 데이터 분석 결과:")
-        logger.info(f"   • 분석 기간: {days_back}일")
+        logger.info(f"   • 분석 기간: {period_str}")
         logger.info(f"   • 총 IP 수: {total_ips:,}개")
         logger.info(f"   • 활성 일수: {total_days}일")
         logger.info(f"   • 일평균: {avg_per_day:.1f}개")
@@ -297,39 +166,24 @@ def get_detection_timeline():
                 logger.warning(
                     f"   • {day['detection_day']}: {day['ip_count']:,}개 IP ({', '.join(day['suspicious_patterns'])})"
                 )
-=======
-        # 로그 출력 (탐지일 데이터 분석)
-        period_str = "전체" if days_back is None else f"{days_back}일"
-        logger.info("📊 탐지일 데이터 분석 결과:")
-        logger.info(f"   • 분석 기간: {period_str}")
-        logger.info(f"   • 총 IP 수: {total_ips:,}개")
-        logger.info(f"   • 활성 일수: {total_days}일")
-        logger.info(f"   • 일평균: {avg_per_day:.1f}개")
->>>>>>> Stashed changes:app-source/core/routes/api/analytics.py
 
         response_data = {
             "success": True,
             "metadata": {
-<<<<<<< Updated upstream:app/core/routes/api/analytics.py
-                "analysis_period_days": days_back,
-=======
                 "analysis_period_days": days_back,  # None means all
->>>>>>> Stashed changes:app-source/core/routes/api/analytics.py
                 "total_ips": total_ips,
                 "total_days": total_days,
                 "avg_per_day": round(avg_per_day, 1),
+                "mode": mode,
                 "generated_at": datetime.now().isoformat(),
             },
             "timeline": timeline_data,
             "source_statistics": source_stats,
-<<<<<<< Updated upstream:app/core/routes/api/analytics.py
             "suspicious_analysis": {
                 "suspicious_days_count": len(suspicious_days),
                 "pattern_summary": pattern_summary,
                 "suspicious_days": suspicious_days[:10],  # 최대 10일만 반환
             },
-=======
->>>>>>> Stashed changes:app-source/core/routes/api/analytics.py
         }
 
         if format_type == "chart":
@@ -340,7 +194,6 @@ def get_detection_timeline():
                     {
                         "label": "IP 수집량",
                         "data": [d["ip_count"] for d in timeline_data],
-<<<<<<< Updated upstream:app/core/routes/api/analytics.py
                         "backgroundColor": [
                             ("rgba(255, 99, 132, 0.8)" if d["is_suspicious"] else "rgba(54, 162, 235, 0.8)")
                             for d in timeline_data
@@ -349,10 +202,6 @@ def get_detection_timeline():
                             ("rgba(255, 99, 132, 1)" if d["is_suspicious"] else "rgba(54, 162, 235, 1)")
                             for d in timeline_data
                         ],
-=======
-                        "backgroundColor": "rgba(54, 162, 235, 0.8)",
-                        "borderColor": "rgba(54, 162, 235, 1)",
->>>>>>> Stashed changes:app-source/core/routes/api/analytics.py
                         "borderWidth": 1,
                     }
                 ],
@@ -363,10 +212,7 @@ def get_detection_timeline():
                     "data": {
                         "chart_data": chart_data,
                         "summary": response_data["metadata"],
-<<<<<<< Updated upstream:app/core/routes/api/analytics.py
                         "suspicious_count": len(suspicious_days),
-=======
->>>>>>> Stashed changes:app-source/core/routes/api/analytics.py
                     },
                     "timestamp": datetime.now().isoformat(),
                     "request_id": g.request_id,
@@ -401,162 +247,113 @@ def get_suspicious_patterns():
 
     GET /analytics/suspicious-patterns
 
+    탐지일 x 소스 요약(analytics_daily_source)만 조회 (?live=true 이면 전체 스캔)
+
     Raises:
         DatabaseError: Database query failed
     """
-    db_service = current_app.extensions["db_service"]
-    conn = None
+    live = request.args.get("live", "false").lower() == "true"
 
     try:
-        conn = db_service.get_connection()
-        cursor = conn.cursor()
+        summaries = current_app.extensions["analytics_service"].summaries
+        patterns = []
 
-        try:
-            patterns = []
-
-            # 1. 정확히 떨어지는 숫자 패턴
-            cursor.execute(
-                """
-                SELECT
-                    COALESCE(detection_date, created_at::date) as day,
-                    COUNT(*) as count,
-                    source
-                FROM blacklist_ips_with_auto_inactive
-                GROUP BY COALESCE(detection_date, created_at::date), source
-                HAVING COUNT(*) % 1000 = 0 AND COUNT(*) >= 1000
-                ORDER BY count DESC
-            """
+        # 1. 정확히 떨어지는 숫자 패턴
+        round_numbers, mode = summaries.fetch("round_numbers", live=live)
+        if round_numbers:
+            patterns.append(
+                {
+                    "type": "round_numbers",
+                    "description": "정확히 떨어지는 숫자 (1000, 5000, 10000 등)",
+                    "severity": "high",
+                    "count": len(round_numbers),
+                    "examples": [
+                        {"date": str(row["day"]), "ip_count": row["count"], "source": row["source"]}
+                        for row in round_numbers[:5]
+                    ],
+                }
             )
 
-            round_numbers = cursor.fetchall()
-            if round_numbers:
-                patterns.append(
-                    {
-                        "type": "round_numbers",
-                        "description": "정확히 떨어지는 숫자 (1000, 5000, 10000 등)",
-                        "severity": "high",
-                        "count": len(round_numbers),
-                        "examples": [
-                            {"date": str(row[0]), "ip_count": row[1], "source": row[2]} for row in round_numbers[:5]
-                        ],
-                    }
-                )
+            # 로그 출력
+            logger.warning("🚨 정확히 떨어지는 숫자 패턴 발견:")
+            for row in round_numbers[:3]:
+                logger.warning(f"   • {row['day']}: {row['count']:,}개 ({row['source']})")
 
-                # 로그 출력
-                logger.warning("🚨 정확히 떨어지는 숫자 패턴 발견:")
-                for row in round_numbers[:3]:
-                    logger.warning(f"   • {row[0]}: {row[1]:,}개 ({row[2]})")
-
-            # 2. 비정상적 대량 수집
-            cursor.execute(
-                """
-                WITH daily_stats AS (
-                    SELECT
-                        COALESCE(detection_date, created_at::date) as day,
-                        COUNT(*) as count
-                    FROM blacklist_ips_with_auto_inactive
-                    GROUP BY COALESCE(detection_date, created_at::date)
-                ),
-                avg_stats AS (
-                    SELECT AVG(count) as avg_count, STDDEV(count) as stddev_count
-                    FROM daily_stats
-                )
-                SELECT d.day, d.count, a.avg_count
-                FROM daily_stats d, avg_stats a
-                WHERE d.count > (a.avg_count + 2 * COALESCE(a.stddev_count, a.avg_count))
-                ORDER BY d.count DESC
-            """
+        # 2. 비정상적 대량 수집
+        bulk_collections, _ = summaries.fetch("bulk_collection", live=live)
+        if bulk_collections:
+            patterns.append(
+                {
+                    "type": "bulk_collection",
+                    "description": "비정상적 대량 수집 (평균 + 2σ 이상)",
+                    "severity": "medium",
+                    "count": len(bulk_collections),
+                    "examples": [
+                        {
+                            "date": str(row["day"]),
+                            "ip_count": row["count"],
+                            "avg_baseline": round(float(row["avg_count"]), 1),
+                        }
+                        for row in bulk_collections[:5]
+                    ],
+                }
             )
 
-            bulk_collections = cursor.fetchall()
-            if bulk_collections:
-                patterns.append(
-                    {
-                        "type": "bulk_collection",
-                        "description": "비정상적 대량 수집 (평균 + 2σ 이상)",
-                        "severity": "medium",
-                        "count": len(bulk_collections),
-                        "examples": [
-                            {
-                                "date": str(row[0]),
-                                "ip_count": row[1],
-                                "avg_baseline": round(float(row[2]), 1),
-                            }
-                            for row in bulk_collections[:5]
-                        ],
-                    }
-                )
+            # 로그 출력
+            logger.warning("🚨 비정상적 대량 수집 패턴 발견:")
+            for row in bulk_collections[:3]:
+                logger.warning(f"   • {row['day']}: {row['count']:,}개 (평균: {row['avg_count']:.1f}개)")
 
-                # 로그 출력
-                logger.warning("🚨 비정상적 대량 수집 패턴 발견:")
-                for row in bulk_collections[:3]:
-                    logger.warning(f"   • {row[0]}: {row[1]:,}개 (평균: {row[2]:.1f}개)")
-
-            # 3. 단일 소스 대량 수집
-            cursor.execute(
-                """
-                SELECT
-                    data_source,
-                    COALESCE(detection_date, created_at::date) as day,
-                    COUNT(*) as count
-                FROM blacklist_ips_with_auto_inactive
-                GROUP BY data_source, COALESCE(detection_date, created_at::date)
-                HAVING COUNT(*) > 10000
-                ORDER BY count DESC
-            """
+        # 3. 단일 소스 대량 수집
+        single_source_bulk, _ = summaries.fetch("single_source_bulk", live=live)
+        if single_source_bulk:
+            patterns.append(
+                {
+                    "type": "single_source_bulk",
+                    "description": "단일 소스에서 1만개 이상 수집",
+                    "severity": "high",
+                    "count": len(single_source_bulk),
+                    "examples": [
+                        {"source": row["data_source"], "date": str(row["day"]), "ip_count": row["count"]}
+                        for row in single_source_bulk[:5]
+                    ],
+                }
             )
 
-            single_source_bulk = cursor.fetchall()
-            if single_source_bulk:
-                patterns.append(
-                    {
-                        "type": "single_source_bulk",
-                        "description": "단일 소스에서 1만개 이상 수집",
-                        "severity": "high",
-                        "count": len(single_source_bulk),
-                        "examples": [
-                            {"source": row[0], "date": str(row[1]), "ip_count": row[2]}
-                            for row in single_source_bulk[:5]
-                        ],
-                    }
-                )
-
-                # 로그 출력
-                logger.warning("🚨 단일 소스 대량 수집 패턴 발견:")
-                for row in single_source_bulk[:3]:
-                    logger.warning(f"   • {row[1]} {row[0]}: {row[2]:,}개")
-
-            # 종합 위험도 평가
-            total_issues = sum([p["count"] for p in patterns])
-            risk_level = "low"
-            if total_issues > 10:
-                risk_level = "high"
-            elif total_issues > 5:
-                risk_level = "medium"
-
-            logger.info(
-                f"📊 수상한 패턴 분석 완료: {len(patterns)}가지 패턴, 총 {total_issues}건, 위험도: {risk_level}"
-            )
+            # 로그 출력
+            logger.warning("🚨 단일 소스 대량 수집 패턴 발견:")
+            for row in single_source_bulk[:3]:
+                logger.warning(f"   • {row['day']} {row['data_source']}: {row['count']:,}개")
+
+        # 종합 위험도 평가
+        total_issues = sum([p["count"] for p in patterns])
+        risk_level = "low"
+        if total_issues > 10:
+            risk_level = "high"
+        elif total_issues > 5:
+            risk_level = "medium"
+
+        logger.info(
+            f"📊 수상한 패턴 분석 완료: {len(patterns)}가지 패턴, 총 {total_issues}건, 위험도: {risk_level}"
+        )
 
-            return jsonify(
-                {
-                    "success": True,
-                    "data": {
-                        "analysis": {
-                            "total_pattern_types": len(patterns),
-                            "total_issues": total_issues,
-                            "risk_level": risk_level,
-                            "generated_at": datetime.now().isoformat(),
-                        },
-                        "patterns": patterns,
+        return jsonify(
+            {
+                "success": True,
+                "data": {
+                    "analysis": {
+                        "total_pattern_types": len(patterns),
+                        "total_issues": total_issues,
+                        "risk_level": risk_level,
+                        "mode": mode,
+                        "generated_at": datetime.now().isoformat(),
                     },
-                    "timestamp": datetime.now().isoformat(),
-                    "request_id": g.request_id,
-                }
-            ), 200
-
-        finally:
-            cursor.close()
+                    "patterns": patterns,
+                },
+                "timestamp": datetime.now().isoformat(),
+                "request_id": g.request_id,
+            }
+        ), 200
 
     except Exception as e:
         logger.error(f"Suspicious patterns analysis error: {e}", exc_info=True)
@@ -564,9 +361,6 @@ def get_suspicious_patterns():
             message="Failed to analyze suspicious patterns",
             details={"error_type": type(e).__name__},
         )
-    finally:
-        if conn:
-            db_service.return_connection(conn)
 
 
 @detection_bp.route("/detection-chart")
@@ -7,6 +7,7 @@
 - Core operations (list, stats, check, JSON)
 - Manual IP management (add/remove blacklist/whitelist)
 - Batch operations (bulk add/remove/update)
+- Export jobs (asynchronous raw data export)
 - System status (containers, credentials, database)
 - Collection triggering (REGTECH collection)
 """
@@ -17,6 +18,7 @@
 from .core import blacklist_core_bp
 from .management import blacklist_management_bp
 from .batch import blacklist_batch_bp
+from .export import blacklist_export_bp
 from .system import blacklist_system_bp
 from .collection import blacklist_collection_bp
 
@@ -31,6 +33,7 @@ def register_blacklist_routes(app):
         - blacklist_core_bp: Core operations (4 routes)
         - blacklist_management_bp: Manual IP management (3 routes)
         - blacklist_batch_bp: Batch operations (3 routes)
+        - blacklist_export_bp: Export jobs (4 routes)
         - blacklist_system_bp: System/credentials status (4 routes)
         - blacklist_collection_bp: Collection triggering (1 route)
     """
@@ -38,6 +41,7 @@ def register_blacklist_routes(app):
     app.register_blueprint(blacklist_core_bp, url_prefix="/api")
     app.register_blueprint(blacklist_management_bp, url_prefix="/api")
     app.register_blueprint(blacklist_batch_bp, url_prefix="/api")
+    app.register_blueprint(blacklist_export_bp, url_prefix="/api")
     app.register_blueprint(blacklist_system_bp, url_prefix="/api")
     app.register_blueprint(blacklist_collection_bp, url_prefix="/api")
 
@@ -48,6 +52,7 @@ def register_blacklist_routes(app):
         csrf.exempt(blacklist_core_bp)
         csrf.exempt(blacklist_management_bp)
         csrf.exempt(blacklist_batch_bp)
+        csrf.exempt(blacklist_export_bp)
         csrf.exempt(blacklist_system_bp)
         csrf.exempt(blacklist_collection_bp)
 
@@ -7,7 +7,8 @@
 from datetime import datetime
 import logging
 from functools import wraps
-import re
+import ipaddress
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -32,68 +33,116 @@ def limited_route(*args, **kwargs):
 
 blacklist_batch_bp = Blueprint("blacklist_batch", __name__)
 
+# 요청당 최대 IP 수 (단일 statement 처리 기준)
+BATCH_MAX_IPS = int(os.getenv("BATCH_MAX_IPS", "50000"))
 
-@blacklist_batch_bp.route("/blacklist/batch/add", methods=["POST"])
-@rate_limit("10 per hour; 2 per minute")  # Resource-intensive batch operation
-def batch_add_blacklist():
-    """Batch add multiple IPs to blacklist"""
-    try:
-        # Use dependency injection via app.extensions
-        db_service = current_app.extensions['db_service']
+BATCH_RATE_LIMIT = "60 per hour; 10 per minute"
 
-        data = request.get_json() or {}
-        ips = data.get("ips", [])
-        reason = data.get("reason", "Batch import")
-        country = data.get("country", "UNKNOWN")
 
-        if not ips or not isinstance(ips, list):
-            return jsonify({
-                "success": False,
-                "error": "IPs list is required"
-            }), 400
+def _validate_ips(ips):
+    """
+    IP 목록 일괄 검증 (1회 순회)
 
-        # Validate all IPs
-        ip_pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-        valid_ips = []
-        invalid_ips = []
-
-        for ip in ips:
-            if re.match(ip_pattern, str(ip).strip()):
-                octets = str(ip).strip().split('.')
-                if all(0 <= int(octet) <= 255 for octet in octets):
-                    valid_ips.append(str(ip).strip())
-                else:
-                    invalid_ips.append(ip)
-            else:
-                invalid_ips.append(ip)
+    Returns:
+        (valid_ips, invalid_ips) - valid_ips 는 정규화/중복 제거, 입력 순서 유지
+    """
+    valid_ips = []
+    invalid_ips = []
+    seen = set()
+
+    for ip in ips:
+        try:
+            normalized = str(ipaddress.IPv4Address(str(ip).strip()))
+        except ValueError:
+            invalid_ips.append(ip)
+            continue
+        if normalized not in seen:
+            seen.add(normalized)
+            valid_ips.append(normalized)
+
+    return valid_ips, invalid_ips
 
-        # Batch insert valid IPs
-        conn = db_service.get_connection()
-        cursor = conn.cursor()
 
-        added_count = 0
-        duplicate_count = 0
-
-        for ip in valid_ips:
-            try:
-                cursor.execute("""
-                    INSERT INTO blacklist_ips
-                    (ip_address, source, country, reason, detection_date, last_seen, detection_count, created_at, updated_at)
-                    VALUES (%s, %s, %s, %s, CURRENT_DATE, NOW(), 1, NOW(), NOW())
-                    ON CONFLICT (ip_address) DO NOTHING
-                """, (ip, "BATCH", country, reason))
-                if cursor.rowcount > 0:
-                    added_count += 1
-                else:
-                    duplicate_count += 1
-            except Exception as e:
-                logger.warning(f"Failed to add IP {ip}: {e}")
+def _parse_ips():
+    """요청 본문에서 IP 목록 추출 및 크기 검증. Returns (data, ips, error_response)"""
+    data = request.get_json() or {}
+    ips = data.get("ips", [])
 
+    if not ips or not isinstance(ips, list):
+        return data, None, (jsonify({
+            "success": False,
+            "error": "IPs list is required"
+        }), 400)
+
+    if len(ips) > BATCH_MAX_IPS:
+        return data, None, (jsonify({
+            "success": False,
+            "error": f"Too many IPs in one batch (max {BATCH_MAX_IPS})",
+            "max_batch_size": BATCH_MAX_IPS,
+        }), 400)
+
+    return data, ips, None
+
+
+def _run_batch(db_service, sql, params):
+    """단일 statement 실행 후 RETURNING 행 반환 (실패 시 rollback)"""
+    conn = db_service.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
         conn.commit()
         cursor.close()
+        return rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
         db_service.return_connection(conn)
 
-        logger.info(f"✅ Batch added {added_count} IPs to blacklist")
+
+@blacklist_batch_bp.route("/blacklist/batch/add", methods=["POST"])
+@rate_limit(BATCH_RATE_LIMIT)  # Set-based: one INSERT per batch
+def batch_add_blacklist():
+    """Batch add multiple IPs to blacklist (single INSERT ... ON CONFLICT)"""
+    try:
+        # Use dependency injection via app.extensions
+        db_service = current_app.extensions['db_service']
+
+        data, ips, error = _parse_ips()
+        if error:
+            return error
+
+        reason = data.get("reason", "Batch import")
+        country = data.get("country", "UNKNOWN")
+
+        valid_ips, invalid_ips = _validate_ips(ips)
+
+        rows = []
+        if valid_ips:
+            # Insert or refresh in one statement; xmax = 0 marks freshly inserted rows
+            rows = _run_batch(db_service, """
+                INSERT INTO blacklist_ips
+                (ip_address, source, country, reason, detection_date, last_seen, detection_count, created_at, updated_at)
+                SELECT ip, 'BATCH', %s, %s, CURRENT_DATE, NOW(), 1, NOW(), NOW()
+                FROM unnest(%s::text[]) AS t(ip)
+                ON CONFLICT (ip_address, source) DO UPDATE SET
+                    last_seen = NOW(),
+                    detection_count = blacklist_ips.detection_count + 1,
+                    updated_at = NOW()
+                RETURNING ip_address, (xmax = 0) AS inserted
+            """, (country, reason, valid_ips))
+
+        inserted = {ip: is_new for ip, is_new in rows}
+        added_count = sum(1 for is_new in inserted.values() if is_new)
+        duplicate_count = len(inserted) - added_count
+
+        results = [
+            {"ip": ip, "status": "added" if inserted.get(ip) else "duplicate"}
+            for ip in valid_ips
+        ] + [{"ip": ip, "status": "invalid"} for ip in invalid_ips]
+
+        logger.info(f"✅ Batch added {added_count} IPs to blacklist ({duplicate_count} refreshed)")
 
         return jsonify({
             "success": True,
@@ -105,6 +154,7 @@ def batch_add_blacklist():
                 "invalid": len(invalid_ips)
             },
             "invalid_ips": invalid_ips,
+            "results": results,
             "timestamp": datetime.now().isoformat()
         })
 
@@ -118,36 +168,37 @@ def batch_add_blacklist():
 
 
 @blacklist_batch_bp.route("/blacklist/batch/remove", methods=["POST"])
-@rate_limit("10 per hour; 2 per minute")  # Resource-intensive batch operation
+@rate_limit(BATCH_RATE_LIMIT)  # Set-based: one DELETE per batch
 def batch_remove_blacklist():
-    """Batch remove multiple IPs from blacklist"""
+    """Batch remove multiple IPs from blacklist (single DELETE ... = ANY)"""
     try:
         # Use dependency injection via app.extensions
         db_service = current_app.extensions['db_service']
 
-        data = request.get_json() or {}
-        ips = data.get("ips", [])
+        data, ips, error = _parse_ips()
+        if error:
+            return error
 
-        if not ips or not isinstance(ips, list):
-            return jsonify({
-                "success": False,
-                "error": "IPs list is required"
-            }), 400
+        valid_ips, invalid_ips = _validate_ips(ips)
 
-        conn = db_service.get_connection()
-        cursor = conn.cursor()
+        rows = []
+        if valid_ips:
+            rows = _run_batch(
+                db_service,
+                "DELETE FROM blacklist_ips WHERE ip_address = ANY(%s) RETURNING ip_address",
+                (valid_ips,),
+            )
 
-        removed_count = 0
-        for ip in ips:
-            try:
-                cursor.execute("DELETE FROM blacklist_ips WHERE ip_address = %s", (str(ip).strip(),))
-                removed_count += cursor.rowcount
-            except Exception as e:
-                logger.warning(f"Failed to remove IP {ip}: {e}")
+        # An IP can exist once per source, so count rows per IP
+        removed = {}
+        for (ip,) in rows:
+            removed[ip] = removed.get(ip, 0) + 1
+        removed_count = len(rows)
 
-        conn.commit()
-        cursor.close()
-        db_service.return_connection(conn)
+        results = [
+            {"ip": ip, "status": "removed" if ip in removed else "not_found", "rows": removed.get(ip, 0)}
+            for ip in valid_ips
+        ] + [{"ip": ip, "status": "invalid", "rows": 0} for ip in invalid_ips]
 
         logger.info(f"✅ Batch removed {removed_count} IPs from blacklist")
 
@@ -156,8 +207,11 @@ def batch_remove_blacklist():
             "message": "Batch remove completed",
             "summary": {
                 "total_requested": len(ips),
-                "removed": removed_count
+                "removed": removed_count,
+                "not_found": len(valid_ips) - len(removed),
+                "invalid": len(invalid_ips)
             },
+            "results": results,
             "timestamp": datetime.now().isoformat()
         })
 
@@ -171,59 +225,50 @@ def batch_remove_blacklist():
 
 
 @blacklist_batch_bp.route("/blacklist/batch/update", methods=["POST"])
-@rate_limit("10 per hour; 2 per minute")  # Resource-intensive batch operation
+@rate_limit(BATCH_RATE_LIMIT)  # Set-based: one UPDATE ... FROM unnest per batch
 def batch_update_blacklist():
-    """Batch update multiple blacklist entries"""
+    """Batch update multiple blacklist entries (single UPDATE ... FROM unnest)"""
     try:
         # Use dependency injection via app.extensions
         db_service = current_app.extensions['db_service']
 
-        data = request.get_json() or {}
-        ips = data.get("ips", [])
+        data, ips, error = _parse_ips()
+        if error:
+            return error
+
         reason = data.get("reason")
         country = data.get("country")
 
-        if not ips or not isinstance(ips, list):
-            return jsonify({
-                "success": False,
-                "error": "IPs list is required"
-            }), 400
-
         if not reason and not country:
             return jsonify({
                 "success": False,
                 "error": "At least one field (reason or country) is required for update"
             }), 400
 
-        conn = db_service.get_connection()
-        cursor = conn.cursor()
-
-        updated_count = 0
-        for ip in ips:
-            try:
-                # Build dynamic UPDATE query
-                update_fields = []
-                update_values = []
-
-                if reason:
-                    update_fields.append("reason = %s")
-                    update_values.append(reason)
-                if country:
-                    update_fields.append("country = %s")
-                    update_values.append(country)
-
-                update_fields.append("updated_at = NOW()")
-                update_values.append(str(ip).strip())
-
-                query = f"UPDATE blacklist_ips SET {', '.join(update_fields)} WHERE ip_address = %s"
-                cursor.execute(query, tuple(update_values))
-                updated_count += cursor.rowcount
-            except Exception as e:
-                logger.warning(f"Failed to update IP {ip}: {e}")
-
-        conn.commit()
-        cursor.close()
-        db_service.return_connection(conn)
+        valid_ips, invalid_ips = _validate_ips(ips)
+
+        rows = []
+        if valid_ips:
+            # NULL parameters keep the current value (only provided fields change)
+            rows = _run_batch(db_service, """
+                UPDATE blacklist_ips AS b
+                SET reason = COALESCE(%s, b.reason),
+                    country = COALESCE(%s, b.country),
+                    updated_at = NOW()
+                FROM unnest(%s::text[]) AS t(ip)
+                WHERE b.ip_address = t.ip
+                RETURNING b.ip_address
+            """, (reason or None, country or None, valid_ips))
+
+        updated = {}
+        for (ip,) in rows:
+            updated[ip] = updated.get(ip, 0) + 1
+        updated_count = len(rows)
+
+        results = [
+            {"ip": ip, "status": "updated" if ip in updated else "not_found", "rows": updated.get(ip, 0)}
+            for ip in valid_ips
+        ] + [{"ip": ip, "status": "invalid", "rows": 0} for ip in invalid_ips]
 
         logger.info(f"✅ Batch updated {updated_count} IPs in blacklist")
 
@@ -232,8 +277,11 @@ def batch_update_blacklist():
             "message": "Batch update completed",
             "summary": {
                 "total_requested": len(ips),
-                "updated": updated_count
+                "updated": updated_count,
+                "not_found": len(valid_ips) - len(updated),
+                "invalid": len(invalid_ips)
             },
+            "results": results,
             "timestamp": datetime.now().isoformat()
         })
 
@@ -12,11 +12,21 @@
 import logging
 from functools import wraps
 from ipaddress import ip_address, AddressValueError
+from psycopg2.extras import RealDictCursor
 from ....exceptions import (
     BadRequestError,
     ValidationError,
     DatabaseError,
 )
+from ....utils.db_json import join_docs
+from ....utils.fast_json import json_response, raw_json
+from ....utils.pagination import (
+    count_rows,
+    cursor_from_row,
+    keyset_condition,
+    page_count,
+    parse_keyset_args,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +54,9 @@ def limited_route(*args, **kwargs):
 
 blacklist_core_bp = Blueprint("blacklist_core", __name__)
 
+# /json 정렬 키 (NULL updated_at 은 가장 오래된 것으로 취급, 인덱스 표현식과 동일해야 함)
+JSON_SORT_KEY = "COALESCE(updated_at, TIMESTAMP '1970-01-01')"
+
 
 @blacklist_core_bp.route("/blacklist/health", methods=["GET"])
 def blacklist_health():
@@ -81,6 +94,12 @@ def get_blacklist_list():
     블랙리스트 목록 조회 API (Phase 1.4: Standardized Error Handling)
 
     GET /api/blacklist/list?page=1&per_page=50
+    GET /api/blacklist/list?cursor=<next_cursor>&per_page=50&total=estimate
+
+    Pagination:
+        page 모드 (기존 호환): OFFSET 기반, total 기본값 exact
+        cursor 모드: cursor 파라미터 (빈 값 = 첫 페이지) 지정 시 id 기준 keyset seek,
+                     total 기본값 estimate (exact | estimate | none)
 
     Returns:
         {
@@ -113,30 +132,68 @@ def get_blacklist_list():
             details={"provided_value": per_page, "allowed_range": "1-1000"},
         )
 
+    try:
+        keyset, after, total_mode = parse_keyset_args(request.args, size=1)
+    except ValueError as e:
+        raise ValidationError(
+            message=f"Invalid pagination parameters: {e}",
+            field="cursor",
+            details={"cursor": request.args.get("cursor"), "total": request.args.get("total")},
+        )
+
     # Use dependency injection via app.extensions
     db_service = current_app.extensions["db_service"]
 
     try:
-        offset = (page - 1) * per_page
-
-        # 데이터베이스 조회 (parameterized query for security)
-        blacklist_data = db_service.query(
-            "SELECT * FROM blacklist_ips_with_auto_inactive ORDER BY id DESC LIMIT %s OFFSET %s",
-            (per_page, offset),
-        )
-
-        total_count = db_service.query("SELECT COUNT(*) as count FROM blacklist_ips_with_auto_inactive")[0]["count"]
+        conn = db_service.get_connection()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+        try:
+            # 데이터베이스 조회 (parameterized query for security)
+            # keyset: WHERE id < 마지막 id (PK 역방향 스캔), offset: 기존 page 호환
+            # 다음 페이지 존재 여부 확인을 위해 per_page + 1 행 조회
+            if after:
+                cursor.execute(
+                    "SELECT * FROM blacklist_ips_with_auto_inactive WHERE id < %s ORDER BY id DESC LIMIT %s",
+                    (after[0], per_page + 1),
+                )
+            elif keyset:
+                cursor.execute(
+                    "SELECT * FROM blacklist_ips_with_auto_inactive ORDER BY id DESC LIMIT %s",
+                    (per_page + 1,),
+                )
+            else:
+                cursor.execute(
+                    "SELECT * FROM blacklist_ips_with_auto_inactive ORDER BY id DESC LIMIT %s OFFSET %s",
+                    (per_page + 1, (page - 1) * per_page),
+                )
+            rows = cursor.fetchall()
+
+            total_count = count_rows(cursor, total_mode, "SELECT 1 FROM blacklist_ips_with_auto_inactive")
+        finally:
+            cursor.close()
+            db_service.return_connection(conn)
+
+        has_more = len(rows) > per_page
+        blacklist_data = [dict(row) for row in rows[:per_page]]
+        next_cursor = cursor_from_row(blacklist_data[-1], ["id"]) if has_more else None
+
+        pagination = {
+            "per_page": per_page,
+            "total": total_count,
+            "total_mode": total_mode,
+            "pages": page_count(total_count, per_page),
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+        if not keyset:
+            pagination["page"] = page
 
         return jsonify(
             {
                 "success": True,
                 "data": blacklist_data,
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": total_count,
-                    "pages": (total_count + per_page - 1) // per_page,
-                },
+                "pagination": pagination,
                 "timestamp": datetime.now().isoformat(),
                 "request_id": g.request_id,
             }
@@ -146,6 +203,49 @@ def get_blacklist_list():
         logger.error(f"Blacklist list query failed: {e}", exc_info=True)
         raise DatabaseError(
             message=f"Failed to retrieve blacklist data (page={page}): {type(e).__name__}",
+        )
+
+
+@blacklist_core_bp.route("/blacklist/stats", methods=["GET"])
+def get_blacklist_stats():
+    """
+    블랙리스트 통계 API (Phase 1.4: Standardized Error Handling)
+
+    GET /api/blacklist/stats
+
+    Returns:
+        {
+            "success": True,
+            "data": {
+                "total_ips": 1234,
+                "active_ips": 1234,
+                "sources": [{"source": "REGTECH", "count": 1234}, ...],
+                "last_update": "..."
+            },
+            "timestamp": "...",
+            "request_id": "..."
+        }
+
+    Raises:
+        DatabaseError: Database query failed
+    """
+    try:
+        stats = current_app.extensions["stats_service"].get_snapshot()
+
+        sources = [
+            {"source": source, "count": count}
+            for source, count in sorted(stats["by_data_source_all"].items(), key=lambda item: item[1], reverse=True)
+        ]
+
+        return jsonify(
+            {
+                "success": True,
+                "data": {
+                    "total_ips": stats["total_ips"],
+                    "active_ips": stats["active_ips"],
+                    "sources": sources,
+                    "last_update": stats["last_updated"].isoformat() if stats["last_updated"] else None,
+                },
                 "timestamp": datetime.now().isoformat(),
                 "request_id": g.request_id,
             }
@@ -246,6 +346,7 @@ def get_blacklist_json():
     블랙리스트 데이터 JSON 조회 API (Phase 1.4: Standardized Error Handling)
 
     GET /api/json?page=1&per_page=100
+    GET /api/json?cursor=<next_cursor>&per_page=100&total=none
 
     Note: This endpoint uses graceful degradation for JavaScript consumption.
     Returns empty data instead of raising errors when database is unavailable.
@@ -280,53 +381,78 @@ def get_blacklist_json():
             details={"provided_value": per_page, "allowed_range": "1-1000"},
         )
 
+    try:
+        keyset, after, total_mode = parse_keyset_args(request.args, size=2)
+    except ValueError as e:
+        raise ValidationError(
+            message=f"Invalid pagination parameters: {e}",
+            field="cursor",
+            details={"cursor": request.args.get("cursor"), "total": request.args.get("total")},
+        )
+
     try:
         # Use dependency injection via app.extensions
         db_service = current_app.extensions["db_service"]
-        offset = (page - 1) * per_page
 
         # 데이터베이스 연결 시도
         conn = db_service.get_connection()
         cursor = conn.cursor()
 
-        # 전체 카운트
-        cursor.execute("SELECT COUNT(*) FROM blacklist_ips_with_auto_inactive")
-        total = cursor.fetchone()[0]
-
-        # 데이터 조회
+        # 전체 카운트 (total=none 이면 생략, estimate 는 플래너 추정치)
+        total = count_rows(cursor, total_mode, "SELECT 1 FROM blacklist_ips_with_auto_inactive")
+
+        # 데이터 조회: (updated_at, id) 정렬 — idx_blacklist_ips_updated_keyset
+        if after:
+            seek_sql, seek_params = keyset_condition([JSON_SORT_KEY, "id"], after)
+            where_sql = f"WHERE {seek_sql}"
+            limit_sql = "LIMIT %s"
+            params = seek_params + [per_page + 1]
+        else:
+            where_sql = ""
+            limit_sql = "LIMIT %s" if keyset else "LIMIT %s OFFSET %s"
+            params = [per_page + 1] if keyset else [per_page + 1, (page - 1) * per_page]
+
+        # 행 JSON 은 PostgreSQL 이 생성 → 파싱 없이 이어 붙여 응답에 그대로 삽입
         cursor.execute(
-            """
-            SELECT ip_address, source, detection_date, updated_at, confidence_level
+            f"""
+            SELECT json_build_object(
+                       'ip_address', ip_address, 'source', source,
+                       'detection_date', detection_date, 'updated_at', updated_at,
+                       'confidence_level', confidence_level
+                   )::text AS doc,
+                   id, {JSON_SORT_KEY} AS sort_key
             FROM blacklist_ips_with_auto_inactive
-            ORDER BY updated_at DESC
-            LIMIT %s OFFSET %s
+            {where_sql}
+            ORDER BY {JSON_SORT_KEY} DESC, id DESC
+            {limit_sql}
         """,
-            (per_page, offset),
+            params,
         )
 
         results = cursor.fetchall()
         cursor.close()
         db_service.return_connection(conn)
 
-        return jsonify(
+        has_more = len(results) > per_page
+        results = results[:per_page]
+        next_cursor = cursor_from_row(results[-1], [2, 1]) if has_more else None
+
+        pagination = {
+            "per_page": per_page,
+            "total": total,
+            "total_mode": total_mode,
+            "pages": page_count(total, per_page),
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+        if not keyset:
+            pagination["page"] = page
+
+        return json_response(
             {
                 "success": True,
-                "data": [
-                    {
-                        "ip_address": row[0],
-                        "source": row[1],
-                        "detection_date": row[2].isoformat() if row[2] else None,
-                        "updated_at": row[3].isoformat() if row[3] else None,
-                        "confidence_level": row[4],
-                    }
-                    for row in results
-                ],
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": total,
-                    "pages": (total + per_page - 1) // per_page,
-                },
+                "data": raw_json(join_docs([row[0] for row in results])),
+                "pagination": pagination,
                 "timestamp": datetime.now().isoformat(),
                 "request_id": g.request_id,
             }
@@ -358,147 +484,37 @@ def export_raw_data():
     """
     블랙리스트 Raw 데이터 CSV 내보내기 API (수집 근거 포함)
     GET /api/blacklist/export-raw?source=REGTECH&active_only=true&include_empty=false
+
+    raw_data 평탄화는 SQL 에서 처리 (export_job_service.build_export_query).
+    대량 내보내기는 POST /api/blacklist/export-jobs (비동기, 이어받기 지원) 사용.
     """
     import csv
     import io
-    import json
     from flask import send_file
+    from ....services.export_job_service import EXPORT_COLUMNS, build_export_query
 
+    conn = None
     try:
         db_service = current_app.extensions["db_service"]
 
-        source = request.args.get("source")
-        active_only = request.args.get("active_only", "true").lower() == "true"
-        include_empty = request.args.get("include_empty", "false").lower() == "true"
-
-        with db_service.get_connection() as conn:
-            with conn.cursor() as cur:
-                where_conditions = []
-                params = []
-
-                if active_only:
-                    where_conditions.append("is_active = %s")
-                    params.append(True)
-
-                if source:
-                    where_conditions.append("source = %s")
-                    params.append(source)
-
-                if not include_empty:
-                    where_conditions.append("raw_data IS NOT NULL")
-                    where_conditions.append("raw_data != '{}'::jsonb")
-
-                where_clause = " WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-
-                export_query = f"""
-                    SELECT
-                        ip_address, source, country, detection_date, removal_date, reason,
-                        confidence_level, detection_count,
-                        is_active,
-                        last_seen, created_at, raw_data
-                    FROM blacklist_ips_with_auto_inactive
-                    {where_clause}
-                    ORDER BY created_at DESC
-                """
-                cur.execute(export_query, params)
-                results = cur.fetchall()
+        export_query, params = build_export_query(
+            source=request.args.get("source"),
+            active_only=request.args.get("active_only", "true").lower() == "true",
+            include_empty=request.args.get("include_empty", "false").lower() == "true",
+        )
 
         output = io.StringIO()
+        output.write("\ufeff")
         writer = csv.writer(output)
+        writer.writerow([header for _, header in EXPORT_COLUMNS])
 
-        writer.writerow(
-            [
-                "IP Address",
-                "Source",
-                "Country",
-                "Detection Date",
-                "Removal Date",
-                "Reason",
-                "Confidence Level",
-                "Detection Count",
-                "Is Active",
-                "Last Seen",
-                "Created At",
-                "Raw 번호",
-                "Raw IP",
-                "Raw 탐지일",
-                "Raw 해제일",
-                "Raw 탐지내용",
-                "Raw 국가",
-                "수집 시각",
-            ]
-        )
+        conn = db_service.get_connection()
+        with conn.cursor() as cur:
+            cur.execute(export_query, params)
+            writer.writerows(cur)
 
-        for row in results:
-            raw_no = ""
-            raw_ip = ""
-            raw_detection_date = ""
-            raw_removal_date = ""
-            raw_reason = ""
-            raw_country = ""
-            collection_ts = ""
-
-            if row[11]:
-                try:
-                    raw_data = row[11] if isinstance(row[11], dict) else json.loads(row[11])
-
-                    if "row_data" in raw_data:
-                        row_data = raw_data["row_data"]
-                        if isinstance(row_data, list):
-                            raw_no = row_data[0] if len(row_data) > 0 else ""
-                            raw_ip = row_data[1] if len(row_data) > 1 else ""
-                            raw_detection_date = row_data[2] if len(row_data) > 2 else ""
-                            raw_removal_date = row_data[3] if len(row_data) > 3 else ""
-                            raw_reason = row_data[4] if len(row_data) > 4 else ""
-                            raw_country = row_data[5] if len(row_data) > 5 else ""
-
-                    elif "api_response" in raw_data:
-                        api = raw_data["api_response"]
-                        raw_ip = api.get("ipAddress") or api.get("ip_address", "")
-                        raw_detection_date = api.get("detectedDate") or api.get("detected_date", "")
-                        raw_removal_date = api.get("releaseDate") or api.get("release_date", "")
-                        raw_reason = api.get("blockReason") or api.get("reason", "")
-                        raw_country = api.get("country") or api.get("countryCode", "")
-
-                    else:
-                        raw_ip = raw_data.get("ip_address", "")
-                        raw_detection_date = str(raw_data.get("detection_date", ""))
-                        raw_removal_date = str(raw_data.get("removal_date", ""))
-                        raw_reason = raw_data.get("reason", "")
-                        raw_country = raw_data.get("country", "")
-
-                    collection_ts = raw_data.get("collection_timestamp", "")
-
-                except (json.JSONDecodeError, TypeError, AttributeError):
-                    raw_reason = str(row[11])[:200] if row[11] else ""
-
-            writer.writerow(
-                [
-                    row[0],
-                    row[1],
-                    row[2] or "",
-                    row[3].strftime("%Y-%m-%d") if row[3] else "",
-                    row[4].strftime("%Y-%m-%d") if row[4] else "",
-                    row[5],
-                    row[6],
-                    row[7],
-                    "Yes" if row[8] else "No",
-                    row[9].strftime("%Y-%m-%d %H:%M:%S") if row[9] else "",
-                    row[10].strftime("%Y-%m-%d %H:%M:%S") if row[10] else "",
-                    raw_no,
-                    raw_ip,
-                    raw_detection_date,
-                    raw_removal_date,
-                    raw_reason,
-                    raw_country,
-                    collection_ts,
-                ]
-            )
-
-        output.seek(0)
-        csv_bytes = b"\xef\xbb\xbf" + output.getvalue().encode("utf-8")
         return send_file(
-            io.BytesIO(csv_bytes),
+            io.BytesIO(output.getvalue().encode("utf-8")),
             mimetype="text/csv; charset=utf-8",
             as_attachment=True,
             download_name=f"blacklist_raw_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
@@ -506,4 +522,9 @@ def export_raw_data():
 
     except Exception as e:
         logger.error(f"Blacklist raw export API error: {e}")
+        if conn:
+            conn.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
+    finally:
+        if conn:
+            db_service.return_connection(conn)
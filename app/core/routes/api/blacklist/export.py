@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Asynchronous Export Jobs
+Routes: /blacklist/export-jobs, /blacklist/export-jobs/<job_id>, /blacklist/export-jobs/<job_id>/download
+"""
+
+from flask import Blueprint, jsonify, request, current_app, g, send_file
+from datetime import datetime
+import logging
+import os
+from ....exceptions import BadRequestError, ConflictError, NotFoundError
+from ....services.export_job_service import EXPORT_FORMATS
+
+logger = logging.getLogger(__name__)
+
+blacklist_export_bp = Blueprint("blacklist_export", __name__)
+
+
+def _get_job_or_404(job_id):
+    job = current_app.extensions["export_job_service"].get_job(job_id)
+    if not job:
+        raise NotFoundError(message=f"Export job {job_id} not found", details={"job_id": job_id})
+    return job
+
+
+def _job_response(job):
+    """작업 상태 + 진행률 (rows_estimated 는 플래너 추정치)"""
+    progress = None
+    if job["status"] == "completed":
+        progress = 100.0
+    elif job.get("rows_estimated"):
+        progress = round(min(job["rows_written"] / job["rows_estimated"], 0.99) * 100, 1)
+
+    data = dict(job, progress=progress)
+    if job["status"] == "completed":
+        data["download_url"] = f"/api/blacklist/export-jobs/{job['id']}/download"
+    return data
+
+
+@blacklist_export_bp.route("/blacklist/export-jobs", methods=["POST"])
+def create_export_job():
+    """
+    Export 작업 생성
+    POST /api/blacklist/export-jobs
+    {"format": "csv" | "ndjson" | "parquet", "source": "REGTECH", "active_only": true, "include_empty": false}
+    """
+    data = request.get_json(silent=True) or {}
+
+    try:
+        job = current_app.extensions["export_job_service"].create_job(
+            export_format=str(data.get("format", "csv")).lower(),
+            source=data.get("source"),
+            active_only=bool(data.get("active_only", True)),
+            include_empty=bool(data.get("include_empty", False)),
+        )
+    except ValueError as e:
+        raise BadRequestError(message=str(e), details={"format": data.get("format")})
+
+    return jsonify(
+        {
+            "success": True,
+            "data": _job_response(job),
+            "timestamp": datetime.now().isoformat(),
+            "request_id": g.request_id,
+        }
+    ), 202
+
+
+@blacklist_export_bp.route("/blacklist/export-jobs", methods=["GET"])
+def list_export_jobs():
+    """
+    Export 작업 목록
+    GET /api/blacklist/export-jobs
+    """
+    jobs = current_app.extensions["export_job_service"].list_jobs()
+    return jsonify(
+        {
+            "success": True,
+            "data": [_job_response(job) for job in jobs],
+            "timestamp": datetime.now().isoformat(),
+            "request_id": g.request_id,
+        }
+    ), 200
+
+
+@blacklist_export_bp.route("/blacklist/export-jobs/<job_id>", methods=["GET"])
+def get_export_job(job_id):
+    """
+    Export 작업 진행 상태
+    GET /api/blacklist/export-jobs/<job_id>
+    """
+    job = _get_job_or_404(job_id)
+    return jsonify(
+        {
+            "success": True,
+            "data": _job_response(job),
+            "timestamp": datetime.now().isoformat(),
+            "request_id": g.request_id,
+        }
+    ), 200
+
+
+@blacklist_export_bp.route("/blacklist/export-jobs/<job_id>/download", methods=["GET"])
+def download_export_job(job_id):
+    """
+    Export 결과 다운로드 (Range / If-Range 지원 → 이어받기 가능)
+    GET /api/blacklist/export-jobs/<job_id>/download
+    """
+    job = _get_job_or_404(job_id)
+    if job["status"] != "completed":
+        raise ConflictError(
+            message=f"Export job {job_id} is not completed (status={job['status']})",
+            details={"job_id": job_id, "status": job["status"]},
+        )
+
+    path = current_app.extensions["export_job_service"].file_path(job)
+    if not os.path.exists(path):
+        raise NotFoundError(message=f"Export file for job {job_id} has expired", details={"job_id": job_id})
+
+    # conditional=True: ETag/Last-Modified + 206 Partial Content for Range requests
+    return send_file(
+        path,
+        mimetype=EXPORT_FORMATS[job["format"]]["mimetype"],
+        as_attachment=True,
+        download_name=job["filename"],
+        conditional=True,
+        max_age=0,
+    )
@@ -40,95 +40,28 @@ def get_dashboard_stats():
         - whitelisted_ips: Whitelisted IP count
         - last_update: Last update timestamp
     """
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        # Single read of blacklist_stats_rollup (live GROUPING SETS fallback)
+        stats = current_app.extensions["stats_service"].get_snapshot()
 
-        # Total IPs
-        cursor.execute("SELECT COUNT(*) as count FROM blacklist_ips_with_auto_inactive")
-        row = cursor.fetchone()
-        total_ips = row["count"] if row else 0
-
-        # Active IPs
-        cursor.execute("SELECT COUNT(*) as count FROM blacklist_ips_with_auto_inactive WHERE is_active = true")
-        row = cursor.fetchone()
-        active_ips = row["count"] if row else 0
-
-        cursor.execute(
-            """
-            SELECT COUNT(*) as count FROM blacklist_ips_with_auto_inactive
-            WHERE last_seen >= CURRENT_DATE - INTERVAL '1 day'
-        """
-        )
-        row = cursor.fetchone()
-        recent_additions = row["count"] if row else 0
-
-        # Whitelisted IPs
-        cursor.execute("SELECT COUNT(*) as count FROM whitelist_ips")
-        row = cursor.fetchone()
-        whitelisted_ips = row["count"] if row else 0
-
-        # Last update
-        cursor.execute(
-            """
-            SELECT MAX(last_seen) as last_update
-            FROM blacklist_ips_with_auto_inactive
-        """
-        )
-        last_update_row = cursor.fetchone()
         last_update = (
-            last_update_row["last_update"].isoformat()
-            if last_update_row and last_update_row["last_update"]
+            stats["last_seen"].isoformat()
+            if stats["last_seen"]
             else datetime.now().isoformat()
         )
 
-        # Stats by data_source (REGTECH, MANUAL, etc.)
-        cursor.execute(
-            """
-            SELECT COALESCE(data_source, 'UNKNOWN') as source, COUNT(*) as count
-            FROM blacklist_ips_with_auto_inactive
-            WHERE is_active = true
-            GROUP BY data_source
-        """
-        )
-        by_source = {row["source"]: row["count"] for row in cursor.fetchall()}
-
-        # Stats by country
-        cursor.execute(
-            """
-            SELECT COALESCE(country, 'UNKNOWN') as country, COUNT(*) as count
-            FROM blacklist_ips_with_auto_inactive
-            WHERE is_active = true
-            GROUP BY country
-        """
-        )
-        by_country = {row["country"]: row["count"] for row in cursor.fetchall()}
-
-        # Stats by reason (threat type)
-        cursor.execute(
-            """
-            SELECT COALESCE(source, 'UNKNOWN') as reason, COUNT(*) as count
-            FROM blacklist_ips_with_auto_inactive
-            WHERE is_active = true
-            GROUP BY source
-        """
-        )
-        by_reason = {row["reason"]: row["count"] for row in cursor.fetchall()}
-
-        cursor.close()
         return jsonify(
             {
                 "success": True,
                 "data": {
-                    "total_ips": total_ips,
-                    "active_ips": active_ips,
-                    "recent_additions": recent_additions,
-                    "whitelisted_ips": whitelisted_ips,
+                    "total_ips": stats["total_ips"],
+                    "active_ips": stats["active_ips"],
+                    "recent_additions": stats["recent_additions"],
+                    "whitelisted_ips": stats["whitelisted_ips"],
                     "last_update": last_update,
-                    "by_source": by_source,
-                    "by_country": by_country,
-                    "by_reason": by_reason,
+                    "by_source": stats["by_data_source"],
+                    "by_country": stats["by_country"],
+                    "by_reason": stats["by_source"],
                 },
                 "timestamp": datetime.now().isoformat(),
             }
@@ -150,9 +83,6 @@ def get_dashboard_stats():
                 "timestamp": datetime.now().isoformat(),
             }
         ), 200
-    finally:
-        if conn:
-            current_app.extensions["db_service"].return_connection(conn)
 
 
 @dashboard_bp.route("/status", methods=["GET"])
@@ -11,6 +11,7 @@
 from .logs import fortinet_logs_bp
 from .management import fortinet_management_bp
 from .threat_feed import fortinet_feed_bp
+from .utils import ACTIVE_COUNT
 
 
 def register_fortinet_routes(app):
@@ -40,8 +41,7 @@ def fortinet_health():
 
     try:
         db_service = current_app.extensions["db_service"]
-        count_query = "SELECT COUNT(*) as count FROM blacklist_ips_with_auto_inactive WHERE is_active = true"
-        result = db_service.query(count_query)
+        result = db_service.query_prepared(ACTIVE_COUNT)
         active_count = result[0]["count"] if result else 0
 
         return jsonify(
@@ -8,17 +8,29 @@
 from datetime import datetime
 from flask import Blueprint, jsonify, request, g, current_app, Response
 from core.exceptions import ValidationError, DatabaseError, InternalServerError
-from .utils import _log_pull_request
+from psycopg2.extras import RealDictCursor
+from core.utils.pagination import count_rows, cursor_from_row, keyset_condition, parse_keyset_args
+from core.monitoring.tracing import span
+from .utils import FEED_IPS, _log_pull_request
 
 logger = logging.getLogger(__name__)
 
 fortinet_core_bp = Blueprint("fortinet_core", __name__)
 
+# /active-ips 정렬 키 (인덱스 표현식과 동일해야 함)
+ACTIVE_IPS_SORT_KEYS = {
+    "sort_confidence": "COALESCE(b.confidence_level, 0)",
+    "sort_detection": "COALESCE(b.detection_date, DATE '1970-01-01')",
+}
+
 
 @fortinet_core_bp.route("/active-ips", methods=["GET"])
 def get_active_ips():
     """
     Get active blacklist IPs for FortiGate integration
+
+    GET /api/fortinet/active-ips?page=1&limit=20             (offset, exact total)
+    GET /api/fortinet/active-ips?cursor=<next_cursor>&limit=20  (keyset, estimated total)
     """
     limit = request.args.get("limit", 20, type=int)
     page = request.args.get("page", 1, type=int)
@@ -36,23 +48,66 @@ def get_active_ips():
             details={"provided_value": page},
         )
 
+    try:
+        keyset, after, total_mode = parse_keyset_args(request.args, size=3)
+    except ValueError as e:
+        raise ValidationError(
+            message=f"Invalid pagination parameters: {e}",
+            field="cursor",
+            details={"cursor": request.args.get("cursor"), "total": request.args.get("total")},
+        )
+
     db_service = current_app.extensions["db_service"]
 
     try:
-        offset = (page - 1) * limit
-        query = """
+        base_query = """
             SELECT
                 b.id, b.ip_address, b.country, b.reason,
-                b.confidence_level, b.detection_date, b.removal_date, b.is_active
+                b.confidence_level, b.detection_date, b.removal_date, b.is_active,
+                {sort_confidence} AS sort_confidence,
+                {sort_detection} AS sort_detection
             FROM blacklist_ips_with_auto_inactive b
             WHERE b.is_active = true
               AND b.ip_address NOT IN (
                   SELECT ip_address FROM whitelist_ips WHERE is_active = true
               )
-            ORDER BY b.confidence_level DESC, b.detection_date DESC
-            LIMIT %s OFFSET %s
+        """.format(**ACTIVE_IPS_SORT_KEYS)
+
+        # (confidence, detection_date, id) 역순 — idx_blacklist_ips_active_keyset
+        params = []
+        query = base_query
+        if after:
+            seek_sql, params = keyset_condition(
+                [ACTIVE_IPS_SORT_KEYS["sort_confidence"], ACTIVE_IPS_SORT_KEYS["sort_detection"], "b.id"],
+                after,
+            )
+            query += f" AND {seek_sql}"
+        query += """
+            ORDER BY sort_confidence DESC, sort_detection DESC, b.id DESC
+            LIMIT %s
         """
-        rows = db_service.query(query, (limit, offset))
+        params.append(limit + 1)
+        if not keyset:
+            query += " OFFSET %s"
+            params.append((page - 1) * limit)
+
+        conn = db_service.get_connection()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            total = count_rows(cursor, total_mode, base_query)
+        finally:
+            cursor.close()
+            db_service.return_connection(conn)
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = (
+            cursor_from_row(rows[-1], ["sort_confidence", "sort_detection", "id"])
+            if has_more
+            else None
+        )
 
         active_ips = []
         for row in rows:
@@ -73,23 +128,16 @@ def get_active_ips():
                 }
             )
 
-        count_query = """
-            SELECT COUNT(*) as count
-            FROM blacklist_ips_with_auto_inactive b
-            WHERE b.is_active = true
-              AND b.ip_address NOT IN (
-                  SELECT ip_address FROM whitelist_ips WHERE is_active = true
-              )
-        """
-        total = db_service.query(count_query)[0]["count"]
-
         return jsonify(
             {
                 "success": True,
                 "data": active_ips,
                 "total": total,
-                "page": page,
+                "total_mode": total_mode,
+                "page": None if keyset else page,
                 "limit": limit,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
                 "timestamp": datetime.now().isoformat(),
                 "request_id": g.request_id,
             }
@@ -125,23 +173,16 @@ def get_blocklist():
     db_service = current_app.extensions["db_service"]
 
     try:
-        query = """
-            SELECT ip_address
-            FROM blacklist_ips_with_auto_inactive
-            WHERE is_active = true
-              AND ip_address NOT IN (
-                  SELECT ip_address FROM whitelist_ips WHERE is_active = true
-              )
-            ORDER BY ip_address
-        """
-        rows = db_service.query(query)
+        rows = db_service.query_prepared(FEED_IPS)
         ip_list = [row["ip_address"] for row in rows]
 
         response_time_ms = int((time.time() - start_time) * 1000)
         _log_pull_request("/blocklist", len(ip_list), 200, response_time_ms)
 
-        if output_format == "json":
+        with span("serialize"):
             blocklist_text = "\n".join(ip_list)
+
+        if output_format == "json":
             return jsonify(
                 {
                     "success": True,
@@ -151,7 +192,6 @@ def get_blocklist():
                 }
             ), 200
 
-        blocklist_text = "\n".join(ip_list)
         return Response(
             blocklist_text,
             mimetype="text/plain",
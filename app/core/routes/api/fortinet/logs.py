@@ -180,6 +180,8 @@ def get_pull_logs():
         """
         stats_row = db_service.query(stats_query, (hours,))[0]
 
+        pull_log_writer = current_app.extensions.get("pull_log_writer")
+
         return jsonify(
             {
                 "success": True,
@@ -190,6 +192,7 @@ def get_pull_logs():
                     "failed_pulls": stats_row["failed_pulls"],
                     "unique_devices": stats_row["unique_devices"],
                 },
+                "writer": pull_log_writer.get_stats() if pull_log_writer else None,
                 "timestamp": datetime.now().isoformat(),
                 "request_id": g.request_id,
             }
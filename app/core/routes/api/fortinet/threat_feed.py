@@ -4,14 +4,29 @@
 """
 
 import logging
+import os
+import time
 from datetime import datetime
 from flask import Blueprint, jsonify, request, g, current_app, Response
 from core.exceptions import ValidationError, DatabaseError
+from core.utils.db_json import open_json_array
+from core.utils.fast_json import dumps, json_response, rows_to_dicts
+from .utils import FEED_COUNT, FEED_IPS, _log_pull_request
 
 logger = logging.getLogger(__name__)
 
 fortinet_feed_bp = Blueprint("fortinet_feed", __name__)
 
+# json-connector 응답 생성 위치: db (PostgreSQL 이 JSON 생성, 스트리밍) | app (Python 직렬화)
+JSON_CONNECTOR_RENDERS = ("db", "app")
+JSON_CONNECTOR_RENDER = os.getenv("JSON_CONNECTOR_RENDER", "db").lower()
+
+JSON_CONNECTOR_RISK_SQL = """CASE
+                    WHEN COALESCE(b.confidence_level, 0) >= 80 THEN 'high'
+                    WHEN COALESCE(b.confidence_level, 0) >= 50 THEN 'medium'
+                    ELSE 'low'
+                END"""
+
 
 @fortinet_feed_bp.route("/threat-feed", methods=["GET"])
 def get_threat_feed():
@@ -19,6 +34,7 @@ def get_threat_feed():
     FortiGate Push API - Threat Feed Format (JSON)
     Compatible with FortiGate 7.2+ Push API method.
     """
+    start_time = time.time()
     command = request.args.get("command", "snapshot").lower()
     output_format = request.args.get("format", "json").lower()
 
@@ -45,18 +61,12 @@ def get_threat_feed():
     db_service = current_app.extensions["db_service"]
 
     try:
-        query = """
-            SELECT ip_address
-            FROM blacklist_ips_with_auto_inactive
-            WHERE is_active = true
-              AND ip_address NOT IN (
-                  SELECT ip_address FROM whitelist_ips WHERE is_active = true
-              )
-            ORDER BY ip_address
-        """
-        rows = db_service.query(query)
+        rows = db_service.query_prepared(FEED_IPS)
         ip_list = [row["ip_address"] for row in rows]
 
+        response_time_ms = int((time.time() - start_time) * 1000)
+        _log_pull_request("/threat-feed", len(ip_list), 200, response_time_ms)
+
         if output_format == "text":
             blocklist_text = "\n".join(ip_list)
             return Response(
@@ -88,6 +98,8 @@ def get_threat_feed():
         raise
     except Exception as e:
         logger.error(f"Error generating threat feed: {e}", exc_info=True)
+        response_time_ms = int((time.time() - start_time) * 1000)
+        _log_pull_request("/threat-feed", 0, 500, response_time_ms)
         if output_format == "text":
             return Response(f"# Error: {str(e)}\n", mimetype="text/plain", status=500)
         else:
@@ -105,6 +117,9 @@ def get_threat_feed():
 def get_json_connector():
     """
     FortiGate JSON Connector Format with metadata
+
+    render=db (default, JSON_CONNECTOR_RENDER): PostgreSQL builds each result object
+    and the response streams its chunks unchanged. render=app: Python-side serialization.
     """
     limit = request.args.get("limit", type=int)
     risk_level = request.args.get("risk_level", "").lower()
@@ -127,14 +142,18 @@ def get_json_connector():
             },
         )
 
+    render = request.args.get("render", JSON_CONNECTOR_RENDER).lower()
+    if render not in JSON_CONNECTOR_RENDERS:
+        raise ValidationError(
+            message=f"Invalid render: {render}. Must be 'db' or 'app'",
+            field="render",
+            details={"provided_value": render, "allowed_values": list(JSON_CONNECTOR_RENDERS)},
+        )
+
     db_service = current_app.extensions["db_service"]
 
     try:
-        query = """
-            SELECT
-                b.ip_address, b.country, b.reason, b.confidence_level,
-                b.detection_date, b.updated_at
-            FROM blacklist_ips_with_auto_inactive b
+        where_sql = """
             WHERE b.is_active = true
               AND b.ip_address NOT IN (
                   SELECT ip_address FROM whitelist_ips WHERE is_active = true
@@ -143,76 +162,107 @@ def get_json_connector():
         params = []
 
         if risk_level == "high":
-            query += " AND b.confidence_level >= 80"
+            where_sql += " AND b.confidence_level >= 80"
         elif risk_level == "medium":
-            query += " AND b.confidence_level >= 50 AND b.confidence_level < 80"
+            where_sql += " AND b.confidence_level >= 50 AND b.confidence_level < 80"
         elif risk_level == "low":
-            query += " AND b.confidence_level < 50"
+            where_sql += " AND b.confidence_level < 50"
 
         if country_filter:
-            query += " AND b.country = %s"
+            where_sql += " AND b.country = %s"
             params.append(country_filter)
 
-        query += " ORDER BY b.confidence_level DESC, b.detection_date DESC"
-
+        order_sql = " ORDER BY b.confidence_level DESC, b.detection_date DESC"
+        limit_sql = ""
         if limit:
-            query += " LIMIT %s"
+            limit_sql = " LIMIT %s"
             params.append(limit)
 
-        rows = db_service.query(query, tuple(params) if params else None)
+        total_count = db_service.query_prepared(FEED_COUNT)[0]["count"]
 
-        total_query = """
-            SELECT COUNT(*) as count
-            FROM blacklist_ips_with_auto_inactive
-            WHERE is_active = true
-              AND ip_address NOT IN (
-                  SELECT ip_address FROM whitelist_ips WHERE is_active = true
-              )
-        """
-        total_count = db_service.query(total_query)[0]["count"]
-
-        results = []
-        for row in rows:
-            confidence = row["confidence_level"] or 0
-            if confidence >= 80:
-                risk = "high"
-            elif confidence >= 50:
-                risk = "medium"
-            else:
-                risk = "low"
-
-            results.append(
-                {
-                    "ip": row["ip_address"],
-                    "country": row["country"] or "unknown",
-                    "risk_level": risk,
-                    "reason": row["reason"] or "unspecified",
-                    "confidence": confidence,
-                    "first_seen": row["detection_date"].isoformat()
-                    if row["detection_date"]
-                    else None,
-                    "last_updated": row["updated_at"].isoformat()
-                    if row["updated_at"]
-                    else None,
-                }
+        metadata = {
+            "total": total_count,
+            "generated_at": datetime.now().isoformat(),
+            "version": "1.0",
+            "filters": {
+                "risk_level": risk_level or "all",
+                "country": country_filter or "all",
+                "limit": limit or "none",
+            },
+        }
+
+        if render == "db":
+            # PostgreSQL 이 행 JSON 을 만들고 chunk 단위로 그대로 전달 (행 단위 Python 작업 없음)
+            doc_query = (
+                f"""
+                SELECT json_build_object(
+                           'ip', b.ip_address,
+                           'country', COALESCE(NULLIF(b.country, ''), 'unknown'),
+                           'risk_level', {JSON_CONNECTOR_RISK_SQL},
+                           'reason', COALESCE(NULLIF(b.reason, ''), 'unspecified'),
+                           'confidence', COALESCE(b.confidence_level, 0),
+                           'first_seen', b.detection_date,
+                           'last_updated', b.updated_at
+                       ) AS doc,
+                       b.confidence_level AS sort_confidence,
+                       b.detection_date AS sort_detection
+                FROM blacklist_ips_with_auto_inactive b
+                """
+                + where_sql
+                + order_sql
+                + limit_sql
             )
+            request_id = g.request_id
+
+            def envelope_end(rows: int) -> bytes:
+                return (
+                    b',"metadata":'
+                    + dumps({**metadata, "filtered": rows})
+                    + b'},"timestamp":'
+                    + dumps(datetime.now().isoformat())
+                    + b',"request_id":'
+                    + dumps(request_id)
+                    + b"}\n"
+                )
+
+            body = open_json_array(
+                db_service,
+                doc_query,
+                tuple(params) if params else None,
+                "sort_confidence DESC, sort_detection DESC",
+                prefix=b'{"success":true,"data":{"results":',
+                suffix=envelope_end,
+            )
+            return Response(body, mimetype="application/json")
+
+        # 결과 필드 이름/기본값/위험도는 SQL 에서 바로 만들어 tuple 행 → dict 1회 변환만 한다
+        query = (
+            f"""
+            SELECT
+                b.ip_address AS ip,
+                COALESCE(NULLIF(b.country, ''), 'unknown') AS country,
+                {JSON_CONNECTOR_RISK_SQL} AS risk_level,
+                COALESCE(NULLIF(b.reason, ''), 'unspecified') AS reason,
+                COALESCE(b.confidence_level, 0) AS confidence,
+                b.detection_date AS first_seen,
+                b.updated_at AS last_updated
+            FROM blacklist_ips_with_auto_inactive b
+            """
+            + where_sql
+            + order_sql
+            + limit_sql
+        )
+        columns, rows = db_service.query_tuples(query, tuple(params) if params else None)
+
+        # datetime/date 는 json_response 가 ISO 8601 로 직렬화
+        results = rows_to_dicts(columns, rows)
 
-        return jsonify(
+        return json_response(
             {
                 "success": True,
                 "data": {
                     "results": results,
-                    "metadata": {
-                        "total": total_count,
-                        "filtered": len(results),
-                        "generated_at": datetime.now().isoformat(),
-                        "version": "1.0",
-                        "filters": {
-                            "risk_level": risk_level or "all",
-                            "country": country_filter or "all",
-                            "limit": limit or "none",
-                        },
-                    },
+                    "metadata": {**metadata, "filtered": len(results)},
                 },
                 "timestamp": datetime.now().isoformat(),
                 "request_id": g.request_id,
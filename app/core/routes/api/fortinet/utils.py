@@ -5,25 +5,69 @@
 
 import logging
 from flask import request, current_app
+from core.database.prepared import statement
 
 logger = logging.getLogger(__name__)
 
+# FortiGate/FortiManager 가 주기적으로 당겨가는 피드 쿼리 (연결당 1회 PREPARE)
+FEED_IPS = statement(
+    "fortinet_feed_ips",
+    """
+    SELECT ip_address
+    FROM blacklist_ips_with_auto_inactive
+    WHERE is_active = true
+      AND ip_address NOT IN (
+          SELECT ip_address FROM whitelist_ips WHERE is_active = true
+      )
+    ORDER BY ip_address
+    """,
+)
+
+FEED_COUNT = statement(
+    "fortinet_feed_count",
+    """
+    SELECT COUNT(*) as count
+    FROM blacklist_ips_with_auto_inactive
+    WHERE is_active = true
+      AND ip_address NOT IN (
+          SELECT ip_address FROM whitelist_ips WHERE is_active = true
+      )
+    """,
+)
+
+ACTIVE_COUNT = statement(
+    "fortinet_active_count",
+    "SELECT COUNT(*) as count FROM blacklist_ips_with_auto_inactive WHERE is_active = true",
+)
+
 
 def _log_pull_request(
     endpoint: str, ip_count: int, status_code: int = 200, response_time_ms: int = 0
 ):
-    """Log FortiGate pull request to database"""
-    try:
-        db_service = current_app.extensions.get("db_service")
-        if not db_service:
-            return
+    """
+    Log FortiGate pull request to database
 
+    Rows are handed to the background PullLogWriter so the response path never
+    waits on an INSERT; falls back to a direct write if the writer is absent.
+    """
+    try:
         client_ip = request.headers.get("X-Forwarded-For", request.remote_addr)
         if client_ip and "," in client_ip:
             client_ip = client_ip.split(",")[0].strip()
 
         user_agent = request.headers.get("User-Agent", "")[:500]  # Limit length
 
+        pull_log_writer = current_app.extensions.get("pull_log_writer")
+        if pull_log_writer:
+            pull_log_writer.enqueue(
+                client_ip, user_agent, endpoint, ip_count, response_time_ms, status_code
+            )
+            return
+
+        db_service = current_app.extensions.get("db_service")
+        if not db_service:
+            return
+
         db_service.execute(
             """
             INSERT INTO fortinet_pull_logs 
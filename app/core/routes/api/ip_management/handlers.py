@@ -4,6 +4,7 @@
 from flask import g
 
 from ....exceptions import ValidationError
+from ....utils.pagination import page_count, parse_keyset_args
 
 
 def validate_pagination(page: Any, limit: Any) -> tuple[int, int]:
@@ -33,6 +34,17 @@ def validate_pagination(page: Any, limit: Any) -> tuple[int, int]:
     return page, limit
 
 
+def validate_keyset(args: Any) -> tuple[bool, Optional[list], str]:
+    try:
+        return parse_keyset_args(args, size=2)
+    except ValueError as e:
+        raise ValidationError(
+            message=f"Invalid pagination parameters: {e}",
+            field="cursor",
+            details={"cursor": args.get("cursor"), "total": args.get("total")},
+        )
+
+
 def validate_list_type(list_type: Optional[str]) -> Optional[str]:
     if list_type and list_type not in ("whitelist", "blacklist"):
         raise ValidationError(
@@ -54,9 +66,11 @@ def parse_bool_param(value: Optional[str], default: Optional[bool] = None) -> Op
 
 def paginated_response(
     items: list[dict],
-    total: int,
-    page: int,
+    total: Optional[int],
+    page: Optional[int],
     limit: int,
+    next_cursor: Optional[str] = None,
+    total_mode: str = "exact",
 ) -> dict:
     return {
         "success": True,
@@ -64,9 +78,12 @@ def paginated_response(
             "items": items,
             "pagination": {
                 "total": total,
+                "total_mode": total_mode,
                 "page": page,
                 "limit": limit,
-                "total_pages": (total + limit - 1) // limit if limit > 0 else 0,
+                "total_pages": page_count(total, limit),
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
             },
         },
         "timestamp": datetime.now().isoformat(),
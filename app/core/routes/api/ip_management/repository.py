@@ -8,6 +8,10 @@
 from psycopg2.extras import RealDictCursor
 import logging
 
+from ....utils.fast_json import cursor_columns
+from ....utils.ip_search import ip_predicate
+from ....utils.pagination import count_rows, cursor_from_row, keyset_condition
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +24,9 @@ class IPManagementRepository:
         "detection_count", "is_active", "country", "detection_date", "removal_date"
     }
 
+    # 목록 정렬 키 (postgres/migrations/005 인덱스 표현식과 동일해야 함)
+    CREATED_SORT_KEY = "COALESCE(created_at, TIMESTAMP '1970-01-01')"
+
     def __init__(self, db_service: Any):
         self.db_service = db_service
 
@@ -36,6 +43,67 @@ def _serialize_row(self, row: dict) -> dict:
     def _serialize_rows(self, rows: list[dict]) -> list[dict]:
         return [self._serialize_row(row) for row in rows]
 
+    def _fetch_page(
+        self,
+        cursor: Any,
+        columns: str,
+        from_sql: str,
+        where_clauses: list[str],
+        params: list[Any],
+        page: int,
+        limit: int,
+        after: Optional[list] = None,
+        keyset: bool = False,
+        total_mode: str = "exact",
+    ) -> tuple[list[dict], Optional[int], Optional[str]]:
+        """
+        (created_at, id) 역순 페이지 조회. Returns (items, total, next_cursor).
+
+        keyset 모드는 WHERE (sort_key, id) < cursor 로 seek, 아니면 기존 OFFSET.
+        total 은 total_mode 에 따라 exact / estimate / none(None).
+
+        cursor 는 tuple cursor: 컬럼명은 description 에서 한 번만 읽어 행마다 dict 1개만 만들고,
+        datetime 은 그대로 둔다 (fast_json.json_response 가 ISO 8601 로 직렬화).
+        """
+        where_sql = " AND ".join(where_clauses) if where_clauses else "TRUE"
+        total = count_rows(cursor, total_mode, f"SELECT 1 FROM {from_sql} WHERE {where_sql}", params)
+
+        page_params = list(params)
+        if after:
+            seek_sql, seek_params = keyset_condition([self.CREATED_SORT_KEY, "id"], after)
+            where_sql = f"{where_sql} AND {seek_sql}"
+            page_params.extend(seek_params)
+
+        limit_sql = "LIMIT %s"
+        page_params.append(limit + 1)
+        if not keyset:
+            limit_sql += " OFFSET %s"
+            page_params.append((page - 1) * limit)
+
+        cursor.execute(
+            f"""
+            SELECT {columns}, {self.CREATED_SORT_KEY} AS sort_key
+            FROM {from_sql}
+            WHERE {where_sql}
+            ORDER BY sort_key DESC, id DESC
+            {limit_sql}
+            """,
+            page_params,
+        )
+        rows = cursor.fetchall()
+
+        names = cursor_columns(cursor)
+        sort_index, id_index = names.index("sort_key"), names.index("id")
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = cursor_from_row(rows[-1], [sort_index, id_index])
+
+        names = names[:sort_index]  # sort_key 는 마지막 컬럼
+        items = [dict(zip(names, row)) for row in rows]
+        return items, total, next_cursor
+
     def get_unified_list(
         self,
         page: int,
@@ -43,13 +111,15 @@ def get_unified_list(
         list_type: Optional[str] = None,
         search_ip: Optional[str] = None,
         is_active: Optional[bool] = True,
-    ) -> tuple[list[dict], int]:
-        """Get unified IP list with pagination. Returns (items, total_count)."""
-        offset = (page - 1) * limit
+        after: Optional[list] = None,
+        keyset: bool = False,
+        total_mode: str = "exact",
+    ) -> tuple[list[dict], Optional[int], Optional[str]]:
+        """Get unified IP list with pagination. Returns (items, total_count, next_cursor)."""
         conn = self._get_connection()
 
         try:
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor = conn.cursor()
 
             where_clauses = []
             params: list[Any] = []
@@ -59,42 +129,34 @@ def get_unified_list(
                 params.append(list_type)
 
             if search_ip:
-                where_clauses.append("ip_address LIKE %s")
-                params.append(f"%{search_ip}%")
+                ip_sql, ip_params = ip_predicate("ip_address", search_ip)
+                where_clauses.append(ip_sql)
+                params.extend(ip_params)
 
             if is_active is not None:
                 where_clauses.append("is_active = %s")
                 params.append(is_active)
 
-            where_sql = " AND ".join(where_clauses) if where_clauses else "TRUE"
-
-            cursor.execute(
-                f"SELECT COUNT(*) as total FROM unified_ip_list WHERE {where_sql}",
-                params,
-            )
-            total_result = cursor.fetchone()
-            total = total_result["total"] if total_result else 0
-
-            cursor.execute(
-                f"""
-                SELECT
-                    list_type, id, ip_address, reason, source,
+            result = self._fetch_page(
+                cursor,
+                """list_type, id, ip_address, reason, source,
                     confidence_level, detection_count, is_active,
                     country, detection_date, removal_date, last_seen,
-                    created_at, updated_at
-                FROM unified_ip_list
-                WHERE {where_sql}
-                ORDER BY created_at DESC
-                LIMIT %s OFFSET %s
-                """,
-                params + [limit, offset],
+                    created_at, updated_at""",
+                "unified_ip_list",
+                where_clauses,
+                params,
+                page,
+                limit,
+                after=after,
+                keyset=keyset,
+                total_mode=total_mode,
             )
-            data = cursor.fetchall()
 
             cursor.close()
             conn.close()
 
-            return self._serialize_rows(data), total
+            return result
 
         except Exception:
             if conn:
@@ -121,33 +183,37 @@ def get_statistics(self) -> list[dict]:
                 conn.rollback()
             raise
 
-    def get_whitelist(self, page: int, limit: int) -> tuple[list[dict], int]:
-        """Get whitelist entries with pagination. Returns (items, total_count)."""
-        offset = (page - 1) * limit
+    def get_whitelist(
+        self,
+        page: int,
+        limit: int,
+        after: Optional[list] = None,
+        keyset: bool = False,
+        total_mode: str = "exact",
+    ) -> tuple[list[dict], Optional[int], Optional[str]]:
+        """Get whitelist entries with pagination. Returns (items, total_count, next_cursor)."""
         conn = self._get_connection()
 
         try:
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-            cursor.execute("SELECT COUNT(*) as total FROM whitelist_ips")
-            total_result = cursor.fetchone()
-            total = total_result["total"] if total_result else 0
-
-            cursor.execute(
-                """
-                SELECT id, ip_address, reason, source, country, created_at, updated_at
-                FROM whitelist_ips
-                ORDER BY created_at DESC
-                LIMIT %s OFFSET %s
-                """,
-                (limit, offset),
+            cursor = conn.cursor()
+
+            result = self._fetch_page(
+                cursor,
+                "id, ip_address, reason, source, country, created_at, updated_at",
+                "whitelist_ips",
+                [],
+                [],
+                page,
+                limit,
+                after=after,
+                keyset=keyset,
+                total_mode=total_mode,
             )
-            data = cursor.fetchall()
 
             cursor.close()
             conn.close()
 
-            return self._serialize_rows(data), total
+            return result
 
         except Exception:
             if conn:
@@ -267,37 +333,39 @@ def delete_whitelist(self, id: int) -> Optional[str]:
                 conn.rollback()
             raise
 
-    def get_blacklist(self, page: int, limit: int) -> tuple[list[dict], int]:
-        """Get blacklist entries with pagination. Returns (items, total_count)."""
-        offset = (page - 1) * limit
+    def get_blacklist(
+        self,
+        page: int,
+        limit: int,
+        after: Optional[list] = None,
+        keyset: bool = False,
+        total_mode: str = "exact",
+    ) -> tuple[list[dict], Optional[int], Optional[str]]:
+        """Get blacklist entries with pagination. Returns (items, total_count, next_cursor)."""
         conn = self._get_connection()
 
         try:
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-            cursor.execute(
-                "SELECT COUNT(*) as total FROM blacklist_ips_with_auto_inactive"
-            )
-            total_result = cursor.fetchone()
-            total = total_result["total"] if total_result else 0
+            cursor = conn.cursor()
 
-            cursor.execute(
-                """
-                SELECT id, ip_address, reason, source, confidence_level,
+            result = self._fetch_page(
+                cursor,
+                """id, ip_address, reason, source, confidence_level,
                        detection_count, is_active, country, detection_date,
-                       removal_date, last_seen, created_at, updated_at
-                FROM blacklist_ips_with_auto_inactive
-                ORDER BY created_at DESC
-                LIMIT %s OFFSET %s
-                """,
-                (limit, offset),
+                       removal_date, last_seen, created_at, updated_at""",
+                "blacklist_ips_with_auto_inactive",
+                [],
+                [],
+                page,
+                limit,
+                after=after,
+                keyset=keyset,
+                total_mode=total_mode,
             )
-            data = cursor.fetchall()
 
             cursor.close()
             conn.close()
 
-            return self._serialize_rows(data), total
+            return result
 
         except Exception:
             if conn:
@@ -4,11 +4,13 @@
 from flask import Blueprint, Response, current_app, jsonify, request
 
 from ....exceptions import BadRequestError, DatabaseError, NotFoundError
+from ....utils.fast_json import json_response
 from .handlers import (
     deleted_response,
     paginated_response,
     parse_bool_param,
     success_response,
+    validate_keyset,
     validate_list_type,
     validate_pagination,
 )
@@ -38,17 +40,23 @@ def get_unified_ip_list() -> tuple[Response, int]:
     list_type = validate_list_type(request.args.get("type"))
     search_ip = request.args.get("ip")
     is_active = parse_bool_param(request.args.get("is_active"), default=True)
+    keyset, after, total_mode = validate_keyset(request.args)
 
     try:
         repo = _get_repository()
-        items, total = repo.get_unified_list(
+        items, total, next_cursor = repo.get_unified_list(
             page=page,
             limit=limit,
             list_type=list_type,
             search_ip=search_ip,
             is_active=is_active,
+            after=after,
+            keyset=keyset,
+            total_mode=total_mode,
         )
-        return jsonify(paginated_response(items, total, page, limit)), 200
+        return json_response(
+            paginated_response(items, total, None if keyset else page, limit, next_cursor, total_mode)
+        ), 200
 
     except Exception as e:
         logger.error(f"Unified IP list query error: {e}", exc_info=True)
@@ -80,10 +88,16 @@ def get_whitelist() -> tuple[Response, int]:
         request.args.get("limit", 50),
     )
 
+    keyset, after, total_mode = validate_keyset(request.args)
+
     try:
         repo = _get_repository()
-        items, total = repo.get_whitelist(page=page, limit=limit)
-        return jsonify(paginated_response(items, total, page, limit)), 200
+        items, total, next_cursor = repo.get_whitelist(
+            page=page, limit=limit, after=after, keyset=keyset, total_mode=total_mode
+        )
+        return json_response(
+            paginated_response(items, total, None if keyset else page, limit, next_cursor, total_mode)
+        ), 200
 
     except Exception as e:
         logger.error(f"Whitelist query error: {e}", exc_info=True)
@@ -183,10 +197,16 @@ def get_blacklist() -> tuple[Response, int]:
         request.args.get("limit", 50),
     )
 
+    keyset, after, total_mode = validate_keyset(request.args)
+
     try:
         repo = _get_repository()
-        items, total = repo.get_blacklist(page=page, limit=limit)
-        return jsonify(paginated_response(items, total, page, limit)), 200
+        items, total, next_cursor = repo.get_blacklist(
+            page=page, limit=limit, after=after, keyset=keyset, total_mode=total_mode
+        )
+        return json_response(
+            paginated_response(items, total, None if keyset else page, limit, next_cursor, total_mode)
+        ), 200
 
     except Exception as e:
         logger.error(f"Blacklist query error: {e}", exc_info=True)
@@ -10,4 +10,4 @@
 
 monitoring_bp = Blueprint('monitoring', __name__)
 
-from . import metrics  # noqa
+from . import metrics, profiling, queries  # noqa
@@ -0,0 +1,49 @@
+"""
+Live profiling API routes
+Opt-in sampling profiler for hot-path inspection (PROFILER_ENABLED=true)
+
+GET /api/monitoring/profile?seconds=5&interval_ms=5             (JSON summary)
+GET /api/monitoring/profile?seconds=5&format=folded             (flamegraph input)
+"""
+
+import logging
+from flask import Response, jsonify, request
+from . import monitoring_bp
+from core.monitoring import profiler
+
+logger = logging.getLogger(__name__)
+
+
+@monitoring_bp.route("/monitoring/profile", methods=["GET"])
+def get_profile():
+    """
+    Sample all worker threads for a few seconds and return the hot stacks
+
+    Blocks the calling request for `seconds` (max PROFILER_MAX_SECONDS).
+    Returns 404 unless PROFILER_ENABLED=true, 409 if a profile is already running.
+    """
+    if not profiler.PROFILER_ENABLED:
+        return jsonify(
+            {
+                "success": False,
+                "error": {"code": "PROFILER_DISABLED", "message": "Set PROFILER_ENABLED=true"},
+            }
+        ), 404
+
+    seconds = request.args.get("seconds", 5.0, type=float)
+    interval_ms = request.args.get("interval_ms", 5.0, type=float)
+    output_format = request.args.get("format", "json").lower()
+
+    sampler = profiler.profile(seconds, interval=interval_ms / 1000)
+    if sampler is None:
+        return jsonify(
+            {
+                "success": False,
+                "error": {"code": "PROFILER_BUSY", "message": "Another profile is running"},
+            }
+        ), 409
+
+    logger.info(f"Profile collected: {sampler.samples} samples over {seconds}s")
+    if output_format == "folded":
+        return Response(sampler.folded(), mimetype="text/plain")
+    return jsonify({"success": True, "data": sampler.summary()})
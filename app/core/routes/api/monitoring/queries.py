@@ -0,0 +1,69 @@
+"""
+Query statistics API routes
+Per-endpoint SQL fingerprints, slow-query events and sampled EXPLAIN plans
+
+GET  /api/monitoring/queries?limit=20&sort=total_ms&endpoint=fortinet_core.get_blocklist
+GET  /api/monitoring/queries/slow?limit=50
+POST /api/monitoring/queries/reset
+"""
+
+import logging
+from flask import jsonify, request
+from . import monitoring_bp
+from core.monitoring import query_stats as query_stats_module
+from core.monitoring.query_stats import query_stats
+
+logger = logging.getLogger(__name__)
+
+QUERY_SORT_KEYS = ("total_ms", "mean_ms", "max_ms", "calls", "rows", "slow_calls")
+
+
+@monitoring_bp.route("/monitoring/queries", methods=["GET"])
+def get_query_stats():
+    """
+    Top SQL fingerprints by total time, attributed to Flask endpoints
+
+    Each entry: query_id, endpoint, normalized query, calls, total_ms, mean_ms,
+    max_ms, rows, slow_calls and the latest sampled EXPLAIN (ANALYZE, BUFFERS)
+    plan (null until a slow call has been sampled).
+    """
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 500)
+    sort = request.args.get("sort", "total_ms")
+    if sort not in QUERY_SORT_KEYS:
+        return jsonify(
+            {
+                "success": False,
+                "error": {
+                    "code": "INVALID_SORT",
+                    "message": f"sort must be one of {', '.join(QUERY_SORT_KEYS)}",
+                },
+            }
+        ), 400
+
+    return jsonify(
+        {
+            "success": True,
+            "data": {
+                "since": query_stats.started_at.isoformat(),
+                "enabled": query_stats_module.QUERY_STATS_ENABLED,
+                "slow_query_ms": query_stats_module.SLOW_QUERY_MS,
+                "explain_sample_rate": query_stats_module.EXPLAIN_SAMPLE_RATE,
+                "queries": query_stats.top(limit, sort=sort, endpoint=request.args.get("endpoint")),
+            },
+        }
+    )
+
+
+@monitoring_bp.route("/monitoring/queries/slow", methods=["GET"])
+def get_slow_queries():
+    """Most recent slow-query events (newest first)"""
+    limit = min(max(request.args.get("limit", 50, type=int), 1), query_stats_module.SLOW_EVENTS_MAX)
+    return jsonify({"success": True, "data": query_stats.slow(limit)})
+
+
+@monitoring_bp.route("/monitoring/queries/reset", methods=["POST"])
+def reset_query_stats():
+    """Clear accumulated query statistics"""
+    query_stats.reset()
+    logger.info("Query statistics reset")
+    return jsonify({"success": True})
@@ -47,19 +47,16 @@ def get_monitoring_dashboard():
     """
     try:
         db_service = current_app.extensions["db_service"]
+
+        # 기본 통계 (blacklist_stats_rollup 단일 조회)
+        stats = current_app.extensions["stats_service"].get_snapshot()
+        total_ips = stats["total_ips"]
+        active_ips = stats["active_ips"]
+
         conn = db_service.get_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
         try:
-            # 기본 통계
-            cursor.execute("SELECT COUNT(*) as total_ips FROM blacklist_ips_with_auto_inactive")
-            total_result = cursor.fetchone()
-            total_ips = total_result["total_ips"] if total_result else 0
-
-            cursor.execute("SELECT COUNT(*) as active_ips FROM blacklist_ips_with_auto_inactive WHERE is_active = true")
-            active_result = cursor.fetchone()
-            active_ips = active_result["active_ips"] if active_result else 0
-
             # 최근 수집 정보
             cursor.execute(
                 """
@@ -131,60 +128,22 @@ def get_system_stats():
         DatabaseError: Database query failed
     """
     try:
-        db_service = current_app.extensions["db_service"]
-        conn = db_service.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        try:
-            # 기본 IP 통계: total, active 구분 (detection_date 컬럼 사용하지 않음)
-            cursor.execute("SELECT COUNT(*) as total_ips FROM blacklist_ips_with_auto_inactive")
-            total_result = cursor.fetchone()
-            total_ips = total_result["total_ips"] if total_result else 0
-
-            # Active IP: is_active = true인 IP (간단한 조건)
-            cursor.execute("SELECT COUNT(*) as active_ips FROM blacklist_ips_with_auto_inactive WHERE is_active = true")
-            active_result = cursor.fetchone()
-            active_ips = active_result["active_ips"] if active_result else 0
-
-            # Expired IP: is_active = false인 IP
-            cursor.execute(
-                "SELECT COUNT(*) as expired_ips FROM blacklist_ips_with_auto_inactive WHERE is_active = false"
-            )
-            expired_result = cursor.fetchone()
-            expired_ips = expired_result["expired_ips"] if expired_result else 0
-
-            # 소스별 분포
-            cursor.execute(
-                """
-                 SELECT data_source, COUNT(*) as count,
-                        ROUND(COUNT(*) * 100.0 / NULLIF((SELECT COUNT(*) FROM blacklist_ips_with_auto_inactive), 0), 1) as percentage
-                 FROM blacklist_ips_with_auto_inactive
-                WHERE data_source IS NOT NULL
-                GROUP BY data_source
-                ORDER BY count DESC
-            """
-            )
-            source_results = cursor.fetchall()
-
-            source_distribution = {}
-            for row in source_results:
-                source_distribution[row["data_source"]] = {
-                    "count": row["count"],
-                    "percentage": float(row["percentage"]) if row["percentage"] else 0,
-                }
-
-            # 최근 업데이트 시간
-            cursor.execute("SELECT MAX(created_at) as last_update FROM blacklist_ips_with_auto_inactive")
-            update_result = cursor.fetchone()
-            last_update = (
-                update_result["last_update"].isoformat()
-                if update_result and update_result["last_update"]
-                else "데이터 없음"
-            )
+        # 기본 IP 통계 + 소스별 분포 + 최근 업데이트 (blacklist_stats_rollup 단일 조회)
+        stats = current_app.extensions["stats_service"].get_snapshot()
+        total_ips = stats["total_ips"]
+        active_ips = stats["active_ips"]
+        expired_ips = stats["expired_ips"]
+
+        source_distribution = {}
+        for data_source, count in sorted(
+            stats["by_data_source_all"].items(), key=lambda item: item[1], reverse=True
+        ):
+            source_distribution[data_source] = {
+                "count": count,
+                "percentage": round(count * 100.0 / total_ips, 1) if total_ips else 0,
+            }
 
-        finally:
-            cursor.close()
-            db_service.return_connection(conn)
+        last_update = stats["last_created"].isoformat() if stats["last_created"] else "데이터 없음"
 
         return jsonify(
             {
@@ -248,19 +207,11 @@ def get_chart_data():
             # 일별 수집 통계 (최근 30일)
             cursor.execute(
                 """
-<<<<<<< Updated upstream:app/core/routes/api/system_api.py
-                SELECT DATE(timestamp) as date,
-                       COALESCE(SUM(items_collected), 0) as collected
-                FROM collection_history
-                WHERE timestamp >= %s AND success = true
-                GROUP BY DATE(timestamp)
-=======
                 SELECT DATE(collection_date) as date,
                        COALESCE(SUM(items_collected), 0) as collected
                 FROM collection_history
                 WHERE collection_date >= %s AND success = true
                 GROUP BY DATE(collection_date)
->>>>>>> Stashed changes:app-source/core/routes/api/system_api.py
                 ORDER BY date DESC
                 LIMIT 30
             """,
@@ -322,11 +273,7 @@ def get_system_logs():
         import os
 
         # 로그 파일 읽기 (최근 100줄)
-<<<<<<< Updated upstream:app/core/routes/api/system_api.py
         log_file = "/app/logs/app.log"
-=======
-        log_file = "/app/logs/collector.log"
->>>>>>> Stashed changes:app-source/core/routes/api/system_api.py
         if not os.path.exists(log_file):
             return jsonify(
                 {
@@ -362,11 +309,7 @@ def get_system_logs():
         logger.error(f"System logs error: {e}", exc_info=True)
         raise InternalServerError(
             message="Failed to read system logs",
-<<<<<<< Updated upstream:app/core/routes/api/system_api.py
             details={"log_file": "/app/logs/app.log", "error_type": type(e).__name__},
-=======
-            details={"log_file": "/app/logs/collector.log", "error_type": type(e).__name__},
->>>>>>> Stashed changes:app-source/core/routes/api/system_api.py
         )
 
 
@@ -7,6 +7,8 @@
 import logging
 from flask_wtf.csrf import CSRFProtect
 
+from ...utils.ip_search import ip_predicate
+
 logger = logging.getLogger(__name__)
 collection_bp = Blueprint("simple_collection", __name__, url_prefix="/collection-panel")
 
@@ -409,8 +411,10 @@ def search_collected_ips():
         params = []
 
         if ip_search:
-            where_clauses.append("ip_address LIKE %s")
-            params.append(f"%{ip_search}%")
+            # 검색어 유형별 인덱스 조건 (정확/CIDR/접두사/부분 일치)
+            ip_sql, ip_params = ip_predicate("ip_address", ip_search)
+            where_clauses.append(ip_sql)
+            params.extend(ip_params)
 
         if country and country != "ALL":
             where_clauses.append("country = %s")
@@ -32,12 +32,17 @@ def handle_subscribe_stats():
         join_room('stats_room')
         logger.info("📊 통계 룸 구독")
 
-        # 초기 통계 전송
-        # Use dependency injection via app.extensions
-        optimized_blacklist_service = current_app.extensions['optimized_blacklist_service']
-        stats = optimized_blacklist_service.get_unified_statistics()
-
-        emit('stats_update', stats, room='stats_room')
+        # 초기 통계 전송 (요청한 클라이언트에게만, 공유 스냅샷 사용 → DB 조회 없음)
+        broadcaster = current_app.extensions.get('stats_broadcaster')
+        if broadcaster is None:
+            optimized_blacklist_service = current_app.extensions['optimized_blacklist_service']
+            emit('stats_update', optimized_blacklist_service.get_unified_statistics())
+            return
+
+        snapshot = broadcaster.get_snapshot()
+        if snapshot is not None:
+            emit('stats_update', dict(snapshot['stats'], version=snapshot['version']))
+        # 스냅샷이 아직 없으면 첫 계산 결과(version 1 stats_diff = 전체)가 룸으로 전송됨
 
     @socketio.on('unsubscribe_stats')
     def handle_unsubscribe_stats():
@@ -51,12 +56,16 @@ def handle_subscribe_collection():
         join_room('collection_room')
         logger.info("🔄 수집 룸 구독")
 
-        # 초기 수집 상태 전송
-        # Use dependency injection via app.extensions
-        optimized_blacklist_service = current_app.extensions['optimized_blacklist_service']
-        status = optimized_blacklist_service.get_collection_status()
+        # 초기 수집 상태 전송 (요청한 클라이언트에게만)
+        broadcaster = current_app.extensions.get('stats_broadcaster')
+        if broadcaster is None:
+            optimized_blacklist_service = current_app.extensions['optimized_blacklist_service']
+            emit('collection_status', optimized_blacklist_service.get_collection_status())
+            return
 
-        emit('collection_status', status, room='collection_room')
+        snapshot = broadcaster.get_snapshot()
+        if snapshot is not None:
+            emit('collection_status', snapshot['collection'])
 
     return socketio
 
@@ -8,6 +8,8 @@
 from datetime import datetime
 from typing import Dict, List, Any
 
+from .analytics_summary_service import AnalyticsSummaryService
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,11 +24,23 @@ def __init__(self, db_service=None):
             db_service: DatabaseService instance for connection pool access
         """
         self.db_service = db_service
+        self.summaries = AnalyticsSummaryService(db_service)
+
+    def refresh_summaries(self, full: bool = False) -> int:
+        """수집 완료 후 변경된 분석 요약 버킷 재계산"""
+        try:
+            return self.summaries.refresh(full=full)
+        except Exception as e:
+            logger.error(f"Analytics summary refresh failed: {e}")
+            return 0
 
     def analyze_false_positive_patterns(self, days: int = 7) -> Dict[str, Any]:
         """
         오탐 패턴 분석 (Phase 3.1)
 
+        요약 테이블(analytics_hourly_*)의 최근 days일 버킷만 조회.
+        분석 창은 시(hour) 경계로 정렬됨.
+
         Args:
             days: 분석 기간 (일)
 
@@ -35,95 +49,25 @@ def analyze_false_positive_patterns(self, days: int = 7) -> Dict[str, Any]:
         """
         try:
             # 1. 차단 사유별 통계
-            reason_stats = self.db_service.query(
-                """
-                SELECT
-                    reason,
-                    COUNT(*) as count,
-                    COUNT(DISTINCT ip_address) as unique_ips
-                FROM blacklist_ips
-                WHERE is_active = true
-                    AND created_at > NOW() - INTERVAL '%s days'
-                GROUP BY reason
-                ORDER BY count DESC
-                LIMIT 10
-            """,
-                (days,),
-            )
+            reason_stats, mode = self.summaries.fetch("reason_distribution", days=days)
 
-            # 2. 소스별 통계
-            source_stats = self.db_service.query(
-                """
-                SELECT
-                    source,
-                    COUNT(*) as count,
-                    COUNT(DISTINCT ip_address) as unique_ips,
-                    MAX(created_at) as last_updated
-                FROM blacklist_ips
-                WHERE is_active = true
-                    AND created_at > NOW() - INTERVAL '%s days'
-                GROUP BY data_source
-                ORDER BY count DESC
-            """,
-                (days,),
-            )
+            # 2. 소스별 통계 (data_source 기준)
+            source_stats, _ = self.summaries.fetch("source_distribution", days=days)
 
-            # 3. 국가별 통계 (country 컬럼이 있는 경우)
-            try:
-                country_stats = self.db_service.query(
-                    """
-                    SELECT
-                        country,
-                        COUNT(*) as count,
-                        COUNT(DISTINCT ip_address) as unique_ips
-                    FROM blacklist_ips
-                    WHERE is_active = true
-                        AND country IS NOT NULL
-                        AND created_at > NOW() - INTERVAL '%s days'
-                    GROUP BY country
-                    ORDER BY count DESC
-                    LIMIT 10
-                """,
-                    (days,),
-                )
-            except Exception as e:
-                logger.warning(f"Country stats failed: {e}")
-                country_stats = []
+            # 3. 국가별 통계
+            country_stats, _ = self.summaries.fetch("country_distribution", days=days)
 
             # 4. 시간대별 차단 패턴
-            hourly_stats = self.db_service.query(
-                """
-                SELECT
-                    EXTRACT(HOUR FROM created_at) as hour,
-                    COUNT(*) as count
-                FROM blacklist_ips
-                WHERE is_active = true
-                    AND created_at > NOW() - INTERVAL '%s days'
-                GROUP BY hour
-                ORDER BY hour
-            """,
-                (days,),
-            )
+            hourly_stats, _ = self.summaries.fetch("hourly_pattern", days=days)
 
-            # 5. 급증 IP 대역 감지 (최근 24시간)
-            spike_detection = self.db_service.query("""
-                SELECT
-                    substring(ip_address from '([0-9]+\\.[0-9]+\\.)') as ip_prefix,
-                    COUNT(*) as count,
-                    COUNT(DISTINCT ip_address) as unique_ips
-                FROM blacklist_ips
-                WHERE is_active = true
-                    AND created_at > NOW() - INTERVAL '24 hours'
-                GROUP BY ip_prefix
-                HAVING COUNT(*) > 10
-                ORDER BY count DESC
-                LIMIT 10
-            """)
+            # 5. 급증 IP 대역 감지 (최근 24시간, /16 정수 키)
+            spike_detection, _ = self.summaries.fetch("spike_detection")
 
             return {
                 "success": True,
                 "period_days": days,
                 "analyzed_at": datetime.now().isoformat(),
+                "mode": mode,
                 "analysis": {
                     "reason_distribution": reason_stats,
                     "source_distribution": source_stats,
@@ -199,6 +143,7 @@ def get_whitelist_candidates(self, min_blocked_count: int = 5) -> Dict[str, Any]
         """
         try:
             # 자주 차단되지만 화이트리스트에 없는 IP
+            # (idx_blacklist_ips_active_detection_count 순서대로 읽다가 20건에서 중단)
             candidates = self.db_service.query(
                 """
                 SELECT
@@ -208,10 +153,11 @@ def get_whitelist_candidates(self, min_blocked_count: int = 5) -> Dict[str, Any]
                     bi.detection_count,
                     bi.last_seen
                 FROM blacklist_ips bi
-                LEFT JOIN whitelist_ips wi ON bi.ip_address = wi.ip_address
                 WHERE bi.is_active = true
-                    AND wi.ip_address IS NULL
                     AND bi.detection_count >= %s
+                    AND NOT EXISTS (
+                        SELECT 1 FROM whitelist_ips wi WHERE wi.ip_address = bi.ip_address
+                    )
                 ORDER BY bi.detection_count DESC
                 LIMIT 20
             """,
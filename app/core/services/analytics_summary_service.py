@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+증분 분석 요약 서비스
+탐지 패턴/오탐 분석을 요약 테이블 조회로 제공
+
+- analytics_hourly_prefix / analytics_hourly_dimension: 활성 IP의 created_at 시간 버킷별 집계
+  (/16 대역은 정수 키 ipv4_to_bigint(ip) >> 16)
+- analytics_daily_source: 탐지일(COALESCE(detection_date, created_at::date)) x 소스별 집계
+- 변경된 버킷만 refresh_analytics_summaries() 로 재계산 (수집 완료 후, 또는 조회 시 MAX_AGE 경과)
+- 폴백: 요약 테이블이 없거나 ANALYTICS_SUMMARY_ENABLED=false 이면 기존 전체 스캔 쿼리
+- 시간 창은 시(hour) 경계로 정렬 (LOCALTIMESTAMP 기준), 전체 스캔 쿼리도 같은 경계를 사용
+
+unique_ips (고유 IP 수) 는 전체 스캔 경로에서만 제공하고 요약 경로에서는 null
+(시간 버킷별 고유 수는 합산해도 창 전체의 고유 수가 되지 않음 - 여러 버킷에 걸친 IP 중복 집계)
+
+Schema: postgres/migrations/007_analytics_summaries.sql
+
+Correctness check:
+    python -m core.services.analytics_summary_service   # 요약 vs 전체 스캔 결과 비교
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+# created_at 기준 분석 창 (시 경계 정렬)
+_WINDOW = "date_trunc('hour', LOCALTIMESTAMP - %(days)s * INTERVAL '1 day')"
+_SPIKE_WINDOW = "date_trunc('hour', LOCALTIMESTAMP - INTERVAL '24 hours')"
+
+# 탐지일 기준 분석 창 (days=None → 전체)
+_DAY_FILTER = "(%(days)s::int IS NULL OR {day} >= CURRENT_DATE - %(days)s::int)"
+_LIVE_DAY = "COALESCE(detection_date, created_at::date)"
+
+# name -> (summary SQL, full-scan SQL); 두 쿼리는 같은 컬럼/정렬을 반환
+ANALYSES: Dict[str, Tuple[str, str]] = {
+    # ---- AnalyticsService.analyze_false_positive_patterns (활성 IP, created_at 창) ----
+    "reason_distribution": (
+        f"""
+        SELECT value AS reason, SUM(ip_count)::bigint AS count, NULL::bigint AS unique_ips
+        FROM analytics_hourly_dimension
+        WHERE dimension = 'reason' AND bucket >= {_WINDOW}
+        GROUP BY value
+        ORDER BY count DESC, reason NULLS LAST
+        LIMIT 10
+        """,
+        f"""
+        SELECT reason, COUNT(*)::bigint AS count, COUNT(DISTINCT ip_address)::bigint AS unique_ips
+        FROM blacklist_ips
+        WHERE is_active = true AND created_at >= {_WINDOW}
+        GROUP BY reason
+        ORDER BY count DESC, reason NULLS LAST
+        LIMIT 10
+        """,
+    ),
+    "source_distribution": (
+        f"""
+        SELECT value AS source, SUM(ip_count)::bigint AS count, NULL::bigint AS unique_ips,
+               MAX(last_created) AS last_updated
+        FROM analytics_hourly_dimension
+        WHERE dimension = 'data_source' AND bucket >= {_WINDOW}
+        GROUP BY value
+        ORDER BY count DESC, source NULLS LAST
+        """,
+        f"""
+        SELECT data_source AS source, COUNT(*)::bigint AS count,
+               COUNT(DISTINCT ip_address)::bigint AS unique_ips, MAX(created_at) AS last_updated
+        FROM blacklist_ips
+        WHERE is_active = true AND created_at >= {_WINDOW}
+        GROUP BY data_source
+        ORDER BY count DESC, source NULLS LAST
+        """,
+    ),
+    "country_distribution": (
+        f"""
+        SELECT value AS country, SUM(ip_count)::bigint AS count, NULL::bigint AS unique_ips
+        FROM analytics_hourly_dimension
+        WHERE dimension = 'country' AND value IS NOT NULL AND bucket >= {_WINDOW}
+        GROUP BY value
+        ORDER BY count DESC, country
+        LIMIT 10
+        """,
+        f"""
+        SELECT country, COUNT(*)::bigint AS count, COUNT(DISTINCT ip_address)::bigint AS unique_ips
+        FROM blacklist_ips
+        WHERE is_active = true AND country IS NOT NULL AND created_at >= {_WINDOW}
+        GROUP BY country
+        ORDER BY count DESC, country
+        LIMIT 10
+        """,
+    ),
+    "hourly_pattern": (
+        f"""
+        SELECT EXTRACT(HOUR FROM bucket)::int AS hour, SUM(ip_count)::bigint AS count
+        FROM analytics_hourly_dimension
+        WHERE dimension = 'data_source' AND bucket >= {_WINDOW}
+        GROUP BY 1
+        ORDER BY 1
+        """,
+        f"""
+        SELECT EXTRACT(HOUR FROM created_at)::int AS hour, COUNT(*)::bigint AS count
+        FROM blacklist_ips
+        WHERE is_active = true AND created_at >= {_WINDOW}
+        GROUP BY 1
+        ORDER BY 1
+        """,
+    ),
+    "spike_detection": (
+        f"""
+        SELECT (prefix16 >> 8) || '.' || (prefix16 & 255) || '.' AS ip_prefix,
+               SUM(ip_count)::bigint AS count, NULL::bigint AS unique_ips
+        FROM analytics_hourly_prefix
+        WHERE bucket >= {_SPIKE_WINDOW}
+        GROUP BY prefix16
+        HAVING SUM(ip_count) > 10
+        ORDER BY count DESC, ip_prefix NULLS LAST
+        LIMIT 10
+        """,
+        f"""
+        SELECT substring(ip_address from '([0-9]+\\.[0-9]+\\.)') AS ip_prefix,
+               COUNT(*)::bigint AS count, COUNT(DISTINCT ip_address)::bigint AS unique_ips
+        FROM blacklist_ips
+        WHERE is_active = true AND created_at >= {_SPIKE_WINDOW}
+        GROUP BY 1
+        HAVING COUNT(*) > 10
+        ORDER BY count DESC, ip_prefix NULLS LAST
+        LIMIT 10
+        """,
+    ),
+    # ---- /analytics/detection-timeline (전체 IP, 탐지일 창) ----
+    "detection_timeline": (
+        f"""
+        SELECT detection_day, SUM(ip_count)::bigint AS ip_count,
+               COUNT(DISTINCT source)::bigint AS source_count,
+               STRING_AGG(DISTINCT source, ', ') AS sources,
+               MIN(first_collected) AS first_collected, MAX(last_collected) AS last_collected
+        FROM analytics_daily_source
+        WHERE {_DAY_FILTER.format(day="detection_day")}
+        GROUP BY detection_day
+        ORDER BY detection_day DESC
+        """,
+        f"""
+        SELECT {_LIVE_DAY} AS detection_day, COUNT(*)::bigint AS ip_count,
+               COUNT(DISTINCT source)::bigint AS source_count,
+               STRING_AGG(DISTINCT source, ', ') AS sources,
+               MIN(created_at) AS first_collected, MAX(created_at) AS last_collected
+        FROM blacklist_ips_with_auto_inactive
+        WHERE {_DAY_FILTER.format(day=_LIVE_DAY)}
+        GROUP BY 1
+        ORDER BY 1 DESC
+        """,
+    ),
+    "source_statistics": (
+        f"""
+        SELECT source, SUM(ip_count)::bigint AS total_ips,
+               COUNT(DISTINCT detection_day)::bigint AS active_days,
+               MIN(detection_day) AS first_detection, MAX(detection_day) AS last_detection
+        FROM analytics_daily_source
+        WHERE {_DAY_FILTER.format(day="detection_day")}
+        GROUP BY source
+        ORDER BY total_ips DESC, source
+        """,
+        f"""
+        SELECT source, COUNT(*)::bigint AS total_ips,
+               COUNT(DISTINCT {_LIVE_DAY})::bigint AS active_days,
+               MIN({_LIVE_DAY}) AS first_detection, MAX({_LIVE_DAY}) AS last_detection
+        FROM blacklist_ips_with_auto_inactive
+        WHERE {_DAY_FILTER.format(day=_LIVE_DAY)}
+        GROUP BY source
+        ORDER BY total_ips DESC, source
+        """,
+    ),
+    # ---- /analytics/suspicious-patterns (전체 IP, 탐지일 전체) ----
+    "round_numbers": (
+        """
+        SELECT detection_day AS day, SUM(ip_count)::bigint AS count, source
+        FROM analytics_daily_source
+        GROUP BY detection_day, source
+        HAVING SUM(ip_count) %% 1000 = 0 AND SUM(ip_count) >= 1000
+        ORDER BY count DESC, day DESC, source
+        """,
+        f"""
+        SELECT {_LIVE_DAY} AS day, COUNT(*)::bigint AS count, source
+        FROM blacklist_ips_with_auto_inactive
+        GROUP BY {_LIVE_DAY}, source
+        HAVING COUNT(*) %% 1000 = 0 AND COUNT(*) >= 1000
+        ORDER BY count DESC, day DESC, source
+        """,
+    ),
+    "bulk_collection": (
+        """
+        WITH daily_stats AS (
+            SELECT detection_day AS day, SUM(ip_count)::bigint AS count
+            FROM analytics_daily_source
+            GROUP BY detection_day
+        ),
+        avg_stats AS (
+            SELECT AVG(count) AS avg_count, STDDEV(count) AS stddev_count
+            FROM daily_stats
+        )
+        SELECT d.day, d.count, a.avg_count
+        FROM daily_stats d, avg_stats a
+        WHERE d.count > (a.avg_count + 2 * COALESCE(a.stddev_count, a.avg_count))
+        ORDER BY d.count DESC, d.day DESC
+        """,
+        f"""
+        WITH daily_stats AS (
+            SELECT {_LIVE_DAY} AS day, COUNT(*)::bigint AS count
+            FROM blacklist_ips_with_auto_inactive
+            GROUP BY {_LIVE_DAY}
+        ),
+        avg_stats AS (
+            SELECT AVG(count) AS avg_count, STDDEV(count) AS stddev_count
+            FROM daily_stats
+        )
+        SELECT d.day, d.count, a.avg_count
+        FROM daily_stats d, avg_stats a
+        WHERE d.count > (a.avg_count + 2 * COALESCE(a.stddev_count, a.avg_count))
+        ORDER BY d.count DESC, d.day DESC
+        """,
+    ),
+    "single_source_bulk": (
+        """
+        SELECT data_source, detection_day AS day, SUM(ip_count)::bigint AS count
+        FROM analytics_daily_source
+        GROUP BY data_source, detection_day
+        HAVING SUM(ip_count) > 10000
+        ORDER BY count DESC, day DESC, data_source NULLS LAST
+        """,
+        f"""
+        SELECT data_source, {_LIVE_DAY} AS day, COUNT(*)::bigint AS count
+        FROM blacklist_ips_with_auto_inactive
+        GROUP BY data_source, {_LIVE_DAY}
+        HAVING COUNT(*) > 10000
+        ORDER BY count DESC, day DESC, data_source NULLS LAST
+        """,
+    ),
+}
+
+
+def _rows(cursor) -> List[Dict[str, Any]]:
+    columns = [desc[0] for desc in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+class AnalyticsSummaryService:
+    """분석 요약 테이블 조회/갱신 서비스"""
+
+    def __init__(self, db_service=None):
+        """
+        Initialize analytics summary service
+
+        Args:
+            db_service: DatabaseService instance for connection pool access
+        """
+        self.db_service = db_service
+        self.enabled = os.getenv("ANALYTICS_SUMMARY_ENABLED", "true").lower() in (
+            "true",
+            "1",
+            "yes",
+        )
+        # 조회 시 자동 갱신 주기 (초). 0 이면 조회 때마다 변경 버킷 반영
+        self.max_age = int(os.getenv("ANALYTICS_SUMMARY_MAX_AGE", "60"))
+        # None = not yet checked; False after the summary tables were found missing
+        self._available: Optional[bool] = None
+        self._refreshed_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def _fetch(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        conn = self.db_service.get_connection()
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                return _rows(cursor)
+            finally:
+                cursor.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_service.return_connection(conn)
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        변경된 버킷 재계산 (수집 완료 후 호출)
+
+        Args:
+            full: True 이면 전체 재구성 (드리프트 보정용)
+
+        Returns:
+            재계산한 버킷 수 (-1: 다른 갱신이 진행 중)
+        """
+        if not self.enabled or self._available is False:
+            return 0
+
+        conn = self.db_service.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT refresh_analytics_summaries(%s)", (full,))
+            refreshed = cursor.fetchone()[0]
+            conn.commit()
+            cursor.close()
+            self._available = True
+            self._refreshed_at = time.monotonic()
+            if refreshed > 0:
+                logger.info(f"✅ analytics summaries refreshed: {refreshed} buckets")
+            return refreshed
+        except psycopg2.errors.UndefinedFunction:
+            conn.rollback()
+            self._available = False
+            logger.warning(
+                "refresh_analytics_summaries() not found - using full-scan analytics queries "
+                "(apply postgres/migrations/007_analytics_summaries.sql)"
+            )
+            return 0
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_service.return_connection(conn)
+
+    def _ensure_fresh(self):
+        """MAX_AGE 경과 시 변경 버킷 반영 (동시 요청은 기다리지 않고 현재 요약 사용)"""
+        if time.monotonic() - self._refreshed_at < self.max_age:
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"analytics summary refresh failed, serving current summaries: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def fetch(self, name: str, live: bool = False, days: Optional[int] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        분석 결과 조회
+
+        Args:
+            name: ANALYSES 키
+            live: True 이면 요약 대신 전체 스캔
+            days: 분석 기간 (created_at 창은 일 단위, 탐지일 창은 None = 전체)
+
+        Returns:
+            (rows, mode)  mode: "summary" | "live"
+        """
+        summary_sql, live_sql = ANALYSES[name]
+        params = {"days": days}
+
+        if not live and self.enabled and self._available is not False:
+            self._ensure_fresh()
+            try:
+                rows = self._fetch(summary_sql, params)
+                self._available = True
+                return rows, "summary"
+            except psycopg2.errors.UndefinedTable:
+                self._available = False
+                logger.warning(
+                    "analytics summary tables not found - using full-scan analytics queries "
+                    "(apply postgres/migrations/007_analytics_summaries.sql)"
+                )
+
+        return self._fetch(live_sql, params), "live"
+
+
+# ----------------------------------------------------------------------
+# Correctness check: summary results vs full-scan queries
+# ----------------------------------------------------------------------
+
+
+def _compare(summary_rows: List[Dict[str, Any]], live_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """행 단위 비교 (모든 컬럼 정확히 일치, 요약 경로가 제공하지 않는 unique_ips(null) 는 제외)"""
+    mismatches = []
+    if len(summary_rows) != len(live_rows):
+        mismatches.append({"rows": {"summary": len(summary_rows), "live": len(live_rows)}})
+
+    for index, (summary, live) in enumerate(zip(summary_rows, live_rows)):
+        for key, expected in live.items():
+            actual = summary.get(key)
+            if key == "unique_ips" and actual is None:
+                continue
+            if actual != expected:
+                mismatches.append({"row": index, "column": key, "summary": actual, "live": expected})
+    return mismatches
+
+
+def verify_against_full_scan(db_service, days: int = 7) -> Dict[str, Dict[str, Any]]:
+    """
+    요약 테이블 결과와 기존 전체 스캔 쿼리 결과 비교
+
+    변경 버킷을 먼저 반영한 뒤 REPEATABLE READ 스냅샷 하나에서 두 쿼리를 실행한다.
+    (migration 007 적용 필요, 읽기 전용)
+    """
+    AnalyticsSummaryService(db_service).refresh()
+
+    conn = db_service.get_connection()
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        conn.rollback()
+        cursor = conn.cursor()
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+
+        for name, (summary_sql, live_sql) in ANALYSES.items():
+            cases = [days, None] if name in ("detection_timeline", "source_statistics") else [days]
+            for window in cases:
+                params = {"days": window}
+                cursor.execute(summary_sql, params)
+                summary_rows = _rows(cursor)
+                cursor.execute(live_sql, params)
+                live_rows = _rows(cursor)
+
+                mismatches = _compare(summary_rows, live_rows)
+                key = name if window == days else f"{name}(all)"
+                results[key] = {
+                    "rows": len(live_rows),
+                    "match": not mismatches,
+                    "mismatches": mismatches[:5],
+                }
+    finally:
+        conn.rollback()
+        db_service.return_connection(conn)
+
+    return results
+
+
+if __name__ == "__main__":
+    from core.services.database_service import DatabaseService
+
+    report = verify_against_full_scan(DatabaseService())
+    for name, result in report.items():
+        print(f"{name:24s} {result}")
+    failed = [name for name, result in report.items() if not result["match"]]
+    if failed:
+        raise SystemExit(f"summary mismatch for: {', '.join(failed)}")
@@ -1,30 +1,37 @@
 from datetime import datetime
 from typing import Any, Optional
 
+from ..database.prepared import statement
+
+# 단일 IP 체크 경로 (요청마다 호출) - 연결당 1회 PREPARE 후 EXECUTE
+WHITELIST_COUNT = statement(
+    "whitelist_count_by_ip",
+    """
+    SELECT COUNT(*) as count FROM whitelist_ips
+    WHERE ip_address = %s AND is_active = true
+    """,
+)
+
+BLACKLIST_ENTRY = statement(
+    "blacklist_entry_by_ip",
+    """
+    SELECT ip_address, reason, source, detection_count
+    FROM blacklist_ips_with_auto_inactive
+    WHERE ip_address = %s AND is_active = true
+    """,
+)
+
 
 class BlacklistRepository:
     def __init__(self, db_service):
         self.db = db_service
 
     def count_whitelist_by_ip(self, ip: str) -> int:
-        result = self.db.query(
-            """
-            SELECT COUNT(*) as count FROM whitelist_ips
-            WHERE ip_address = %s AND is_active = true
-            """,
-            (ip,),
-        )
+        result = self.db.query_prepared(WHITELIST_COUNT, (ip,))
         return result[0]["count"] if result else 0
 
     def get_blacklist_entry(self, ip: str) -> Optional[dict]:
-        results = self.db.query(
-            """
-            SELECT ip_address, reason, source, detection_count
-            FROM blacklist_ips_with_auto_inactive
-            WHERE ip_address = %s AND is_active = true
-            """,
-            (ip,),
-        )
+        results = self.db.query_prepared(BLACKLIST_ENTRY, (ip,))
         return results[0] if results else None
 
     def insert_blacklist(
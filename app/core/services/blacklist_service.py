@@ -4,6 +4,7 @@
 """
 
 import os
+import time
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
@@ -13,10 +14,8 @@
 import redis
 import json
 
-from ..monitoring.metrics import (
-    blacklist_decisions_total,
-    blacklist_whitelist_hits_total,
-)
+from ..monitoring.metrics import blacklist_whitelist_hits_total, blacklist_check_duration_seconds
+from ..monitoring.decision_log import decision_log
 from .blacklist_repository import BlacklistRepository
 
 # 구조화된 로깅 설정
@@ -67,19 +66,9 @@ def log_decision(
         reason: str,
         metadata: Optional[Dict[str, Any]] = None,
     ):
-        log_data = {
-            "ip": ip,
-            "decision": decision,
-            "reason": reason,
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-
-        if metadata:
-            log_data.update(metadata)
-
-        blacklist_decisions_total.labels(decision=decision, reason=reason).inc()
-
-        logger.info("blacklist_decision", **log_data)
+        # Counted on every call; ALLOWED decisions are sampled before logging
+        # and the structlog event is emitted off the request path.
+        decision_log.record(ip, decision, reason, metadata)
 
     def is_whitelisted(self, ip: str) -> bool:
         cache_key = f"whitelist:{ip}"
@@ -133,6 +122,20 @@ def _create_whitelist_table(self):
             standard_logger.error(f"Failed to create whitelist table: {e}")
 
     def check_blacklist(self, ip: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        response = self._check_blacklist(ip)
+        if response["reason"] == "whitelisted":
+            outcome = "whitelisted"
+        elif response["reason"] == "error":
+            outcome = "error"
+        elif response["metadata"].get("cache_hit"):
+            outcome = "cache"
+        else:
+            outcome = "db"
+        blacklist_check_duration_seconds.labels(result=outcome).observe(time.perf_counter() - started)
+        return response
+
+    def _check_blacklist(self, ip: str) -> Dict[str, Any]:
         cache_key = f"blacklist:{ip}"
 
         try:
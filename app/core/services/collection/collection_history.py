@@ -83,6 +83,13 @@ def record_collection_history(
             logger.info(
                 f"Collection history recorded: {collection_type}, {collected_count} items, success={success}"
             )
+
+            # 수집 완료 → 변경된 분석 요약 버킷 재계산
+            if success and collected_count:
+                analytics_service = current_app.extensions.get("analytics_service")
+                if analytics_service:
+                    analytics_service.refresh_summaries()
+
             return True
 
         except Exception as e:
@@ -234,8 +241,24 @@ def get_collection_statistics(self) -> Dict[str, Any]:
             }
 
     def cleanup_old_history(self) -> int:
-        """오래된 이력 정리"""
+        """오래된 이력 정리
+
+        파티션 테이블이면 보존 기간(partition_config.retention)이 지난 월 파티션을
+        DROP 하고 삭제한 파티션 수를 반환. 전환 전 테이블은 기존처럼 DELETE.
+        """
         try:
+            from ..partition_manager import PartitionManager
+
+            manager = PartitionManager(db_service=self.db_service)
+            if manager.is_partitioned("collection_history"):
+                dropped = manager.drop_expired("collection_history")
+                if dropped:
+                    logger.info(
+                        f"Dropped {len(dropped)} expired collection_history partitions: "
+                        f"{[row['dropped_partition'] for row in dropped]}"
+                    )
+                return len(dropped)
+
             conn = self.db_service.get_connection()
             cursor = conn.cursor()
 
@@ -5,20 +5,23 @@
 
 import os
 import psycopg2
-from psycopg2 import pool, sql
-from psycopg2.extras import RealDictCursor
+from psycopg2 import sql
 from typing import Dict, Optional, Any
 import time
 
 # Enhanced logging with tagging
 from ..utils.logger_config import db_logger as logger
+from ..database import prepared
+from ..database.pool import ConnectionPool, PoolTimeout, close_pool, get_pool
+from ..monitoring.query_stats import query_stats
 
 
 class DatabaseService:
     """Database service with connection pooling and retry logic for dependency resilience"""
 
     def __init__(self):
-        self.connection_pool: Optional[pool.ThreadedConnectionPool] = None
+        self.connection_pool: Optional[ConnectionPool] = None
+        self._stats_service = None
         self.db_config = {
             "host": os.getenv("POSTGRES_HOST", "blacklist-postgres"),
             "port": int(os.getenv("POSTGRES_PORT", 5432)),
@@ -29,6 +32,8 @@ def __init__(self):
         # Read retry configuration from environment (for testing)
         self.max_retries = int(os.getenv("DB_CONNECT_RETRIES", "10"))
         self.base_delay = float(os.getenv("DB_BACKOFF_DELAY", "2.0"))
+        # 느린 쿼리 EXPLAIN 은 풀 밖의 별도 연결로 수집
+        query_stats.attach(self.create_raw_connection)
         if os.getenv("TESTING") == "True" and os.getenv("USE_REAL_DB") != "True":
             self.connection_pool = None  # Ensure it's explicitly None in testing
             logger.info("✅ DatabaseService initialized in TESTING mode (no real connection)")
@@ -36,20 +41,19 @@ def __init__(self):
             self._initialize_pool_with_retry(max_retries=self.max_retries, base_delay=self.base_delay)
 
     def _initialize_pool_with_retry(self, max_retries: int = 10, base_delay: float = 2.0):
-        """Initialize connection pool with exponential backoff retry for Watchtower resilience"""
+        """Initialize connection pool with exponential backoff retry for Watchtower resilience
+
+        프로세스 공용 풀 (core/database/pool.py) 을 사용 - get_db_connection / 연결 관리자와 공유
+        """
         retry_count = 0
 
         while retry_count < max_retries:
             try:
-                if self.connection_pool:
-                    self.connection_pool.closeall()
-
-                self.connection_pool = pool.ThreadedConnectionPool(minconn=3, maxconn=8, **self.db_config)
+                self.connection_pool = get_pool()
 
                 # Test connection
-                test_conn = self.connection_pool.getconn()
-                test_conn.cursor().execute("SELECT 1")
-                self.connection_pool.putconn(test_conn)
+                with self.connection_pool.connection(use="health") as test_conn:
+                    test_conn.cursor().execute("SELECT 1")
 
                 logger.info(f"✅ Database connection pool initialized successfully (attempt {retry_count + 1})")
                 return
@@ -66,28 +70,34 @@ def _initialize_pool_with_retry(self, max_retries: int = 10, base_delay: float =
                     logger.error(f"❌ Database connection failed after {max_retries} attempts: {e}")
                     raise
 
-    def get_connection(self):
-        """Get connection from pool with automatic retry on failure"""
+    def get_connection(self, use: Optional[str] = None):
+        """
+        Get connection from pool with automatic retry on failure
+
+        Args:
+            use: statement_timeout class (api/background/health/report).
+                 기본값은 요청 중이면 api, 그 외 background
+
+        반환은 return_connection() 또는 conn.close() (둘 다 풀 반환)
+        """
         max_retries = 3
         retry_count = 0
 
         while retry_count < max_retries:
             try:
-                if not self.connection_pool:
+                if not self.connection_pool or self.connection_pool.closed:
                     self._initialize_pool_with_retry()
 
-                return self.connection_pool.getconn()
+                return self.connection_pool.getconn(use=use)
 
+            except PoolTimeout:
+                # 풀 포화 - 재시도/재초기화는 대기 중인 요청만 늘린다
+                raise
             except Exception as e:
                 retry_count += 1
                 if retry_count < max_retries:
                     logger.warning(f"⚠️ Failed to get connection (attempt {retry_count}/{max_retries}): {e}")
                     time.sleep(1)
-                    # Try to reinitialize pool
-                    try:
-                        self._initialize_pool_with_retry()
-                    except Exception as init_error:
-                        logger.error(f"❌ Pool reinitialization failed: {init_error}")
                 else:
                     logger.error(f"❌ Failed to get connection after {max_retries} attempts: {e}")
                     raise
@@ -104,7 +114,7 @@ def close_all_connections(self):
         """Close all connections in pool"""
         try:
             if self.connection_pool:
-                self.connection_pool.closeall()
+                close_pool()
                 self.connection_pool = None
                 logger.info("All database connections closed")
         except Exception as e:
@@ -113,12 +123,17 @@ def close_all_connections(self):
     def health_check(self) -> bool:
         """Health check with retry logic"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            result = cursor.fetchone()
-            cursor.close()
-            self.return_connection(conn)
+            conn = self.get_connection(use="health")
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                result = cursor.fetchone()
+                cursor.close()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self.return_connection(conn)
             return result is not None
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
@@ -130,10 +145,7 @@ def get_connection_status(self) -> Dict[str, Any]:
             is_healthy = self.health_check()
             pool_info = {}
             if self.connection_pool:
-                pool_info = {
-                    "min_connections": self.connection_pool.minconn,
-                    "max_connections": self.connection_pool.maxconn,
-                }
+                pool_info = self.connection_pool.status()
             return {
                 "status": "healthy" if is_healthy else "unhealthy",
                 "host": self.db_config.get("host"),
@@ -147,20 +159,67 @@ def get_connection_status(self) -> Dict[str, Any]:
 
     def query(self, sql: str, params=None) -> list:
         """Execute a SELECT query and return results as list of dicts"""
+        columns, rows = self.query_tuples(sql, params)
+        return [dict(zip(columns, row)) for row in rows]
+
+    def query_tuples(self, sql: str, params=None) -> tuple:
+        """
+        Execute a SELECT query with a plain tuple cursor
+
+        Returns:
+            (column names, list of row tuples) - 컬럼명은 결과당 한 번만 읽음
+            (RealDictRow 처럼 행마다 컬럼 매핑을 만들지 않음)
+        """
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            if params:
-                cursor.execute(sql, params)
-            else:
-                cursor.execute(sql)
-            results = cursor.fetchall()
-            cursor.close()
-            self.return_connection(conn)
-            return [dict(row) for row in results] if results else []
+            cursor = conn.cursor()
+            try:
+                if params:
+                    cursor.execute(sql, params)
+                else:
+                    cursor.execute(sql)
+                columns = tuple(desc[0] for desc in cursor.description) if cursor.description else ()
+                rows = cursor.fetchall() if cursor.description else []
+            finally:
+                cursor.close()
+            return columns, rows
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
+            conn.rollback()
             raise
+        finally:
+            self.return_connection(conn)
+
+    def query_prepared(self, statement, params=None) -> list:
+        """Run a registered prepared statement and return results as list of dicts"""
+        columns, rows = self.query_prepared_tuples(statement, params)
+        return [dict(zip(columns, row)) for row in rows]
+
+    def query_prepared_tuples(self, statement, params=None) -> tuple:
+        """
+        Run a registered prepared statement (core/database/prepared.py) with a tuple cursor
+
+        연결에서 처음 쓰일 때만 PREPARE, 이후 EXECUTE (파싱/계획 생략)
+
+        Returns:
+            (column names, list of row tuples)
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            try:
+                prepared.execute(cursor, statement, params)
+                columns = tuple(desc[0] for desc in cursor.description) if cursor.description else ()
+                rows = cursor.fetchall() if cursor.description else []
+            finally:
+                cursor.close()
+            return columns, rows
+        except Exception as e:
+            logger.error(f"Prepared query {getattr(statement, 'name', statement)} failed: {e}")
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
 
     def execute(self, sql: str, params=None) -> int:
         """
@@ -173,27 +232,28 @@ def execute(self, sql: str, params=None) -> int:
         Returns:
             Number of affected rows
         """
-        conn = None
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
             cursor = conn.cursor()
-            if params:
-                cursor.execute(sql, params)
-            else:
-                cursor.execute(sql)
-            affected_rows = cursor.rowcount
+            try:
+                if params:
+                    cursor.execute(sql, params)
+                else:
+                    cursor.execute(sql)
+                affected_rows = cursor.rowcount
+            finally:
+                cursor.close()
             conn.commit()
-            cursor.close()
-            self.return_connection(conn)
             return affected_rows
         except Exception as e:
             logger.error(f"Execute query failed: {e}")
             try:
-                if conn:
-                    conn.rollback()
+                conn.rollback()
             except Exception:
                 pass
             raise
+        finally:
+            self.return_connection(conn)
 
     def create_raw_connection(self):
         """
@@ -252,7 +312,6 @@ def save_blacklist_ip(self, ip_data: dict) -> bool:
 
             conn.commit()
             cursor.close()
-            self.return_connection(conn)
             return True
 
         except Exception as e:
@@ -260,10 +319,12 @@ def save_blacklist_ip(self, ip_data: dict) -> bool:
             try:
                 if conn:
                     conn.rollback()
-                    self.return_connection(conn)
-            except BaseException:
+            except Exception:
                 pass
             return False
+        finally:
+            if conn:
+                self.return_connection(conn)
 
     def get_collection_credentials(self, service_name: str) -> Dict[str, Any]:
         """수집 서비스 인증정보 조회 - 보안 서비스 통합"""
@@ -288,19 +349,23 @@ def get_collection_credentials(self, service_name: str) -> Dict[str, Any]:
                 # 기존 방식으로 폴백 (호환성)
                 conn = self.get_connection()
                 cursor = conn.cursor()
-
-                cursor.execute(
-                    """
-                    SELECT service_name, username, password, config, created_at, updated_at
-                    FROM collection_credentials
-                    WHERE service_name = %s AND is_active = true
-                """,
-                    (service_name.upper(),),
-                )
-
-                result = cursor.fetchone()
-                cursor.close()
-                self.return_connection(conn)
+                try:
+                    cursor.execute(
+                        """
+                        SELECT service_name, username, password, config, created_at, updated_at
+                        FROM collection_credentials
+                        WHERE service_name = %s AND is_active = true
+                    """,
+                        (service_name.upper(),),
+                    )
+                    result = cursor.fetchone()
+                    cursor.close()
+                finally:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+                    self.return_connection(conn)
 
                 if result:
                     (
@@ -331,6 +396,7 @@ def get_collection_credentials(self, service_name: str) -> Dict[str, Any]:
 
     def show_database_tables(self) -> Dict[str, Any]:
         """데이터베이스 테이블 상세 정보 조회 (UI용)"""
+        conn = None
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
@@ -383,41 +449,37 @@ def show_database_tables(self) -> Dict[str, Any]:
                     }
 
             cursor.close()
-            self.return_connection(conn)
 
             return {"success": True, "total_tables": len(tables), "tables": tables}
 
         except Exception as e:
             logger.error(f"❌ show_database_tables 실패: {e}")
             return {"success": False, "error": str(e), "tables": {}}
+        finally:
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                self.return_connection(conn)
+
+    def _get_stats_service(self):
+        """blacklist_stats_rollup 기반 통계 서비스 (지연 생성)"""
+        if self._stats_service is None:
+            from .stats_rollup_service import StatsRollupService
+
+            self._stats_service = StatsRollupService(self)
+        return self._stats_service
 
     def get_blacklist_stats(self) -> Dict[str, Any]:
         """블랙리스트 통계 조회"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            # Total IPs
-            cursor.execute("SELECT COUNT(*) FROM blacklist_ips")
-            total_ips = cursor.fetchone()[0]
-
-            # Active IPs
-            cursor.execute("SELECT COUNT(*) FROM blacklist_ips WHERE is_active = true")
-            active_ips = cursor.fetchone()[0]
-
-            # Last update
-            cursor.execute("""
-                SELECT MAX(updated_at) FROM blacklist_ips
-            """)
-            last_update_result = cursor.fetchone()[0]
-            last_update = last_update_result.strftime("%Y-%m-%d %H:%M") if last_update_result else "없음"
-
-            cursor.close()
-            self.return_connection(conn)
+            stats = self._get_stats_service().get_snapshot()
+            last_update = stats["last_updated"].strftime("%Y-%m-%d %H:%M") if stats["last_updated"] else "없음"
 
             return {
-                "total_ips": total_ips,
-                "active_ips": active_ips,
+                "total_ips": stats["total_ips"],
+                "active_ips": stats["active_ips"],
                 "last_update": last_update,
             }
 
@@ -428,30 +490,13 @@ def get_blacklist_stats(self) -> Dict[str, Any]:
     def get_dashboard_stats(self) -> Dict[str, Any]:
         """대시보드 통계 조회"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            # Total IPs
-            cursor.execute("SELECT COUNT(*) FROM blacklist_ips")
-            total_count = cursor.fetchone()[0]
-
-            # REGTECH source IPs
-            cursor.execute("SELECT COUNT(*) FROM blacklist_ips WHERE data_source = 'REGTECH'")
-            regtech_count = cursor.fetchone()[0]
-
-            # Last collection
-            cursor.execute("""
-                SELECT MAX(collection_date) FROM collection_history
-            """)
-            last_collection_result = cursor.fetchone()[0]
-            last_updated = last_collection_result.strftime("%Y-%m-%d %H:%M") if last_collection_result else "확인 중..."
-
-            cursor.close()
-            self.return_connection(conn)
+            stats = self._get_stats_service().get_snapshot()
+            last_collection = stats["last_collection"]
+            last_updated = last_collection.strftime("%Y-%m-%d %H:%M") if last_collection else "확인 중..."
 
             return {
-                "total_count": total_count,
-                "regtech_count": regtech_count,
+                "total_count": stats["total_ips"],
+                "regtech_count": stats["regtech_count"],
                 "last_updated": last_updated,
             }
 
@@ -3,12 +3,36 @@
 해제일이 지난 IP들을 자동으로 비활성화
 """
 
+import os
+import time
 import logging
 from datetime import date
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# expire_blacklist_ips_chunk() 규칙 (postgres/migrations/008_batched_ip_expiry.sql)
+#   removal_date:    해제일 경과
+#   stale_detection: 탐지일 3개월 경과
+EXPIRY_RULES = ("removal_date", "stale_detection")
+
+# 세션 advisory lock 키 - collector/scheduler.py 와 동일해야 함 (fleet 전체에서 1개 프로세스만 실행)
+EXPIRY_LOCK_KEY = "blacklist_ip_expiry"
+
+
+def _record_chunk_metrics(rule: str, by_source: Dict[str, int], duration: float):
+    try:
+        from ..monitoring.metrics import (
+            blacklist_expiry_chunk_duration_seconds,
+            blacklist_expiry_deactivated_total,
+        )
+
+        blacklist_expiry_chunk_duration_seconds.labels(rule=rule).observe(duration)
+        for source, count in by_source.items():
+            blacklist_expiry_deactivated_total.labels(rule=rule, source=source).inc(count)
+    except Exception as e:
+        logger.debug(f"expiry metrics unavailable: {e}")
+
 
 class IPExpiryService:
     """IP 만료 관리 서비스"""
@@ -21,75 +45,105 @@ def __init__(self, db_service=None):
             db_service: DatabaseService instance for connection pool access
         """
         self.db_service = db_service
+        # 청크당 최대 비활성화 건수 (청크마다 커밋 → 행 잠금 시간 제한)
+        self.batch_size = int(os.getenv("EXPIRY_BATCH_SIZE", "5000"))
+        # 규칙당 최대 청크 수 (1회 실행 상한)
+        self.max_chunks = int(os.getenv("EXPIRY_MAX_CHUNKS", "1000"))
+
+    def _run_rule(self, conn, cursor, rule: str, totals: Dict[str, Any]):
+        """규칙 하나를 청크 단위로 실행 (청크마다 커밋 + 요약 로그/메트릭)"""
+        for chunk in range(1, self.max_chunks + 1):
+            started = time.monotonic()
+            cursor.execute(
+                "SELECT expired, by_source, oldest, newest FROM expire_blacklist_ips_chunk(%s, %s)",
+                (rule, self.batch_size),
+            )
+            expired, by_source, oldest, newest = cursor.fetchone()
+            conn.commit()
+            duration = time.monotonic() - started
+
+            if expired:
+                totals["chunks"] += 1
+                totals["expired_count"] += expired
+                totals["by_rule"][rule] = totals["by_rule"].get(rule, 0) + expired
+                for source, count in by_source.items():
+                    totals["by_source"][source] = totals["by_source"].get(source, 0) + count
+
+                logger.info(
+                    f"만료 처리 [{rule}] chunk {chunk}: {expired}개 비활성화 "
+                    f"({oldest} ~ {newest}, {duration * 1000:.0f}ms) {by_source}"
+                )
+                _record_chunk_metrics(rule, by_source, duration)
+
+            if expired < self.batch_size:
+                return
+
+        logger.warning(f"만료 처리 [{rule}]: 최대 청크 수({self.max_chunks}) 도달 - 다음 실행에서 계속")
 
     def check_and_deactivate_expired_ips(self) -> Dict[str, Any]:
-        """해제일이 지난 IP들을 비활성화"""
+        """
+        만료 IP 비활성화 (set-based, 청크 단위)
+
+        - expire_blacklist_ips_chunk(): LIMIT + FOR UPDATE SKIP LOCKED 로 청크를 선점해 UPDATE
+        - 청크마다 커밋, 청크별 요약만 로그 (IP별 로그 없음)
+        - pg_try_advisory_lock 으로 app/collector 중 한 프로세스만 실행
+        """
+        conn = None
         try:
-            today = date.today()
+            conn = self.db_service.get_connection()
+            cursor = conn.cursor()
 
-            # 해제일이 지났지만 아직 활성화된 IP들 조회
-            expired_ips = self.db_service.query(
-                """
-                SELECT id, ip_address, source, removal_date
-                FROM blacklist_ips
-                WHERE removal_date IS NOT NULL
-                AND removal_date < %s
-                AND is_active = true
-                """,
-                (today,),
-            )
+            cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", (EXPIRY_LOCK_KEY,))
+            locked = cursor.fetchone()[0]
+            conn.commit()
 
-            if not expired_ips:
-                logger.info("만료된 IP가 없습니다.")
+            if not locked:
+                logger.info("다른 프로세스에서 만료 처리가 진행 중입니다.")
                 return {
                     "success": True,
+                    "skipped": True,
                     "expired_count": 0,
-                    "message": "만료된 IP가 없습니다.",
+                    "message": "다른 프로세스에서 만료 처리가 진행 중입니다.",
                 }
 
-            # 만료된 IP들을 비활성화
-            expired_ids = [ip["id"] for ip in expired_ips]
-
-            updated_count = self.db_service.execute(
-                """
-                UPDATE blacklist_ips
-                SET is_active = false,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ANY(%s)
-                """,
-                (expired_ids,),
+            totals: Dict[str, Any] = {"expired_count": 0, "chunks": 0, "by_rule": {}, "by_source": {}}
+            started = time.monotonic()
+            try:
+                for rule in EXPIRY_RULES:
+                    self._run_rule(conn, cursor, rule, totals)
+            finally:
+                conn.rollback()
+                cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", (EXPIRY_LOCK_KEY,))
+                conn.commit()
+
+            expired_count = totals["expired_count"]
+            if expired_count:
+                message = f"{expired_count}개의 만료된 IP를 비활성화했습니다."
+            else:
+                message = "만료된 IP가 없습니다."
+            logger.info(
+                f"{message} (chunks={totals['chunks']}, {time.monotonic() - started:.1f}s, "
+                f"by_rule={totals['by_rule']})"
             )
 
-            logger.info(f"만료된 IP {updated_count}개를 비활성화했습니다.")
-
-            # 만료된 IP 목록 로그
-            for ip in expired_ips:
-                logger.info(
-                    f"비활성화: {ip['ip_address']} (소스: {ip['source']}, "
-                    f"해제일: {ip['removal_date']})"
-                )
-
             return {
                 "success": True,
-                "expired_count": updated_count,
-                "expired_ips": [
-                    {
-                        "ip_address": ip["ip_address"],
-                        "source": ip["source"],
-                        "removal_date": (
-                            ip["removal_date"].isoformat()
-                            if ip["removal_date"]
-                            else None
-                        ),
-                    }
-                    for ip in expired_ips
-                ],
-                "message": f"{updated_count}개의 만료된 IP를 비활성화했습니다.",
+                "skipped": False,
+                "expired_count": expired_count,
+                "chunks": totals["chunks"],
+                "by_rule": totals["by_rule"],
+                "by_source": totals["by_source"],
+                "message": message,
             }
 
         except Exception as e:
+            if conn:
+                conn.rollback()
             logger.error(f"IP 만료 처리 실패: {e}")
             return {"success": False, "error": str(e), "expired_count": 0}
+        finally:
+            if conn:
+                self.db_service.return_connection(conn)
 
     def get_expiry_stats(self) -> Dict[str, Any]:
         """만료 관련 통계 반환"""
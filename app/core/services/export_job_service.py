@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+블랙리스트 Export Job 서비스
+대용량 내보내기를 요청 경로에서 분리한 비동기 작업
+
+- POST 로 작업 생성 → 백그라운드 워커가 named server-side cursor 로 행 스트리밍
+- raw_data (row_data / api_response / flat) 평탄화는 SQL (jsonb_to_record, ->>) 에서 처리
+- gzip CSV / gzip NDJSON / Parquet(gzip, pyarrow 필요) 을 spool 디렉터리에 기록
+- 완료 파일은 Range 요청 지원 다운로드로 제공 (이어받기)
+- 작업 상태는 spool 디렉터리의 manifest(JSON)에 기록되어 재시작 후에도 조회 가능
+- 조회(get_job/list_jobs)는 manifest 기준 → 다른 gunicorn 워커가 만든 작업도 조회/다운로드 가능
+  (메모리의 _jobs 는 이 프로세스가 실행 중인 작업만, 진행률이 manifest 보다 최신)
+- manifest 의 owner(pid + 프로세스 시작 시각)가 살아 있지 않은 queued/running 작업은 중단(failed)으로 처리
+
+Configuration (environment):
+    EXPORT_SPOOL_DIR       - 결과 파일 디렉터리 (default: /app/data/exports)
+    EXPORT_WORKERS         - 동시 실행 작업 수 (default: 2)
+    EXPORT_FETCH_SIZE      - server-side cursor fetch 크기 (default: 5000)
+    EXPORT_JOB_TTL_HOURS   - 완료 파일 보관 시간 (default: 24)
+"""
+
+import csv
+import gzip
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import psutil
+
+from ..utils.pagination import estimate_count
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": {"extension": "csv.gz", "mimetype": "application/gzip"},
+    "ndjson": {"extension": "ndjson.gz", "mimetype": "application/gzip"},
+    "parquet": {"extension": "parquet", "mimetype": "application/vnd.apache.parquet"},
+}
+
+# uuid4().hex - manifest 경로에 쓰이므로 요청 값은 이 형식만 허용
+JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# (column name, CSV header)
+EXPORT_COLUMNS: List[Tuple[str, str]] = [
+    ("ip_address", "IP Address"),
+    ("source", "Source"),
+    ("country", "Country"),
+    ("detection_date", "Detection Date"),
+    ("removal_date", "Removal Date"),
+    ("reason", "Reason"),
+    ("confidence_level", "Confidence Level"),
+    ("detection_count", "Detection Count"),
+    ("is_active", "Is Active"),
+    ("last_seen", "Last Seen"),
+    ("created_at", "Created At"),
+    ("raw_no", "Raw 번호"),
+    ("raw_ip", "Raw IP"),
+    ("raw_detection_date", "Raw 탐지일"),
+    ("raw_removal_date", "Raw 해제일"),
+    ("raw_reason", "Raw 탐지내용"),
+    ("raw_country", "Raw 국가"),
+    ("collection_ts", "수집 시각"),
+]
+
+# raw_data shapes:
+#   {"row_data": [no, ip, detected, released, reason, country], ...}   (REGTECH 엑셀)
+#   {"api_response": {"ipAddress" | "ip_address", ...}, ...}           (API 수집)
+#   {"ip_address": ..., "detection_date": ..., ...}                      (기타)
+# 비객체 raw_data 는 앞 200자를 Raw 탐지내용으로 사용
+EXPORT_SELECT = """
+    SELECT
+        b.ip_address,
+        b.source,
+        COALESCE(b.country, '') AS country,
+        COALESCE(to_char(b.detection_date, 'YYYY-MM-DD'), '') AS detection_date,
+        COALESCE(to_char(b.removal_date, 'YYYY-MM-DD'), '') AS removal_date,
+        b.reason,
+        b.confidence_level,
+        b.detection_count,
+        CASE WHEN b.is_active THEN 'Yes' ELSE 'No' END AS is_active,
+        COALESCE(to_char(b.last_seen, 'YYYY-MM-DD HH24:MI:SS'), '') AS last_seen,
+        COALESCE(to_char(b.created_at, 'YYYY-MM-DD HH24:MI:SS'), '') AS created_at,
+        COALESCE(r.row_data ->> 0, '') AS raw_no,
+        COALESCE(CASE
+            WHEN r.has_row_data THEN r.row_data ->> 1
+            WHEN r.has_api THEN COALESCE(NULLIF(a."ipAddress", ''), a.ip_address)
+            ELSE r.obj ->> 'ip_address'
+        END, '') AS raw_ip,
+        COALESCE(CASE
+            WHEN r.has_row_data THEN r.row_data ->> 2
+            WHEN r.has_api THEN COALESCE(NULLIF(a."detectedDate", ''), a.detected_date)
+            ELSE r.obj ->> 'detection_date'
+        END, '') AS raw_detection_date,
+        COALESCE(CASE
+            WHEN r.has_row_data THEN r.row_data ->> 3
+            WHEN r.has_api THEN COALESCE(NULLIF(a."releaseDate", ''), a.release_date)
+            ELSE r.obj ->> 'removal_date'
+        END, '') AS raw_removal_date,
+        COALESCE(CASE
+            WHEN r.obj IS NULL THEN left(b.raw_data #>> '{}', 200)
+            WHEN r.has_row_data THEN r.row_data ->> 4
+            WHEN r.has_api THEN COALESCE(NULLIF(a."blockReason", ''), a.reason)
+            ELSE r.obj ->> 'reason'
+        END, '') AS raw_reason,
+        COALESCE(CASE
+            WHEN r.has_row_data THEN r.row_data ->> 5
+            WHEN r.has_api THEN COALESCE(NULLIF(a.country, ''), a."countryCode")
+            ELSE r.obj ->> 'country'
+        END, '') AS raw_country,
+        COALESCE(r.obj ->> 'collection_timestamp', '') AS collection_ts
+    FROM blacklist_ips_with_auto_inactive b
+    CROSS JOIN LATERAL (
+        SELECT
+            o.obj,
+            o.obj ? 'row_data' AS has_row_data,
+            NOT (o.obj ? 'row_data') AND jsonb_typeof(o.obj -> 'api_response') = 'object' AS has_api,
+            CASE WHEN jsonb_typeof(o.obj -> 'row_data') = 'array' THEN o.obj -> 'row_data' END AS row_data
+        FROM (
+            SELECT CASE WHEN jsonb_typeof(b.raw_data) = 'object' THEN b.raw_data END AS obj
+        ) o
+    ) r
+    LEFT JOIN LATERAL jsonb_to_record(CASE WHEN r.has_api THEN r.obj -> 'api_response' END) AS a(
+        "ipAddress" text, ip_address text,
+        "detectedDate" text, detected_date text,
+        "releaseDate" text, release_date text,
+        "blockReason" text, reason text,
+        country text, "countryCode" text
+    ) ON true
+"""
+
+
+def build_export_query(
+    source: Optional[str] = None,
+    active_only: bool = True,
+    include_empty: bool = False,
+) -> Tuple[str, List[Any]]:
+    """export-raw 필터 → (SQL, params). 행 순서는 created_at DESC"""
+    where_conditions = []
+    params: List[Any] = []
+
+    if active_only:
+        where_conditions.append("b.is_active = %s")
+        params.append(True)
+
+    if source:
+        where_conditions.append("b.source = %s")
+        params.append(source)
+
+    if not include_empty:
+        where_conditions.append("b.raw_data IS NOT NULL")
+        where_conditions.append("b.raw_data != '{}'::jsonb")
+
+    where_clause = " WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+    return f"{EXPORT_SELECT}{where_clause} ORDER BY b.created_at DESC", params
+
+
+class ExportJobService:
+    """Background export jobs streamed from a server-side cursor into a spool directory"""
+
+    def __init__(
+        self,
+        db_service=None,
+        spool_dir: Optional[str] = None,
+        workers: Optional[int] = None,
+        fetch_size: Optional[int] = None,
+    ):
+        """
+        Initialize export job service
+
+        Args:
+            db_service: DatabaseService instance (raw connections for long-running cursors)
+            spool_dir: Directory for finished export files and job manifests
+            workers: Number of concurrent export workers
+            fetch_size: Rows fetched per server-side cursor round trip
+        """
+        self.db_service = db_service
+        self.spool_dir = spool_dir or os.getenv("EXPORT_SPOOL_DIR", "/app/data/exports")
+        self.workers = workers or int(os.getenv("EXPORT_WORKERS", "2"))
+        self.fetch_size = fetch_size or int(os.getenv("EXPORT_FETCH_SIZE", "5000"))
+        self.ttl = timedelta(hours=float(os.getenv("EXPORT_JOB_TTL_HOURS", "24")))
+
+        # 이 프로세스가 실행 중인 작업 (다른 워커의 작업은 manifest 로 조회)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._load_manifests()
+
+    # ------------------------------------------------------------------
+    # Job registry
+    # ------------------------------------------------------------------
+
+    def _manifest_path(self, job_id: str) -> str:
+        return os.path.join(self.spool_dir, f"{job_id}.json")
+
+    def _save(self, job: Dict[str, Any]):
+        tmp_path = self._manifest_path(job["id"]) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, self._manifest_path(job["id"]))
+
+    @staticmethod
+    def _current_owner() -> Dict[str, Any]:
+        process = psutil.Process()
+        return {"pid": process.pid, "started": process.create_time()}
+
+    @staticmethod
+    def _owner_alive(job: Dict[str, Any]) -> bool:
+        """작업을 실행하는 프로세스가 아직 살아 있는지 (pid 재사용은 시작 시각으로 구분)"""
+        owner = job.get("owner") or {}
+        try:
+            return psutil.Process(owner["pid"]).create_time() == owner["started"]
+        except (KeyError, TypeError, psutil.Error):
+            return False
+
+    def _read_manifest(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """manifest 읽기 (소유 프로세스가 사라진 queued/running 작업은 failed 로 기록)"""
+        if not JOB_ID_RE.match(job_id):
+            return None
+        try:
+            with open(self._manifest_path(job_id), encoding="utf-8") as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if job.get("status") in ("queued", "running") and not self._owner_alive(job):
+            job["status"] = "failed"
+            job["error"] = "interrupted by restart"
+            job["finished_at"] = job.get("finished_at") or datetime.now().isoformat()
+            self._save(job)
+        return job
+
+    def _read_manifests(self) -> List[Dict[str, Any]]:
+        jobs = []
+        for name in os.listdir(self.spool_dir):
+            if name.endswith(".json"):
+                job = self._read_manifest(name[: -len(".json")])
+                if job:
+                    jobs.append(job)
+        return jobs
+
+    def _load_manifests(self):
+        """재시작 시 중단된 작업 실패 처리 (다른 워커가 실행 중인 작업은 그대로 둔다)"""
+        self._read_manifests()
+
+    def _update(self, job_id: str, persist: bool = True, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            snapshot = dict(job)
+            if fields.get("status") in ("completed", "failed"):
+                del self._jobs[job_id]
+        if persist:
+            self._save(snapshot)
+
+    def _purge_expired(self):
+        cutoff = (datetime.now() - self.ttl).isoformat()
+        expired = [
+            job for job in self._read_manifests()
+            if job.get("finished_at") and job["finished_at"] < cutoff
+        ]
+
+        for job in expired:
+            for path in (self.file_path(job), self._manifest_path(job["id"])):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def create_job(
+        self,
+        export_format: str = "csv",
+        source: Optional[str] = None,
+        active_only: bool = True,
+        include_empty: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Export 작업 생성 및 큐 등록
+
+        Raises:
+            ValueError: 지원하지 않는 형식 (parquet 은 pyarrow 필요)
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported format: {export_format}")
+        if export_format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError("Parquet export requires pyarrow")
+
+        self._purge_expired()
+
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "format": export_format,
+            "filters": {
+                "source": source,
+                "active_only": active_only,
+                "include_empty": include_empty,
+            },
+            "rows_written": 0,
+            "rows_estimated": None,
+            "bytes_written": 0,
+            "created_at": datetime.now().isoformat(),
+            "owner": self._current_owner(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "filename": f"blacklist_raw_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            f".{EXPORT_FORMATS[export_format]['extension']}",
+        }
+
+        with self._lock:
+            self._jobs[job_id] = job
+        self._save(job)
+
+        self._ensure_workers()
+        self._queue.put(job_id)
+        logger.info(f"Export job {job_id} queued ({export_format})")
+        return dict(job)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                return dict(job)
+        return self._read_manifest(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        jobs = {job["id"]: job for job in self._read_manifests()}
+        with self._lock:
+            jobs.update((job_id, dict(job)) for job_id, job in self._jobs.items())
+        return sorted(jobs.values(), key=lambda job: job["created_at"], reverse=True)
+
+    def file_path(self, job: Dict[str, Any]) -> str:
+        extension = EXPORT_FORMATS[job["format"]]["extension"]
+        return os.path.join(self.spool_dir, f"{job['id']}.{extension}")
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _ensure_workers(self):
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f"export-worker-{len(self._threads)}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run_job(job_id)
+            except Exception as e:
+                logger.error(f"Export job {job_id} failed: {e}", exc_info=True)
+                self._update(job_id, status="failed", error=str(e), finished_at=datetime.now().isoformat())
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job_id: str):
+        job = self.get_job(job_id)
+        sql, params = build_export_query(**job["filters"])
+        final_path = self.file_path(job)
+        part_path = final_path + ".part"
+
+        self._update(job_id, status="running", started_at=datetime.now().isoformat())
+
+        # Long-running cursor on a dedicated connection so the request pool stays free
+        conn = self.db_service.create_raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                rows_estimated = estimate_count(cursor, sql, params)
+            self._update(job_id, rows_estimated=rows_estimated)
+
+            cursor = conn.cursor(name=f"export_{job_id}")
+            cursor.itersize = self.fetch_size
+            cursor.execute(sql, params)
+
+            writer = getattr(self, f"_write_{job['format']}")
+            try:
+                rows_written = writer(job_id, cursor, part_path)
+            except Exception:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
+            cursor.close()
+            conn.rollback()
+        finally:
+            conn.close()
+
+        os.replace(part_path, final_path)
+        self._update(
+            job_id,
+            status="completed",
+            rows_written=rows_written,
+            bytes_written=os.path.getsize(final_path),
+            finished_at=datetime.now().isoformat(),
+        )
+        logger.info(f"Export job {job_id} completed ({rows_written} rows)")
+
+    def _batches(self, job_id: str, cursor):
+        """fetchmany 루프 + 진행률 갱신 (manifest 는 최대 1초에 1번 기록)"""
+        rows_written = 0
+        last_persist = time.monotonic()
+        while True:
+            rows = cursor.fetchmany(self.fetch_size)
+            if not rows:
+                break
+            yield rows
+            rows_written += len(rows)
+            now = time.monotonic()
+            persist = now - last_persist >= 1.0
+            if persist:
+                last_persist = now
+            self._update(job_id, persist=persist, rows_written=rows_written)
+
+    def _write_csv(self, job_id: str, cursor, path: str) -> int:
+        rows_written = 0
+        with gzip.open(path, "wt", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([header for _, header in EXPORT_COLUMNS])
+            for rows in self._batches(job_id, cursor):
+                writer.writerows(rows)
+                rows_written += len(rows)
+        return rows_written
+
+    def _write_ndjson(self, job_id: str, cursor, path: str) -> int:
+        names = [name for name, _ in EXPORT_COLUMNS]
+        rows_written = 0
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for rows in self._batches(job_id, cursor):
+                f.writelines(
+                    json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n" for row in rows
+                )
+                rows_written += len(rows)
+        return rows_written
+
+    def _write_parquet(self, job_id: str, cursor, path: str) -> int:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        names = [name for name, _ in EXPORT_COLUMNS]
+        schema = pa.schema(
+            [
+                (name, pa.int64() if name in ("confidence_level", "detection_count") else pa.string())
+                for name in names
+            ]
+        )
+        rows_written = 0
+        with pq.ParquetWriter(path, schema, compression="gzip") as writer:
+            for rows in self._batches(job_id, cursor):
+                columns = zip(*rows)
+                arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows_written += len(rows)
+        return rows_written
@@ -0,0 +1,583 @@
+"""
+FortiManager Fan-out Push Service
+
+Purpose:
+    - fortigate_devices 의 활성 장비 전체에 유효 블랙리스트 배포
+    - 장비별 JSON-RPC 세션을 풀에 보관하고 Push 간 재사용 (매번 로그인/로그아웃 없음)
+    - bounded worker pool 로 N개 대상 동시 Push, 대상별 재시도 + 지수 백오프
+    - 대상별 마지막 Push 버전(content hash) 보관 → 변경 없는 대상은 skip
+    - 결과는 fortimanager_push_logs 에 fanout_id 단위로 기록 (migration 010)
+
+Usage:
+    python -m core.services.fortimanager_fanout_service                # 1회 fan-out (--force: 해시 무시)
+    python -m core.services.fortimanager_fanout_service --verify-mock  # mock-fortigate 여러 개 대상 E2E 검증
+"""
+
+import os
+import sys
+import time
+import uuid
+import base64
+import random
+import hashlib
+import logging
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fortimanager_push_service import (
+    EFFECTIVE_LIST_SQL,
+    EXTERNAL_RESOURCE_NAME,
+    _record_push_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC 세션 만료/미인증 코드 → 재로그인 후 1회 재시도
+SESSION_EXPIRED_CODES = (-10, -11)
+
+
+class FortiManagerPushError(Exception):
+    """JSON-RPC 호출 실패 (로그인 실패, 비정상 status code)"""
+
+
+@dataclass
+class FortiManagerTarget:
+    """Push 대상 장비"""
+
+    target: str  # host[:port]
+    user: str
+    password: str
+    scheme: str = "https"
+    adom: str = "root"
+    device_id: Optional[int] = None
+    name: Optional[str] = None
+
+    @property
+    def jsonrpc_url(self) -> str:
+        return f"{self.scheme}://{self.target}/jsonrpc"
+
+
+class FortiManagerSessionPool:
+    """대상별 HTTP keep-alive 세션 + JSON-RPC 세션 ID 풀
+
+    같은 대상에 대한 호출은 대상별 lock 으로 직렬화 (세션 ID 공유),
+    서로 다른 대상은 병렬 호출 가능.
+    """
+
+    def __init__(self, verify_ssl: bool = False, timeout: float = 30):
+        self.verify_ssl = verify_ssl
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def _entry(self, target: FortiManagerTarget) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._entries.get(target.target)
+            if entry is None:
+                http = requests.Session()
+                http.mount(
+                    f"{target.scheme}://",
+                    requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2),
+                )
+                entry = {
+                    "http": http,
+                    "url": target.jsonrpc_url,
+                    "session_id": None,
+                    "lock": threading.Lock(),
+                }
+                self._entries[target.target] = entry
+            return entry
+
+    def _post(self, entry, target: FortiManagerTarget, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = entry["http"].post(
+            target.jsonrpc_url, json=payload, verify=self.verify_ssl, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _login(self, entry, target: FortiManagerTarget):
+        result = self._post(
+            entry,
+            target,
+            {
+                "method": "exec",
+                "params": [
+                    {
+                        "url": "/sys/login/user",
+                        "data": {"user": target.user, "passwd": target.password},
+                    }
+                ],
+                "id": 1,
+            },
+        )
+        if result.get("result", [{}])[0].get("status", {}).get("code") != 0 or not result.get("session"):
+            raise FortiManagerPushError(f"login failed: {result.get('result')}")
+        entry["session_id"] = result["session"]
+        logger.debug(f"FortiManager login: {target.target}")
+
+    def call(
+        self, target: FortiManagerTarget, method: str, url: str, data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """JSON-RPC 호출 (세션 재사용, 만료 시 재로그인 1회)"""
+        entry = self._entry(target)
+        with entry["lock"]:
+            for attempt in range(2):
+                if not entry["session_id"]:
+                    self._login(entry, target)
+
+                params: Dict[str, Any] = {"url": url}
+                if data is not None:
+                    params["data"] = data
+                result = self._post(
+                    entry,
+                    target,
+                    {"method": method, "params": [params], "session": entry["session_id"], "id": 2},
+                )
+
+                status = result.get("result", [{}])[0].get("status", {})
+                if status.get("code") in SESSION_EXPIRED_CODES and attempt == 0:
+                    entry["session_id"] = None
+                    continue
+                if status.get("code") != 0:
+                    raise FortiManagerPushError(
+                        f"{method} {url} failed: code={status.get('code')} {status.get('message')}"
+                    )
+                return result
+        raise FortiManagerPushError(f"{method} {url} failed after re-login")
+
+    def invalidate(self, target: str):
+        with self._lock:
+            entry = self._entries.get(target)
+        if entry:
+            entry["session_id"] = None
+
+    def close(self):
+        """모든 세션 로그아웃 + HTTP 연결 종료"""
+        with self._lock:
+            entries, self._entries = self._entries, {}
+        for entry in entries.values():
+            try:
+                if entry["session_id"]:
+                    entry["http"].post(
+                        entry["url"],
+                        json={
+                            "method": "exec",
+                            "params": [{"url": "/sys/logout"}],
+                            "session": entry["session_id"],
+                            "id": 99,
+                        },
+                        verify=self.verify_ssl,
+                        timeout=5,
+                    )
+            except Exception as e:
+                logger.debug(f"Logout error (non-critical): {e}")
+            finally:
+                entry["http"].close()
+
+
+class FortiManagerFanoutService:
+    """여러 FortiManager/FortiGate 대상에 대한 동시 Push"""
+
+    def __init__(self, db_service=None):
+        """
+        Initialize fan-out push service
+
+        Args:
+            db_service: DatabaseService instance for connection pool access
+        """
+        self.db_service = db_service
+        self.max_workers = int(os.getenv("FMG_FANOUT_WORKERS", "8"))
+        self.max_attempts = int(os.getenv("FMG_PUSH_RETRIES", "3"))
+        self.backoff_base = float(os.getenv("FMG_PUSH_BACKOFF", "1.0"))
+        self.backoff_max = float(os.getenv("FMG_PUSH_BACKOFF_MAX", "30"))
+
+        # fortigate_devices.config 에 값이 없을 때의 기본값
+        self.default_user = os.getenv("FMG_USER", "admin")
+        self.default_pass = os.getenv("FMG_PASS")
+        self.default_scheme = os.getenv("FMG_SCHEME", "https")
+        self.default_adom = os.getenv("FMG_ADOM", "root")
+        verify_ssl = os.getenv("FMG_VERIFY_SSL", "false").lower() == "true"
+
+        self.sessions = FortiManagerSessionPool(verify_ssl=verify_ssl)
+        self.record_history = True
+
+        # target → 마지막으로 성공한 content hash
+        self._state: Dict[str, str] = {}
+        self._state_loaded = False
+        self._state_lock = threading.Lock()
+
+    def load_targets(self) -> List[FortiManagerTarget]:
+        """fortigate_devices 의 활성 + push_enabled 장비"""
+        rows = self.db_service.query(
+            """
+            SELECT id, device_ip, device_name, config
+            FROM fortigate_devices
+            WHERE is_active = true
+              AND COALESCE((config->>'push_enabled')::boolean, true)
+            ORDER BY id
+            """
+        )
+        targets = []
+        for row in rows:
+            config = row["config"] or {}
+            host = row["device_ip"]
+            if config.get("port"):
+                host = f"{host}:{config['port']}"
+            targets.append(
+                FortiManagerTarget(
+                    target=host,
+                    user=config.get("username") or self.default_user,
+                    password=config.get("password") or self.default_pass,
+                    scheme=config.get("scheme") or self.default_scheme,
+                    adom=config.get("adom") or self.default_adom,
+                    device_id=row["id"],
+                    name=row["device_name"],
+                )
+            )
+        return targets
+
+    def fetch_effective(self) -> Tuple[str, int]:
+        """유효 블랙리스트 (개행 구분 IP 목록, IP 수)"""
+        row = self.db_service.query(EFFECTIVE_LIST_SQL)[0]
+        return row["ip_list"], int(row["ip_count"])
+
+    def _load_state(self):
+        if self._state_loaded:
+            return
+        if self.db_service and self.record_history:
+            try:
+                rows = self.db_service.query(
+                    """
+                    SELECT target, content_hash FROM fortimanager_push_targets
+                    WHERE last_status = 'success' AND content_hash IS NOT NULL
+                    """
+                )
+                self._state.update({row["target"]: row["content_hash"] for row in rows})
+            except Exception as e:
+                logger.warning(f"Failed to load push target state: {e}")
+        self._state_loaded = True
+
+    def _backoff(self, attempt: int) -> float:
+        """지수 백오프 + jitter (attempt: 1부터)"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _push_target(
+        self,
+        target: FortiManagerTarget,
+        resource: str,
+        content_hash: str,
+        ip_count: int,
+        payload_bytes: int,
+        force: bool,
+        fanout_id: str,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result: Dict[str, Any] = {
+            "target": target.target,
+            "device_id": target.device_id,
+            "status": "skipped",
+            "attempts": 0,
+            "content_hash": content_hash,
+            "ip_count": ip_count,
+            "payload_bytes": 0,
+        }
+
+        with self._state_lock:
+            up_to_date = self._state.get(target.target) == content_hash
+
+        if force or not up_to_date:
+            result["status"] = "failed"
+            url = f"/pm/config/adom/{target.adom}/obj/system/external-resource/{EXTERNAL_RESOURCE_NAME}"
+            data = {
+                "resource": resource,
+                "comments": f"Auto-updated by Push Service - {time.strftime('%Y-%m-%d %H:%M:%S')}",
+            }
+            for attempt in range(1, self.max_attempts + 1):
+                result["attempts"] = attempt
+                try:
+                    self.sessions.call(target, "update", url, data)
+                    result["status"] = "success"
+                    result["payload_bytes"] = payload_bytes
+                    result.pop("error", None)
+                    break
+                except Exception as e:
+                    result["error"] = str(e)
+                    if isinstance(e, requests.RequestException):
+                        # 연결 문제 → 다음 시도는 새 로그인부터
+                        self.sessions.invalidate(target.target)
+                    if attempt < self.max_attempts:
+                        delay = self._backoff(attempt)
+                        logger.warning(
+                            f"Push to {target.target} failed (attempt {attempt}/{self.max_attempts}): "
+                            f"{e} - retry in {delay:.1f}s"
+                        )
+                        time.sleep(delay)
+
+            if result["status"] == "success":
+                with self._state_lock:
+                    self._state[target.target] = content_hash
+
+        duration = time.perf_counter() - started
+        result["duration_ms"] = int(duration * 1000)
+        _record_push_metrics(target.target, result["status"], duration, result["payload_bytes"])
+        self._save_result(target, result, fanout_id)
+        return result
+
+    def _save_result(self, target: FortiManagerTarget, result: Dict[str, Any], fanout_id: str):
+        if not (self.record_history and self.db_service):
+            return
+        try:
+            self.db_service.execute(
+                """
+                INSERT INTO fortimanager_push_logs
+                (target, status, content_hash, ip_count, payload_bytes,
+                 response_time_ms, error_message, fanout_id, attempts)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                (
+                    target.target,
+                    result["status"],
+                    result["content_hash"],
+                    result["ip_count"],
+                    result["payload_bytes"],
+                    result["duration_ms"],
+                    result.get("error"),
+                    fanout_id,
+                    result["attempts"],
+                ),
+            )
+            if result["status"] == "skipped":
+                return
+            success = result["status"] == "success"
+            self.db_service.execute(
+                """
+                INSERT INTO fortimanager_push_targets
+                (target, device_id, content_hash, ip_count, last_status,
+                 consecutive_failures, last_error, last_pushed_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (target) DO UPDATE SET
+                    device_id = EXCLUDED.device_id,
+                    content_hash = COALESCE(EXCLUDED.content_hash, fortimanager_push_targets.content_hash),
+                    ip_count = CASE WHEN EXCLUDED.last_status = 'success'
+                                    THEN EXCLUDED.ip_count ELSE fortimanager_push_targets.ip_count END,
+                    last_status = EXCLUDED.last_status,
+                    consecutive_failures = CASE WHEN EXCLUDED.last_status = 'success'
+                                                THEN 0 ELSE fortimanager_push_targets.consecutive_failures + 1 END,
+                    last_error = EXCLUDED.last_error,
+                    last_pushed_at = COALESCE(EXCLUDED.last_pushed_at, fortimanager_push_targets.last_pushed_at),
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                (
+                    target.target,
+                    target.device_id,
+                    result["content_hash"] if success else None,
+                    result["ip_count"],
+                    result["status"],
+                    0 if success else 1,
+                    result.get("error"),
+                    time.strftime("%Y-%m-%d %H:%M:%S") if success else None,
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record push result for {target.target}: {e}")
+
+    def push_all(
+        self,
+        targets: Optional[List[FortiManagerTarget]] = None,
+        force: bool = False,
+        effective: Optional[Tuple[str, int]] = None,
+    ) -> Dict[str, Any]:
+        """모든 대상에 유효 블랙리스트 Push (변경 없는 대상은 skip)
+
+        Args:
+            targets: Push 대상 (기본: fortigate_devices 활성 장비)
+            force: 대상별 해시가 같아도 업로드
+            effective: (IP 목록, IP 수) - 호출자가 이미 조회한 경우 재사용
+        """
+        if targets is None:
+            targets = self.load_targets()
+        fanout_id = str(uuid.uuid4())
+        summary: Dict[str, Any] = {
+            "fanout_id": fanout_id,
+            "targets": len(targets),
+            "success": 0,
+            "skipped": 0,
+            "failed": 0,
+            "results": [],
+        }
+        if not targets:
+            summary["ok"] = True
+            return summary
+
+        ip_list, ip_count = effective if effective is not None else self.fetch_effective()
+        encoded = ip_list.encode()
+        content_hash = hashlib.sha256(encoded).hexdigest()
+        # 대상 수와 무관하게 한 번만 인코딩
+        resource = f"data:text/plain;base64,{base64.b64encode(encoded).decode()}"
+
+        self._load_state()
+
+        started = time.perf_counter()
+        workers = max(1, min(self.max_workers, len(targets)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fmg-push") as pool:
+            futures = [
+                pool.submit(
+                    self._push_target,
+                    target,
+                    resource,
+                    content_hash,
+                    ip_count,
+                    len(encoded),
+                    force,
+                    fanout_id,
+                )
+                for target in targets
+            ]
+            for future in futures:
+                result = future.result()
+                summary[result["status"]] += 1
+                summary["results"].append(result)
+
+        summary["ok"] = summary["failed"] == 0
+        summary["duration_ms"] = int((time.perf_counter() - started) * 1000)
+        logger.info(
+            f"📤 Fan-out {fanout_id[:8]}: {summary['success']} pushed, "
+            f"{summary['skipped']} unchanged, {summary['failed']} failed "
+            f"({len(targets)} targets, {ip_count} IPs, {summary['duration_ms']}ms)"
+        )
+        return summary
+
+    def close(self):
+        self.sessions.close()
+
+
+def verify_fanout_against_mocks(db_service=None, instances: int = 3) -> Dict[str, Any]:
+    """mock-fortigate/app.py 를 서로 다른 임시 포트로 여러 개 띄워 fan-out E2E 검증
+
+    db_service 가 없으면 고정 샘플 목록으로 검증 (Postgres 불필요).
+    """
+    import importlib.util
+    from pathlib import Path
+    from werkzeug.serving import make_server
+
+    mock_path = Path(__file__).resolve().parents[3] / "mock-fortigate" / "app.py"
+    mocks, servers = [], []
+    for i in range(instances):
+        # 인스턴스마다 별도 모듈 → 세션/리소스 저장소 분리
+        spec = importlib.util.spec_from_file_location(f"mock_fortigate_app_{i}", mock_path)
+        mock = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mock)
+        server = make_server("127.0.0.1", 0, mock.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        mocks.append(mock)
+        servers.append(server)
+
+    # 닫힌 포트 → 재시도 후 실패해야 하는 대상
+    dead = make_server("127.0.0.1", 0, mocks[0].app)
+    dead_port = dead.server_port
+    dead.server_close()
+
+    service = FortiManagerFanoutService(db_service=db_service)
+    service.record_history = False
+    service._state_loaded = True
+    service.backoff_base = 0.01
+
+    try:
+        targets = [
+            FortiManagerTarget(
+                target=f"127.0.0.1:{server.server_port}",
+                user=mock.ADMIN_USERNAME,
+                password=mock.ADMIN_PASSWORD,
+                scheme="http",
+            )
+            for mock, server in zip(mocks, servers)
+        ]
+        if db_service is not None:
+            effective = service.fetch_effective()
+        else:
+            sample = [f"198.51.100.{i}" for i in range(1, 201)]
+            effective = ("\n".join(sample), len(sample))
+
+        def pushed(mock) -> Optional[str]:
+            resource = mock.external_resources.get(EXTERNAL_RESOURCE_NAME, {}).get("resource")
+            return base64.b64decode(resource.split(",", 1)[1]).decode() if resource else None
+
+        def updates(mock) -> int:
+            return mock.external_resources.get(EXTERNAL_RESOURCE_NAME, {}).get("update_count", 0)
+
+        first = service.push_all(targets, effective=effective)
+        second = service.push_all(targets, effective=effective)
+        forced = service.push_all(targets, force=True, effective=effective)
+
+        # 대상 0: 세션 만료 + 버전 상태 유실 → 그 대상만 재로그인 후 Push
+        mocks[0].sessions.clear()
+        service._state.pop(targets[0].target)
+        partial = service.push_all(targets, effective=effective)
+
+        dead_target = FortiManagerTarget(
+            target=f"127.0.0.1:{dead_port}", user="admin", password="admin", scheme="http"
+        )
+        failed = service.push_all([dead_target], effective=effective)
+
+        checks = {
+            "first_push_all_targets": first["success"] == instances,
+            "content_matches": all(pushed(mock) == effective[0] for mock in mocks),
+            "unchanged_targets_skipped": second["skipped"] == instances,
+            "sessions_reused": all(len(mock.sessions) == 1 for mock in mocks[1:]),
+            "only_stale_target_pushed": partial["success"] == 1
+            and partial["results"][0]["status"] == "success",
+            "relogin_after_expiry": len(mocks[0].sessions) == 1 and updates(mocks[0]) == 3,
+            "upload_counts": [updates(mock) for mock in mocks[1:]] == [2] * (instances - 1),
+            "retries_exhausted_on_dead_target": failed["failed"] == 1
+            and failed["results"][0]["attempts"] == service.max_attempts,
+        }
+        return {
+            "ok": all(checks.values()),
+            "checks": checks,
+            "instances": instances,
+            "ip_count": effective[1],
+            "fanout_ms": {
+                "first": first["duration_ms"],
+                "forced": forced["duration_ms"],
+                "dead_target": failed["duration_ms"],
+            },
+        }
+    finally:
+        service.close()
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+
+    try:
+        from .database_service import DatabaseService
+
+        db_service = DatabaseService()
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to initialize DatabaseService: {e}")
+        db_service = None
+
+    if "--verify-mock" in sys.argv:
+        import json
+
+        report = verify_fanout_against_mocks(db_service=db_service)
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report["ok"] else 1)
+
+    if db_service is None:
+        sys.exit(1)
+
+    service = FortiManagerFanoutService(db_service=db_service)
+    try:
+        outcome = service.push_all(force="--force" in sys.argv)
+    finally:
+        service.close()
+    sys.exit(0 if outcome["ok"] else 1)
@@ -2,24 +2,64 @@
 FortiManager Push Service (Real-time)
 
 Purpose:
-    - PostgreSQL NOTIFY/LISTEN으로 blacklist 변경 감지
-    - 변경 시 즉시 FortiManager에 Push
+    - PostgreSQL NOTIFY/LISTEN으로 blacklist 변경 감지 (migration 009 트리거)
+    - 연속된 알림은 debounce 후 한 번의 Push로 병합 (최대 지연 상한 있음)
+    - 유효 블랙리스트(활성 - 화이트리스트)를 Postgres에서 직접 조회
+    - 내용 해시(sha256)가 마지막 Push와 같으면 업로드 생략
+    - Push 실패 시 대기 상태를 되살려 지수 backoff(상한 FMG_PUSH_RETRY_MAX)로 재시도
     - Cron 없이 실시간 동기화
 
 Usage:
-    python -m core.services.fortimanager_push_service
+    python -m core.services.fortimanager_push_service            # LISTEN 루프
+    python -m core.services.fortimanager_push_service --once     # 1회 동기화 (--force: 해시 무시)
+    python -m core.services.fortimanager_push_service --verify-mock  # mock-fortigate 대상 E2E 검증
 """
 
 import os
+import sys
 import time
+import base64
+import hashlib
 import requests
 import psycopg2
 import select
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+EXTERNAL_RESOURCE_NAME = "NXTD-Blacklist-Hosted"
+
+# 유효 블랙리스트: 중복 제거 + 정렬 → 같은 내용이면 같은 해시
+EFFECTIVE_LIST_SQL = """
+    SELECT COUNT(*) AS ip_count,
+           COALESCE(string_agg(ip_address, E'\\n' ORDER BY ip_address), '') AS ip_list
+    FROM (
+        SELECT DISTINCT b.ip_address
+        FROM blacklist_ips b
+        WHERE b.is_active = true
+          AND NOT EXISTS (
+              SELECT 1 FROM whitelist_ips w WHERE w.ip_address = b.ip_address
+          )
+    ) effective
+"""
+
+
+def _record_push_metrics(target: str, result: str, duration: float, payload_bytes: int):
+    try:
+        from ..monitoring.metrics import (
+            fortimanager_push_duration_seconds,
+            fortimanager_push_payload_bytes,
+            fortimanager_push_total,
+        )
+
+        fortimanager_push_total.labels(target=target, result=result).inc()
+        fortimanager_push_duration_seconds.labels(target=target).observe(duration)
+        if result == "success":
+            fortimanager_push_payload_bytes.labels(target=target).observe(payload_bytes)
+    except Exception as e:
+        logger.debug(f"push metrics unavailable: {e}")
+
 
 class FortiManagerPushService:
     """FortiManager 실시간 Push 서비스"""
@@ -33,22 +73,47 @@ def __init__(self, db_service=None):
 
         Note:
             This service maintains a separate persistent connection (self.db_conn)
-            for PostgreSQL LISTEN/NOTIFY functionality. The db_service is available
-            for any other database queries needed in the future.
+            for PostgreSQL LISTEN/NOTIFY functionality. The effective blacklist
+            and the push log go through db_service (pooled connections).
         """
         self.db_service = db_service
         self.fmg_host = os.getenv("FMG_HOST")
+        self.fmg_scheme = os.getenv("FMG_SCHEME", "https")
         self.fmg_user = os.getenv("FMG_USER", "admin")
         self.fmg_pass = os.getenv("FMG_PASS")
         self.fmg_adom = os.getenv("FMG_ADOM", "root")
-        self.api_url = os.getenv(
-            "API_URL", "http://localhost:443/api/fortinet/threat-feed?format=text"
-        )
+        self.verify_ssl = os.getenv("FMG_VERIFY_SSL", "false").lower() == "true"
+
+        # 마지막 알림 후 조용한 구간(초) / 첫 알림 후 최대 대기(초)
+        self.debounce_seconds = float(os.getenv("FMG_PUSH_DEBOUNCE", "5"))
+        self.max_delay_seconds = float(os.getenv("FMG_PUSH_MAX_DELAY", "60"))
+        # 실패 후 재시도 간격: base * 2^(연속 실패-1), 상한 max (초)
+        self.retry_base_seconds = float(os.getenv("FMG_PUSH_RETRY_BASE", "10"))
+        self.retry_max_seconds = float(os.getenv("FMG_PUSH_RETRY_MAX", "300"))
+        self.record_history = True
+
+        # fortigate_devices 전체 대상 동시 Push (fortimanager_fanout_service)
+        self.fanout = None
+        if os.getenv("FMG_FANOUT_ENABLED", "false").lower() == "true" and db_service:
+            from .fortimanager_fanout_service import FortiManagerFanoutService
+
+            self.fanout = FortiManagerFanoutService(db_service=db_service)
 
         self.session_id: Optional[str] = None
+        self.http = requests.Session()  # keep-alive
         # Persistent connection for PostgreSQL LISTEN/NOTIFY (required for real-time notifications)
         self.db_conn = None
-        self.last_update = time.time()
+
+        self.last_pushed_hash: Optional[str] = None
+        self._pending_notifications = 0
+        self._first_notified_at: Optional[float] = None
+        self._last_notified_at: Optional[float] = None
+        self._consecutive_failures = 0
+        self._retry_at: Optional[float] = None
+
+    @property
+    def jsonrpc_url(self) -> str:
+        return f"{self.fmg_scheme}://{self.fmg_host}/jsonrpc"
 
     def connect_database(self):
         """
@@ -84,7 +149,6 @@ def login_fortimanager(self) -> bool:
             logger.error("FMG_HOST or FMG_PASS not configured")
             return False
 
-        url = f"https://{self.fmg_host}/jsonrpc"
         payload = {
             "method": "exec",
             "params": [
@@ -97,7 +161,9 @@ def login_fortimanager(self) -> bool:
         }
 
         try:
-            response = requests.post(url, json=payload, verify=False, timeout=10)
+            response = self.http.post(
+                self.jsonrpc_url, json=payload, verify=self.verify_ssl, timeout=10
+            )
             result = response.json()
 
             if result.get("result", [{}])[0].get("status", {}).get("code") == 0:
@@ -113,33 +179,39 @@ def login_fortimanager(self) -> bool:
             logger.error(f"❌ Login error: {e}")
             return False
 
-    def fetch_blacklist(self) -> Optional[str]:
-        """Flask API에서 블랙리스트 가져오기"""
+    def fetch_blacklist(self) -> Optional[Tuple[str, int]]:
+        """유효 블랙리스트 조회 (Postgres 직접, 단일 행으로 집계)
+
+        Returns:
+            (개행 구분 IP 목록, IP 수) 또는 조회 실패 시 None
+        """
         try:
-            response = requests.get(self.api_url, timeout=10)
-            if response.status_code == 200:
-                ip_list = response.text.strip()
-                ip_count = len(ip_list.split("\n"))
-                logger.info(f"✅ Fetched {ip_count} IPs from API")
-                return ip_list
+            if self.db_service:
+                rows = self.db_service.query(EFFECTIVE_LIST_SQL)
+                if not rows:
+                    logger.error("❌ Effective blacklist query returned no rows")
+                    return None
+                row = rows[0]
+                ip_list, ip_count = row["ip_list"], row["ip_count"]
             else:
-                logger.error(f"❌ API error: {response.status_code}")
-                return None
+                cursor = self.db_conn.cursor()
+                cursor.execute(EFFECTIVE_LIST_SQL)
+                ip_count, ip_list = cursor.fetchone()
+                cursor.close()
+
+            logger.info(f"✅ Fetched {ip_count} IPs from database")
+            return ip_list, int(ip_count)
         except Exception as e:
-            logger.error(f"❌ API fetch error: {e}")
+            logger.error(f"❌ Blacklist fetch error: {e}")
             return None
 
-    def upload_to_fortimanager(self, ip_list: str) -> bool:
+    def upload_to_fortimanager(self, ip_list: str, _retried: bool = False) -> bool:
         """FortiManager Hosted Resource 업데이트"""
         if not self.session_id:
             if not self.login_fortimanager():
                 return False
 
-        url = f"https://{self.fmg_host}/jsonrpc"
-
         # Base64 인코딩
-        import base64
-
         file_content = base64.b64encode(ip_list.encode()).decode()
 
         # Update External Resource
@@ -147,7 +219,7 @@ def upload_to_fortimanager(self, ip_list: str) -> bool:
             "method": "update",
             "params": [
                 {
-                    "url": f"/pm/config/adom/{self.fmg_adom}/obj/system/external-resource/NXTD-Blacklist-Hosted",
+                    "url": f"/pm/config/adom/{self.fmg_adom}/obj/system/external-resource/{EXTERNAL_RESOURCE_NAME}",
                     "data": {
                         "resource": f"data:text/plain;base64,{file_content}",
                         "comments": f"Auto-updated by Push Service - {time.strftime('%Y-%m-%d %H:%M:%S')}",
@@ -159,7 +231,9 @@ def upload_to_fortimanager(self, ip_list: str) -> bool:
         }
 
         try:
-            response = requests.post(url, json=payload, verify=False, timeout=10)
+            response = self.http.post(
+                self.jsonrpc_url, json=payload, verify=self.verify_ssl, timeout=30
+            )
             result = response.json()
 
             status_code = result.get("result", [{}])[0].get("status", {}).get("code")
@@ -169,36 +243,175 @@ def upload_to_fortimanager(self, ip_list: str) -> bool:
                 return True
             else:
                 logger.error(f"❌ Update failed: {result}")
-                # Session expired? Try re-login
-                if status_code == -11:
+                # Session expired? Re-login once
+                if status_code in (-10, -11) and not _retried:
                     self.session_id = None
-                    return self.upload_to_fortimanager(ip_list)
+                    return self.upload_to_fortimanager(ip_list, _retried=True)
                 return False
         except Exception as e:
             logger.error(f"❌ Upload error: {e}")
             return False
 
+    def load_last_pushed_hash(self) -> Optional[str]:
+        """마지막 성공 Push의 내용 해시 (재시작 후 불필요한 재업로드 방지)"""
+        if not self.db_service:
+            return None
+        rows = self.db_service.query(
+            """
+            SELECT content_hash FROM fortimanager_push_logs
+            WHERE target = %s AND status = 'success'
+            ORDER BY created_at DESC LIMIT 1
+            """,
+            (self.fmg_host,),
+        )
+        self.last_pushed_hash = rows[0]["content_hash"] if rows else None
+        return self.last_pushed_hash
+
+    def _record_push(self, result: Dict[str, Any], duration: float):
+        _record_push_metrics(
+            self.fmg_host or "unknown", result["status"], duration, result["payload_bytes"]
+        )
+        if not (self.record_history and self.db_service):
+            return
+        try:
+            self.db_service.execute(
+                """
+                INSERT INTO fortimanager_push_logs
+                (target, status, content_hash, ip_count, payload_bytes,
+                 notifications, response_time_ms, error_message)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                (
+                    self.fmg_host,
+                    result["status"],
+                    result["content_hash"],
+                    result["ip_count"],
+                    result["payload_bytes"],
+                    result["notifications"],
+                    result["duration_ms"],
+                    result.get("error"),
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record push log: {e}")
+
+    def push_once(self, force: bool = False, notifications: int = 0) -> Dict[str, Any]:
+        """현재 유효 블랙리스트를 1회 동기화
+
+        Args:
+            force: 내용 해시가 같아도 업로드
+            notifications: 이번 Push로 병합된 NOTIFY 수 (로그용)
+        """
+        started = time.perf_counter()
+        result: Dict[str, Any] = {
+            "status": "failed",
+            "content_hash": None,
+            "ip_count": 0,
+            "payload_bytes": 0,
+            "notifications": notifications,
+        }
+
+        fetched = self.fetch_blacklist()
+        if fetched is None:
+            result["error"] = "effective blacklist query failed"
+        else:
+            ip_list, result["ip_count"] = fetched
+            result["payload_bytes"] = len(ip_list.encode())
+            result["content_hash"] = hashlib.sha256(ip_list.encode()).hexdigest()
+
+            if self.fanout is not None:
+                # 같은 조회 결과 재사용, 대상별 버전 비교는 fan-out 쪽에서
+                try:
+                    result["fanout"] = self.fanout.push_all(force=force, effective=fetched)
+                except Exception as e:
+                    logger.error(f"❌ Fan-out push error: {e}")
+
+                if not self.fmg_host:
+                    # 단일 FMG_HOST 없이 fan-out 대상만 사용 (대상별 로그는 fan-out이 기록)
+                    result["status"] = "success" if result.get("fanout", {}).get("ok") else "failed"
+                    result["duration_ms"] = int((time.perf_counter() - started) * 1000)
+                    result["success"] = result["status"] != "failed"
+                    return result
+
+            if not force and result["content_hash"] == self.last_pushed_hash:
+                result["status"] = "skipped"
+                logger.info(
+                    f"⏭️ Blacklist unchanged ({result['ip_count']} IPs) - push skipped"
+                )
+            elif self.upload_to_fortimanager(ip_list):
+                result["status"] = "success"
+                self.last_pushed_hash = result["content_hash"]
+            else:
+                result["error"] = "FortiManager upload failed"
+
+        duration = time.perf_counter() - started
+        result["duration_ms"] = int(duration * 1000)
+        result["success"] = result["status"] != "failed"
+        self._record_push(result, duration)
+        return result
+
     def handle_change_notification(self, payload: str):
-        """DB 변경 알림 처리
+        """DB 변경 알림 처리 (즉시 Push하지 않고 대기열에 병합)
 
         Note: INSERT/UPDATE/DELETE 모두 전체 재동기화 방식
               - 삭제된 IP도 자동으로 FortiManager에서 제거됨
+              - 알림이 이어지는 동안은 debounce, 첫 알림 후 max_delay 내 반드시 Push
         """
-        logger.info(f"🔔 Database change detected: {payload}")
+        logger.debug(f"🔔 Database change detected: {payload}")
+
+        now = time.monotonic()
+        if self._first_notified_at is None:
+            self._first_notified_at = now
+        self._last_notified_at = now
+        self._pending_notifications += 1
 
-        # Rate limiting (1분에 1번만)
-        now = time.time()
-        if now - self.last_update < 60:
-            logger.info("⏳ Rate limited (wait 60s)")
+    def _push_deadline(self) -> Optional[float]:
+        """대기 중인 알림의 Push 시각 (monotonic), 없으면 None"""
+        if not self._pending_notifications:
+            return None
+        deadline = min(
+            self._last_notified_at + self.debounce_seconds,
+            self._first_notified_at + self.max_delay_seconds,
+        )
+        if self._retry_at is not None:
+            # 실패 직후에는 새 알림이 와도 backoff 가 끝날 때까지 대기
+            deadline = max(deadline, self._retry_at)
+        return deadline
+
+    def _after_push(self, result: Dict[str, Any], notifications: int):
+        """Push 결과 반영: 실패하면 대기 상태를 되살려 backoff 후 재시도"""
+        if result["status"] != "failed":
+            self._consecutive_failures = 0
+            self._retry_at = None
             return
 
-        self.last_update = now
+        self._consecutive_failures += 1
+        delay = min(
+            self.retry_max_seconds,
+            self.retry_base_seconds * 2 ** (self._consecutive_failures - 1),
+        )
+        now = time.monotonic()
+        self._retry_at = now + delay
+        self._pending_notifications += max(1, notifications)
+        if self._first_notified_at is None:
+            self._first_notified_at = now
+        self._last_notified_at = self._last_notified_at or now
+        logger.warning(
+            f"⚠️ Push failed ({self._consecutive_failures} in a row): "
+            f"{result.get('error', 'unknown error')} - retry in {delay:.0f}s"
+        )
 
-        # Fetch CURRENT state and Upload
-        # 현재 DB 상태를 전체 동기화 (삭제된 IP는 자동으로 제외됨)
-        ip_list = self.fetch_blacklist()
-        if ip_list:
-            self.upload_to_fortimanager(ip_list)
+    def flush_pending(self) -> Dict[str, Any]:
+        """병합된 알림을 한 번의 Push로 처리"""
+        notifications = self._pending_notifications
+        self._pending_notifications = 0
+        self._first_notified_at = None
+        self._last_notified_at = None
+
+        logger.info(f"🔔 {notifications} change notification(s) coalesced → push")
+        result = self.push_once(notifications=notifications)
+        self._after_push(result, notifications)
+        return result
 
     def run(self):
         """메인 루프"""
@@ -210,19 +423,30 @@ def run(self):
         # FortiManager 로그인
         self.login_fortimanager()
 
+        # 중단 중 놓친 변경 반영 (내용이 같으면 skip)
+        try:
+            self.load_last_pushed_hash()
+        except Exception as e:
+            logger.warning(f"Failed to load last pushed hash: {e}")
+        self._after_push(self.push_once(), 0)
+
         logger.info("👂 Listening for database changes...")
 
         try:
             while True:
-                # Wait for notifications (timeout 30s)
-                if select.select([self.db_conn], [], [], 30) == ([], [], []):
-                    # No notification, check connection
-                    continue
+                deadline = self._push_deadline()
+                timeout = 30 if deadline is None else max(0.0, deadline - time.monotonic())
 
-                self.db_conn.poll()
-                while self.db_conn.notifies:
-                    notify = self.db_conn.notifies.pop(0)
-                    self.handle_change_notification(notify.payload)
+                # Wait for notifications (or the pending push deadline)
+                if select.select([self.db_conn], [], [], timeout) != ([], [], []):
+                    self.db_conn.poll()
+                    while self.db_conn.notifies:
+                        notify = self.db_conn.notifies.pop(0)
+                        self.handle_change_notification(notify.payload)
+
+                deadline = self._push_deadline()
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.flush_pending()
 
         except KeyboardInterrupt:
             logger.info("Shutting down...")
@@ -231,6 +455,67 @@ def run(self):
                 self.db_conn.close()
 
 
+def verify_push_against_mock(db_service=None) -> Dict[str, Any]:
+    """mock-fortigate/app.py 를 임시 포트로 띄워 Push 파이프라인 E2E 검증
+
+    1) 첫 Push → 업로드 성공, mock에 저장된 resource 디코드 == DB 유효 목록
+    2) 같은 내용 재Push → skipped (업로드 횟수 1 유지)
+    3) 알림 3건 병합 → flush 1회 (notifications=3)
+    """
+    import importlib.util
+    import threading
+    from pathlib import Path
+    from werkzeug.serving import make_server
+
+    mock_path = Path(__file__).resolve().parents[3] / "mock-fortigate" / "app.py"
+    spec = importlib.util.spec_from_file_location("mock_fortigate_app", mock_path)
+    mock = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mock)
+
+    server = make_server("127.0.0.1", 0, mock.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        service = FortiManagerPushService(db_service=db_service)
+        service.fmg_host = f"127.0.0.1:{server.server_port}"
+        service.fmg_scheme = "http"
+        service.fmg_user = mock.ADMIN_USERNAME
+        service.fmg_pass = mock.ADMIN_PASSWORD
+        service.record_history = False
+        if db_service is None:
+            service.connect_database()
+
+        first = service.push_once()
+        resource = mock.external_resources.get(EXTERNAL_RESOURCE_NAME, {})
+        encoded = resource.get("resource", "").split(",", 1)[-1]
+        pushed = base64.b64decode(encoded).decode() if encoded else None
+        expected = service.fetch_blacklist()
+
+        second = service.push_once()
+
+        for _ in range(3):
+            service.handle_change_notification('{"table": "blacklist_ips", "op": "INSERT"}')
+        coalesced = service.flush_pending()
+
+        checks = {
+            "first_push_success": first["status"] == "success",
+            "resource_matches_db": expected is not None and pushed == expected[0],
+            "unchanged_push_skipped": second["status"] == "skipped",
+            "single_upload": mock.external_resources[EXTERNAL_RESOURCE_NAME].get("update_count") == 1,
+            "notifications_coalesced": coalesced["notifications"] == 3
+            and coalesced["status"] == "skipped",
+        }
+        return {
+            "ok": all(checks.values()),
+            "checks": checks,
+            "ip_count": first["ip_count"],
+            "payload_bytes": first["payload_bytes"],
+            "push_ms": first["duration_ms"],
+        }
+    finally:
+        server.shutdown()
+
+
 if __name__ == "__main__":
     logging.basicConfig(
         level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
@@ -246,7 +531,25 @@ def run(self):
         logger.warning(f"⚠️ Failed to initialize DatabaseService: {e}")
         db_service = None
 
+    if "--verify-mock" in sys.argv:
+        import json
+
+        report = verify_push_against_mock(db_service=db_service)
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report["ok"] else 1)
+
     service = FortiManagerPushService(db_service=db_service)
+    if "--once" in sys.argv:
+        if db_service is None:
+            service.connect_database()
+        else:
+            try:
+                service.load_last_pushed_hash()
+            except Exception as e:
+                logger.warning(f"Failed to load last pushed hash: {e}")
+        outcome = service.push_once(force="--force" in sys.argv)
+        sys.exit(0 if outcome["success"] else 1)
+
     service.run()
 
 from flask import current_app
@@ -9,6 +9,10 @@
 from datetime import datetime
 from psycopg2.extras import RealDictCursor
 
+from ..utils.db_json import join_docs
+from ..utils.fast_json import raw_json
+from ..utils.ip_search import clamp_limit, search_predicate
+
 logger = logging.getLogger(__name__)
 
 
@@ -98,27 +102,28 @@ def get_unified_statistics(self) -> Dict[str, Any]:
             }
 
     def search_ips(self, query: str, limit: int = 100) -> Dict[str, Any]:
-        """IP 검색 - 최적화된 인덱스 활용"""
+        """IP 검색 - 검색어 유형별 인덱스 조건 (core.utils.ip_search)"""
         conn = None
         try:
+            where_sql, params, match_type = search_predicate(query)
+            limit = clamp_limit(limit)
+
             conn = self.db.get_connection()
             cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-            # IP 검색 최적화 (인덱스 활용)
+            # 정확/CIDR/접두사 → btree, 부분 일치 → pg_trgm GIN (LIMIT 는 SQL 에서 적용)
             cursor.execute(
-                """
+                f"""
                 SELECT
                     ip_address, source, reason, confidence_level,
                     detection_count, is_active, country,
                     detection_date, last_seen, created_at
                 FROM blacklist_ips_with_auto_inactive
-                WHERE ip_address ILIKE %s
-                   OR source ILIKE %s
-                   OR country ILIKE %s
+                WHERE {where_sql}
                 ORDER BY detection_count DESC, last_seen DESC
                 LIMIT %s
             """,
-                (f"%{query}%", f"%{query}%", f"%{query}%", limit),
+                params + [limit],
             )
 
             results = cursor.fetchall()
@@ -130,6 +135,8 @@ def search_ips(self, query: str, limit: int = 100) -> Dict[str, Any]:
                 "results": [dict(row) for row in results],
                 "count": len(results),
                 "query": query,
+                "match_type": match_type,
+                "limit": limit,
                 "timestamp": datetime.now().isoformat(),
             }
 
@@ -145,65 +152,69 @@ def search_ips(self, query: str, limit: int = 100) -> Dict[str, Any]:
             }
 
     def get_active_blacklist(self, format_type: str = "json") -> Dict[str, Any]:
-        """활성 블랙리스트 조회 - 형식별 최적화"""
+        """
+        활성 블랙리스트 조회 - 형식별 최적화
+
+        json 형식은 PostgreSQL 이 행 JSON 을 만들고 (json_build_object),
+        "blacklist" 에 raw_json() 으로 파싱 없이 삽입한다 → fast_json.json_response() 로 응답.
+        """
         conn = None
         try:
             conn = self.db.get_connection()
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-            if format_type == "plain":
-                # 단순 IP 리스트만
-                cursor.execute("""
-                    SELECT ip_address
-                    FROM blacklist_ips_with_auto_inactive
-                    WHERE is_active = true
-                    ORDER BY ip_address
-                """)
-                ips = [row["ip_address"] for row in cursor.fetchall()]
-
-                cursor.close()
-                self.db.return_connection(conn)
-
-                return {
-                    "success": True,
-                    "ips": ips,
-                    "count": len(ips),
-                    "format": "plain",
-                    "timestamp": datetime.now().isoformat(),
-                }
-            else:
-                # 전체 정보
+            cursor = conn.cursor()
+            try:
+                if format_type == "plain":
+                    # 단순 IP 리스트만
+                    cursor.execute("""
+                        SELECT ip_address
+                        FROM blacklist_ips_with_auto_inactive
+                        WHERE is_active = true
+                        ORDER BY ip_address
+                    """)
+                    ips = [row[0] for row in cursor.fetchall()]
+
+                    return {
+                        "success": True,
+                        "ips": ips,
+                        "count": len(ips),
+                        "format": "plain",
+                        "timestamp": datetime.now().isoformat(),
+                    }
+
+                # 전체 정보 - DB 측 JSON
                 cursor.execute("""
-                    SELECT
-                        ip_address, source, reason, confidence_level,
-                        detection_count, country, detection_date, last_seen
+                    SELECT json_build_object(
+                               'ip_address', ip_address, 'source', source, 'reason', reason,
+                               'confidence_level', confidence_level, 'detection_count', detection_count,
+                               'country', country, 'detection_date', detection_date, 'last_seen', last_seen
+                           )::text AS doc
                     FROM blacklist_ips_with_auto_inactive
                     WHERE is_active = true
                     ORDER BY detection_count DESC, last_seen DESC
                 """)
-
-                results = cursor.fetchall()
-                cursor.close()
-                self.db.return_connection(conn)
+                docs = [row[0] for row in cursor.fetchall()]
 
                 return {
                     "success": True,
-                    "blacklist": [dict(row) for row in results],
-                    "count": len(results),
+                    "blacklist": raw_json(join_docs(docs)),
+                    "count": len(docs),
                     "format": "json",
                     "timestamp": datetime.now().isoformat(),
                 }
+            finally:
+                cursor.close()
 
         except Exception as e:
             logger.error(f"활성 블랙리스트 조회 실패: {e}")
-            if conn:
-                self.db.return_connection(conn)
             return {
                 "success": False,
                 "error": str(e),
                 "format": format_type,
                 "timestamp": datetime.now().isoformat(),
             }
+        finally:
+            if conn:
+                self.db.return_connection(conn)
 
     def get_collection_status(self) -> Dict[str, Any]:
         """수집 상태 조회 - 최적화된 단일 쿼리"""
@@ -0,0 +1,320 @@
+"""
+이력/로그 테이블 파티션 관리
+collection_history, monitoring_data, system_logs, pipeline_metrics,
+fortigate_pull_logs, fortinet_pull_logs 의 일/월 RANGE 파티션을 관리한다.
+
+- 파티션 정의/보존 기간: partition_config 테이블 (postgres/migrations/012_partitioned_log_tables.sql)
+- maintain(): 미래 파티션 미리 생성 + 보존 기간 지난 파티션 DETACH/DROP (스케줄러에서 주기 실행)
+- convert_online(): 대용량 기존 테이블을 쓰기 중단 없이 파티션 테이블로 전환
+
+Usage:
+    python -m core.services.partition_manager              # maintain
+    python -m core.services.partition_manager --status
+    python -m core.services.partition_manager --convert system_logs
+"""
+
+import sys
+import time
+import logging
+from typing import Any, Dict, List
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+# 전환 마지막 단계(이름 교체)의 ACCESS EXCLUSIVE 잠금 대기 상한 / 재시도
+SWAP_LOCK_TIMEOUT = "5s"
+SWAP_RETRIES = 5
+
+
+class PartitionManager:
+    """RANGE 파티션 생성/삭제 및 온라인 전환"""
+
+    def __init__(self, db_service=None):
+        """
+        Initialize partition manager
+
+        Args:
+            db_service: DatabaseService instance for connection pool access
+        """
+        self.db_service = db_service
+
+    def _call(self, query: str, params=None) -> List[Dict[str, Any]]:
+        """DDL 을 실행하는 파티션 함수 호출 (결과 반환 후 커밋)"""
+        conn = self.db_service.get_connection()
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(query, params)
+            rows = [dict(row) for row in cursor.fetchall()]
+            conn.commit()
+            cursor.close()
+            return rows
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_service.return_connection(conn)
+
+    def is_partitioned(self, table: str) -> bool:
+        rows = self.db_service.query(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)) AS partitioned",
+            (table,),
+        )
+        return bool(rows and rows[0]["partitioned"])
+
+    def maintain(self) -> Dict[str, Any]:
+        """전환된 모든 테이블: 미래 파티션 생성 + 만료 파티션 삭제"""
+        try:
+            started = time.monotonic()
+            rows = self._call("SELECT relation, created, dropped FROM partition_maintain()")
+            created = sum(row["created"] for row in rows)
+            dropped = sum(row["dropped"] for row in rows)
+            if created or dropped:
+                logger.info(
+                    f"🗂️ 파티션 관리: {created}개 생성, {dropped}개 삭제 "
+                    f"({(time.monotonic() - started) * 1000:.0f}ms) {rows}"
+                )
+            return {"success": True, "created": created, "dropped": dropped, "tables": rows}
+        except Exception as e:
+            logger.error(f"파티션 관리 실패: {e}")
+            return {"success": False, "error": str(e), "created": 0, "dropped": 0}
+
+    def drop_expired(self, table: str) -> List[Dict[str, Any]]:
+        """보존 기간이 지난 파티션 DETACH + DROP → [{dropped_partition, upper_bound}]"""
+        return self._call(
+            "SELECT dropped_partition, upper_bound FROM partition_drop_expired(%s)", (table,)
+        )
+
+    def status(self) -> List[Dict[str, Any]]:
+        """테이블별 설정 + 파티션 목록 (범위, 크기)"""
+        tables = self.db_service.query(
+            """
+            SELECT table_name, partition_column, granularity, retention::text AS retention,
+                   premake, legacy_until, converted_at
+            FROM partition_config ORDER BY table_name
+            """
+        )
+        partitions = self.db_service.query(
+            """
+            SELECT p.relname::text AS parent, c.relname::text AS partition,
+                   pg_get_expr(c.relpartbound, c.oid) AS bound,
+                   pg_total_relation_size(c.oid) AS bytes,
+                   c.reltuples::bigint AS approx_rows
+            FROM partition_config pc
+            JOIN pg_inherits i ON i.inhparent = to_regclass(pc.table_name)
+            JOIN pg_class p ON p.oid = i.inhparent
+            JOIN pg_class c ON c.oid = i.inhrelid
+            ORDER BY c.relname
+            """
+        )
+        for table in tables:
+            table["partitions"] = [
+                {k: v for k, v in part.items() if k != "parent"}
+                for part in partitions
+                if part["parent"] == table["table_name"]
+            ]
+        return tables
+
+    # ------------------------------------------------------------------
+    # Online conversion
+    # ------------------------------------------------------------------
+    def convert_online(self, table: str) -> str:
+        """기존 테이블을 쓰기 중단 없이 파티션 테이블로 전환
+
+        partition_convert() 가 잠금 상태에서 스캔/인덱스 생성을 하지 않도록
+        필요한 제약/인덱스를 먼저 온라인으로 준비한다.
+          1. CHECK (<col> IS NOT NULL AND <col> < legacy_until) NOT VALID
+             → NULL 키 보정 → VALIDATE (SHARE UPDATE EXCLUSIVE, 쓰기 허용)
+          2. PK 에 파티션 키가 없으면 (pk..., <col>) UNIQUE 인덱스를 CONCURRENTLY 생성
+          3. partition_convert(): 이름 교체 + ATTACH (카탈로그 변경만, lock_timeout 재시도)
+        """
+        conn = self.db_service.create_raw_connection()
+        conn.autocommit = True
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT partition_column, granularity, legacy_until FROM partition_config WHERE table_name = %s",
+                (table,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"partition_config has no entry for {table}")
+            column, granularity, legacy_until = row
+
+            cursor.execute(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+                (table,),
+            )
+            if cursor.fetchone()[0]:
+                return f"{table}: already partitioned"
+
+            try:
+                return self._prepare_and_swap(cursor, table, column, granularity, legacy_until)
+            except Exception:
+                # 전환 실패/중단 시 비분할 테이블에 경계 CHECK 가 남으면 legacy_until 이후 INSERT 가 모두 거부됨
+                self._release_bound(cursor, table)
+                raise
+        finally:
+            conn.close()
+
+    def _release_bound(self, cursor, table: str):
+        """전환되지 않은 테이블의 파티션 경계 CHECK 제거 + legacy_until 초기화 (다음 전환 때 다시 계산)"""
+        try:
+            cursor.execute(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+                (table,),
+            )
+            if cursor.fetchone()[0]:
+                return
+            cursor.execute("SET lock_timeout = %s", (SWAP_LOCK_TIMEOUT,))
+            for attempt in range(1, SWAP_RETRIES + 1):
+                try:
+                    cursor.execute(
+                        sql.SQL("ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {bound}").format(
+                            table=sql.Identifier(table), bound=sql.Identifier(f"{table}_partition_bound")
+                        )
+                    )
+                    break
+                except psycopg2.errors.LockNotAvailable:
+                    if attempt == SWAP_RETRIES:
+                        raise
+                    time.sleep(attempt)
+            cursor.execute("RESET lock_timeout")
+            cursor.execute(
+                "UPDATE partition_config SET legacy_until = NULL, updated_at = CURRENT_TIMESTAMP WHERE table_name = %s",
+                (table,),
+            )
+            logger.warning(f"{table}: conversion failed, partition bound removed")
+        except Exception as e:
+            logger.error(f"{table}: failed to remove partition bound after failed conversion: {e}")
+
+    def _prepare_and_swap(self, cursor, table: str, column: str, granularity: str, legacy_until) -> str:
+        """convert_online 1~3 단계 (autocommit 연결의 cursor)"""
+        table_id, column_id = sql.Identifier(table), sql.Identifier(column)
+        bound = f"{table}_partition_bound"
+        cursor.execute(
+            "SELECT convalidated FROM pg_constraint WHERE conrelid = to_regclass(%s) AND conname = %s",
+            (table, bound),
+        )
+        bound_row = cursor.fetchone()
+
+        # 1. 파티션 경계 CHECK
+        if bound_row is None or legacy_until is None:
+            cursor.execute(
+                sql.SQL(
+                    "SELECT date_trunc(%s, GREATEST(LOCALTIMESTAMP, COALESCE(max({col}), LOCALTIMESTAMP))) "
+                    "+ 2 * (%s)::interval FROM {table}"
+                ).format(col=column_id, table=table_id),
+                (granularity, f"1 {granularity}"),
+            )
+            legacy_until = cursor.fetchone()[0]
+            cursor.execute(
+                "UPDATE partition_config SET legacy_until = %s, updated_at = CURRENT_TIMESTAMP WHERE table_name = %s",
+                (legacy_until, table),
+            )
+            cursor.execute("SET lock_timeout = %s", (SWAP_LOCK_TIMEOUT,))
+            if bound_row is not None:
+                cursor.execute(
+                    sql.SQL("ALTER TABLE {table} DROP CONSTRAINT {bound}").format(
+                        table=table_id, bound=sql.Identifier(bound)
+                    )
+                )
+            cursor.execute(
+                sql.SQL(
+                    "ALTER TABLE {table} ADD CONSTRAINT {bound} "
+                    "CHECK ({col} IS NOT NULL AND {col} < %s) NOT VALID"
+                ).format(table=table_id, bound=sql.Identifier(bound), col=column_id),
+                (legacy_until,),
+            )
+            cursor.execute("RESET lock_timeout")
+            bound_row = (False,)
+            logger.info(f"{table}: legacy partition bound < {legacy_until}")
+
+        if not bound_row[0]:
+            cursor.execute(
+                sql.SQL("UPDATE {table} SET {col} = '-infinity' WHERE {col} IS NULL").format(
+                    table=table_id, col=column_id
+                )
+            )
+            if cursor.rowcount:
+                logger.info(f"{table}: {cursor.rowcount} rows with NULL {column} → -infinity")
+            cursor.execute(
+                sql.SQL("ALTER TABLE {table} VALIDATE CONSTRAINT {bound}").format(
+                    table=table_id, bound=sql.Identifier(bound)
+                )
+            )
+            logger.info(f"{table}: {bound} validated")
+
+        # 2. 파티션 키를 포함한 PK 인덱스
+        cursor.execute(
+            """
+            SELECT array_agg(a.attname::text ORDER BY k.ord)
+            FROM pg_constraint c
+            CROSS JOIN LATERAL unnest(c.conkey) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+            WHERE c.conrelid = to_regclass(%s) AND c.contype = 'p'
+            """,
+            (table,),
+        )
+        pk_cols = cursor.fetchone()[0]
+        if pk_cols and column not in pk_cols:
+            index = f"{table}_pkey_part"
+            cursor.execute(
+                "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", (index,)
+            )
+            index_row = cursor.fetchone()
+            if index_row is not None and not index_row[0]:
+                # 중단된 CONCURRENTLY 빌드의 잔재
+                cursor.execute(
+                    sql.SQL("DROP INDEX CONCURRENTLY {index}").format(index=sql.Identifier(index))
+                )
+                index_row = None
+            if index_row is None:
+                started = time.monotonic()
+                cursor.execute(
+                    sql.SQL("CREATE UNIQUE INDEX CONCURRENTLY {index} ON {table} ({cols})").format(
+                        index=sql.Identifier(index),
+                        table=table_id,
+                        cols=sql.SQL(", ").join(sql.Identifier(c) for c in pk_cols + [column]),
+                    )
+                )
+                logger.info(f"{table}: {index} built in {time.monotonic() - started:.1f}s")
+
+        # 3. 이름 교체 + ATTACH
+        cursor.execute("SET lock_timeout = %s", (SWAP_LOCK_TIMEOUT,))
+        for attempt in range(1, SWAP_RETRIES + 1):
+            try:
+                cursor.execute("SELECT partition_convert(%s)", (table,))
+                result = cursor.fetchone()[0]
+                logger.info(f"✅ {result}")
+                return result
+            except psycopg2.errors.LockNotAvailable:
+                logger.warning(f"{table}: swap lock timeout (attempt {attempt}/{SWAP_RETRIES})")
+                time.sleep(attempt)
+        raise RuntimeError(f"{table}: could not acquire lock for partition swap")
+
+
+if __name__ == "__main__":
+    import json
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+
+    from .database_service import DatabaseService
+
+    manager = PartitionManager(db_service=DatabaseService())
+
+    if "--convert" in sys.argv:
+        tables = sys.argv[sys.argv.index("--convert") + 1:]
+        for name in tables:
+            print(manager.convert_online(name))
+        manager.maintain()
+    elif "--status" in sys.argv:
+        print(json.dumps(manager.status(), indent=2, default=str))
+    else:
+        result = manager.maintain()
+        print(json.dumps(result, indent=2, default=str))
+        sys.exit(0 if result["success"] else 1)
@@ -0,0 +1,233 @@
+"""
+FortiGate Pull Log Writer (Asynchronous, Batched)
+
+Purpose:
+    - FortiGate pull 요청 로그를 응답 경로에서 분리
+    - 메모리 내 bounded queue에 적재 후 백그라운드 스레드가 일괄 INSERT
+    - 큐가 가득 차면 대기하지 않고 drop (drop 카운트 기록)
+    - 프로세스 종료 시 남은 로그 flush
+
+Configuration (environment):
+    PULL_LOG_QUEUE_SIZE      - 최대 대기 로그 수 (default: 10000)
+    PULL_LOG_BATCH_SIZE      - 한 번에 INSERT 할 최대 행 수 (default: 500)
+    PULL_LOG_FLUSH_INTERVAL_MS - flush 주기 (default: 1000)
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+PullLogRow = Tuple[str, str, str, int, int, int, datetime]
+
+
+class PullLogWriter:
+    """Bounded in-process queue with a background batch flusher for fortinet_pull_logs"""
+
+    INSERT_SQL = """
+        INSERT INTO fortinet_pull_logs
+        (device_ip, user_agent, request_path, ip_count, response_time_ms,
+         response_status, created_at)
+        VALUES %s
+    """
+
+    def __init__(
+        self,
+        db_service=None,
+        max_queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+    ):
+        """
+        Initialize pull log writer
+
+        Args:
+            db_service: DatabaseService instance for connection pool access
+            max_queue_size: Maximum rows waiting to be written
+            batch_size: Maximum rows per multi-row INSERT
+            flush_interval_ms: Maximum delay before queued rows are written
+        """
+        self.db_service = db_service
+        self.max_queue_size = max_queue_size or int(
+            os.getenv("PULL_LOG_QUEUE_SIZE", "10000")
+        )
+        self.batch_size = batch_size or int(os.getenv("PULL_LOG_BATCH_SIZE", "500"))
+        self.flush_interval = (
+            flush_interval_ms or int(os.getenv("PULL_LOG_FLUSH_INTERVAL_MS", "1000"))
+        ) / 1000.0
+
+        self._queue: "queue.Queue[PullLogRow]" = queue.Queue(maxsize=self.max_queue_size)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # Counters (written by the flusher thread, except enqueued/dropped)
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_flush_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+        atexit.register(self.shutdown)
+
+    def start(self):
+        """Start the background flusher (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="pull-log-writer", daemon=True
+            )
+            self._thread.start()
+            logger.info(
+                f"✅ Pull log writer started (batch={self.batch_size}, "
+                f"interval={int(self.flush_interval * 1000)}ms, queue={self.max_queue_size})"
+            )
+
+    def enqueue(
+        self,
+        device_ip: str,
+        user_agent: str,
+        request_path: str,
+        ip_count: int,
+        response_time_ms: int,
+        response_status: int,
+    ) -> bool:
+        """
+        Queue a pull log row without blocking
+
+        Returns:
+            False if the row was dropped because the queue is full
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+
+        try:
+            self._queue.put_nowait(
+                (
+                    device_ip,
+                    user_agent,
+                    request_path,
+                    ip_count,
+                    response_time_ms,
+                    response_status,
+                    datetime.now(),
+                )
+            )
+            self.enqueued += 1
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(
+                    f"⚠️ Pull log queue full, dropping rows (dropped so far: {self.dropped})"
+                )
+            return False
+
+    def _drain(self, first: Optional[PullLogRow] = None) -> List[PullLogRow]:
+        batch: List[PullLogRow] = [first] if first is not None else []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch: List[PullLogRow]):
+        if not batch or not self.db_service:
+            return
+
+        conn = None
+        try:
+            conn = self.db_service.get_connection()
+            cursor = conn.cursor()
+            execute_values(cursor, self.INSERT_SQL, batch, page_size=self.batch_size)
+            conn.commit()
+            cursor.close()
+            self.written += len(batch)
+            self.batches += 1
+            self.last_flush_at = datetime.now()
+        except Exception as e:
+            self.failed += len(batch)
+            self.last_error = str(e)
+            logger.warning(f"Failed to write {len(batch)} pull log rows: {e}")
+            try:
+                if conn:
+                    conn.rollback()
+            except Exception:
+                pass
+        finally:
+            if conn:
+                self.db_service.return_connection(conn)
+
+    def _run(self):
+        """Flusher loop: write when batch_size rows are queued or flush_interval elapses"""
+        while not self._stop_event.is_set():
+            deadline = time.monotonic() + self.flush_interval
+            batch: List[PullLogRow] = []
+
+            while len(batch) < self.batch_size and not self._stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.extend(self._drain(self._queue.get(timeout=remaining)))
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+
+        # Final drain on shutdown
+        self.flush()
+
+    def flush(self):
+        """Write everything currently queued (called on shutdown)"""
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Stop the flusher and write remaining rows"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.warning("⚠️ Pull log writer did not stop in time")
+        else:
+            logger.info(
+                f"Pull log writer stopped (written={self.written}, dropped={self.dropped})"
+            )
+        self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Writer counters for monitoring"""
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "queued": self._queue.qsize(),
+            "queue_capacity": self.max_queue_size,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_flush_at": self.last_flush_at.isoformat()
+            if self.last_flush_at
+            else None,
+            "last_error": self.last_error,
+        }
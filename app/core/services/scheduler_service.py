@@ -1,6 +1,7 @@
 """
 자동 수집 스케줄러 서비스
 실제 REGTECH/SECUDIUM 데이터를 주기적으로 수집
+로그/이력 파티션 관리는 수집과 별도 주기로 실행 (자동 수집이 꺼져 있어도 동작)
 """
 
 import threading
@@ -28,6 +29,10 @@ def __init__(self, db_service=None):
         self.scheduler_thread: Optional[threading.Thread] = None
         self.collection_interval = int(os.getenv("COLLECTION_INTERVAL", "3600"))  # 1시간
         self.last_collection = {}
+        self.maintenance_running = False
+        self.maintenance_thread: Optional[threading.Thread] = None
+        self.maintenance_interval = int(os.getenv("PARTITION_MAINTENANCE_INTERVAL", "3600"))  # 1시간
+        self.last_maintenance: Optional[datetime] = None
 
     def start(self):
         """스케줄러 시작"""
@@ -53,6 +58,42 @@ def stop(self):
         logger.info("자동 수집 스케줄러 중지됨")
         return True
 
+    def start_maintenance(self):
+        """파티션 관리 루프 시작 (수집 스케줄러와 독립)"""
+        if self.maintenance_running:
+            return False
+
+        self.maintenance_running = True
+        self.maintenance_thread = threading.Thread(
+            target=self._maintenance_loop, daemon=True, name="PartitionMaintenance"
+        )
+        self.maintenance_thread.start()
+        logger.info(f"파티션 관리 스케줄러 시작됨 (간격: {self.maintenance_interval}초)")
+        return True
+
+    def stop_maintenance(self):
+        """파티션 관리 루프 중지"""
+        if not self.maintenance_running:
+            return False
+
+        self.maintenance_running = False
+        if self.maintenance_thread and self.maintenance_thread.is_alive():
+            self.maintenance_thread.join(timeout=5)
+        return True
+
+    def _maintenance_loop(self):
+        """파티션 관리 루프 (여러 워커가 동시에 돌아도 partition_maintain() 이 advisory lock 으로 직렬화)"""
+        while self.maintenance_running:
+            try:
+                self._maintain_partitions()
+            except Exception as e:
+                logger.error(f"파티션 관리 루프 오류: {e}")
+
+            for _ in range(self.maintenance_interval):
+                if not self.maintenance_running:
+                    break
+                time.sleep(1)
+
     def _scheduler_loop(self):
         """스케줄러 메인 루프"""
         logger.info("자동 수집 스케줄러 루프 시작")
@@ -113,7 +154,7 @@ def _run_collection(self):
             logger.error(f"자동 수집 실행 중 오류: {e}")
 
     def _deactivate_expired_ips(self):
-        """해제일이 지난 IP들을 자동으로 비활성 처리"""
+        """해제일이 지난 IP들을 자동으로 비활성 처리 (IPExpiryService 청크 엔진 사용)"""
         try:
             logger.info("🔄 해제일 만료 IP 비활성 처리 시작")
 
@@ -121,95 +162,37 @@ def _deactivate_expired_ips(self):
                 logger.error("Database service not available")
                 return
 
-            conn = self.db_service.get_connection()
-            cursor = conn.cursor()
+            from .expiry_service import IPExpiryService
 
-            # 해제일이 지나고 아직 활성 상태인 IP들 찾기
-            cursor.execute(
-                """
-                SELECT id, ip_address, removal_date, source
-                FROM blacklist_ips
-                WHERE is_active = true
-                AND removal_date IS NOT NULL
-                AND removal_date < CURRENT_DATE
-            """
-            )
-
-            expired_ips = cursor.fetchall()
-
-            if expired_ips:
-                expired_count = len(expired_ips)
-                logger.info(f"📋 해제일 만료 IP {expired_count}개 발견")
-
-                # 해제일이 지난 IP들을 비활성 처리
-                expired_ids = [str(ip[0]) for ip in expired_ips]
-                placeholders = ",".join(["%s"] * len(expired_ids))
-
-                cursor.execute(
-                    f"""
-                    UPDATE blacklist_ips
-                    SET is_active = false,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id IN ({placeholders})
-                """,
-                    expired_ids,
-                )
+            result = IPExpiryService(db_service=self.db_service).check_and_deactivate_expired_ips()
 
-                updated_count = cursor.rowcount
-                conn.commit()
-
-                # 로그 출력
-                for ip_record in expired_ips:
-                    ip_id, ip_address, removal_date, source = ip_record
-                    logger.info(f"🚫 IP 비활성 처리: {ip_address} (해제일: {removal_date}, 소스: {source})")
-
-                logger.info(f"✅ 해제일 만료 IP 비활성 처리 완료: {updated_count}개")
-
-                # 비활성 처리 통계 기록
-                cursor.execute(
-                    """
-                    INSERT INTO collection_history (
-                        collection_type,
-                        collected_count,
-                        success,
-                        additional_info
-                    ) VALUES (%s, %s, %s, %s)
-                """,
-                    (
-                        "expired_ip_deactivation",
-                        updated_count,
-                        True,
-                        {
-                            "deactivated_count": updated_count,
-                            "expired_ips": [
-                                {
-                                    "ip": ip[1],
-                                    "removal_date": str(ip[2]),
-                                    "source": ip[3],
-                                }
-                                for ip in expired_ips
-                            ],
-                            "execution_time": datetime.now().isoformat(),
-                        },
-                    ),
+            if not result.get("success"):
+                logger.error(f"❌ 해제일 만료 IP 비활성 처리 오류: {result.get('error')}")
+            elif result.get("skipped"):
+                logger.info("⏭️ 다른 프로세스에서 만료 처리 진행 중 - 건너뜀")
+            elif result["expired_count"]:
+                logger.info(
+                    f"✅ 해제일 만료 IP 비활성 처리 완료: {result['expired_count']}개 "
+                    f"({result['chunks']} chunks, 소스별 {result['by_source']})"
                 )
-
-                conn.commit()
-
             else:
                 logger.info("✅ 해제일 만료 IP 없음 - 모든 활성 IP가 유효함")
 
-            cursor.close()
-            self.db_service.return_connection(conn)
-
         except Exception as e:
             logger.error(f"❌ 해제일 만료 IP 비활성 처리 오류: {e}")
-            if "conn" in locals():
-                try:
-                    conn.rollback()
-                    self.db_service.return_connection(conn)
-                except BaseException:
-                    pass
+
+    def _maintain_partitions(self):
+        """미래 파티션 미리 생성 + 보존 기간 지난 파티션 DROP (PartitionManager)"""
+        if not self.db_service:
+            return
+
+        from .partition_manager import PartitionManager
+
+        result = PartitionManager(db_service=self.db_service).maintain()
+        if not result.get("success"):
+            logger.error(f"❌ 파티션 관리 오류: {result.get('error')}")
+        else:
+            self.last_maintenance = datetime.now()
 
     def _update_collection_stats(self):
         """수집 통계 업데이트"""
@@ -254,6 +237,11 @@ def get_status(self) -> Dict[str, Any]:
             "last_collection": {source: timestamp.isoformat() for source, timestamp in self.last_collection.items()},
             "thread_alive": (self.scheduler_thread.is_alive() if self.scheduler_thread else False),
             "next_collection_in_seconds": (self.collection_interval if self.running else 0),
+            "partition_maintenance": {
+                "running": self.maintenance_running,
+                "interval": self.maintenance_interval,
+                "last_run": self.last_maintenance.isoformat() if self.last_maintenance else None,
+            },
         }
 
     def force_collection(self) -> Dict[str, Any]:
@@ -33,20 +33,24 @@ def calculate_score(self, ip: str, context: Optional[Dict[str, Any]] = None) ->
         """
         score = 0
         context = context or {}
+        # Per-step breakdown is debug-only; skip formatting on the hot path
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         # 1. 블랙리스트 매칭 (50점)
         if context.get("in_blacklist", False):
             score += 50
-            logger.info(f"Score +50: {ip} in blacklist")
+            if debug:
+                logger.debug(f"Score +50: {ip} in blacklist")
 
         # 2. 탐지 횟수 (최대 30점)
         detection_count = context.get("detection_count", 0)
         if detection_count > 0:
             detection_score = min(detection_count * 5, 30)
             score += detection_score
-            logger.info(
-                f"Score +{detection_score}: {ip} detected {detection_count} times"
-            )
+            if debug:
+                logger.debug(
+                    f"Score +{detection_score}: {ip} detected {detection_count} times"
+                )
 
         # 3. 소스 신뢰도 (최대 20점)
         source = context.get("source", "unknown")
@@ -57,7 +61,8 @@ def calculate_score(self, ip: str, context: Optional[Dict[str, Any]] = None) ->
         }
         source_score = source_scores.get(source, 10)
         score += source_score
-        logger.info(f"Score +{source_score}: {ip} from {source}")
+        if debug:
+            logger.debug(f"Score +{source_score}: {ip} from {source}")
 
         # 4. 최근 활동 (최대 10점)
         last_seen = context.get("last_seen")
@@ -75,7 +80,8 @@ def calculate_score(self, ip: str, context: Optional[Dict[str, Any]] = None) ->
 
                 if datetime.utcnow() - last_seen_dt < timedelta(hours=24):
                     score += 10
-                    logger.info(f"Score +10: {ip} active within 24h")
+                    if debug:
+                        logger.debug(f"Score +10: {ip} active within 24h")
             except Exception as e:
                 logger.warning(f"Failed to parse last_seen: {e}")
 
@@ -4,7 +4,7 @@
 Implements dependency injection pattern for Flask application
 
 This factory:
-1. Initializes all 14 application services in correct dependency order
+1. Initializes all 17 application services in correct dependency order
 2. Returns service container dictionary
 3. Manages service dependencies explicitly
 4. Eliminates 100+ redundant imports in route files
@@ -19,9 +19,9 @@
 Service Categories:
 - Core Infrastructure: database_service
 - Collection Services: collection_service, scheduler_service
-- Integration Services: fortimanager_service, secudium_service
+- Integration Services: fortimanager_service, secudium_service, pull_log_writer
 - Configuration Services: credential_service, secure_credential_service, regtech_config_service, settings_service
-- Business Logic: blacklist_service, analytics_service, scoring_service, expiry_service, ab_test_service
+- Business Logic: blacklist_service, stats_service, export_job_service, analytics_service, scoring_service, expiry_service, ab_test_service
 
 Created: 2025-11-21 (Service DI Improvement - HIGH PRIORITY #2)
 Reference: docs/102-SERVICE-DI-IMPROVEMENT-PLAN.md
@@ -90,6 +90,28 @@ def initialize_services(app: Flask) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"  ❌ Failed to initialize blacklist_service: {e}")
 
+    # Stats Rollup Service - Single-query dashboard/system statistics
+    try:
+        from .stats_rollup_service import StatsRollupService
+
+        stats_service = StatsRollupService(db_service=services["db_service"])
+        services["stats_service"] = stats_service
+        logger.info("  ✅ stats_service (StatsRollupService) - blacklist_stats_rollup reads")
+    except Exception as e:
+        logger.error(f"  ❌ Failed to initialize stats_service: {e}")
+
+    # Export Job Service - Asynchronous raw data exports
+    try:
+        from .export_job_service import ExportJobService
+
+        export_job_service = ExportJobService(db_service=services["db_service"])
+        services["export_job_service"] = export_job_service
+        logger.info(
+            f"  ✅ export_job_service (ExportJobService) - spool: {export_job_service.spool_dir}"
+        )
+    except Exception as e:
+        logger.error(f"  ❌ Failed to initialize export_job_service: {e}")
+
     # Analytics Service - Analytics and reporting
     try:
         from .analytics_service import AnalyticsService
@@ -146,6 +168,16 @@ def initialize_services(app: Flask) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"  ❌ Failed to initialize fortimanager_service: {e}")
 
+    # Pull Log Writer - Batched, non-blocking fortinet_pull_logs recording
+    try:
+        from .pull_log_writer import PullLogWriter
+
+        pull_log_writer = PullLogWriter(db_service=services["db_service"])
+        services["pull_log_writer"] = pull_log_writer
+        logger.info("  ✅ pull_log_writer (PullLogWriter) - background batch INSERT")
+    except Exception as e:
+        logger.error(f"  ❌ Failed to initialize pull_log_writer: {e}")
+
     # ============================================================
     # 5. CONFIGURATION SERVICES
     # ============================================================
@@ -187,8 +219,11 @@ def initialize_services(app: Flask) -> Dict[str, Any]:
         from .settings_service import SettingsService
 
         settings_service = SettingsService(db_service=services["db_service"])
+        settings_service.start_listener()
         services["settings_service"] = settings_service
-        logger.info("  ✅ settings_service (SettingsService)")
+        logger.info(
+            "  ✅ settings_service (SettingsService) - in-memory snapshot, LISTEN settings_changed"
+        )
     except Exception as e:
         logger.error(f"  ❌ Failed to initialize settings_service: {e}")
 
@@ -246,7 +281,7 @@ def initialize_services(app: Flask) -> Dict[str, Any]:
     # ============================================================
 
     initialized_count = len(services)
-    total_services = 14
+    total_services = 17
 
     if initialized_count == total_services:
         logger.info(f"✅ Successfully initialized all {initialized_count} services")
@@ -267,11 +302,11 @@ def get_service_info() -> Dict[str, Any]:
         Dictionary with service metadata
     """
     return {
-        "total_services": 14,
+        "total_services": 17,
         "categories": {
             "core_infrastructure": ["db_service"],
             "collection_services": ["collection_service", "scheduler_service"],
-            "integration_services": ["fortimanager_service"],
+            "integration_services": ["fortimanager_service", "pull_log_writer"],
             "configuration_services": [
                 "credential_service",
                 "secure_credential_service",
@@ -280,6 +315,8 @@ def get_service_info() -> Dict[str, Any]:
             ],
             "business_logic": [
                 "blacklist_service",
+                "stats_service",
+                "export_job_service",
                 "analytics_service",
                 "scoring_service",
                 "expiry_service",
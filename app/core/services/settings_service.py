@@ -2,11 +2,20 @@
 Settings Service
 Manages application settings stored in database
 Replaces .env file dependency for runtime configurable settings
+
+Reads are served from one in-memory snapshot of all active settings
+(decrypted and type-converted once). The snapshot is reloaded when a
+'settings_changed' NOTIFY (migration 011) carries a newer settings_version,
+so changes made by any worker, the collector or plain SQL propagate without
+polling. Without a LISTEN connection the snapshot falls back to a 60s TTL.
 """
 
+import json
 import logging
+import select
+import threading
+import time
 from typing import Optional, Dict, List, Any
-from datetime import datetime
 from cryptography.fernet import Fernet
 import os
 import base64
@@ -16,6 +25,8 @@
 
 logger = logging.getLogger(__name__)
 
+SETTINGS_CHANNEL = "settings_changed"
+
 
 class SettingsService:
     """Singleton service for managing system settings"""
@@ -25,9 +36,15 @@ class SettingsService:
 
     def __init__(self, db_service: Optional[DatabaseService] = None):
         self.db = db_service
-        self._cache: Dict[str, Any] = {}
-        self._cache_timestamp: Optional[datetime] = None
+        # key → decrypted, converted value (active settings only)
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_version: Optional[int] = None
+        self._snapshot_loaded_at: float = 0.0
+        self._snapshot_lock = threading.Lock()
+        # TTL fallback, only used while no LISTEN connection is up
         self._cache_ttl = 60
+        self._listening = False
+        self._listener_thread: Optional[threading.Thread] = None
 
         self._init_encryption_key()
         logger.info("SettingsService initialized")
@@ -60,13 +77,14 @@ def _init_encryption_key(self):
             key_str = base64.urlsafe_b64encode(key_bytes).decode()
 
         self._encryption_key: bytes = key_str.encode()
+        # Fernet instance is reused for every encrypt/decrypt call
+        self._fernet = Fernet(self._encryption_key)
         logger.info("Encryption key initialized")
 
     def _encrypt_value(self, value: str) -> str:
         """Encrypt a value using Fernet"""
         try:
-            f = Fernet(self._encryption_key)
-            encrypted = f.encrypt(value.encode())
+            encrypted = self._fernet.encrypt(value.encode())
             return base64.urlsafe_b64encode(encrypted).decode()
         except Exception as e:
             logger.error(f"Encryption failed: {e}")
@@ -75,27 +93,145 @@ def _encrypt_value(self, value: str) -> str:
     def _decrypt_value(self, encrypted_value: str) -> str:
         """Decrypt a value using Fernet"""
         try:
-            f = Fernet(self._encryption_key)
             decoded = base64.urlsafe_b64decode(encrypted_value.encode())
-            decrypted = f.decrypt(decoded)
+            decrypted = self._fernet.decrypt(decoded)
             return decrypted.decode()
         except Exception as e:
             logger.error(f"Decryption failed: {e}")
             raise
 
     def _invalidate_cache(self):
-        """Invalidate settings cache"""
-        self._cache = {}
-        self._cache_timestamp = None
-        logger.debug("Settings cache invalidated")
-
-    def _is_cache_valid(self) -> bool:
-        """Check if cache is still valid"""
-        if not self._cache_timestamp:
-            return False
+        """Reload the snapshot after a local write (other processes get NOTIFY)"""
+        try:
+            self.reload()
+        except Exception as e:
+            logger.warning(f"Settings snapshot reload failed, will retry on next read: {e}")
+            with self._snapshot_lock:
+                self._snapshot_loaded_at = 0.0
+                self._snapshot_version = None
+
+    def reload(self) -> int:
+        """Load all active settings + the settings_version they include
+
+        Returns:
+            Snapshot version (0 if migration 011 is not applied)
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            # Version first: each statement gets its own READ COMMITTED snapshot, so
+            # the rows are at least as new as the version. A change committed in
+            # between is picked up again by its (newer) NOTIFY instead of being
+            # recorded under a version that already includes it.
+            try:
+                cursor.execute("SELECT version FROM settings_version WHERE id = 1")
+                row = cursor.fetchone()
+                version = row[0] if row else 0
+            except Exception:
+                conn.rollback()
+                version = 0
+            cursor.execute(
+                """
+                SELECT setting_key, setting_value, setting_type, is_encrypted
+                FROM system_settings
+                WHERE is_active = true
+            """
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+            conn.commit()
+        finally:
+            self.db.return_connection(conn)
 
-        age = (datetime.now() - self._cache_timestamp).total_seconds()
-        return age < self._cache_ttl
+        snapshot: Dict[str, Any] = {}
+        for key, value, setting_type, is_encrypted in rows:
+            if is_encrypted and value:
+                try:
+                    value = self._decrypt_value(value)
+                except Exception:
+                    logger.error(f"Failed to decrypt setting {key}, skipped in snapshot")
+                    continue
+            snapshot[key] = self._convert_value(value, setting_type)
+
+        with self._snapshot_lock:
+            self._snapshot = snapshot
+            self._snapshot_version = version
+            self._snapshot_loaded_at = time.monotonic()
+
+        logger.debug(f"Settings snapshot loaded: {len(snapshot)} settings, version {version}")
+        return version
+
+    def _current_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Snapshot for reads; (re)loads only when missing or TTL-expired without LISTEN"""
+        snapshot = self._snapshot
+        stale = snapshot is None or (
+            not self._listening
+            and time.monotonic() - self._snapshot_loaded_at >= self._cache_ttl
+        )
+        if not stale:
+            return snapshot
+
+        try:
+            self.reload()
+        except Exception as e:
+            logger.error(f"Settings snapshot load failed: {e}")
+        return self._snapshot
+
+    @property
+    def version(self) -> Optional[int]:
+        """settings_version of the loaded snapshot"""
+        return self._snapshot_version
+
+    def start_listener(self):
+        """LISTEN settings_changed in a daemon thread (reload on newer version)"""
+        if self.db is None or self._listener_thread is not None:
+            return
+        self._listener_thread = threading.Thread(
+            target=self._listen_loop, name="settings-listener", daemon=True
+        )
+        self._listener_thread.start()
+
+    def _listen_loop(self):
+        import psycopg2
+
+        while True:
+            conn = None
+            try:
+                conn = self.db.create_raw_connection()
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                conn.cursor().execute(f"LISTEN {SETTINGS_CHANNEL};")
+                self._listening = True
+                # Catch up on changes missed while disconnected
+                self.reload()
+                logger.info(f"Settings listener started: {SETTINGS_CHANNEL}")
+
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    newest = None
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            version = json.loads(notify.payload).get("version")
+                        except (ValueError, AttributeError):
+                            version = None
+                        # Unknown version → reload to be safe
+                        newest = max(newest or 0, version) if version is not None else float("inf")
+
+                    current = self._snapshot_version
+                    if newest is not None and (current is None or newest > current):
+                        self.reload()
+            except Exception as e:
+                self._listening = False
+                logger.warning(f"Settings listener error: {e} - reconnecting in 5s")
+                time.sleep(5)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
 
     def get_setting(self, key: str, default: Any = None, use_cache: bool = True) -> Any:
         """
@@ -104,16 +240,18 @@ def get_setting(self, key: str, default: Any = None, use_cache: bool = True) ->
         Args:
             key: Setting key (e.g., 'COLLECTION_INTERVAL')
             default: Default value if setting not found
-            use_cache: Whether to use cached value
+            use_cache: Whether to use the in-memory snapshot (False reads the database)
 
         Returns:
             Setting value (decrypted if encrypted)
         """
-        try:
-            # Check cache first
-            if use_cache and self._is_cache_valid() and key in self._cache:
-                return self._cache[key]
+        if use_cache:
+            snapshot = self._current_snapshot()
+            if snapshot is not None:
+                return snapshot.get(key, default)
 
+        conn: Any = None
+        try:
             conn = self._get_connection()
             cursor = conn.cursor()
 
@@ -139,19 +277,14 @@ def get_setting(self, key: str, default: Any = None, use_cache: bool = True) ->
             if is_encrypted and value:
                 value = self._decrypt_value(value)
 
-            # Convert type
-            converted_value = self._convert_value(value, setting_type)
-
-            # Update cache
-            self._cache[key] = converted_value
-            if not self._cache_timestamp:
-                self._cache_timestamp = datetime.now()
-
-            return converted_value
+            return self._convert_value(value, setting_type)
 
         except Exception as e:
             logger.error(f"Error getting setting {key}: {e}")
             return default
+        finally:
+            if conn is not None:
+                self.db.return_connection(conn)
 
     def _convert_value(self, value: str, setting_type: str) -> Any:
         """Convert string value to appropriate type"""
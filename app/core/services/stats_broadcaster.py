@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+WebSocket 통계 브로드캐스터
+구독 이벤트마다 집계 쿼리를 실행하지 않고, 단일 백그라운드 작업이 계산한
+스냅샷을 공유한다.
+
+- 계산 시점: blacklist_changes NOTIFY (migration 009) 수신 시, 또는 변경이 없어도
+  STATS_BROADCAST_IDLE 주기마다. 어떤 경우에도 STATS_BROADCAST_INTERVAL 당 최대 1회.
+- 신규 구독자: 메모리 스냅샷(없으면 Redis 스냅샷)을 즉시 전송 - DB 조회 없음
+- stats_room: 바뀐 필드만 'stats_diff' 로 전송 (version 으로 누락 감지)
+- 멀티 워커: SocketIO message_queue(Redis pub/sub)로 emit 공유,
+  Redis 리더 키를 가진 워커 하나만 계산하고 스냅샷을 Redis 에 게시
+
+활성화: WEBSOCKET_ENABLED=true (기본 비활성)
+  - 워커마다 풀 밖의 LISTEN blacklist_changes 연결 1개 + 백그라운드 작업 2개
+  - gunicorn 다중 워커에서는 프록시 sticky session (Socket.IO polling 핸드셰이크가
+    같은 워커로 가야 함) 과 Redis message queue (SOCKETIO_MESSAGE_QUEUE) 가 필요
+"""
+
+import os
+import json
+import time
+import socket
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+STATS_ROOM = "stats_room"
+COLLECTION_ROOM = "collection_room"
+SNAPSHOT_KEY = "blacklist:ws:stats_snapshot"
+LEADER_KEY = "blacklist:ws:stats_leader"
+
+# 리더 키 갱신 (자기 키일 때만 TTL 연장)
+_RENEW_LEADER_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# 값이 바뀌어도 diff 전송 사유가 되지 않는 필드
+_VOLATILE_KEYS = {"timestamp"}
+
+
+def message_queue_url() -> str:
+    """SocketIO message_queue (Redis pub/sub) URL"""
+    return os.getenv(
+        "SOCKETIO_MESSAGE_QUEUE",
+        f"redis://{os.getenv('REDIS_HOST', 'blacklist-redis')}:{os.getenv('REDIS_PORT', '6379')}/0",
+    )
+
+
+def diff_snapshot(old: Any, new: Any) -> Tuple[Dict[str, Any], List[str]]:
+    """중첩 dict 비교 → (바뀐/추가된 필드, 삭제된 필드 경로)
+
+    dict 는 재귀 비교, 그 외 값(list 포함)은 통째로 교체.
+    """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return ({} if old == new else {"": new}), []
+
+    changed: Dict[str, Any] = {}
+    removed = [key for key in old if key not in new]
+    for key, value in new.items():
+        if key not in old:
+            changed[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            sub_changed, sub_removed = diff_snapshot(old[key], value)
+            if sub_changed:
+                changed[key] = sub_changed
+            removed.extend(f"{key}.{path}" for path in sub_removed)
+        elif value != old[key]:
+            changed[key] = value
+    return changed, removed
+
+
+class StatsBroadcaster:
+    """통계/수집 상태 스냅샷 계산 + 구독자 전송"""
+
+    def __init__(self, app, socketio):
+        self.app = app
+        self.socketio = socketio
+        self.interval = float(os.getenv("STATS_BROADCAST_INTERVAL", "5"))
+        self.idle_interval = float(os.getenv("STATS_BROADCAST_IDLE", "60"))
+        self.leader_ttl = int(max(self.idle_interval, self.interval) * 3)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        try:
+            self.redis_client = redis.Redis(
+                host=os.getenv("REDIS_HOST", "blacklist-redis"),
+                port=int(os.getenv("REDIS_PORT", 6379)),
+                db=0,
+                decode_responses=True,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+            )
+            self.redis_client.ping()
+            self._renew_leader = self.redis_client.register_script(_RENEW_LEADER_LUA)
+        except Exception as e:
+            logger.warning(f"⚠️ Redis unavailable - stats broadcaster runs per worker: {e}")
+            self.redis_client = None
+
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._is_leader = False
+        self._last_computed = 0.0
+        self._started = False
+
+    # ------------------------------------------------------------------
+    # Snapshot access (구독 핸들러에서 호출 - DB 조회 없음)
+    # ------------------------------------------------------------------
+    def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        """최신 스냅샷 {"version", "stats", "collection", "computed_at"}"""
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is not None and (self._is_leader or self.redis_client is None):
+            return snapshot
+
+        # 리더가 아닌 워커: 리더가 게시한 스냅샷
+        if self.redis_client is not None:
+            try:
+                raw = self.redis_client.get(SNAPSHOT_KEY)
+                if raw:
+                    return json.loads(raw)
+            except Exception as e:
+                logger.debug(f"stats snapshot read failed: {e}")
+
+        if snapshot is None:
+            # 첫 계산 전 → 백그라운드 작업에 즉시 계산 요청
+            self.request_refresh()
+        return snapshot
+
+    def request_refresh(self):
+        """데이터 변경 알림 (interval 제한 내에서 재계산)"""
+        self._dirty.set()
+
+    # ------------------------------------------------------------------
+    # Background tasks
+    # ------------------------------------------------------------------
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        self.socketio.start_background_task(self._run)
+        self.socketio.start_background_task(self._listen_changes)
+        self.request_refresh()
+        logger.info(
+            f"📡 Stats broadcaster started (interval={self.interval}s, idle={self.idle_interval}s)"
+        )
+
+    def stop(self):
+        self._stop.set()
+        self._dirty.set()
+
+    def _acquire_leadership(self) -> bool:
+        if self.redis_client is None:
+            self._is_leader = True
+            return True
+        try:
+            renewed = self._renew_leader(
+                keys=[LEADER_KEY], args=[self.worker_id, self.leader_ttl]
+            )
+            acquired = renewed or self.redis_client.set(
+                LEADER_KEY, self.worker_id, nx=True, ex=self.leader_ttl
+            )
+        except Exception as e:
+            logger.debug(f"stats leader check failed: {e}")
+            acquired = False
+
+        if acquired and not self._is_leader:
+            # 새 리더 → 이전 리더의 스냅샷을 기준으로 diff/version 이어가기
+            try:
+                raw = self.redis_client.get(SNAPSHOT_KEY)
+                if raw:
+                    with self._lock:
+                        self._snapshot = json.loads(raw)
+            except Exception:
+                pass
+            logger.info(f"📡 Stats broadcaster leader: {self.worker_id}")
+        self._is_leader = bool(acquired)
+        return self._is_leader
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._dirty.wait(timeout=self.idle_interval)
+            if self._stop.is_set():
+                break
+
+            # 계산은 interval 당 최대 1회 (그 사이 알림은 다음 계산에 합쳐짐)
+            wait = self._last_computed + self.interval - time.monotonic()
+            if wait > 0:
+                self._stop.wait(wait)
+            self._dirty.clear()
+
+            if not self._acquire_leadership():
+                continue
+            try:
+                self._compute_and_broadcast()
+            except Exception as e:
+                logger.error(f"❌ 통계 스냅샷 계산 실패: {e}")
+            finally:
+                self._last_computed = time.monotonic()
+
+    def _listen_changes(self):
+        """blacklist_changes LISTEN → request_refresh (연결 끊기면 재접속)"""
+        import select
+
+        import psycopg2
+
+        while not self._stop.is_set():
+            conn = None
+            try:
+                db_service = self.app.extensions["db_service"]
+                conn = db_service.create_raw_connection()
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                conn.cursor().execute("LISTEN blacklist_changes;")
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self.request_refresh()
+            except Exception as e:
+                logger.warning(f"stats broadcaster LISTEN error: {e} - retry in 30s")
+                self._stop.wait(30)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _refresh_snapshot_ttl(self, snapshot: Dict[str, Any]):
+        """SNAPSHOT_KEY TTL 연장 (키가 이미 사라졌으면 현재 스냅샷을 다시 게시)"""
+        if self.redis_client is None:
+            return
+        try:
+            if not self.redis_client.expire(SNAPSHOT_KEY, self.leader_ttl * 2):
+                self.redis_client.set(
+                    SNAPSHOT_KEY, json.dumps(snapshot), ex=self.leader_ttl * 2
+                )
+        except Exception as e:
+            logger.warning(f"stats snapshot TTL refresh failed: {e}")
+
+    def _compute_and_broadcast(self):
+        with self.app.app_context():
+            service = self.app.extensions["optimized_blacklist_service"]
+            # JSON 직렬화 형태로 정규화 (Redis 게시 / diff 비교 기준 일치)
+            stats = json.loads(json.dumps(service.get_unified_statistics(), default=str))
+            collection = json.loads(json.dumps(service.get_collection_status(), default=str))
+
+        with self._lock:
+            previous = self._snapshot or {}
+            version = previous.get("version", 0)
+
+            stats_changed, stats_removed = diff_snapshot(previous.get("stats", {}), stats)
+            stats_dirty = bool(set(stats_changed) - _VOLATILE_KEYS or stats_removed)
+            collection_changed, collection_removed = diff_snapshot(
+                previous.get("collection", {}), collection
+            )
+            collection_dirty = bool(
+                set(collection_changed) - _VOLATILE_KEYS or collection_removed
+            )
+            unchanged = not (stats_dirty or collection_dirty or not previous)
+            if not unchanged:
+                snapshot = {
+                    "version": version + 1,
+                    "stats": stats,
+                    "collection": collection,
+                    "computed_at": datetime.now().isoformat(),
+                }
+                self._snapshot = snapshot
+
+        if unchanged:
+            # 변경 없음: 게시된 스냅샷이 만료되지 않도록 매 tick TTL 갱신
+            self._refresh_snapshot_ttl(previous)
+            return
+
+        if self.redis_client is not None:
+            try:
+                self.redis_client.set(
+                    SNAPSHOT_KEY, json.dumps(snapshot), ex=self.leader_ttl * 2
+                )
+            except Exception as e:
+                logger.warning(f"stats snapshot publish failed: {e}")
+
+        if stats_dirty:
+            self.socketio.emit(
+                "stats_diff",
+                {
+                    "version": snapshot["version"],
+                    "changed": stats_changed,
+                    "removed": stats_removed,
+                },
+                room=STATS_ROOM,
+            )
+        if collection_dirty:
+            self.socketio.emit("collection_status", collection, room=COLLECTION_ROOM)
+        logger.debug(
+            f"📡 stats snapshot v{snapshot['version']} "
+            f"(stats={'diff' if stats_dirty else '-'}, collection={'sent' if collection_dirty else '-'})"
+        )
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+블랙리스트 통계 롤업 서비스
+대시보드/시스템 통계를 단일 쿼리로 제공
+
+- 기본: blacklist_stats_rollup (트리거로 증분 유지되는 집계 테이블) 1회 조회
+- 폴백: 롤업 테이블이 없거나 STATS_ROLLUP_ENABLED=false 이면
+  base 테이블에 대해 GROUPING SETS + COUNT(*) FILTER 단일 쿼리
+- 두 경로 모두 같은 행 형태를 반환하므로 결과 조립 로직은 공유
+- 두 쿼리 모두 prepared statement (연결당 1회 PREPARE, 이후 EXECUTE)
+- 최신 시각(MAX last_seen/created_at/updated_at)은 조회 시 인덱스 끝값으로 읽음
+  (idx_blacklist_ips_last_seen, migration 005 의 COALESCE(...) keyset 인덱스 → 한 번의 index probe)
+
+Schema: postgres/migrations/004_blacklist_stats_rollup.sql
+"""
+
+import os
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import psycopg2
+
+from ..database import prepared
+
+logger = logging.getLogger(__name__)
+
+# GROUPING(data_source, source, country) bitmask -> breakdown name
+_GROUPING_SETS = {7: "total", 3: "by_data_source", 5: "by_source", 6: "by_country"}
+
+_GROUPING_SQL = """
+    GROUP BY GROUPING SETS (
+        (list_type, is_active),
+        (list_type, is_active, data_source),
+        (list_type, is_active, source),
+        (list_type, is_active, country)
+    )
+"""
+
+ROLLUP_QUERY = prepared.statement(
+    "stats_rollup_snapshot",
+    """
+    SELECT
+        list_type, is_active, data_source, source, country,
+        GROUPING(data_source, source, country) AS grp,
+        SUM(ip_count)::bigint AS ip_count,
+        COALESCE(SUM(ip_count) FILTER (WHERE day >= CURRENT_DATE - 1), 0)::bigint AS recent_count,
+        (SELECT MAX(last_seen) FROM blacklist_ips) AS max_last_seen,
+        (SELECT NULLIF(MAX(COALESCE(created_at, TIMESTAMP '1970-01-01')), TIMESTAMP '1970-01-01')
+         FROM blacklist_ips) AS max_created_at,
+        (SELECT NULLIF(MAX(COALESCE(updated_at, TIMESTAMP '1970-01-01')), TIMESTAMP '1970-01-01')
+         FROM blacklist_ips) AS max_updated_at,
+        (SELECT MAX(collection_date) FROM collection_history) AS last_collection
+    FROM blacklist_stats_rollup
+"""
+    + _GROUPING_SQL
+)
+
+LIVE_QUERY = prepared.statement(
+    "stats_live_snapshot",
+    """
+    WITH base AS (
+        SELECT 'blacklist'::text AS list_type,
+               COALESCE(is_active, false) AS is_active,
+               COALESCE(data_source, 'UNKNOWN') AS data_source,
+               COALESCE(source, 'UNKNOWN') AS source,
+               COALESCE(country, 'UNKNOWN') AS country,
+               last_seen
+        FROM blacklist_ips
+        UNION ALL
+        SELECT 'whitelist', true, 'WHITELIST', COALESCE(source, 'UNKNOWN'),
+               COALESCE(country, 'UNKNOWN'), created_at
+        FROM whitelist_ips
+    )
+    SELECT
+        list_type, is_active, data_source, source, country,
+        GROUPING(data_source, source, country) AS grp,
+        COUNT(*)::bigint AS ip_count,
+        COUNT(*) FILTER (WHERE last_seen >= CURRENT_DATE - INTERVAL '1 day')::bigint AS recent_count,
+        (SELECT MAX(last_seen) FROM blacklist_ips) AS max_last_seen,
+        (SELECT MAX(created_at) FROM blacklist_ips) AS max_created_at,
+        (SELECT MAX(updated_at) FROM blacklist_ips) AS max_updated_at,
+        (SELECT MAX(collection_date) FROM collection_history) AS last_collection
+    FROM base
+"""
+    + _GROUPING_SQL
+)
+
+
+class StatsRollupService:
+    """블랙리스트/화이트리스트 통계 스냅샷 서비스"""
+
+    def __init__(self, db_service=None):
+        """
+        Initialize stats rollup service
+
+        Args:
+            db_service: DatabaseService instance for connection pool access
+        """
+        self.db_service = db_service
+        self.rollup_enabled = os.getenv("STATS_ROLLUP_ENABLED", "true").lower() in (
+            "true",
+            "1",
+            "yes",
+        )
+        # None = not yet checked; False after the rollup table was found missing
+        self._rollup_available: Optional[bool] = None
+
+    def _fetch(self, stmt: prepared.PreparedStatement) -> list:
+        conn = self.db_service.get_connection()
+        try:
+            cursor = conn.cursor()
+            try:
+                prepared.execute(cursor, stmt)
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_service.return_connection(conn)
+
+    def get_snapshot(self, live: bool = False) -> Dict[str, Any]:
+        """
+        통계 스냅샷 조회 (단일 쿼리)
+
+        Args:
+            live: True 이면 롤업 대신 base 테이블에서 직접 집계
+
+        Returns:
+            {
+                "total_ips", "active_ips", "expired_ips", "recent_additions",
+                "whitelisted_ips", "regtech_count",
+                "by_data_source", "by_data_source_all", "by_country", "by_source",
+                "last_seen", "last_created", "last_updated", "last_collection",
+                "mode": "rollup" | "live"
+            }
+        """
+        rows = None
+        mode = "live"
+
+        if not live and self.rollup_enabled and self._rollup_available is not False:
+            try:
+                rows = self._fetch(ROLLUP_QUERY)
+                self._rollup_available = True
+                mode = "rollup"
+            except psycopg2.errors.UndefinedTable:
+                self._rollup_available = False
+                logger.warning(
+                    "blacklist_stats_rollup not found - using live aggregate query "
+                    "(apply postgres/migrations/004_blacklist_stats_rollup.sql)"
+                )
+
+        if rows is None:
+            rows = self._fetch(LIVE_QUERY)
+
+        return self._assemble(rows, mode)
+
+    @staticmethod
+    def _assemble(rows: list, mode: str) -> Dict[str, Any]:
+        snapshot: Dict[str, Any] = {
+            "total_ips": 0,
+            "active_ips": 0,
+            "expired_ips": 0,
+            "recent_additions": 0,
+            "whitelisted_ips": 0,
+            "regtech_count": 0,
+            "by_data_source": {},
+            "by_data_source_all": {},
+            "by_country": {},
+            "by_source": {},
+            "last_seen": None,
+            "last_created": None,
+            "last_updated": None,
+            "last_collection": None,
+            "mode": mode,
+        }
+
+        for row in rows:
+            snapshot["last_seen"] = row["max_last_seen"]
+            snapshot["last_created"] = row["max_created_at"]
+            snapshot["last_updated"] = row["max_updated_at"]
+            snapshot["last_collection"] = row["last_collection"]
+
+            count = int(row["ip_count"] or 0)
+            kind = _GROUPING_SETS.get(row["grp"])
+
+            if row["list_type"] == "whitelist":
+                if kind == "total":
+                    snapshot["whitelisted_ips"] += count
+                continue
+
+            if kind == "total":
+                snapshot["total_ips"] += count
+                snapshot["recent_additions"] += int(row["recent_count"] or 0)
+                if row["is_active"]:
+                    snapshot["active_ips"] += count
+                else:
+                    snapshot["expired_ips"] += count
+            elif kind == "by_data_source":
+                key = row["data_source"]
+                all_counts = snapshot["by_data_source_all"]
+                all_counts[key] = all_counts.get(key, 0) + count
+                if key == "REGTECH":
+                    snapshot["regtech_count"] += count
+                if row["is_active"]:
+                    snapshot["by_data_source"][key] = count
+            elif kind == "by_source" and row["is_active"]:
+                snapshot["by_source"][row["source"]] = count
+            elif kind == "by_country" and row["is_active"]:
+                snapshot["by_country"][row["country"]] = count
+
+        return snapshot
+
+    def refresh(self) -> bool:
+        """롤업 전체 재계산 (수집 완료 후 또는 드리프트 보정용)"""
+        conn = None
+        try:
+            conn = self.db_service.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT refresh_blacklist_stats_rollup()")
+            conn.commit()
+            cursor.close()
+            logger.info(f"✅ blacklist_stats_rollup refreshed at {datetime.now().isoformat()}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ blacklist_stats_rollup refresh failed: {e}")
+            if conn:
+                conn.rollback()
+            return False
+        finally:
+            if conn:
+                self.db_service.return_connection(conn)
@@ -24,6 +24,9 @@
 # Cache utilities
 from .cache_utils import CacheManager, cached
 
+# Pagination utilities (keyset/cursor)
+from .pagination import encode_cursor, decode_cursor, keyset_condition
+
 # Validation utilities
 from .validators import *
 
@@ -44,4 +47,8 @@
     # Cache utilities
     'CacheManager',
     'cached',
+    # Pagination utilities
+    'encode_cursor',
+    'decode_cursor',
+    'keyset_condition',
 ]
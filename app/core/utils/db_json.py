@@ -0,0 +1,244 @@
+"""
+Server-side JSON generation
+PostgreSQL 이 행 JSON 을 만들고 앱은 bytes 를 그대로 흘려보내는 경로 (행 단위 Python 작업 없음)
+
+- 호출자는 json_build_object(...) AS doc 컬럼 + 정렬 컬럼을 가진 SELECT 를 넘긴다
+- PostgreSQL 이 doc 를 CHUNK_ROWS 개씩 string_agg 로 이어 붙여 chunk 단위로 반환
+  (서버 측 named cursor 라 전체 결과를 메모리에 올리지 않음)
+- open_json_array(): 첫 chunk 까지는 호출 시점에 실행 (SQL 오류는 응답 시작 전에 예외),
+  나머지는 JsonArrayStream 으로 스트리밍, 연결은 close() 에서 반환 (HEAD/304 처럼 body 를
+  읽지 않는 응답도 WSGI 서버가 close() 를 호출)
+
+Benchmark (Python 측 vs DB 측 JSON, 50k / 500k 행):
+    python -m core.utils.db_json --benchmark
+"""
+
+import json
+import logging
+import sys
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ROWS = 5000
+
+
+def chunked_array_sql(select_sql: str, order_by: str, chunk_rows: int = CHUNK_ROWS) -> str:
+    """
+    select_sql 의 doc 컬럼을 order_by 순서로 chunk_rows 개씩 이어 붙이는 쿼리
+
+    select_sql 은 doc (json) 과 order_by 에서 참조하는 컬럼을 반환해야 한다.
+    결과: (chunk text '{...},{...}', rows) 행들, chunk 순서대로
+    """
+    chunk_rows = int(chunk_rows)
+    return f"""
+        SELECT string_agg(doc::text, ',' ORDER BY rn) AS chunk, count(*) AS rows
+        FROM (
+            SELECT doc, row_number() OVER (ORDER BY {order_by}) AS rn
+            FROM ({select_sql}) AS src
+        ) AS docs
+        GROUP BY (rn - 1) / {chunk_rows}
+        ORDER BY (rn - 1) / {chunk_rows}
+    """
+
+
+class JsonArrayStream:
+    """
+    open_json_array() 의 응답 body (iterator)
+
+    연결/커서 반환은 close() 에서 한다. WSGI 서버는 body 를 끝까지 읽든,
+    중간에 끊기든, HEAD/304 처럼 전혀 읽지 않든 close() 를 호출하므로
+    (generator 의 finally 는 시작하지 않은 generator 를 닫을 때 실행되지 않는다)
+    풀 연결이 항상 돌아간다.
+    """
+
+    def __init__(self, db_service, conn, cursor, first, prefix: bytes, suffix: Callable[[int], bytes]):
+        self._db_service = db_service
+        self._conn = conn
+        self._cursor = cursor
+        self._row = first
+        self._prefix = prefix
+        self._suffix = suffix
+        self._rows = 0
+        self._state = "start"  # start → body → end → done
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            if self._state == "start":
+                self._state = "body"
+                return self._prefix + b"["
+            if self._state == "body":
+                row = self._row
+                if row is not None:
+                    chunk, count = row
+                    separator = b"," if self._rows else b""
+                    self._rows += count
+                    self._row = self._cursor.fetchone()
+                    return separator + chunk.encode("utf-8")
+                self._state = "end"
+                return b"]" + self._suffix(self._rows)
+        except Exception as e:
+            logger.error(f"DB-side JSON stream aborted after {self._rows} rows: {e}")
+            self.close()
+            raise
+        self.close()
+        raise StopIteration
+
+    def close(self):
+        """커서 닫기 + 롤백 + 풀 반환 (여러 번 호출해도 1회만 수행)"""
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        self._state = "done"
+        try:
+            self._cursor.close()
+            conn.rollback()
+        except Exception:
+            pass
+        self._db_service.return_connection(conn)
+
+
+def open_json_array(
+    db_service: Any,
+    select_sql: str,
+    params: Optional[Sequence[Any]],
+    order_by: str,
+    prefix: bytes = b"",
+    suffix: Callable[[int], bytes] = lambda rows: b"",
+    chunk_rows: int = CHUNK_ROWS,
+) -> JsonArrayStream:
+    """
+    prefix + '[' + DB 가 만든 행 JSON + ']' + suffix(rows) 를 내보내는 iterator
+
+    쿼리 실행과 첫 chunk 조회는 이 함수 안에서 바로 수행하므로 DB 오류는 호출자에게
+    예외로 전달된다. 그 이후 오류는 로그만 남고 응답이 잘린다 (헤더 전송 후라 상태 변경 불가).
+    반환값은 Response body 로 그대로 넘기며, 연결은 WSGI 서버가 호출하는 close() 에서 반환된다.
+    """
+    conn = db_service.get_connection()
+    cursor = None
+    try:
+        cursor = conn.cursor(name=f"db_json_{uuid.uuid4().hex[:12]}")
+        cursor.itersize = 2
+        cursor.execute(chunked_array_sql(select_sql, order_by, chunk_rows), params)
+        first = cursor.fetchone()
+    except Exception:
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        conn.rollback()
+        db_service.return_connection(conn)
+        raise
+
+    return JsonArrayStream(db_service, conn, cursor, first, prefix, suffix)
+
+
+def join_docs(docs: Sequence[str]) -> str:
+    """행 JSON 텍스트 → JSON 배열 텍스트 (파싱 없이 이어 붙임)"""
+    return "[" + ",".join(docs) + "]"
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+BENCH_SETUP_SQL = """
+    CREATE TEMP TABLE bench_json_rows ON COMMIT DROP AS
+    SELECT
+        format('10.%%s.%%s.%%s', (g >> 16) & 255, (g >> 8) & 255, g & 255) AS ip_address,
+        (ARRAY['KR', 'US', 'CN', NULL])[(1 + g %% 4)::int] AS country,
+        CASE WHEN g %% 7 = 0 THEN NULL ELSE 'malicious activity' END AS reason,
+        (g %% 101) AS confidence_level,
+        DATE '2025-01-01' - (g %% 365) AS detection_date,
+        TIMESTAMP '2025-01-01 12:00:00.123456' - (g %% 100000) * INTERVAL '1 second' AS updated_at
+    FROM generate_series(1, %s) AS g
+"""
+
+BENCH_PYTHON_SQL = """
+    SELECT ip_address AS ip, COALESCE(country, 'unknown') AS country,
+           COALESCE(reason, 'unspecified') AS reason,
+           confidence_level AS confidence, detection_date AS first_seen, updated_at AS last_updated
+    FROM bench_json_rows
+    ORDER BY confidence_level DESC, detection_date DESC, ip_address
+"""
+
+BENCH_DOC_SQL = """
+    SELECT json_build_object(
+               'ip', ip_address, 'country', COALESCE(country, 'unknown'),
+               'reason', COALESCE(reason, 'unspecified'), 'confidence', confidence_level,
+               'first_seen', detection_date, 'last_updated', updated_at
+           ) AS doc,
+           confidence_level, detection_date, ip_address
+    FROM bench_json_rows
+"""
+
+BENCH_ORDER_BY = "confidence_level DESC, detection_date DESC, ip_address"
+
+
+def benchmark_db_json(db_service: Any, sizes=(50_000, 500_000), repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    Python 측 (tuple 행 → dict → fast_json.dumps) vs DB 측 (json_build_object + string_agg chunk)
+
+    임시 테이블(generate_series)로 실행 후 롤백하므로 실제 데이터에는 영향 없음.
+    시간은 쿼리 + 직렬화 전체 (응답 bytes 가 준비될 때까지).
+    """
+    from .fast_json import ORJSON_AVAILABLE, dumps, rows_to_dicts
+
+    results = []
+    conn = db_service.get_connection()
+    try:
+        for size in sizes:
+            cursor = conn.cursor()
+            cursor.execute(BENCH_SETUP_SQL, (size,))
+            cursor.execute("ANALYZE bench_json_rows")
+
+            timings = {"python": [], "db": []}
+            for _ in range(repeat):
+                started = time.perf_counter()
+                cursor.execute(BENCH_PYTHON_SQL)
+                columns = tuple(desc[0] for desc in cursor.description)
+                python_body = dumps(rows_to_dicts(columns, cursor.fetchall()))
+                timings["python"].append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                cursor.execute(chunked_array_sql(BENCH_DOC_SQL, BENCH_ORDER_BY))
+                db_body = b"[" + b",".join(row[0].encode("utf-8") for row in cursor.fetchall()) + b"]"
+                timings["db"].append(time.perf_counter() - started)
+
+            if size <= 50_000:
+                assert json.loads(python_body) == json.loads(db_body), "payload mismatch"
+            python_ms = min(timings["python"]) * 1000
+            db_ms = min(timings["db"]) * 1000
+            results.append(
+                {
+                    "rows": size,
+                    "python_ms": round(python_ms, 1),
+                    "db_ms": round(db_ms, 1),
+                    "speedup": round(python_ms / db_ms, 2) if db_ms else None,
+                    "bytes": len(db_body),
+                    "orjson": ORJSON_AVAILABLE,
+                }
+            )
+            cursor.close()
+            conn.rollback()
+    finally:
+        conn.rollback()
+        db_service.return_connection(conn)
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    if "--benchmark" in sys.argv:
+        from core.services.database_service import DatabaseService
+
+        for result in benchmark_db_json(DatabaseService()):
+            print(result)
+    else:
+        print("Usage: python -m core.utils.db_json --benchmark")
@@ -38,17 +38,23 @@ def get_db_connection(
             cursor.execute("SELECT * FROM table")
 
     Args:
-        config: 데이터베이스 설정 (None이면 기본값 사용)
+        config: 데이터베이스 설정 (None이면 공용 연결 풀 사용)
         cursor_factory: 커서 팩토리 (기본값: RealDictCursor)
 
     Yields:
         psycopg2 connection object
     """
-    db_config = config or get_db_config()
     conn = None
 
     try:
-        conn = psycopg2.connect(**db_config, cursor_factory=cursor_factory)
+        if config is None:
+            # 기본 DB 는 공용 풀에서 대여 (finally 의 close() 가 풀 반환)
+            from ..database.pool import get_pool
+
+            conn = get_pool().getconn()
+            conn.cursor_factory = cursor_factory
+        else:
+            conn = psycopg2.connect(**config, cursor_factory=cursor_factory)
         yield conn
         conn.commit()
     except psycopg2.Error as e:
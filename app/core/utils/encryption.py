@@ -4,6 +4,7 @@
 """
 
 import base64
+import functools
 import hashlib
 import os
 import logging
@@ -15,6 +16,19 @@
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def _derive_fernet(master_key: str, salt: bytes) -> Fernet:
+    """PBKDF2(100,000회) 키 파생 + Fernet 생성 - (마스터 키, 솔트)별 1회만 수행"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(master_key.encode()))
+    return Fernet(key)
+
+
 class CredentialEncryption:
     """인증 정보 암호화 클래스"""
 
@@ -80,14 +94,8 @@ def _create_fernet_instance(self) -> Fernet:
         salt_env = os.getenv("ENCRYPTION_SALT")
         salt = salt_env.encode() if salt_env else b"blacklist-regtech-salt-2025"
 
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(self.master_key.encode()))
-        return Fernet(key)
+        # 같은 키/솔트의 인스턴스는 파생된 Fernet 공유
+        return _derive_fernet(self.master_key, salt)
 
     def encrypt(self, plaintext: str) -> str:
         """
@@ -0,0 +1,216 @@
+"""
+Fast JSON serialization for large row sets
+큰 목록 응답(수만~수십만 행)의 직렬화 비용을 줄이는 경로
+
+- orjson 이 있으면 사용 (없으면 표준 json 으로 동일한 출력)
+- rows_to_dicts(): tuple cursor 결과 + 한 번만 읽은 컬럼명 → 행마다 dict 1개
+  (RealDictRow → dict 복사 → isoformat 루프의 중간 객체 제거)
+- json_response(): datetime/date 를 ISO 8601 로 직접 직렬화해 바로 bytes 응답 생성
+  (행마다 isoformat() 호출 불필요)
+- raw_json(): PostgreSQL 이 만든 JSON 텍스트를 다시 파싱하지 않고 응답에 삽입 (orjson.Fragment)
+- dumps_flask(): Flask JSON provider 용. datetime 은 OPT_PASSTHROUGH_DATETIME 으로
+  default 핸들러에 넘겨 Flask 기본값(HTTP date)과 같은 출력을 유지
+
+Benchmark:
+    python -m core.utils.fast_json --benchmark
+"""
+
+import ipaddress
+import json
+import sys
+import time
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from flask import Response
+from werkzeug.http import http_date
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(value: Any) -> Any:
+    """orjson/json 이 기본 지원하지 않는 타입 (Decimal, ipaddress 등)"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).decode("utf-8", "replace")
+    if isinstance(value, (ipaddress.IPv4Address, ipaddress.IPv6Address,
+                          ipaddress.IPv4Network, ipaddress.IPv6Network)):
+        return str(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _iso_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return _default(value)
+
+
+def _flask_default(value: Any) -> Any:
+    """Flask DefaultJSONProvider 와 같은 datetime 표현 (RFC 822 HTTP date)"""
+    if isinstance(value, date):
+        return http_date(value)
+    return _default(value)
+
+
+def _flask_iso_fallback(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return _flask_default(value)
+
+
+class _RawJSON:
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+def raw_json(text: str) -> Any:
+    """이미 직렬화된 JSON 텍스트 (예: PostgreSQL 이 만든 배열) 를 dumps() 결과에 그대로 삽입"""
+    if ORJSON_AVAILABLE and hasattr(orjson, "Fragment"):  # orjson >= 3.9
+        return orjson.Fragment(text)
+    return _RawJSON(text)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """datetime/date 를 ISO 8601 로 직렬화 (행 데이터용)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except TypeError:
+            pass  # _RawJSON (orjson < 3.9) → 아래 표준 json 경로
+
+    raw_parts = []
+
+    def default(value):
+        if isinstance(value, _RawJSON):
+            raw_parts.append(value.text)
+            return f"\x00raw{len(raw_parts) - 1}\x00"
+        return _iso_default(value)
+
+    text = json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+    for index, part in enumerate(raw_parts):
+        text = text.replace(f'"\\u0000raw{index}\\u0000"', part, 1)
+    return text.encode("utf-8")
+
+
+def dumps_flask(obj: Any, sort_keys: bool = True) -> bytes:
+    """jsonify() 와 같은 출력 (compact, datetime → HTTP date)"""
+    if ORJSON_AVAILABLE:
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        )
+        return orjson.dumps(obj, default=_flask_default, option=option)
+    return json.dumps(
+        obj, default=_flask_iso_fallback, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys
+    ).encode("utf-8")
+
+
+def json_response(obj: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """dumps() 결과로 바로 application/json 응답 생성 (jsonify 우회)"""
+    from ..monitoring.tracing import span
+
+    with span("json"):
+        body = dumps(obj)
+    return Response(body + b"\n", status=status, headers=headers, mimetype="application/json")
+
+
+def rows_to_dicts(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """tuple 행 → dict 행 (컬럼명은 cursor.description 에서 한 번만 읽은 것을 재사용)"""
+    columns = tuple(columns)
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def cursor_columns(cursor) -> tuple:
+    return tuple(desc[0] for desc in cursor.description)
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+def _synthetic_rows(count: int):
+    """unified_ip_list / json-connector 와 같은 컬럼 구성의 tuple 행"""
+    columns = (
+        "list_type", "id", "ip_address", "reason", "source", "confidence_level",
+        "detection_count", "is_active", "country", "detection_date", "removal_date",
+        "last_seen", "created_at", "updated_at",
+    )
+    now = datetime(2025, 1, 1, 12, 0, 0, 123456)
+    today = date(2025, 1, 1)
+    rows = [
+        (
+            "blacklist", i, f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", "malicious activity",
+            "REGTECH", 80, 3, True, "KR", today, None, now, now, now,
+        )
+        for i in range(count)
+    ]
+    return columns, rows
+
+
+def benchmark_serialization(sizes=(10_000, 100_000), repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    기존 경로 vs 빠른 경로 직렬화 시간 (DB 조회 제외, 같은 행 데이터)
+
+    legacy: RealDictRow 흉내(dict) → dict 복사 → datetime isoformat 루프 → json.dumps
+    fast:   tuple 행 → rows_to_dicts → dumps (orjson 있으면 orjson)
+    """
+    results = []
+    for size in sizes:
+        columns, rows = _synthetic_rows(size)
+        timings = {"legacy": [], "fast": []}
+        for _ in range(repeat):
+            started = time.perf_counter()
+            real_dict_rows = [dict(zip(columns, row)) for row in rows]
+            items = []
+            for row in real_dict_rows:
+                item = dict(row)
+                for key, value in item.items():
+                    if isinstance(value, (datetime, date)):
+                        item[key] = value.isoformat()
+                items.append(item)
+            legacy_body = json.dumps({"items": items}, ensure_ascii=False, separators=(",", ":"))
+            timings["legacy"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            fast_body = dumps({"items": rows_to_dicts(columns, rows)})
+            timings["fast"].append(time.perf_counter() - started)
+
+        assert json.loads(legacy_body) == json.loads(fast_body), "serialization mismatch"
+        legacy_ms = min(timings["legacy"]) * 1000
+        fast_ms = min(timings["fast"]) * 1000
+        results.append(
+            {
+                "rows": size,
+                "legacy_ms": round(legacy_ms, 1),
+                "fast_ms": round(fast_ms, 1),
+                "speedup": round(legacy_ms / fast_ms, 2) if fast_ms else None,
+                "orjson": ORJSON_AVAILABLE,
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        for result in benchmark_serialization():
+            print(result)
+    else:
+        print("Usage: python -m core.utils.fast_json --benchmark")
@@ -0,0 +1,222 @@
+"""
+IP/source/country search query planning
+검색어 유형을 판별해 인덱스를 탈 수 있는 조건으로 변환
+
+Query types:
+    ip_exact   1.2.3.4         → ip_address = %s                          (btree idx_blacklist_ips_ip)
+    cidr       1.2.0.0/16      → ipv4_to_bigint(ip_address) BETWEEN lo/hi (idx_blacklist_ips_ip_int)
+    ip_prefix  1.2.3. / 10.20  → ip_address LIKE '1.2.3.%'                (text_pattern_ops)
+    country    KR / re         → country = 'KR' OR source ILIKE 're%'     (btree idx_blacklist_ips_country +
+                                                                           pg_trgm GIN, BitmapOr)
+    text       그 외 (3자 이상) → ILIKE '%q%' on ip/source/country         (pg_trgm GIN, BitmapOr)
+    too_short  그 외 3자 미만   → FALSE (trigram 을 뽑을 수 없어 인덱스를 못 타므로 검색하지 않음)
+
+2자 검색어는 국가 코드이면서 소스 이름의 앞부분일 수 있어 ("re" → REGTECH) 둘 다 조회한다.
+'%re%' 는 trigram 이 없어 GIN 전체 스캔이 되지만, 'q%' 는 앞쪽 공백 패딩 trigram('  r', ' re')으로
+인덱스를 탈 수 있다.
+
+Indexes: postgres/migrations/006_search_indexes.sql
+
+Plan verification:
+    python -m core.utils.ip_search   # 1M-row synthetic table, EXPLAIN per query type
+"""
+
+import ipaddress
+import re
+from typing import Any, Dict, List, Tuple
+
+# 검색 결과 상한 (SQL LIMIT 로 전달)
+MAX_SEARCH_LIMIT = 1000
+
+_IP_PREFIX_RE = re.compile(r"^\d{1,3}(\.\d{1,3}){0,3}\.?$")
+_COUNTRY_RE = re.compile(r"^[A-Za-z]{2}$")
+
+# pg_trgm 이 '%q%' 패턴에서 trigram 을 뽑을 수 있는 최소 길이
+MIN_TEXT_LENGTH = 3
+
+# LIKE 패턴 특수문자 이스케이프
+_LIKE_ESCAPE = str.maketrans({"\\": "\\\\", "%": "\\%", "_": "\\_"})
+
+
+def _like_escape(value: str) -> str:
+    return value.translate(_LIKE_ESCAPE)
+
+
+def classify_query(query: str) -> str:
+    """검색어 유형 판별 (ip_exact | cidr | ip_prefix | country | text | too_short)"""
+    query = query.strip()
+
+    if "/" in query:
+        try:
+            ipaddress.IPv4Network(query, strict=False)
+            return "cidr"
+        except ValueError:
+            return "too_short" if len(query) < MIN_TEXT_LENGTH else "text"
+
+    try:
+        ipaddress.IPv4Address(query)
+        return "ip_exact"
+    except ValueError:
+        pass
+
+    if _IP_PREFIX_RE.match(query):
+        return "ip_prefix"
+    if _COUNTRY_RE.match(query):
+        return "country"
+    if len(query) < MIN_TEXT_LENGTH:
+        return "too_short"
+    return "text"
+
+
+def ip_predicate(column: str, query: str, kind: str = None) -> Tuple[str, List[Any]]:
+    """
+    ip_address 컬럼 단일 조건 (IPManagementRepository 검색용)
+
+    text/country 유형은 부분 일치 (trigram 인덱스)로 처리, too_short 는 일치 없음.
+    """
+    query = query.strip()
+    kind = kind or classify_query(query)
+
+    if kind == "too_short":
+        return "FALSE", []
+    if kind == "ip_exact":
+        return f"{column} = %s", [query]
+    if kind == "cidr":
+        network = ipaddress.IPv4Network(query, strict=False)
+        return (
+            f"ipv4_to_bigint({column}) BETWEEN %s AND %s",
+            [int(network.network_address), int(network.broadcast_address)],
+        )
+    if kind == "ip_prefix":
+        return f"{column} LIKE %s", [_like_escape(query) + "%"]
+    return f"{column} ILIKE %s", ["%" + _like_escape(query) + "%"]
+
+
+def search_predicate(query: str) -> Tuple[str, List[Any], str]:
+    """
+    blacklist_ips 통합 검색 조건 (ip_address / source / country)
+
+    Returns:
+        (where_sql, params, kind)
+    """
+    query = query.strip()
+    kind = classify_query(query)
+
+    if kind in ("ip_exact", "cidr", "ip_prefix"):
+        sql, params = ip_predicate("ip_address", query, kind)
+        return sql, params, kind
+    if kind == "country":
+        return "(country = %s OR source ILIKE %s)", [query.upper(), _like_escape(query) + "%"], kind
+    if kind == "too_short":
+        return "FALSE", [], kind
+
+    pattern = "%" + _like_escape(query) + "%"
+    return (
+        "(ip_address ILIKE %s OR source ILIKE %s OR country ILIKE %s)",
+        [pattern, pattern, pattern],
+        kind,
+    )
+
+
+def clamp_limit(limit: Any, default: int = 100) -> int:
+    """검색 결과 수 제한 (1..MAX_SEARCH_LIMIT)"""
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, MAX_SEARCH_LIMIT))
+
+
+# ----------------------------------------------------------------------
+# EXPLAIN verification on a synthetic dataset
+# ----------------------------------------------------------------------
+
+# 합성 데이터는 10.0.0.1 부터 연속 할당
+SAMPLE_QUERIES = {
+    "ip_exact": "10.1.2.3",
+    "cidr": "10.2.3.0/24",
+    "ip_prefix": "10.3.4.",
+    "country": "KR",
+    "text": "udium-13",
+    "too_short": "a-",
+}
+
+_BENCH_TABLE = "ip_search_bench"
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> List[Tuple[str, str]]:
+    nodes = [(plan.get("Node Type", ""), plan.get("Index Name", ""))]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+def verify_plans(db_service, rows: int = 1_000_000) -> Dict[str, Dict[str, Any]]:
+    """
+    합성 데이터(rows 행)로 유형별 검색 쿼리의 실행 계획 검증
+
+    blacklist_ips 의 컬럼/인덱스를 복제한 TEMP 테이블에 데이터를 생성하고
+    EXPLAIN (ANALYZE, FORMAT JSON) 결과에 Seq Scan 이 없는지 확인한다.
+    (migration 006 적용 필요, 운영 테이블은 건드리지 않음)
+    """
+    conn = db_service.get_connection()
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"CREATE TEMP TABLE {_BENCH_TABLE} (LIKE blacklist_ips INCLUDING DEFAULTS INCLUDING INDEXES) "
+            "ON COMMIT DROP"
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {_BENCH_TABLE} (id, ip_address, source, country, detection_count, last_seen)
+            SELECT g,
+                   ((g >> 24) & 255) || '.' || ((g >> 16) & 255) || '.' || ((g >> 8) & 255) || '.' || (g & 255),
+                   (ARRAY['REGTECH', 'SECUDIUM', 'MANUAL', 'ABUSEIPDB'])[1 + g %% 4] || '-' || (g %% 97),
+                   (ARRAY['KR', 'US', 'CN', 'RU', 'JP', 'DE'])[1 + g %% 6] || (g %% 50),
+                   1 + g %% 10,
+                   NOW() - (g %% 1000) * INTERVAL '1 minute'
+            FROM generate_series(167772161, 167772160 + %s) AS g
+            """,
+            (rows,),
+        )
+        cursor.execute(f"ANALYZE {_BENCH_TABLE}")
+
+        for kind, query in SAMPLE_QUERIES.items():
+            where_sql, params, detected = search_predicate(query)
+            cursor.execute(
+                f"""
+                EXPLAIN (ANALYZE, FORMAT JSON)
+                SELECT ip_address, source, country
+                FROM {_BENCH_TABLE}
+                WHERE {where_sql}
+                ORDER BY detection_count DESC, last_seen DESC
+                LIMIT 100
+                """,
+                params,
+            )
+            plan = cursor.fetchone()[0][0]
+            nodes = _plan_nodes(plan["Plan"])
+            results[kind] = {
+                "query": query,
+                "detected": detected,
+                "uses_index": not any(node == "Seq Scan" for node, _ in nodes),
+                "indexes": sorted({index for _, index in nodes if index}),
+                "execution_ms": round(plan.get("Execution Time", 0.0), 3),
+            }
+    finally:
+        conn.rollback()
+        db_service.return_connection(conn)
+
+    return results
+
+
+if __name__ == "__main__":
+    from core.services.database_service import DatabaseService
+
+    report = verify_plans(DatabaseService())
+    for kind, result in report.items():
+        print(f"{kind:10s} {result}")
+    failed = [kind for kind, result in report.items() if not result["uses_index"]]
+    if failed:
+        raise SystemExit(f"sequential scan for: {', '.join(failed)}")
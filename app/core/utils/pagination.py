@@ -0,0 +1,149 @@
+"""
+Keyset (cursor) pagination utilities
+OFFSET 대신 마지막 행의 정렬 키로 seek 하는 페이지네이션 헬퍼
+
+- 커서 토큰: 마지막 행의 (sort_key..., id) 값을 base64url(JSON)로 인코딩한 불투명 문자열
+- 조건: WHERE (sort_key, id) < (%s, %s) → 복합 인덱스 범위 스캔 (앞 페이지 행을 버리지 않음)
+- 전체 건수: 선택 사항 (exact | estimate | none), estimate 는 EXPLAIN 행 추정치 사용
+
+Indexes: postgres/migrations/005_keyset_pagination_indexes.sql
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+# total 파라미터 허용값
+TOTAL_MODES = ("exact", "estimate", "none")
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("unknown cursor value type")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """정렬 키 값 목록 → 불투명 커서 토큰"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    """
+    커서 토큰 → 정렬 키 값 목록
+
+    Raises:
+        ValueError: 토큰이 손상되었거나 키 개수가 맞지 않음
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"malformed cursor: {e}")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("cursor does not match the sort key")
+    try:
+        return [_decode_value(v) for v in values]
+    except TypeError as e:
+        raise ValueError(f"malformed cursor: {e}")
+
+
+def cursor_from_row(row: Any, keys: Sequence[Any]) -> str:
+    """마지막 행에서 다음 페이지 커서 생성 (dict 행은 컬럼명, tuple 행은 인덱스)"""
+    return encode_cursor([row[key] for key in keys])
+
+
+def keyset_condition(
+    expressions: Sequence[str], values: Sequence[Any], descending: bool = True
+) -> Tuple[str, List[Any]]:
+    """
+    Row-value seek 조건 생성
+
+    Example:
+        keyset_condition(["created_at", "id"], [ts, 42])
+        → ("(created_at, id) < (%s, %s)", [ts, 42])
+    """
+    operator = "<" if descending else ">"
+    placeholders = ", ".join(["%s"] * len(expressions))
+    return f"({', '.join(expressions)}) {operator} ({placeholders})", list(values)
+
+
+def parse_total_mode(value: Optional[str], default: str) -> str:
+    """total 쿼리 파라미터 정규화 (잘못된 값은 ValueError)"""
+    if value is None:
+        return default
+    mode = value.lower()
+    if mode not in TOTAL_MODES:
+        raise ValueError(f"total must be one of {', '.join(TOTAL_MODES)}")
+    return mode
+
+
+def parse_keyset_args(args: Any, size: int, default_total: str = "exact") -> Tuple[bool, Optional[List[Any]], str]:
+    """
+    request.args → (keyset 모드 여부, seek 값 또는 None, total 모드)
+
+    cursor 파라미터가 있으면 (빈 값 = 첫 페이지) keyset 모드이며 total 기본값은 estimate,
+    없으면 기존 page/offset 모드이며 total 기본값은 default_total.
+
+    Raises:
+        ValueError: 잘못된 cursor/total 값
+    """
+    token = args.get("cursor")
+    keyset = token is not None
+    after = decode_cursor(token, size) if token else None
+    total_mode = parse_total_mode(args.get("total"), "estimate" if keyset else default_total)
+    return keyset, after, total_mode
+
+
+def page_count(total: Optional[int], per_page: int) -> Optional[int]:
+    """전체 페이지 수 (total 미조회 시 None)"""
+    if total is None:
+        return None
+    return (total + per_page - 1) // per_page if per_page > 0 else 0
+
+
+def estimate_count(cursor, query: str, params: Optional[Sequence[Any]] = None) -> int:
+    """
+    플래너 행 추정치로 건수 추정 (COUNT(*) 전체 스캔 없음)
+
+    필터가 없는 테이블/뷰는 pg_class.reltuples 기반 추정치와 같음.
+    """
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {query}", params or ())
+    row = cursor.fetchone()
+    plan = next(iter(row.values())) if isinstance(row, dict) else row[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(cursor, mode: str, query: str, params: Optional[Sequence[Any]] = None) -> Optional[int]:
+    """
+    total 모드에 따른 건수 조회
+
+    Args:
+        mode: exact (COUNT(*)), estimate (EXPLAIN 추정), none (조회 안 함 → None)
+        query: 'SELECT ... FROM ... WHERE ...' (ORDER BY/LIMIT 제외)
+    """
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        return estimate_count(cursor, query, params)
+
+    cursor.execute(f"SELECT COUNT(*) FROM ({query}) AS counted", params or ())
+    row = cursor.fetchone()
+    return int(next(iter(row.values())) if isinstance(row, dict) else row[0])
@@ -29,4 +29,11 @@ echo -e "${GREEN}🚀 Starting Flask application...${NC}"
 echo -e "${BLUE}========================================${NC}"
 
 # Start Flask application
+# APP_SERVER=gunicorn: APP_WORKERS processes, metrics merged via PROMETHEUS_MULTIPROC_DIR
+if [ "${APP_SERVER:-flask}" = "gunicorn" ]; then
+    echo -e "${GREEN}🦄 gunicorn: ${APP_WORKERS:-4} workers x ${APP_THREADS:-8} threads${NC}"
+    export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}"
+    exec gunicorn -c gunicorn.conf.py run_app:app
+fi
+
 exec python run_app.py
@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration (APP_SERVER=gunicorn in entrypoint.sh)
+
+- APP_WORKERS worker processes x APP_THREADS threads (gthread)
+- Prometheus multiprocess: the master prepares PROMETHEUS_MULTIPROC_DIR before
+  forking so every worker imports prometheus_client in mmap mode, and
+  child_exit cleans up the dead worker's live gauge files.
+"""
+
+import importlib.util
+import os
+
+# Loaded by path: importing the core.monitoring package here would pull
+# prometheus_client and Flask into the master before the workers fork.
+_spec = importlib.util.spec_from_file_location(
+    "_prometheus_multiprocess",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "core", "monitoring", "multiprocess.py"),
+)
+_multiprocess = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_multiprocess)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '2542')}"
+workers = int(os.environ.get("APP_WORKERS", "4"))
+threads = int(os.environ.get("APP_THREADS", "8"))
+worker_class = "gthread"
+timeout = int(os.environ.get("APP_TIMEOUT", "120"))
+graceful_timeout = 30
+accesslog = None
+errorlog = "-"
+
+
+def on_starting(server):
+    _multiprocess.prepare_multiproc_dir()
+
+
+def child_exit(server, worker):
+    _multiprocess.mark_worker_dead(worker.pid)
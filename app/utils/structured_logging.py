@@ -4,63 +4,136 @@
 Phase 2.1: Structlog 기반 구조화된 로깅
 """
 import logging
+import threading
 import time
 import re
 from datetime import datetime
-from collections import defaultdict
+from collections import OrderedDict
+from typing import Optional
 import structlog
 from structlog.processors import JSONRenderer
 import sys
 
 
-class DuplicateFilter(logging.Filter):
-    """중복 로그 메시지 필터링"""
+class RateLimitFilter(logging.Filter):
+    """
+    중복 로그 억제 필터 (O(1), 메모리 상한)
+
+    - 메시지 지문: 로거 이름 + 레벨 + 호출 위치(pathname:lineno) 해시
+      (f-string 으로 인자가 섞인 메시지도 같은 호출 위치로 묶임)
+      %-인자 방식(record.args 있음)이면 템플릿도 포함 → 같은 줄의 서로 다른 템플릿은 따로 집계
+    - 지문별 token bucket: burst 개까지 통과, 이후 burst/window 속도로 회복
+    - 지문 테이블은 max_entries 크기의 LRU (가장 오래된 항목부터 제거)
+    - summary_interval 마다 "suppressed N duplicates" 요약 레코드 출력
+    """
 
-    def __init__(self, max_duplicates: int = 3, time_window: int = 300):
+    SUMMARY_ATTR = "_rate_limit_summary"
+
+    def __init__(
+        self,
+        burst: int = 3,
+        window: float = 300,
+        max_entries: int = 1024,
+        summary_interval: float = 60,
+        target: Optional[logging.Handler] = None,
+    ):
         super().__init__()
-        self.max_duplicates = max_duplicates
-        self.time_window = time_window  # 5분 윈도우
-        self.message_counts = defaultdict(list)
-        self.suppressed_messages = set()
+        self.burst = max(1, burst)
+        self.window = window
+        self.refill_rate = self.burst / window if window > 0 else float("inf")
+        self.max_entries = max_entries
+        self.summary_interval = summary_interval
+        # 요약 레코드를 보낼 핸들러 (없으면 원래 로거로 전달)
+        self.target = target
+
+        # fingerprint -> [tokens, last_refill, suppressed, first_suppressed_at, sample_message, name, levelno]
+        self._entries: "OrderedDict[int, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_summary_at = time.monotonic() + summary_interval
 
     def filter(self, record):
         """로그 레코드 필터링"""
-        message_key = f"{record.name}:{record.levelname}:{record.getMessage()}"
-        current_time = time.time()
-
-        # 시간 윈도우 밖의 기록들 정리
-        self.message_counts[message_key] = [
-            t
-            for t in self.message_counts[message_key]
-            if current_time - t < self.time_window
-        ]
+        if getattr(record, self.SUMMARY_ATTR, False):
+            return True
+
+        now = time.monotonic()
+        template = record.msg if record.args and isinstance(record.msg, str) else None
+        fingerprint = hash((record.name, record.pathname, record.lineno, record.levelno, template))
+        pending = []
+
+        with self._lock:
+            entries = self._entries
+            entry = entries.get(fingerprint)
+            if entry is None:
+                entry = [float(self.burst), now, 0, 0.0, None, record.name, record.levelno]
+                entries[fingerprint] = entry
+                if len(entries) > self.max_entries:
+                    _, evicted = entries.popitem(last=False)
+                    if evicted[2]:
+                        pending.append(evicted)
+            else:
+                entries.move_to_end(fingerprint)
+                entry[0] = min(self.burst, entry[0] + (now - entry[1]) * self.refill_rate)
+                entry[1] = now
+
+            if entry[0] >= 1.0:
+                entry[0] -= 1.0
+                allowed = True
+            else:
+                if not entry[2]:
+                    entry[3] = now
+                    entry[4] = record.getMessage()[:80]
+                entry[2] += 1
+                allowed = False
+
+            if now >= self._next_summary_at:
+                self._next_summary_at = now + self.summary_interval
+                for other in entries.values():
+                    if other[2]:
+                        pending.append(list(other))
+                        other[2] = 0
+
+        for summary in pending:
+            self._emit_summary(summary, now)
+
+        return allowed
+
+    def _emit_summary(self, entry: list, now: float):
+        """억제된 중복 로그 요약 레코드 출력"""
+        _, _, suppressed, first_at, sample, name, levelno = entry
+        summary = logging.LogRecord(
+            name=name,
+            level=max(levelno, logging.WARNING),
+            pathname=__file__,
+            lineno=0,
+            msg="suppressed %d duplicates of '%s' over %ds",
+            args=(suppressed, sample, int(now - first_at)),
+            exc_info=None,
+        )
+        setattr(summary, self.SUMMARY_ATTR, True)
+        try:
+            if self.target is not None:
+                self.target.handle(summary)
+            else:
+                logging.getLogger(name).handle(summary)
+        except Exception:
+            pass
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "tracked_fingerprints": len(self._entries),
+                "currently_suppressed": sum(e[2] for e in self._entries.values()),
+            }
 
-        # 현재 시간 추가
-        self.message_counts[message_key].append(current_time)
-
-        # 중복 횟수 체크
-        count = len(self.message_counts[message_key])
-
-        if count > self.max_duplicates:
-            if message_key not in self.suppressed_messages:
-                # 첫 억제 시에만 알림 로그 생성
-                _suppressed_record = logging.LogRecord(
-                    name=record.name,
-                    level=logging.WARNING,
-                    pathname=record.pathname,
-                    lineno=record.lineno,
-                    msg=f"중복 로그 억제: '{record.getMessage()[:50]}...' (이후 {self.time_window}초 동안 억제)",
-                    args=(),
-                    exc_info=None,
-                )
-                self.suppressed_messages.add(message_key)
-                # 억제 알림은 통과시키고, 원래 메시지는 차단
-                return False
-            return False
-
-        # 억제되었던 메시지가 다시 나타나면 억제 세트에서 제거
-        self.suppressed_messages.discard(message_key)
-        return True
+
+class DuplicateFilter(RateLimitFilter):
+    """중복 로그 메시지 필터링 (RateLimitFilter 호환 래퍼)"""
+
+    def __init__(self, max_duplicates: int = 3, time_window: int = 300):
+        super().__init__(burst=max_duplicates, window=time_window)
+        self.max_duplicates = max_duplicates
+        self.time_window = time_window  # 5분 윈도우
 
 
 class HealthCheckFilter(logging.Filter):
@@ -181,7 +254,9 @@ def setup_smart_logging(
         console_handler.addFilter(LogLevelFixer())
 
     if suppress_duplicates:
-        console_handler.addFilter(DuplicateFilter(max_duplicates=2, time_window=300))
+        console_handler.addFilter(
+            RateLimitFilter(burst=2, window=300, target=console_handler)
+        )
 
     if suppress_health_checks:
         console_handler.addFilter(HealthCheckFilter(suppress_normal_health_checks=True))
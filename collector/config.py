@@ -4,6 +4,10 @@
 """
 
 import os
+import json
+import select
+import threading
+import time
 from typing import Dict, Any
 import psycopg2
 import logging
@@ -39,6 +43,74 @@ class CollectorConfig:
     # 인증정보 캐시 (DB 조회 최소화)
     _credentials_cache: Dict[str, Dict[str, str]] = {}
     _cache_loaded = False
+    _cipher = None
+    _settings_listener: threading.Thread = None
+
+    @classmethod
+    def _get_cipher(cls):
+        """복호화용 Fernet (프로세스당 1회 생성)"""
+        if cls._cipher is None:
+            from cryptography.fernet import Fernet
+
+            key = os.getenv("ENCRYPTION_KEY", "").encode() or Fernet.generate_key()
+            cls._cipher = Fernet(key)
+        return cls._cipher
+
+    @classmethod
+    def invalidate_credentials(cls) -> None:
+        """인증정보 캐시 무효화 → 다음 조회 시 DB 재로드"""
+        cls._cache_loaded = False
+        logger.info("인증정보 캐시 무효화 (settings_changed)")
+
+    @classmethod
+    def start_settings_listener(cls) -> None:
+        """LISTEN settings_changed (migration 011) → collection_credentials 변경 시 캐시 무효화"""
+        if cls._settings_listener is not None:
+            return
+        cls._settings_listener = threading.Thread(
+            target=cls._listen_settings_changed, name="settings-listener", daemon=True
+        )
+        cls._settings_listener.start()
+
+    @classmethod
+    def _listen_settings_changed(cls) -> None:
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(
+                    host=cls.POSTGRES_HOST,
+                    port=cls.POSTGRES_PORT,
+                    database=cls.POSTGRES_DB,
+                    user=cls.POSTGRES_USER,
+                    password=cls.POSTGRES_PASSWORD,
+                )
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                conn.cursor().execute("LISTEN settings_changed;")
+                # 재접속 사이 놓친 변경 대비
+                cls.invalidate_credentials()
+                logger.info("✅ settings_changed LISTEN 시작")
+
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    tables = set()
+                    while conn.notifies:
+                        try:
+                            tables.add(json.loads(conn.notifies.pop(0).payload).get("table"))
+                        except (ValueError, AttributeError):
+                            tables.add(None)
+                    if tables - {"system_settings"}:
+                        cls.invalidate_credentials()
+            except Exception as e:
+                logger.warning(f"settings_changed LISTEN 오류: {e} - 5초 후 재연결")
+                time.sleep(5)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
 
     @classmethod
     def _load_credentials_from_db(cls) -> None:
@@ -70,13 +142,7 @@ def _load_credentials_from_db(cls) -> None:
 
                 # 암호화된 데이터 복호화 (AES-256)
                 try:
-                    from cryptography.fernet import Fernet
-
-                    key = (
-                        os.getenv("ENCRYPTION_KEY", "").encode()
-                        or Fernet.generate_key()
-                    )
-                    f = Fernet(key)
+                    f = cls._get_cipher()
 
                     decrypted_username = f.decrypt(username.encode()).decode()
                     decrypted_password = f.decrypt(password.encode()).decode()
@@ -134,6 +200,11 @@ def get_secudium_credentials(cls) -> tuple:
     COLLECTION_INTERVAL = int(os.getenv("COLLECTION_INTERVAL", "3600"))  # 1시간
     MAX_RETRY_ATTEMPTS = int(os.getenv("MAX_RETRY_ATTEMPTS", "3"))
     BATCH_SIZE = int(os.getenv("BATCH_SIZE", "2000"))  # 배치 크기 증가
+    EXPIRY_BATCH_SIZE = int(os.getenv("EXPIRY_BATCH_SIZE", "5000"))  # 만료 처리 청크 크기
+    RETENTION_KEEP_ROWS = int(os.getenv("RETENTION_KEEP_ROWS", "1000000"))  # blacklist_ips 보존 건수 (최신순)
+    RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "5000"))  # 보존 정책 삭제 배치 크기
+    RETENTION_BATCH_SLEEP = float(os.getenv("RETENTION_BATCH_SLEEP", "0"))  # 배치 사이 대기 (I/O 완화)
+    RETENTION_ARCHIVE_DIR = os.getenv("RETENTION_ARCHIVE_DIR", "/app/logs/retention")  # 삭제 행 아카이브
 
     # 성능 최적화 설정
     MAX_PAGES_PER_COLLECTION = int(os.getenv("MAX_PAGES_PER_COLLECTION", "20"))
@@ -3,13 +3,72 @@
 기존 데이터 유지 및 품질 향상을 위한 통합 관리
 """
 
+import time
 import logging
 from datetime import datetime
 from typing import Dict, List, Any
+from psycopg2.extras import RealDictCursor
 from core.database import db_service
+from core.retention_engine import BlacklistRetentionEngine
 
 logger = logging.getLogger(__name__)
 
+# 중복 정리 DELETE 배치 크기
+CLEANUP_BATCH_SIZE = 5000
+
+# 품질 보고서 지표 전체를 blacklist_ips 1회 스캔으로 계산
+#   - ip_rank / group_rank: ip_address / (ip_address, source) 내 최신순 순번 (같은 정렬 1회)
+#   - duplicate_ids: 그룹별 최신 행을 제외한 id → _perform_automatic_cleanup 이 그대로 사용
+#   - old_inactive: 만료 비활성화 이후 "오래된 비활성 데이터" 삭제 대상이 될 행 수
+QUALITY_SCAN_SQL = r"""
+    WITH scan AS (
+        SELECT
+            id, ip_address, source, is_active, detection_date, removal_date, created_at,
+            ROW_NUMBER() OVER w_ip AS ip_rank,
+            ROW_NUMBER() OVER w_group AS group_rank,
+            COUNT(*) OVER (PARTITION BY ip_address, source) AS group_size
+        FROM blacklist_ips
+        WINDOW
+            w_ip AS (PARTITION BY ip_address ORDER BY source, created_at DESC, id DESC),
+            w_group AS (PARTITION BY ip_address, source ORDER BY created_at DESC, id DESC)
+    )
+    SELECT
+        COUNT(*) AS total_ips,
+        COUNT(*) FILTER (WHERE is_active = true) AS active_ips,
+        COUNT(*) FILTER (WHERE is_active = false) AS inactive_ips,
+        COUNT(*) FILTER (WHERE detection_date IS NULL) AS missing_detection_date,
+        COUNT(*) FILTER (WHERE removal_date IS NULL) AS missing_removal_date,
+        COUNT(*) FILTER (WHERE ip_rank = 1) AS unique_ips,
+        COUNT(*) FILTER (WHERE group_rank = 1) AS unique_combinations,
+        COUNT(*) FILTER (
+            WHERE ip_address !~ '^([0-9]{1,3}\.){3}[0-9]{1,3}$'
+            AND ip_address !~ '^([0-9a-fA-F]{0,4}:){1,7}[0-9a-fA-F]{0,4}$'
+        ) AS invalid_ips,
+        COUNT(*) FILTER (
+            WHERE detection_date IS NOT NULL
+            AND removal_date IS NOT NULL
+            AND removal_date < detection_date
+        ) AS logical_errors,
+        COUNT(*) FILTER (
+            WHERE is_active = true AND removal_date IS NOT NULL AND removal_date <= CURRENT_DATE
+        ) AS expired_active,
+        COUNT(*) FILTER (
+            WHERE (is_active = false OR (is_active = true AND removal_date <= CURRENT_DATE))
+            AND (removal_date IS NULL OR removal_date < CURRENT_DATE - INTERVAL '90 days')
+            AND created_at < CURRENT_DATE - INTERVAL '90 days'
+        ) AS old_inactive,
+        COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '7 days') AS last_7_days,
+        COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '30 days') AS last_30_days,
+        COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '90 days') AS last_90_days,
+        MAX(created_at) AS latest_data,
+        MIN(created_at) AS oldest_data,
+        (array_agg(json_build_array(ip_address, source, group_size)
+                   ORDER BY group_size DESC, ip_address, source)
+            FILTER (WHERE group_rank = 1 AND group_size > 1))[1:10] AS duplicate_groups,
+        COALESCE(array_agg(id ORDER BY id) FILTER (WHERE group_rank > 1), '{}') AS duplicate_ids
+    FROM scan
+"""
+
 
 class DataQualityManager:
     """데이터 품질 관리자"""
@@ -33,8 +92,10 @@ def __init__(self):
             "min_active_rate": 0.80,  # 최소 활성률 80%
         }
 
+        self.retention_engine = BlacklistRetentionEngine()
+
     def perform_comprehensive_quality_check(self) -> Dict[str, Any]:
-        """포괄적 데이터 품질 검사"""
+        """포괄적 데이터 품질 검사 (blacklist_ips 1회 스캔)"""
         logger.info("🔍 포괄적 데이터 품질 검사 시작")
 
         quality_report = {
@@ -46,24 +107,27 @@ def perform_comprehensive_quality_check(self) -> Dict[str, Any]:
         }
 
         try:
+            # 0. 모든 지표를 한 번의 스캔으로 계산
+            scan = self._scan_quality_metrics()
+
             # 1. 기본 통계 수집
-            basic_stats = self._collect_basic_statistics()
+            basic_stats = self._collect_basic_statistics(scan)
             quality_report["metrics"].update(basic_stats)
 
             # 2. 데이터 무결성 검사
-            integrity_issues = self._check_data_integrity()
+            integrity_issues = self._check_data_integrity(scan)
             quality_report["issues"].extend(integrity_issues)
 
             # 3. 데이터 신선도 분석
-            freshness_analysis = self._analyze_data_freshness()
+            freshness_analysis = self._analyze_data_freshness(scan)
             quality_report["metrics"].update(freshness_analysis)
 
             # 4. 중복 데이터 검사
-            duplicate_analysis = self._detect_duplicates()
+            duplicate_analysis = self._detect_duplicates(scan)
             quality_report["metrics"].update(duplicate_analysis)
 
-            # 5. 자동 정제 수행
-            cleanup_actions = self._perform_automatic_cleanup()
+            # 5. 자동 정제 수행 (스캔 결과의 대상만)
+            cleanup_actions = self._perform_automatic_cleanup(scan)
             quality_report["actions_taken"].extend(cleanup_actions)
 
             # 6. 권장사항 생성
@@ -86,267 +150,145 @@ def perform_comprehensive_quality_check(self) -> Dict[str, Any]:
             quality_report["error"] = str(e)
             return quality_report
 
-    def _collect_basic_statistics(self) -> Dict[str, Any]:
-        """기본 통계 수집"""
-        try:
-            conn = db_service.get_connection()
-            cursor = conn.cursor()
-
-            # 전체 IP 통계
-            cursor.execute(
-                """
-                SELECT 
-                    COUNT(*) as total_ips,
-                    COUNT(*) FILTER (WHERE is_active = true) as active_ips,
-                    COUNT(*) FILTER (WHERE is_active = false) as inactive_ips,
-                    COUNT(*) FILTER (WHERE detection_date IS NULL) as missing_detection_date,
-                    COUNT(*) FILTER (WHERE removal_date IS NULL) as missing_removal_date,
-                    COUNT(DISTINCT ip_address) as unique_ips,
-                    COUNT(*) - COUNT(DISTINCT ip_address) as duplicate_count
-                FROM blacklist_ips
-            """
-            )
-
-            stats = cursor.fetchone()
-
+    def _scan_quality_metrics(self) -> Dict[str, Any]:
+        """QUALITY_SCAN_SQL 실행 → 지표 + 정제 대상 (중복 id 목록)"""
+        with db_service.get_connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            started = time.monotonic()
+            cursor.execute(QUALITY_SCAN_SQL)
+            scan = dict(cursor.fetchone())
             cursor.close()
-            db_service.return_connection(conn)
-
-            return {
-                "total_ips": stats[0],
-                "active_ips": stats[1],
-                "inactive_ips": stats[2],
-                "missing_detection_date": stats[3],
-                "missing_removal_date": stats[4],
-                "unique_ips": stats[5],
-                "duplicate_ips": stats[6],
-                "active_rate": round(stats[1] / stats[0] * 100, 2)
-                if stats[0] > 0
-                else 0,
-                "duplicate_rate": round(stats[6] / stats[0] * 100, 2)
-                if stats[0] > 0
-                else 0,
-            }
+            conn.rollback()
 
-        except Exception as e:
-            logger.error(f"❌ 기본 통계 수집 실패: {e}")
-            return {}
+        logger.info(
+            f"📊 품질 스캔 완료: {scan['total_ips']:,}행, {time.monotonic() - started:.2f}s "
+            f"(중복 {len(scan['duplicate_ids']):,}건)"
+        )
+        return scan
+
+    def _collect_basic_statistics(self, scan: Dict[str, Any]) -> Dict[str, Any]:
+        """기본 통계"""
+        total = scan["total_ips"]
+        duplicate_count = total - scan["unique_ips"]
+        return {
+            "total_ips": total,
+            "active_ips": scan["active_ips"],
+            "inactive_ips": scan["inactive_ips"],
+            "missing_detection_date": scan["missing_detection_date"],
+            "missing_removal_date": scan["missing_removal_date"],
+            "unique_ips": scan["unique_ips"],
+            "duplicate_ips": duplicate_count,
+            "active_rate": round(scan["active_ips"] / total * 100, 2) if total > 0 else 0,
+            "duplicate_rate": round(duplicate_count / total * 100, 2) if total > 0 else 0,
+        }
 
-    def _check_data_integrity(self) -> List[str]:
+    def _check_data_integrity(self, scan: Dict[str, Any]) -> List[str]:
         """데이터 무결성 검사"""
         issues = []
 
-        try:
-            conn = db_service.get_connection()
-            cursor = conn.cursor()
-
-            # 1. 잘못된 IP 주소 형식 검사
-            cursor.execute(
-                """
-                SELECT COUNT(*) FROM blacklist_ips 
-                WHERE ip_address !~ '^([0-9]{1,3}\.){3}[0-9]{1,3}$'
-                AND ip_address !~ '^([0-9a-fA-F]{0,4}:){1,7}[0-9a-fA-F]{0,4}$'
-            """
-            )
-            invalid_ips = cursor.fetchone()[0]
-
-            if invalid_ips > 0:
-                issues.append(f"잘못된 IP 주소 형식: {invalid_ips}개")
-
-            # 2. 논리적 모순 검사 (removal_date < detection_date)
-            cursor.execute(
-                """
-                SELECT COUNT(*) FROM blacklist_ips 
-                WHERE detection_date IS NOT NULL 
-                AND removal_date IS NOT NULL 
-                AND removal_date < detection_date
-            """
-            )
-            logical_errors = cursor.fetchone()[0]
-
-            if logical_errors > 0:
-                issues.append(f"논리적 모순 (해제일 < 탐지일): {logical_errors}개")
+        # 1. 잘못된 IP 주소 형식
+        if scan["invalid_ips"] > 0:
+            issues.append(f"잘못된 IP 주소 형식: {scan['invalid_ips']}개")
 
-            # 3. 만료된 IP가 여전히 활성 상태인 경우
-            cursor.execute(
-                """
-                SELECT COUNT(*) FROM blacklist_ips 
-                WHERE is_active = true 
-                AND removal_date IS NOT NULL 
-                AND removal_date <= CURRENT_DATE
-            """
-            )
-            expired_active = cursor.fetchone()[0]
+        # 2. 논리적 모순 (removal_date < detection_date)
+        if scan["logical_errors"] > 0:
+            issues.append(f"논리적 모순 (해제일 < 탐지일): {scan['logical_errors']}개")
 
-            if expired_active > 0:
-                issues.append(f"만료되었지만 활성 상태인 IP: {expired_active}개")
-
-            cursor.close()
-            db_service.return_connection(conn)
-
-        except Exception as e:
-            logger.error(f"❌ 데이터 무결성 검사 실패: {e}")
-            issues.append(f"무결성 검사 오류: {e}")
+        # 3. 만료된 IP가 여전히 활성 상태인 경우
+        if scan["expired_active"] > 0:
+            issues.append(f"만료되었지만 활성 상태인 IP: {scan['expired_active']}개")
 
         return issues
 
-    def _analyze_data_freshness(self) -> Dict[str, Any]:
+    def _analyze_data_freshness(self, scan: Dict[str, Any]) -> Dict[str, Any]:
         """데이터 신선도 분석"""
-        try:
-            conn = db_service.get_connection()
-            cursor = conn.cursor()
-
-            # 최신 데이터 분포 분석
-            cursor.execute(
-                """
-                SELECT 
-                    COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '7 days') as last_7_days,
-                    COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '30 days') as last_30_days,
-                    COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '90 days') as last_90_days,
-                    COUNT(*) as total,
-                    MAX(created_at) as latest_data,
-                    MIN(created_at) as oldest_data
-                FROM blacklist_ips
-            """
-            )
-
-            freshness_data = cursor.fetchone()
-
-            cursor.close()
-            db_service.return_connection(conn)
-
-            # 신선도 점수 계산 (최근 30일 데이터 비율 기준)
-            freshness_score = 0
-            if freshness_data[3] > 0:  # total > 0
-                recent_ratio = (
-                    freshness_data[1] / freshness_data[3]
-                )  # last_30_days / total
-                freshness_score = min(100, recent_ratio * 100 * 2)  # 최대 100점
-
-            return {
-                "data_last_7_days": freshness_data[0],
-                "data_last_30_days": freshness_data[1],
-                "data_last_90_days": freshness_data[2],
-                "freshness_score": round(freshness_score, 2),
-                "latest_data_date": freshness_data[4].isoformat()
-                if freshness_data[4]
-                else None,
-                "oldest_data_date": freshness_data[5].isoformat()
-                if freshness_data[5]
-                else None,
-            }
-
-        except Exception as e:
-            logger.error(f"❌ 데이터 신선도 분석 실패: {e}")
-            return {"freshness_score": 0}
-
-    def _detect_duplicates(self) -> Dict[str, Any]:
-        """중복 데이터 검출"""
-        try:
-            conn = db_service.get_connection()
-            cursor = conn.cursor()
-
-            # 중복 IP 검출
-            cursor.execute(
-                """
-                SELECT 
-                    ip_address, 
-                    source, 
-                    COUNT(*) as duplicate_count
-                FROM blacklist_ips 
-                GROUP BY ip_address, source 
-                HAVING COUNT(*) > 1
-                ORDER BY duplicate_count DESC
-                LIMIT 10
-            """
-            )
-
-            duplicate_groups = cursor.fetchall()
-
-            # 전체 중복 통계
-            cursor.execute(
-                """
-                SELECT 
-                    COUNT(*) - COUNT(DISTINCT ip_address, source) as total_duplicates,
-                    COUNT(DISTINCT ip_address, source) as unique_combinations,
-                    COUNT(*) as total_records
-                FROM blacklist_ips
-            """
-            )
-
-            duplicate_stats = cursor.fetchone()
-
-            cursor.close()
-            db_service.return_connection(conn)
-
-            return {
-                "total_duplicates": duplicate_stats[0],
-                "unique_combinations": duplicate_stats[1],
-                "duplicate_groups": duplicate_groups,
-                "duplicate_percentage": round(
-                    duplicate_stats[0] / duplicate_stats[2] * 100, 2
-                )
-                if duplicate_stats[2] > 0
-                else 0,
-            }
+        # 신선도 점수 계산 (최근 30일 데이터 비율 기준)
+        freshness_score = 0
+        if scan["total_ips"] > 0:
+            recent_ratio = scan["last_30_days"] / scan["total_ips"]
+            freshness_score = min(100, recent_ratio * 100 * 2)  # 최대 100점
+
+        return {
+            "data_last_7_days": scan["last_7_days"],
+            "data_last_30_days": scan["last_30_days"],
+            "data_last_90_days": scan["last_90_days"],
+            "freshness_score": round(freshness_score, 2),
+            "latest_data_date": scan["latest_data"].isoformat() if scan["latest_data"] else None,
+            "oldest_data_date": scan["oldest_data"].isoformat() if scan["oldest_data"] else None,
+        }
 
-        except Exception as e:
-            logger.error(f"❌ 중복 데이터 검출 실패: {e}")
-            return {"total_duplicates": 0}
+    def _detect_duplicates(self, scan: Dict[str, Any]) -> Dict[str, Any]:
+        """중복 데이터 검출 ((ip_address, source) 기준)"""
+        total = scan["total_ips"]
+        total_duplicates = total - scan["unique_combinations"]
+        return {
+            "total_duplicates": total_duplicates,
+            "unique_combinations": scan["unique_combinations"],
+            "duplicate_groups": [tuple(group) for group in scan["duplicate_groups"] or []],
+            "duplicate_percentage": round(total_duplicates / total * 100, 2) if total > 0 else 0,
+        }
 
-    def _perform_automatic_cleanup(self) -> List[str]:
-        """자동 데이터 정제"""
+    def _perform_automatic_cleanup(self, scan: Dict[str, Any]) -> List[str]:
+        """자동 데이터 정제 - 스캔에서 대상이 있는 단계만 실행"""
         actions = []
 
         try:
-            conn = db_service.get_connection()
-            cursor = conn.cursor()
-
-            # 1. 만료된 IP 비활성화
-            cursor.execute(
-                """
-                UPDATE blacklist_ips 
-                SET is_active = false 
-                WHERE is_active = true 
-                AND removal_date IS NOT NULL 
-                AND removal_date <= CURRENT_DATE
-            """
-            )
-            expired_deactivated = cursor.rowcount
-            if expired_deactivated > 0:
-                actions.append(f"만료된 IP {expired_deactivated}개 비활성화")
-
-            # 2. 오래된 비활성 데이터 정리 (90일 이상)
-            cursor.execute(
-                """
-                DELETE FROM blacklist_ips 
-                WHERE is_active = false 
-                AND (removal_date IS NULL OR removal_date < CURRENT_DATE - INTERVAL '90 days')
-                AND created_at < CURRENT_DATE - INTERVAL '90 days'
-            """
-            )
-            old_deleted = cursor.rowcount
-            if old_deleted > 0:
-                actions.append(f"오래된 비활성 데이터 {old_deleted}개 정리")
-
-            # 3. 중복 데이터 정리 (최신 데이터 유지)
-            cursor.execute(
-                """
-                DELETE FROM blacklist_ips 
-                WHERE id NOT IN (
-                    SELECT DISTINCT ON (ip_address, source) id 
-                    FROM blacklist_ips 
-                    ORDER BY ip_address, source, created_at DESC
-                )
-            """
-            )
-            duplicates_removed = cursor.rowcount
-            if duplicates_removed > 0:
-                actions.append(f"중복 데이터 {duplicates_removed}개 정리")
-
-            conn.commit()
-            cursor.close()
-            db_service.return_connection(conn)
+            with db_service.get_connection() as conn:
+                cursor = conn.cursor()
+
+                # 1. 만료된 IP 비활성화
+                if scan["expired_active"] > 0:
+                    cursor.execute(
+                        """
+                        UPDATE blacklist_ips
+                        SET is_active = false
+                        WHERE is_active = true
+                        AND removal_date IS NOT NULL
+                        AND removal_date <= CURRENT_DATE
+                    """
+                    )
+                    expired_deactivated = cursor.rowcount
+                    if expired_deactivated > 0:
+                        actions.append(f"만료된 IP {expired_deactivated}개 비활성화")
+
+                # 2. 오래된 비활성 데이터 정리 (90일 이상)
+                if scan["old_inactive"] > 0:
+                    cursor.execute(
+                        """
+                        DELETE FROM blacklist_ips
+                        WHERE is_active = false
+                        AND (removal_date IS NULL OR removal_date < CURRENT_DATE - INTERVAL '90 days')
+                        AND created_at < CURRENT_DATE - INTERVAL '90 days'
+                    """
+                    )
+                    old_deleted = cursor.rowcount
+                    if old_deleted > 0:
+                        actions.append(f"오래된 비활성 데이터 {old_deleted}개 정리")
+
+                # 3. 중복 데이터 정리 (스캔에서 찾은 그룹별 최신 외 행, 최신 행이 남아 있을 때만)
+                duplicates_removed = 0
+                duplicate_ids = scan["duplicate_ids"]
+                for start in range(0, len(duplicate_ids), CLEANUP_BATCH_SIZE):
+                    cursor.execute(
+                        """
+                        DELETE FROM blacklist_ips b
+                        WHERE b.id = ANY(%s)
+                        AND EXISTS (
+                            SELECT 1 FROM blacklist_ips k
+                            WHERE k.ip_address = b.ip_address
+                            AND k.source = b.source
+                            AND k.id <> b.id
+                            AND NOT (k.id = ANY(%s))
+                        )
+                    """,
+                        (duplicate_ids[start:start + CLEANUP_BATCH_SIZE], duplicate_ids),
+                    )
+                    duplicates_removed += cursor.rowcount
+                if duplicates_removed > 0:
+                    actions.append(f"중복 데이터 {duplicates_removed}개 정리")
+
+                conn.commit()
+                cursor.close()
 
         except Exception as e:
             logger.error(f"❌ 자동 정제 실패: {e}")
@@ -433,40 +375,141 @@ def _save_quality_report(self, quality_report: Dict):
         except Exception as e:
             logger.error(f"❌ 품질 보고서 저장 실패: {e}")
 
-    def maintain_data_retention_policy(self):
-        """데이터 보존 정책 유지"""
+    def maintain_data_retention_policy(self, max_seconds=None) -> Dict[str, Any]:
+        """데이터 보존 정책 유지 (최신 RETENTION_KEEP_ROWS 건 보존)
+
+        BlacklistRetentionEngine: OFFSET seek 로 기준점을 찾고, 삭제 대상을 gzip 으로
+        아카이브하며 배치마다 커밋. max_seconds 를 넘기면 일시정지 후 다음 호출에서 재개.
+        """
         logger.info("🗂️ 데이터 보존 정책 적용 시작")
+        return self.retention_engine.run(max_seconds=max_seconds)
+
+
+# 글로벌 인스턴스
+data_quality_manager = DataQualityManager()
 
-        try:
-            conn = db_service.get_connection()
-            cursor = conn.cursor()
 
-            # 50,000개 IP 데이터 보존 (최신순)
+# 단일 스캔 도입 전 품질 검사가 실행하던 쿼리 (벤치마크 비교용)
+LEGACY_QUALITY_QUERIES = [
+    """SELECT COUNT(*), COUNT(*) FILTER (WHERE is_active = true), COUNT(*) FILTER (WHERE is_active = false),
+              COUNT(*) FILTER (WHERE detection_date IS NULL), COUNT(*) FILTER (WHERE removal_date IS NULL),
+              COUNT(DISTINCT ip_address), COUNT(*) - COUNT(DISTINCT ip_address)
+       FROM blacklist_ips""",
+    r"""SELECT COUNT(*) FROM blacklist_ips
+       WHERE ip_address !~ '^([0-9]{1,3}\.){3}[0-9]{1,3}$'
+       AND ip_address !~ '^([0-9a-fA-F]{0,4}:){1,7}[0-9a-fA-F]{0,4}$'""",
+    """SELECT COUNT(*) FROM blacklist_ips
+       WHERE detection_date IS NOT NULL AND removal_date IS NOT NULL AND removal_date < detection_date""",
+    """SELECT COUNT(*) FROM blacklist_ips
+       WHERE is_active = true AND removal_date IS NOT NULL AND removal_date <= CURRENT_DATE""",
+    """SELECT COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '7 days'),
+              COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '30 days'),
+              COUNT(*) FILTER (WHERE created_at >= CURRENT_DATE - INTERVAL '90 days'),
+              COUNT(*), MAX(created_at), MIN(created_at)
+       FROM blacklist_ips""",
+    """SELECT ip_address, source, COUNT(*) FROM blacklist_ips
+       GROUP BY ip_address, source HAVING COUNT(*) > 1 ORDER BY 3 DESC LIMIT 10""",
+    """SELECT COUNT(*) - COUNT(DISTINCT (ip_address, source)), COUNT(DISTINCT (ip_address, source)), COUNT(*)
+       FROM blacklist_ips""",
+    """SELECT COUNT(*) FROM blacklist_ips WHERE id NOT IN (
+           SELECT DISTINCT ON (ip_address, source) id FROM blacklist_ips
+           ORDER BY ip_address, source, created_at DESC)""",
+]
+
+
+def benchmark_quality_report(rows: int = 2_000_000, repeat: int = 3) -> Dict[str, Any]:
+    """합성 blacklist_ips (rows 행, ~2% 중복) 에서 기존 쿼리 묶음 vs 단일 스캔 비교
+
+    세션 임시 테이블 blacklist_ips 가 실제 테이블을 가리므로 (pg_temp 가 search_path 우선)
+    운영 SQL 을 그대로 실행하며, 트랜잭션은 롤백 - 실제 데이터는 읽지도 쓰지도 않는다.
+    """
+    distinct = int(rows * 0.98)
+    with db_service.get_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SET LOCAL work_mem = '256MB'")
+            cursor.execute(
+                "CREATE TEMP TABLE blacklist_ips (LIKE public.blacklist_ips INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            started = time.monotonic()
             cursor.execute(
                 """
-                DELETE FROM blacklist_ips 
-                WHERE id NOT IN (
-                    SELECT id FROM blacklist_ips 
-                    ORDER BY created_at DESC, id DESC 
-                    LIMIT 1000000
-                )
-            """
+                INSERT INTO blacklist_ips
+                    (id, ip_address, source, is_active, detection_date, removal_date, created_at)
+                SELECT
+                    n,
+                    CASE WHEN n %% 50000 = 0 THEN 'invalid-' || n
+                         ELSE ((k >> 24) & 255) || '.' || ((k >> 16) & 255) || '.' || ((k >> 8) & 255) || '.' || (k & 255)
+                    END,
+                    (ARRAY['REGTECH', 'SECUDIUM', 'MANUAL'])[(1 + k %% 3)::int],
+                    n %% 10 <> 0,
+                    CURRENT_DATE - (n %% 200)::int,
+                    CASE WHEN n %% 2 = 0 THEN CURRENT_DATE - (n %% 200)::int + 90 END,
+                    LOCALTIMESTAMP - make_interval(days => (n %% 180)::int, secs => (n %% 86400)::int)
+                FROM generate_series(1, %s) AS n,
+                     LATERAL (SELECT 167772160::bigint + n %% %s AS k) ip
+                """,
+                (rows, distinct),
+            )
+            cursor.execute("ANALYZE blacklist_ips")
+            load_seconds = time.monotonic() - started
+
+            def best_of(queries) -> float:
+                timings = []
+                for _ in range(repeat):
+                    started = time.monotonic()
+                    for query in queries:
+                        cursor.execute(query)
+                        cursor.fetchall()
+                    timings.append(time.monotonic() - started)
+                return min(timings)
+
+            legacy_seconds = best_of(LEGACY_QUALITY_QUERIES)
+            scan_seconds = best_of([QUALITY_SCAN_SQL])
+
+            # 결과 일치 확인
+            dict_cursor = conn.cursor(cursor_factory=RealDictCursor)
+            dict_cursor.execute(QUALITY_SCAN_SQL)
+            scan = dict_cursor.fetchone()
+            cursor.execute(LEGACY_QUALITY_QUERIES[0])
+            basic = cursor.fetchone()
+            cursor.execute(LEGACY_QUALITY_QUERIES[6])
+            duplicates = cursor.fetchone()
+            cursor.execute(LEGACY_QUALITY_QUERIES[7])
+            cleanup = cursor.fetchone()[0]
+            matches = (
+                (scan["total_ips"], scan["active_ips"], scan["inactive_ips"], scan["unique_ips"])
+                == (basic[0], basic[1], basic[2], basic[5])
+                and scan["unique_combinations"] == duplicates[1]
+                and len(scan["duplicate_ids"]) == cleanup
             )
+        finally:
+            conn.rollback()
+            cursor.close()
 
-            deleted_count = cursor.rowcount
-            conn.commit()
+    return {
+        "rows": rows,
+        "load_seconds": round(load_seconds, 2),
+        "legacy": {"statements": len(LEGACY_QUALITY_QUERIES), "seconds": round(legacy_seconds, 3)},
+        "single_scan": {"statements": 1, "seconds": round(scan_seconds, 3)},
+        "speedup": round(legacy_seconds / scan_seconds, 2) if scan_seconds else None,
+        "duplicates": len(scan["duplicate_ids"]),
+        "results_match": matches,
+    }
 
-            cursor.close()
-            db_service.return_connection(conn)
 
-            if deleted_count > 0:
-                logger.info(f"📦 데이터 보존 정책 적용: {deleted_count}개 오래된 레코드 삭제")
-            else:
-                logger.info("📦 데이터 보존 정책: 삭제할 데이터 없음")
+if __name__ == "__main__":
+    import json
+    import sys
 
-        except Exception as e:
-            logger.error(f"❌ 데이터 보존 정책 적용 실패: {e}")
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
+    )
 
+    if "--benchmark" in sys.argv:
+        args = sys.argv[sys.argv.index("--benchmark") + 1:]
+        report = benchmark_quality_report(rows=int(args[0]) if args else 2_000_000)
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report["results_match"] else 1)
 
-# 글로벌 인스턴스
-data_quality_manager = DataQualityManager()
+    print(json.dumps(data_quality_manager.perform_comprehensive_quality_check(), indent=2, default=str))
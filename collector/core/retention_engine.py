@@ -0,0 +1,335 @@
+"""
+blacklist_ips 보존 정책 엔진
+최신 RETENTION_KEEP_ROWS 건만 남기고 나머지를 아카이브 후 배치 삭제
+
+- 기준점: idx_blacklist_ips_created_keyset (migration 005) 에서 OFFSET 한 번으로
+  (created_at, id) 기준 keep+1 번째 행을 찾음 → 그 행 이하가 삭제 대상
+- 삭제: 오래된 순 keyset 배치 (LIMIT + FOR UPDATE SKIP LOCKED), 배치마다
+  COPY → gzip 아카이브 flush → DELETE → 커밋 (행 잠금/WAL 을 배치 단위로 제한)
+- 진행률/rows/s 로그, 체크포인트 파일로 일시정지/재개 (같은 기준점·아카이브 이어서 사용)
+- pg_try_advisory_lock 으로 한 번에 한 프로세스만 실행
+
+Usage:
+    python -m core.retention_engine            # 실행 (체크포인트가 있으면 재개)
+    python -m core.retention_engine --pause    # 실행 중인 엔진에 일시정지 요청
+    python -m core.retention_engine --resume   # 일시정지 해제 후 재개
+    python -m core.retention_engine --status
+"""
+
+import os
+import gzip
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from core.database import db_service
+from collector.config import CollectorConfig
+
+logger = logging.getLogger(__name__)
+
+RETENTION_LOCK_KEY = "blacklist_ips_retention"
+
+# idx_blacklist_ips_created_keyset 식과 동일해야 함 (NULL created_at 은 가장 오래된 행)
+SORT_KEY = "COALESCE(created_at, TIMESTAMP '1970-01-01')"
+
+# 진행률 로그 간격 (초)
+PROGRESS_INTERVAL = 5.0
+
+
+class BlacklistRetentionEngine:
+    """blacklist_ips 보존 정책 (아카이브 + 배치 삭제, 일시정지/재개)"""
+
+    def __init__(
+        self,
+        keep_rows: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        archive_dir: Optional[str] = None,
+        batch_sleep: Optional[float] = None,
+    ):
+        self.keep_rows = keep_rows if keep_rows is not None else CollectorConfig.RETENTION_KEEP_ROWS
+        self.batch_size = batch_size or CollectorConfig.RETENTION_BATCH_SIZE
+        self.archive_dir = archive_dir or CollectorConfig.RETENTION_ARCHIVE_DIR
+        self.batch_sleep = (
+            batch_sleep if batch_sleep is not None else CollectorConfig.RETENTION_BATCH_SLEEP
+        )
+        self.checkpoint_path = os.path.join(self.archive_dir, "blacklist_ips_retention.json")
+        self.pause_path = os.path.join(self.archive_dir, "blacklist_ips_retention.pause")
+
+        self._pause = threading.Event()
+        self.progress: Dict[str, Any] = {"state": "idle"}
+
+    # ------------------------------------------------------------------
+    # Pause / resume
+    # ------------------------------------------------------------------
+    def pause(self):
+        """현재 배치 커밋 후 중지 (다른 프로세스에서도 pause 파일로 요청 가능)"""
+        self._pause.set()
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with open(self.pause_path, "w") as f:
+            f.write(datetime.now().isoformat())
+        logger.info("⏸️ 보존 정책 일시정지 요청")
+
+    def resume(self, max_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """일시정지 해제 후 체크포인트부터 이어서 실행"""
+        self._pause.clear()
+        if os.path.exists(self.pause_path):
+            os.remove(self.pause_path)
+        return self.run(max_seconds=max_seconds)
+
+    @property
+    def paused(self) -> bool:
+        return self._pause.is_set() or os.path.exists(self.pause_path)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            **self.progress,
+            "paused": self.paused,
+            "checkpoint": self._load_checkpoint(),
+        }
+
+    # ------------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------------
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"보존 정책 체크포인트 읽기 실패 (새로 시작): {e}")
+            return None
+
+    def _save_checkpoint(self, state: Dict[str, Any]):
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _clear_checkpoint(self):
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    # ------------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------------
+    def _start_state(self, cursor) -> Optional[Dict[str, Any]]:
+        """기준점 탐색: 최신순 keep+1 번째 (sort_key, id) - 인덱스 OFFSET 한 번"""
+        cursor.execute(
+            f"""
+            SELECT {SORT_KEY}, id FROM blacklist_ips
+            ORDER BY {SORT_KEY} DESC, id DESC
+            OFFSET %s LIMIT 1
+            """,
+            (self.keep_rows,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+
+        cursor.execute("SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = 'blacklist_ips'::regclass")
+        estimated_total = cursor.fetchone()[0]
+        started_at = datetime.now()
+        return {
+            "cutoff": [row[0].isoformat(), row[1]],
+            "last": None,
+            "archive": os.path.join(
+                self.archive_dir, f"blacklist_ips_{started_at.strftime('%Y%m%d_%H%M%S')}.csv.gz"
+            ),
+            "deleted": 0,
+            "estimated": max(estimated_total - self.keep_rows, 0),
+            "started_at": started_at.isoformat(),
+        }
+
+    def run(self, max_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """보존 정책 실행
+
+        Args:
+            max_seconds: 1회 실행 시간 상한 - 넘으면 체크포인트 저장 후 'paused' 로 반환
+
+        Returns:
+            {"status": completed|paused|skipped|nothing_to_delete|error, "deleted", "rows_per_sec", ...}
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        if self.paused:
+            logger.info("⏸️ 보존 정책 일시정지 상태 - resume() 전까지 실행하지 않음")
+            return {"status": "paused", "deleted": 0, "checkpoint": self._load_checkpoint()}
+
+        try:
+            with db_service.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", (RETENTION_LOCK_KEY,))
+                locked = cursor.fetchone()[0]
+                conn.commit()
+                if not locked:
+                    logger.info("⏭️ 다른 프로세스에서 보존 정책 실행 중 - 건너뜀")
+                    cursor.close()
+                    return {"status": "skipped", "deleted": 0}
+
+                try:
+                    state = self._load_checkpoint()
+                    if state is None:
+                        state = self._start_state(cursor)
+                        conn.commit()
+                        if state is None:
+                            logger.info(f"📦 데이터 보존 정책: 삭제할 데이터 없음 (≤ {self.keep_rows:,}건)")
+                            return {"status": "nothing_to_delete", "deleted": 0}
+                        self._save_checkpoint(state)
+                        logger.info(
+                            f"📦 데이터 보존 정책 시작: 기준점 {state['cutoff']} 이하 "
+                            f"약 {state['estimated']:,}건 삭제 예정 → {state['archive']}"
+                        )
+                    else:
+                        logger.info(
+                            f"▶️ 데이터 보존 정책 재개: {state['deleted']:,}건 삭제됨, "
+                            f"마지막 위치 {state['last']}"
+                        )
+                    return self._delete_batches(conn, cursor, state, max_seconds)
+                finally:
+                    conn.rollback()
+                    cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", (RETENTION_LOCK_KEY,))
+                    conn.commit()
+                    cursor.close()
+
+        except Exception as e:
+            logger.error(f"❌ 데이터 보존 정책 적용 실패: {e}")
+            self.progress["state"] = "error"
+            return {"status": "error", "error": str(e), "deleted": self.progress.get("deleted", 0)}
+
+    def _delete_batches(self, conn, cursor, state: Dict[str, Any], max_seconds: Optional[float]) -> Dict[str, Any]:
+        cutoff_key, cutoff_id = datetime.fromisoformat(state["cutoff"][0]), state["cutoff"][1]
+        started = time.monotonic()
+        last_report = started
+        run_deleted = 0
+        status = "completed"
+        header = not os.path.exists(state["archive"]) or os.path.getsize(state["archive"]) == 0
+
+        self.progress = {"state": "running", "deleted": state["deleted"], "estimated": state["estimated"]}
+
+        # gzip 'ab': 재개 시 새 member 로 이어 씀 (gzip -d 로 하나의 CSV)
+        with gzip.open(state["archive"], "ab") as archive:
+            while True:
+                if self.paused:
+                    status = "paused"
+                    break
+                if max_seconds is not None and time.monotonic() - started >= max_seconds:
+                    status = "paused"
+                    break
+
+                # 1. 오래된 순으로 다음 배치 선점 (keyset - 삭제된 앞부분을 다시 훑지 않음)
+                if state["last"] is None:
+                    cursor.execute(
+                        f"""
+                        SELECT id, {SORT_KEY} FROM blacklist_ips
+                        WHERE ({SORT_KEY}, id) <= (%s, %s)
+                        ORDER BY {SORT_KEY}, id
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                        """,
+                        (cutoff_key, cutoff_id, self.batch_size),
+                    )
+                else:
+                    cursor.execute(
+                        f"""
+                        SELECT id, {SORT_KEY} FROM blacklist_ips
+                        WHERE ({SORT_KEY}, id) > (%s, %s)
+                          AND ({SORT_KEY}, id) <= (%s, %s)
+                        ORDER BY {SORT_KEY}, id
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                        """,
+                        (
+                            datetime.fromisoformat(state["last"][0]),
+                            state["last"][1],
+                            cutoff_key,
+                            cutoff_id,
+                            self.batch_size,
+                        ),
+                    )
+                rows = cursor.fetchall()
+                if not rows:
+                    conn.rollback()
+                    break
+                ids = [row[0] for row in rows]
+
+                # 2. 같은 트랜잭션에서 아카이브 → 삭제 (아카이브가 디스크에 쓰인 뒤 커밋)
+                copy_sql = cursor.mogrify(
+                    "COPY (SELECT * FROM blacklist_ips WHERE id = ANY(%s) ORDER BY id) "
+                    f"TO STDOUT WITH (FORMAT csv{', HEADER true' if header else ''})",
+                    (ids,),
+                ).decode()
+                cursor.copy_expert(copy_sql, archive)
+                archive.flush()
+                header = False
+
+                cursor.execute("DELETE FROM blacklist_ips WHERE id = ANY(%s)", (ids,))
+                deleted = cursor.rowcount
+                conn.commit()
+
+                run_deleted += deleted
+                state["deleted"] += deleted
+                state["last"] = [rows[-1][1].isoformat(), rows[-1][0]]
+                self._save_checkpoint(state)
+
+                now = time.monotonic()
+                rate = run_deleted / max(now - started, 1e-6)
+                self.progress.update(deleted=state["deleted"], rows_per_sec=round(rate, 1))
+                if now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    remaining = max(state["estimated"] - state["deleted"], 0)
+                    percent = state["deleted"] / state["estimated"] * 100 if state["estimated"] else 100.0
+                    logger.info(
+                        f"📦 보존 정책 진행: {state['deleted']:,}/{state['estimated']:,}건 "
+                        f"({percent:.1f}%, {rate:,.0f} rows/s, ETA {remaining / rate if rate else 0:.0f}s)"
+                    )
+
+                if len(rows) < self.batch_size:
+                    break
+                if self.batch_sleep:
+                    time.sleep(self.batch_sleep)
+
+        elapsed = time.monotonic() - started
+        rate = round(run_deleted / elapsed, 1) if elapsed > 0 else 0.0
+        result = {
+            "status": status,
+            "deleted": run_deleted,
+            "total_deleted": state["deleted"],
+            "rows_per_sec": rate,
+            "elapsed_sec": round(elapsed, 1),
+            "archive": state["archive"],
+        }
+
+        if status == "completed":
+            self._clear_checkpoint()
+            logger.info(
+                f"📦 데이터 보존 정책 적용 완료: {state['deleted']:,}건 삭제 "
+                f"({rate:,.0f} rows/s) → {state['archive']}"
+            )
+        else:
+            logger.info(
+                f"⏸️ 데이터 보존 정책 일시정지: {state['deleted']:,}건 삭제됨 "
+                f"({rate:,.0f} rows/s) - resume 시 {state['last']} 부터 재개"
+            )
+        self.progress = {"state": status, **result}
+        return result
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+
+    engine = BlacklistRetentionEngine()
+    if "--pause" in sys.argv:
+        engine.pause()
+    elif "--status" in sys.argv:
+        print(json.dumps(engine.status(), indent=2, default=str))
+    elif "--resume" in sys.argv:
+        print(json.dumps(engine.resume(), indent=2, default=str))
+    else:
+        print(json.dumps(engine.run(), indent=2, default=str))
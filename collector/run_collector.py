@@ -73,6 +73,9 @@ def start(self):
                 self.logger.error("❌ Database connection failed - exiting")
                 sys.exit(1)
 
+            # 인증정보 변경 알림 구독 (collection_credentials → 캐시 무효화)
+            CollectorConfig.start_settings_listener()
+
             # 헬스체크 서버 시작
             self._start_health_server()
 
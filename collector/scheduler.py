@@ -16,6 +16,10 @@
 
 logger = logging.getLogger(__name__)
 
+# expire_blacklist_ips_chunk() 규칙 / advisory lock 키 (app IPExpiryService 와 동일)
+EXPIRY_RULES = ("removal_date", "stale_detection")
+EXPIRY_LOCK_KEY = "blacklist_ip_expiry"
+
 
 class CollectionScheduler:
     """수집 스케줄러 클래스"""
@@ -215,37 +219,49 @@ def _reschedule_adaptive(self):
         )
 
     def _cleanup_expired_ips(self):
-        """만료된 IP 자동 비활성화 (removal_date 기준)"""
+        """
+        만료된 IP 자동 비활성화 (removal_date / 탐지일 3개월 경과)
+
+        expire_blacklist_ips_chunk() 를 청크 단위로 호출하고 청크마다 커밋.
+        앱의 IPExpiryService 와 같은 advisory lock 을 사용하므로 한 번에 한 프로세스만 실행.
+        """
         try:
             logger.info("🧹 만료된 IP 정리 시작")
 
             with db_service.get_connection() as conn:
                 cursor = conn.cursor()
 
-                # 1. removal_date가 지난 IP 비활성화
-                cursor.execute(
-                    """
-                    UPDATE blacklist_ips
-                    SET is_active = false
-                    WHERE is_active = true
-                    AND removal_date IS NOT NULL
-                    AND removal_date < CURRENT_DATE
-                    """
-                )
-                expired_count = cursor.rowcount
-
-                # 2. 3개월(90일) 이상 지난 IP 비활성화 (모든 소스)
-                cursor.execute(
-                    """
-                    UPDATE blacklist_ips
-                    SET is_active = false, updated_at = NOW()
-                    WHERE is_active = true
-                    AND detection_date < CURRENT_DATE - INTERVAL '3 months'
-                    """
-                )
-                old_count = cursor.rowcount
-
+                cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", (EXPIRY_LOCK_KEY,))
+                locked = cursor.fetchone()[0]
                 conn.commit()
+                if not locked:
+                    logger.info("⏭️ 다른 프로세스에서 만료 처리 진행 중 - 건너뜀")
+                    cursor.close()
+                    return
+
+                totals = {}
+                try:
+                    for rule in EXPIRY_RULES:
+                        totals[rule] = 0
+                        chunk = 0
+                        while True:
+                            chunk += 1
+                            cursor.execute(
+                                "SELECT expired, by_source FROM expire_blacklist_ips_chunk(%s, %s)",
+                                (rule, CollectorConfig.EXPIRY_BATCH_SIZE),
+                            )
+                            expired, by_source = cursor.fetchone()
+                            conn.commit()
+
+                            totals[rule] += expired
+                            if expired:
+                                logger.info(f"   • [{rule}] chunk {chunk}: {expired}개 비활성화 {by_source}")
+                            if expired < CollectorConfig.EXPIRY_BATCH_SIZE:
+                                break
+                finally:
+                    conn.rollback()
+                    cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", (EXPIRY_LOCK_KEY,))
+                    conn.commit()
 
                 # 결과 조회
                 cursor.execute("SELECT COUNT(*) FROM blacklist_ips WHERE is_active = true")
@@ -253,7 +269,8 @@ def _cleanup_expired_ips(self):
                 cursor.close()
 
             logger.info(
-                f"✅ 만료된 IP 정리 완료: 만료 {expired_count}개, 3개월+ {old_count}개 비활성화 (활성 IP: {active_count:,}개)"
+                f"✅ 만료된 IP 정리 완료: 만료 {totals['removal_date']}개, "
+                f"3개월+ {totals['stale_detection']}개 비활성화 (활성 IP: {active_count:,}개)"
             )
 
         except Exception as e:
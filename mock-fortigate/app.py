@@ -74,6 +74,8 @@ def jsonrpc():
             return handle_add(params, request_id, session_id)
         elif method == "set":
             return handle_set(params, request_id, session_id)
+        elif method == "update":
+            return handle_update(params, request_id, session_id)
         elif method == "get":
             return handle_get(params, request_id, session_id)
         elif method == "delete":
@@ -231,6 +233,33 @@ def handle_set(params, request_id, session_id=None):
     return success_response(request_id)
 
 
+def handle_update(params, request_id, session_id=None):
+    """Update handler (FortiManagerPushService hosted resource upload)"""
+    if not check_session(session_id):
+        return error_response(request_id, -10, "Not authenticated")
+
+    url = params.get("url", "")
+    data = params.get("data", {})
+
+    # External Resource (create on first update)
+    if "/obj/system/external-resource" in url:
+        name = url.rstrip("/").split("/")[-1]
+        existing = external_resources.get(name, {"name": name})
+        external_resources[name] = {
+            **existing,
+            **data,
+            "last_updated": datetime.now().isoformat(),
+            "update_count": existing.get("update_count", 0) + 1,
+        }
+        logger.info(
+            f"✅ External resource updated: {name} ({len(data.get('resource', ''))} bytes)"
+        )
+        return success_response(request_id, data={"name": name})
+
+    logger.info(f"✅ Update operation: {url}")
+    return success_response(request_id)
+
+
 def handle_get(params, request_id, session_id=None):
     """Get handler"""
     if not check_session(session_id):
@@ -254,7 +283,10 @@ def handle_get(params, request_id, session_id=None):
 
     # External Resources
     elif "/obj/system/external-resource" in url:
-        return success_response(request_id, data=list(external_resources.values()))
+        if url.endswith("/external-resource"):
+            return success_response(request_id, data=list(external_resources.values()))
+        resource_name = url.split("/")[-1]
+        return success_response(request_id, data=external_resources.get(resource_name, []))
 
     # Address Objects
     elif "/obj/firewall/address" in url:
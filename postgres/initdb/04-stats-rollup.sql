@@ -0,0 +1,177 @@
+-- Migration 004: blacklist_stats_rollup (incrementally maintained dashboard counters)
+-- Date: 2026-10-18
+-- Description: Per list/source/country/active/day counters kept in sync by
+--              statement-level triggers on blacklist_ips and whitelist_ips, so
+--              every stats endpoint is answered with one read of a small table.
+--              refresh_blacklist_stats_rollup() rebuilds from the base tables
+--              (initial seed and drift repair).
+--              The triggers only touch the rollup rows of the groups a
+--              statement changed; MAX(last_seen/created_at/updated_at) is read
+--              from the blacklist_ips indexes at query time instead of a
+--              singleton row every writer would have to lock.
+
+-- ============================================================
+-- 1. Rollup tables
+-- ============================================================
+CREATE TABLE IF NOT EXISTS blacklist_stats_rollup (
+    list_type VARCHAR(10) NOT NULL,           -- 'blacklist' | 'whitelist'
+    data_source VARCHAR(50) NOT NULL,         -- COALESCE(data_source, 'UNKNOWN')
+    source VARCHAR(100) NOT NULL,             -- COALESCE(source, 'UNKNOWN')
+    country VARCHAR(10) NOT NULL,             -- COALESCE(country, 'UNKNOWN')
+    is_active BOOLEAN NOT NULL,
+    day DATE NOT NULL,                        -- DATE(last_seen) / DATE(created_at) for whitelist
+    ip_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (list_type, data_source, source, country, is_active, day)
+);
+
+-- Last full rebuild (written by refresh only, never by the triggers)
+CREATE TABLE IF NOT EXISTS blacklist_stats_meta (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    refreshed_at TIMESTAMP
+);
+
+-- High-water marks used to live here, updated by every writer's trigger,
+-- which serialized all concurrent blacklist_ips writers on this one row
+ALTER TABLE blacklist_stats_meta DROP COLUMN IF EXISTS max_last_seen;
+ALTER TABLE blacklist_stats_meta DROP COLUMN IF EXISTS max_created_at;
+ALTER TABLE blacklist_stats_meta DROP COLUMN IF EXISTS max_updated_at;
+
+INSERT INTO blacklist_stats_meta (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+-- ============================================================
+-- 2. Trigger functions (statement-level, transition tables)
+-- ============================================================
+CREATE OR REPLACE FUNCTION blacklist_stats_rollup_blacklist() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO blacklist_stats_rollup AS r
+            (list_type, data_source, source, country, is_active, day, ip_count)
+        SELECT 'blacklist', COALESCE(data_source, 'UNKNOWN'), COALESCE(source, 'UNKNOWN'),
+               COALESCE(country, 'UNKNOWN'), COALESCE(is_active, false),
+               COALESCE(last_seen::date, created_at::date, CURRENT_DATE), COUNT(*)
+        FROM new_rows
+        GROUP BY 1, 2, 3, 4, 5, 6
+        ON CONFLICT (list_type, data_source, source, country, is_active, day)
+        DO UPDATE SET ip_count = r.ip_count + EXCLUDED.ip_count;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO blacklist_stats_rollup AS r
+            (list_type, data_source, source, country, is_active, day, ip_count)
+        SELECT 'blacklist', ds, src, ctry, act, d, SUM(delta)
+        FROM (
+            SELECT COALESCE(data_source, 'UNKNOWN') AS ds, COALESCE(source, 'UNKNOWN') AS src,
+                   COALESCE(country, 'UNKNOWN') AS ctry, COALESCE(is_active, false) AS act,
+                   COALESCE(last_seen::date, created_at::date, CURRENT_DATE) AS d, -1 AS delta
+            FROM old_rows
+            UNION ALL
+            SELECT COALESCE(data_source, 'UNKNOWN'), COALESCE(source, 'UNKNOWN'),
+                   COALESCE(country, 'UNKNOWN'), COALESCE(is_active, false),
+                   COALESCE(last_seen::date, created_at::date, CURRENT_DATE), 1
+            FROM new_rows
+        ) deltas
+        GROUP BY ds, src, ctry, act, d
+        HAVING SUM(delta) <> 0
+        ON CONFLICT (list_type, data_source, source, country, is_active, day)
+        DO UPDATE SET ip_count = r.ip_count + EXCLUDED.ip_count;
+    ELSE
+        INSERT INTO blacklist_stats_rollup AS r
+            (list_type, data_source, source, country, is_active, day, ip_count)
+        SELECT 'blacklist', COALESCE(data_source, 'UNKNOWN'), COALESCE(source, 'UNKNOWN'),
+               COALESCE(country, 'UNKNOWN'), COALESCE(is_active, false),
+               COALESCE(last_seen::date, created_at::date, CURRENT_DATE), -COUNT(*)
+        FROM old_rows
+        GROUP BY 1, 2, 3, 4, 5, 6
+        ON CONFLICT (list_type, data_source, source, country, is_active, day)
+        DO UPDATE SET ip_count = r.ip_count + EXCLUDED.ip_count;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION blacklist_stats_rollup_whitelist() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO blacklist_stats_rollup AS r
+            (list_type, data_source, source, country, is_active, day, ip_count)
+        SELECT 'whitelist', 'WHITELIST', COALESCE(source, 'UNKNOWN'), COALESCE(country, 'UNKNOWN'),
+               true, COALESCE(created_at::date, CURRENT_DATE), -COUNT(*)
+        FROM old_rows
+        GROUP BY 1, 2, 3, 4, 5, 6
+        ON CONFLICT (list_type, data_source, source, country, is_active, day)
+        DO UPDATE SET ip_count = r.ip_count + EXCLUDED.ip_count;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO blacklist_stats_rollup AS r
+            (list_type, data_source, source, country, is_active, day, ip_count)
+        SELECT 'whitelist', 'WHITELIST', COALESCE(source, 'UNKNOWN'), COALESCE(country, 'UNKNOWN'),
+               true, COALESCE(created_at::date, CURRENT_DATE), COUNT(*)
+        FROM new_rows
+        GROUP BY 1, 2, 3, 4, 5, 6
+        ON CONFLICT (list_type, data_source, source, country, is_active, day)
+        DO UPDATE SET ip_count = r.ip_count + EXCLUDED.ip_count;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables require one trigger per event
+DROP TRIGGER IF EXISTS blacklist_stats_rollup_ins ON blacklist_ips;
+CREATE TRIGGER blacklist_stats_rollup_ins AFTER INSERT ON blacklist_ips
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION blacklist_stats_rollup_blacklist();
+
+DROP TRIGGER IF EXISTS blacklist_stats_rollup_upd ON blacklist_ips;
+CREATE TRIGGER blacklist_stats_rollup_upd AFTER UPDATE ON blacklist_ips
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION blacklist_stats_rollup_blacklist();
+
+DROP TRIGGER IF EXISTS blacklist_stats_rollup_del ON blacklist_ips;
+CREATE TRIGGER blacklist_stats_rollup_del AFTER DELETE ON blacklist_ips
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION blacklist_stats_rollup_blacklist();
+
+DROP TRIGGER IF EXISTS whitelist_stats_rollup_ins ON whitelist_ips;
+CREATE TRIGGER whitelist_stats_rollup_ins AFTER INSERT ON whitelist_ips
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION blacklist_stats_rollup_whitelist();
+
+DROP TRIGGER IF EXISTS whitelist_stats_rollup_upd ON whitelist_ips;
+CREATE TRIGGER whitelist_stats_rollup_upd AFTER UPDATE ON whitelist_ips
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION blacklist_stats_rollup_whitelist();
+
+DROP TRIGGER IF EXISTS whitelist_stats_rollup_del ON whitelist_ips;
+CREATE TRIGGER whitelist_stats_rollup_del AFTER DELETE ON whitelist_ips
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION blacklist_stats_rollup_whitelist();
+
+-- ============================================================
+-- 3. Full rebuild (initial seed, drift repair, or per-collection refresh)
+-- ============================================================
+CREATE OR REPLACE FUNCTION refresh_blacklist_stats_rollup() RETURNS VOID AS $$
+BEGIN
+    -- Serialize with the triggers' row locks for a consistent rebuild
+    LOCK TABLE blacklist_stats_rollup IN EXCLUSIVE MODE;
+
+    DELETE FROM blacklist_stats_rollup;
+
+    INSERT INTO blacklist_stats_rollup
+        (list_type, data_source, source, country, is_active, day, ip_count)
+    SELECT 'blacklist', COALESCE(data_source, 'UNKNOWN'), COALESCE(source, 'UNKNOWN'),
+           COALESCE(country, 'UNKNOWN'), COALESCE(is_active, false),
+           COALESCE(last_seen::date, created_at::date, CURRENT_DATE), COUNT(*)
+    FROM blacklist_ips
+    GROUP BY 1, 2, 3, 4, 5, 6
+    UNION ALL
+    SELECT 'whitelist', 'WHITELIST', COALESCE(source, 'UNKNOWN'), COALESCE(country, 'UNKNOWN'),
+           true, COALESCE(created_at::date, CURRENT_DATE), COUNT(*)
+    FROM whitelist_ips
+    GROUP BY 1, 2, 3, 4, 5, 6;
+
+    UPDATE blacklist_stats_meta SET refreshed_at = NOW() WHERE id = 1;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT refresh_blacklist_stats_rollup();
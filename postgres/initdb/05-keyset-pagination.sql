@@ -0,0 +1,38 @@
+-- Migration 005: keyset pagination indexes
+-- Date: 2026-10-18
+-- Description: Composite (sort_key DESC, id DESC) indexes for cursor-paginated
+--              list endpoints, so `WHERE (sort_key, id) < (%s, %s)` seeks are
+--              index range scans instead of OFFSET scan-and-discard.
+--              Expressions must match the sort keys used in
+--              app/core/routes/api (COALESCE keeps NULL rows pageable).
+
+-- /api/json (updated_at)
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_updated_keyset
+    ON blacklist_ips ((COALESCE(updated_at, TIMESTAMP '1970-01-01')) DESC, id DESC);
+
+-- /api/ip-management/blacklist (created_at)
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_created_keyset
+    ON blacklist_ips ((COALESCE(created_at, TIMESTAMP '1970-01-01')) DESC, id DESC);
+
+-- /api/fortinet/active-ips (confidence, detection_date) over active rows only
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_active_keyset
+    ON blacklist_ips (
+        (COALESCE(confidence_level, 0)) DESC,
+        (COALESCE(detection_date, DATE '1970-01-01')) DESC,
+        id DESC
+    )
+    WHERE is_active = true;
+
+-- /api/ip-management/whitelist, /api/ip-management/unified (created_at)
+CREATE INDEX IF NOT EXISTS idx_whitelist_ips_created_keyset
+    ON whitelist_ips ((COALESCE(created_at, TIMESTAMP '1970-01-01')) DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_unified_ip_list_created_keyset
+    ON unified_ip_list ((COALESCE(created_at, TIMESTAMP '1970-01-01')) DESC, id DESC);
+
+-- /api/blacklist/list pages by id DESC on the primary key (no new index)
+
+-- Refresh planner statistics used by total=estimate
+ANALYZE blacklist_ips;
+ANALYZE whitelist_ips;
+ANALYZE unified_ip_list;
@@ -0,0 +1,282 @@
+-- Migration 007: incremental analytics summaries
+-- Date: 2026-10-18
+-- Description: Hourly (created_at) and daily (detection day) aggregates for the
+--              analytics endpoints and AnalyticsService, so pattern analysis
+--              reads a few summary buckets instead of scanning blacklist_ips.
+--              - Statement-level triggers only record which hour/day buckets
+--                changed (analytics_dirty_hours / analytics_dirty_days), one
+--                mark per bucket per writer transaction.
+--              - refresh_analytics_summaries() recomputes just those buckets;
+--                it runs after each collection run (and on read when stale).
+--              - /16 prefixes are stored as integer keys
+--                (ipv4_to_bigint(ip) >> 16, migration 006) instead of
+--                regex-sliced strings.
+--              Reader: app/core/services/analytics_summary_service.py
+
+-- ============================================================
+-- 1. Summary tables
+-- ============================================================
+
+-- Active rows per created_at hour and /16 prefix
+CREATE TABLE IF NOT EXISTS analytics_hourly_prefix (
+    bucket TIMESTAMP NOT NULL,                -- date_trunc('hour', created_at)
+    prefix16 INTEGER,                         -- ipv4_to_bigint(ip) >> 16, NULL if not IPv4
+    ip_count BIGINT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_analytics_hourly_prefix_bucket
+    ON analytics_hourly_prefix (bucket);
+
+-- Active rows per created_at hour and dimension value
+CREATE TABLE IF NOT EXISTS analytics_hourly_dimension (
+    bucket TIMESTAMP NOT NULL,
+    dimension VARCHAR(16) NOT NULL,           -- 'reason' | 'source' | 'data_source' | 'country'
+    value TEXT,
+    ip_count BIGINT NOT NULL,
+    last_created TIMESTAMP
+);
+
+-- Per-bucket distinct counts cannot be summed into a distinct count over a
+-- window (an IP seen in several hours is counted once per hour), so the
+-- summaries only keep row counts; unique_ips comes from the full-scan path.
+ALTER TABLE analytics_hourly_prefix DROP COLUMN IF EXISTS unique_ips;
+ALTER TABLE analytics_hourly_dimension DROP COLUMN IF EXISTS unique_ips;
+
+CREATE INDEX IF NOT EXISTS idx_analytics_hourly_dimension_bucket
+    ON analytics_hourly_dimension (dimension, bucket);
+
+-- All rows per detection day (COALESCE(detection_date, created_at::date)) and source
+CREATE TABLE IF NOT EXISTS analytics_daily_source (
+    detection_day DATE NOT NULL,
+    source VARCHAR(100) NOT NULL,
+    data_source VARCHAR(50),
+    ip_count BIGINT NOT NULL,
+    first_collected TIMESTAMP,
+    last_collected TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_analytics_daily_source_day
+    ON analytics_daily_source (detection_day);
+
+-- Buckets touched since the last refresh, one mark per writer transaction.
+-- A mark becomes visible only when its writer commits, so the refresh claims
+-- (DELETE ... RETURNING) only marks whose rows its recompute can already see;
+-- marks of still-running writers stay for the next refresh. A single mark per
+-- bucket (ON CONFLICT DO NOTHING against an older committed mark) would let a
+-- refresh consume the mark before a concurrent writer committed.
+CREATE TABLE IF NOT EXISTS analytics_dirty_hours (
+    bucket TIMESTAMP NOT NULL,
+    marked_txid BIGINT NOT NULL DEFAULT txid_current(),
+    PRIMARY KEY (bucket, marked_txid)
+);
+
+CREATE TABLE IF NOT EXISTS analytics_dirty_days (
+    day DATE NOT NULL,
+    marked_txid BIGINT NOT NULL DEFAULT txid_current(),
+    PRIMARY KEY (day, marked_txid)
+);
+
+-- Upgrade the earlier one-mark-per-bucket layout
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'analytics_dirty_hours' AND column_name = 'marked_txid'
+    ) THEN
+        ALTER TABLE analytics_dirty_hours DROP CONSTRAINT IF EXISTS analytics_dirty_hours_pkey;
+        ALTER TABLE analytics_dirty_hours ADD COLUMN marked_txid BIGINT NOT NULL DEFAULT txid_current();
+        ALTER TABLE analytics_dirty_hours ADD PRIMARY KEY (bucket, marked_txid);
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'analytics_dirty_days' AND column_name = 'marked_txid'
+    ) THEN
+        ALTER TABLE analytics_dirty_days DROP CONSTRAINT IF EXISTS analytics_dirty_days_pkey;
+        ALTER TABLE analytics_dirty_days ADD COLUMN marked_txid BIGINT NOT NULL DEFAULT txid_current();
+        ALTER TABLE analytics_dirty_days ADD PRIMARY KEY (day, marked_txid);
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS analytics_summary_meta (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    refreshed_at TIMESTAMP
+);
+
+INSERT INTO analytics_summary_meta (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+-- Bucket recompute lookups
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_detection_day
+    ON blacklist_ips ((COALESCE(detection_date, created_at::date)));
+
+-- get_whitelist_candidates: top-N by detection_count over active rows
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_active_detection_count
+    ON blacklist_ips (detection_count DESC)
+    WHERE is_active = true;
+
+-- ============================================================
+-- 2. Dirty-bucket triggers (statement-level, transition tables)
+-- ============================================================
+CREATE OR REPLACE FUNCTION analytics_mark_dirty() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        -- Only rows whose aggregated columns changed (collection upserts that
+        -- just bump last_seen/detection_count leave the summaries alone)
+        INSERT INTO analytics_dirty_hours (bucket)
+        SELECT DISTINCT date_trunc('hour', t.created_at)
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        CROSS JOIN LATERAL (VALUES (n.created_at), (o.created_at)) AS t(created_at)
+        WHERE (n.is_active, n.ip_address, n.reason, n.source, n.data_source, n.country, n.created_at)
+              IS DISTINCT FROM
+              (o.is_active, o.ip_address, o.reason, o.source, o.data_source, o.country, o.created_at)
+          AND t.created_at IS NOT NULL
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO analytics_dirty_days (day)
+        SELECT DISTINCT t.day
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        CROSS JOIN LATERAL (
+            VALUES (COALESCE(n.detection_date, n.created_at::date)),
+                   (COALESCE(o.detection_date, o.created_at::date))
+        ) AS t(day)
+        WHERE (n.detection_date, n.created_at, n.source, n.data_source)
+              IS DISTINCT FROM
+              (o.detection_date, o.created_at, o.source, o.data_source)
+          AND t.day IS NOT NULL
+        ON CONFLICT DO NOTHING;
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO analytics_dirty_hours (bucket)
+        SELECT DISTINCT date_trunc('hour', created_at) FROM new_rows
+        WHERE created_at IS NOT NULL
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO analytics_dirty_days (day)
+        SELECT DISTINCT COALESCE(detection_date, created_at::date) FROM new_rows
+        WHERE COALESCE(detection_date, created_at::date) IS NOT NULL
+        ON CONFLICT DO NOTHING;
+    ELSE
+        INSERT INTO analytics_dirty_hours (bucket)
+        SELECT DISTINCT date_trunc('hour', created_at) FROM old_rows
+        WHERE created_at IS NOT NULL
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO analytics_dirty_days (day)
+        SELECT DISTINCT COALESCE(detection_date, created_at::date) FROM old_rows
+        WHERE COALESCE(detection_date, created_at::date) IS NOT NULL
+        ON CONFLICT DO NOTHING;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables require one trigger per event
+DROP TRIGGER IF EXISTS analytics_mark_dirty_ins ON blacklist_ips;
+CREATE TRIGGER analytics_mark_dirty_ins AFTER INSERT ON blacklist_ips
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION analytics_mark_dirty();
+
+DROP TRIGGER IF EXISTS analytics_mark_dirty_upd ON blacklist_ips;
+CREATE TRIGGER analytics_mark_dirty_upd AFTER UPDATE ON blacklist_ips
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION analytics_mark_dirty();
+
+DROP TRIGGER IF EXISTS analytics_mark_dirty_del ON blacklist_ips;
+CREATE TRIGGER analytics_mark_dirty_del AFTER DELETE ON blacklist_ips
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION analytics_mark_dirty();
+
+-- ============================================================
+-- 3. Refresh: recompute dirty buckets only (p_full rebuilds everything)
+--    Returns the number of buckets recomputed, -1 if another refresh
+--    is already running (its caller will pick up the pending marks).
+-- ============================================================
+CREATE OR REPLACE FUNCTION refresh_analytics_summaries(p_full BOOLEAN DEFAULT false)
+RETURNS INTEGER AS $$
+DECLARE
+    v_hours TIMESTAMP[];
+    v_days DATE[];
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('refresh_analytics_summaries')) THEN
+        RETURN -1;
+    END IF;
+
+    IF p_full THEN
+        DELETE FROM analytics_hourly_prefix;
+        DELETE FROM analytics_hourly_dimension;
+        DELETE FROM analytics_daily_source;
+
+        INSERT INTO analytics_dirty_hours (bucket)
+        SELECT DISTINCT date_trunc('hour', created_at) FROM blacklist_ips
+        WHERE created_at IS NOT NULL
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO analytics_dirty_days (day)
+        SELECT DISTINCT COALESCE(detection_date, created_at::date) FROM blacklist_ips
+        WHERE COALESCE(detection_date, created_at::date) IS NOT NULL
+        ON CONFLICT DO NOTHING;
+    END IF;
+
+    -- Only committed marks are visible here, and each statement below takes a
+    -- newer snapshot, so every claimed writer's rows are part of the recompute.
+    WITH claimed AS (DELETE FROM analytics_dirty_hours RETURNING bucket)
+    SELECT COALESCE(array_agg(DISTINCT bucket), '{}') INTO v_hours FROM claimed;
+
+    WITH claimed AS (DELETE FROM analytics_dirty_days RETURNING day)
+    SELECT COALESCE(array_agg(DISTINCT day), '{}') INTO v_days FROM claimed;
+
+    IF cardinality(v_hours) > 0 THEN
+        DELETE FROM analytics_hourly_prefix WHERE bucket = ANY(v_hours);
+        DELETE FROM analytics_hourly_dimension WHERE bucket = ANY(v_hours);
+
+        -- Range join per bucket → idx_blacklist_ips_created_keyset (migration 005)
+        INSERT INTO analytics_hourly_prefix (bucket, prefix16, ip_count)
+        SELECT h.bucket, (ipv4_to_bigint(b.ip_address) >> 16)::integer, COUNT(*)
+        FROM unnest(v_hours) AS h(bucket)
+        JOIN blacklist_ips b
+          ON COALESCE(b.created_at, TIMESTAMP '1970-01-01') >= h.bucket
+         AND COALESCE(b.created_at, TIMESTAMP '1970-01-01') < h.bucket + INTERVAL '1 hour'
+        WHERE b.is_active = true
+        GROUP BY 1, 2;
+
+        INSERT INTO analytics_hourly_dimension
+            (bucket, dimension, value, ip_count, last_created)
+        SELECT h.bucket, d.dimension, d.value, COUNT(*), MAX(b.created_at)
+        FROM unnest(v_hours) AS h(bucket)
+        JOIN blacklist_ips b
+          ON COALESCE(b.created_at, TIMESTAMP '1970-01-01') >= h.bucket
+         AND COALESCE(b.created_at, TIMESTAMP '1970-01-01') < h.bucket + INTERVAL '1 hour'
+        CROSS JOIN LATERAL (
+            VALUES ('reason', b.reason::text),
+                   ('source', b.source::text),
+                   ('data_source', b.data_source::text),
+                   ('country', b.country::text)
+        ) AS d(dimension, value)
+        WHERE b.is_active = true
+        GROUP BY 1, 2, 3;
+    END IF;
+
+    IF cardinality(v_days) > 0 THEN
+        DELETE FROM analytics_daily_source WHERE detection_day = ANY(v_days);
+
+        INSERT INTO analytics_daily_source
+            (detection_day, source, data_source, ip_count, first_collected, last_collected)
+        SELECT COALESCE(b.detection_date, b.created_at::date), b.source, b.data_source,
+               COUNT(*), MIN(b.created_at), MAX(b.created_at)
+        FROM blacklist_ips b
+        WHERE COALESCE(b.detection_date, b.created_at::date) = ANY(v_days)
+        GROUP BY 1, 2, 3;
+    END IF;
+
+    UPDATE analytics_summary_meta SET refreshed_at = NOW() WHERE id = 1;
+
+    RETURN cardinality(v_hours) + cardinality(v_days);
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT refresh_analytics_summaries(true);
+ANALYZE analytics_hourly_prefix;
+ANALYZE analytics_hourly_dimension;
+ANALYZE analytics_daily_source;
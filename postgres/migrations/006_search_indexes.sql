@@ -0,0 +1,62 @@
+-- Migration 006: IP/source/country search indexes
+-- Date: 2026-10-18
+-- Description: Index support for each query type routed by
+--              app/core/utils/ip_search.py:
+--              - ip_prefix: LIKE '1.2.3.%'          → text_pattern_ops btree
+--              - cidr:      ipv4_to_bigint() range  → expression btree
+--              - text:      ILIKE '%q%'             → pg_trgm GIN (per column, BitmapOr)
+--              Exact IP and country lookups use the existing btree indexes.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ============================================================
+-- 1. IPv4 → BIGINT (NULL for anything that is not a valid dotted quad,
+--    so the expression index never fails on bad rows)
+-- ============================================================
+CREATE OR REPLACE FUNCTION ipv4_to_bigint(ip TEXT) RETURNS BIGINT AS $$
+DECLARE
+    o BIGINT[];
+BEGIN
+    IF ip !~ '^([0-9]{1,3}\.){3}[0-9]{1,3}$' THEN
+        RETURN NULL;
+    END IF;
+    o := string_to_array(ip, '.')::BIGINT[];
+    IF o[1] > 255 OR o[2] > 255 OR o[3] > 255 OR o[4] > 255 THEN
+        RETURN NULL;
+    END IF;
+    RETURN (o[1] << 24) + (o[2] << 16) + (o[3] << 8) + o[4];
+END;
+$$ LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE;
+
+-- ============================================================
+-- 2. blacklist_ips
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_ip_pattern
+    ON blacklist_ips (ip_address text_pattern_ops);
+
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_ip_int
+    ON blacklist_ips (ipv4_to_bigint(ip_address));
+
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_ip_trgm
+    ON blacklist_ips USING GIN (ip_address gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_source_trgm
+    ON blacklist_ips USING GIN (source gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_country_trgm
+    ON blacklist_ips USING GIN (country gin_trgm_ops);
+
+-- ============================================================
+-- 3. unified_ip_list (ip-management search)
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_unified_ip_list_ip_pattern
+    ON unified_ip_list (ip_address text_pattern_ops);
+
+CREATE INDEX IF NOT EXISTS idx_unified_ip_list_ip_int
+    ON unified_ip_list (ipv4_to_bigint(ip_address));
+
+CREATE INDEX IF NOT EXISTS idx_unified_ip_list_ip_trgm
+    ON unified_ip_list USING GIN (ip_address gin_trgm_ops);
+
+ANALYZE blacklist_ips;
+ANALYZE unified_ip_list;
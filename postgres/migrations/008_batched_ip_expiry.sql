@@ -0,0 +1,66 @@
+-- Migration 008: batched blacklist IP expiry
+-- Date: 2026-10-18
+-- Description: One bounded expiry chunk per call, shared by the app
+--              (IPExpiryService) and the collector scheduler so both run the
+--              same rules. Each chunk claims at most p_limit active rows with
+--              FOR UPDATE SKIP LOCKED, deactivates them and returns summary
+--              counters; callers commit between chunks so row locks stay short
+--              and hold pg_try_advisory_lock(hashtext('blacklist_ip_expiry'))
+--              so only one process runs an expiry pass at a time.
+--
+--              Rules:
+--              - removal_date:    removal_date < CURRENT_DATE
+--              - stale_detection: detection_date < CURRENT_DATE - 3 months
+
+-- Candidate lookups over active rows only
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_active_removal_date
+    ON blacklist_ips (removal_date)
+    WHERE is_active = true AND removal_date IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_blacklist_ips_active_detection_date
+    ON blacklist_ips (detection_date)
+    WHERE is_active = true;
+
+CREATE OR REPLACE FUNCTION expire_blacklist_ips_chunk(p_rule TEXT, p_limit INTEGER DEFAULT 5000)
+RETURNS TABLE (expired INTEGER, by_source JSONB, oldest DATE, newest DATE) AS $$
+DECLARE
+    v_ids INTEGER[];
+BEGIN
+    IF p_rule = 'removal_date' THEN
+        SELECT array_agg(id) INTO v_ids FROM (
+            SELECT id FROM blacklist_ips
+            WHERE is_active = true
+              AND removal_date IS NOT NULL
+              AND removal_date < CURRENT_DATE
+            LIMIT p_limit
+            FOR UPDATE SKIP LOCKED
+        ) c;
+    ELSIF p_rule = 'stale_detection' THEN
+        SELECT array_agg(id) INTO v_ids FROM (
+            SELECT id FROM blacklist_ips
+            WHERE is_active = true
+              AND detection_date < CURRENT_DATE - INTERVAL '3 months'
+            LIMIT p_limit
+            FOR UPDATE SKIP LOCKED
+        ) c;
+    ELSE
+        RAISE EXCEPTION 'unknown expiry rule: %', p_rule;
+    END IF;
+
+    RETURN QUERY
+    WITH updated AS (
+        UPDATE blacklist_ips
+        SET is_active = false,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ANY(COALESCE(v_ids, '{}'))
+        RETURNING source,
+                  CASE WHEN p_rule = 'removal_date' THEN removal_date ELSE detection_date END AS expiry_date
+    )
+    SELECT
+        (SELECT COUNT(*) FROM updated)::INTEGER,
+        (SELECT COALESCE(jsonb_object_agg(source, n), '{}'::jsonb)
+         FROM (SELECT source, COUNT(*) AS n FROM updated GROUP BY source) s),
+        (SELECT MIN(expiry_date) FROM updated),
+        (SELECT MAX(expiry_date) FROM updated);
+END;
+$$ LANGUAGE plpgsql;
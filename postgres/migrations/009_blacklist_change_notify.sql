@@ -0,0 +1,90 @@
+-- Migration 009: blacklist_changes notifications + FortiManager push log
+-- Date: 2026-10-18
+-- Description: FortiManagerPushService LISTENs on 'blacklist_changes' but
+--              nothing emitted it. Statement-level triggers on blacklist_ips
+--              and whitelist_ips now send one NOTIFY per statement (not per
+--              row), and only when the effective list can have changed:
+--              UPDATEs that just bump last_seen/detection_count (collection
+--              upserts) stay silent. Postgres also folds identical payloads
+--              within a transaction, so a bulk import notifies once.
+--              Payload: {"table": ..., "op": ..., "rows": N}
+--              Consumer: app/core/services/fortimanager_push_service.py
+
+CREATE OR REPLACE FUNCTION notify_blacklist_changes() RETURNS TRIGGER AS $$
+DECLARE
+    v_rows BIGINT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT COUNT(*) INTO v_rows FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT COUNT(*) INTO v_rows FROM old_rows;
+    ELSIF TG_TABLE_NAME = 'blacklist_ips' THEN
+        SELECT COUNT(*) INTO v_rows
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE (n.ip_address, n.is_active) IS DISTINCT FROM (o.ip_address, o.is_active);
+    ELSE
+        SELECT COUNT(*) INTO v_rows
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE n.ip_address IS DISTINCT FROM o.ip_address;
+    END IF;
+
+    IF v_rows > 0 THEN
+        PERFORM pg_notify(
+            'blacklist_changes',
+            json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'rows', v_rows)::text
+        );
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables require one trigger per event
+DROP TRIGGER IF EXISTS blacklist_changes_notify_ins ON blacklist_ips;
+CREATE TRIGGER blacklist_changes_notify_ins AFTER INSERT ON blacklist_ips
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_blacklist_changes();
+
+DROP TRIGGER IF EXISTS blacklist_changes_notify_upd ON blacklist_ips;
+CREATE TRIGGER blacklist_changes_notify_upd AFTER UPDATE ON blacklist_ips
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_blacklist_changes();
+
+DROP TRIGGER IF EXISTS blacklist_changes_notify_del ON blacklist_ips;
+CREATE TRIGGER blacklist_changes_notify_del AFTER DELETE ON blacklist_ips
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_blacklist_changes();
+
+DROP TRIGGER IF EXISTS whitelist_changes_notify_ins ON whitelist_ips;
+CREATE TRIGGER whitelist_changes_notify_ins AFTER INSERT ON whitelist_ips
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_blacklist_changes();
+
+DROP TRIGGER IF EXISTS whitelist_changes_notify_upd ON whitelist_ips;
+CREATE TRIGGER whitelist_changes_notify_upd AFTER UPDATE ON whitelist_ips
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_blacklist_changes();
+
+DROP TRIGGER IF EXISTS whitelist_changes_notify_del ON whitelist_ips;
+CREATE TRIGGER whitelist_changes_notify_del AFTER DELETE ON whitelist_ips
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_blacklist_changes();
+
+-- Push attempts (one row per push / skip / failure)
+CREATE TABLE IF NOT EXISTS fortimanager_push_logs (
+    id SERIAL PRIMARY KEY,
+    target VARCHAR(255) NOT NULL,             -- FMG host[:port]
+    status VARCHAR(20) NOT NULL,              -- 'success' | 'skipped' | 'failed'
+    content_hash CHAR(64),                    -- sha256 of the pushed IP list
+    ip_count INTEGER DEFAULT 0,
+    payload_bytes INTEGER DEFAULT 0,
+    notifications INTEGER DEFAULT 0,          -- NOTIFYs coalesced into this push
+    response_time_ms INTEGER DEFAULT 0,
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_fortimanager_push_logs_target_created
+    ON fortimanager_push_logs (target, created_at DESC);
@@ -0,0 +1,30 @@
+-- Migration 010: multi-target FortiManager/FortiGate push state
+-- Date: 2026-10-18
+-- Description: FortiManagerFanoutService pushes the effective blacklist to
+--              every active fortigate_devices row concurrently. Each target
+--              remembers the content hash it last accepted, so a fan-out only
+--              uploads to targets that are behind. Per-target attempts are
+--              written to fortimanager_push_logs (migration 009), grouped by
+--              fanout_id.
+--              Device connection settings live in fortigate_devices.config:
+--              {"port": 443, "scheme": "https", "adom": "root",
+--               "username": "...", "password": "...", "push_enabled": true}
+
+CREATE TABLE IF NOT EXISTS fortimanager_push_targets (
+    target VARCHAR(255) PRIMARY KEY,          -- host[:port]
+    device_id INTEGER REFERENCES fortigate_devices(id) ON DELETE SET NULL,
+    content_hash CHAR(64),                    -- last successfully pushed version
+    ip_count INTEGER DEFAULT 0,
+    last_status VARCHAR(20),                  -- 'success' | 'failed'
+    consecutive_failures INTEGER DEFAULT 0,
+    last_error TEXT,
+    last_pushed_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE fortimanager_push_logs ADD COLUMN IF NOT EXISTS fanout_id VARCHAR(36);
+ALTER TABLE fortimanager_push_logs ADD COLUMN IF NOT EXISTS attempts INTEGER DEFAULT 1;
+
+CREATE INDEX IF NOT EXISTS idx_fortimanager_push_logs_fanout
+    ON fortimanager_push_logs (fanout_id)
+    WHERE fanout_id IS NOT NULL;
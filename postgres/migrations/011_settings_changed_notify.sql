@@ -0,0 +1,44 @@
+-- Migration 011: settings_changed notifications + settings version
+-- Date: 2026-10-18
+-- Description: SettingsService keeps one in-memory snapshot of system_settings
+--              per process; the collector caches collection_credentials.
+--              Instead of TTL polling, every statement that changes either
+--              table bumps settings_version and sends
+--              NOTIFY settings_changed '{"table": ..., "op": ..., "version": N}'.
+--              Listeners reload their snapshot when N is newer than theirs
+--              (and once after every LISTEN reconnect, for missed events).
+
+CREATE TABLE IF NOT EXISTS settings_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO settings_version (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION notify_settings_changed() RETURNS TRIGGER AS $$
+DECLARE
+    v_version BIGINT;
+BEGIN
+    UPDATE settings_version
+    SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE id = 1
+    RETURNING version INTO v_version;
+
+    PERFORM pg_notify(
+        'settings_changed',
+        json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'version', v_version)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS system_settings_changed_notify ON system_settings;
+CREATE TRIGGER system_settings_changed_notify
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON system_settings
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_settings_changed();
+
+DROP TRIGGER IF EXISTS collection_credentials_changed_notify ON collection_credentials;
+CREATE TRIGGER collection_credentials_changed_notify
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON collection_credentials
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_settings_changed();
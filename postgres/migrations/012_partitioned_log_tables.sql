@@ -0,0 +1,381 @@
+-- Migration 012: time-partitioned history / log tables
+-- Date: 2026-10-18
+-- Description: collection_history, monitoring_data, system_logs,
+--              pipeline_metrics, fortigate_pull_logs and fortinet_pull_logs
+--              are append-only and only ever trimmed by age. They become
+--              RANGE-partitioned parents (daily or monthly, see
+--              partition_config) so retention is DETACH + DROP of whole
+--              partitions instead of DELETE + VACUUM.
+--
+--              Conversion (partition_convert) keeps existing rows in place:
+--              the old heap is renamed to <table>_legacy and attached as the
+--              partition FROM (MINVALUE) TO (legacy_until). A validated
+--              CHECK (<col> IS NOT NULL AND <col> < legacy_until) and a unique
+--              index that includes the partition key let ATTACH skip the
+--              table scan and the index rebuild, so the swap is catalog-only.
+--              For large tables build those online first with
+--                  python -m core.services.partition_manager --convert <table>
+--              (NOT VALID + VALIDATE, CREATE INDEX CONCURRENTLY); this
+--              migration converts only tables below ~1M rows by itself.
+--              The legacy partition is dropped as a whole once legacy_until
+--              falls out of the retention window.
+--
+--              partition_maintain() pre-creates `premake` future partitions
+--              and drops expired ones; every app worker calls it on its own
+--              timer (PARTITION_MAINTENANCE_INTERVAL), independent of
+--              collection. Partition DDL is serialized with an advisory lock
+--              so concurrent workers don't race on CREATE / DETACH.
+
+CREATE TABLE IF NOT EXISTS partition_config (
+    table_name VARCHAR(63) PRIMARY KEY,
+    partition_column VARCHAR(63) NOT NULL,
+    granularity VARCHAR(10) NOT NULL,
+    retention INTERVAL NOT NULL,
+    premake INTEGER NOT NULL DEFAULT 7,
+    legacy_until TIMESTAMP,
+    converted_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT valid_partition_granularity CHECK (granularity IN ('day', 'month')),
+    CONSTRAINT positive_premake CHECK (premake >= 1)
+);
+
+INSERT INTO partition_config (table_name, partition_column, granularity, retention, premake) VALUES
+    ('collection_history',  'collection_date', 'month', INTERVAL '90 days',  3),
+    ('pipeline_metrics',    'timestamp',       'month', INTERVAL '180 days', 3),
+    ('monitoring_data',     'timestamp',       'day',   INTERVAL '30 days',  7),
+    ('system_logs',         'timestamp',       'day',   INTERVAL '30 days',  7),
+    ('fortigate_pull_logs', 'created_at',      'day',   INTERVAL '30 days',  7),
+    ('fortinet_pull_logs',  'created_at',      'day',   INTERVAL '30 days',  7)
+ON CONFLICT (table_name) DO NOTHING;
+
+-- <table>_pYYYYMMDD (day) / <table>_pYYYYMM (month)
+CREATE OR REPLACE FUNCTION partition_child_name(p_table TEXT, p_granularity TEXT, p_start TIMESTAMP)
+RETURNS TEXT AS $$
+    SELECT p_table || '_p' || to_char(p_start, CASE p_granularity WHEN 'day' THEN 'YYYYMMDD' ELSE 'YYYYMM' END);
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Create the current and the next `premake` partitions (idempotent)
+CREATE OR REPLACE FUNCTION partition_ensure(p_table TEXT, p_premake INTEGER DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    cfg partition_config%ROWTYPE;
+    v_step INTERVAL;
+    v_start TIMESTAMP;
+    v_name TEXT;
+    v_created INTEGER := 0;
+BEGIN
+    SELECT * INTO cfg FROM partition_config WHERE table_name = p_table;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'partition_config has no entry for %', p_table;
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(p_table)) THEN
+        RETURN 0;
+    END IF;
+
+    -- serialize with other workers; to_regclass() below then sees their commits
+    PERFORM pg_advisory_xact_lock(hashtext('partition_maintain'));
+
+    v_step := ('1 ' || cfg.granularity)::INTERVAL;
+    v_start := date_trunc(cfg.granularity, LOCALTIMESTAMP);
+
+    FOR i IN 0 .. COALESCE(p_premake, cfg.premake) LOOP
+        -- periods before legacy_until still belong to the legacy partition
+        IF cfg.legacy_until IS NULL OR v_start >= cfg.legacy_until THEN
+            v_name := partition_child_name(p_table, cfg.granularity, v_start);
+            IF to_regclass(v_name) IS NULL THEN
+                BEGIN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        v_name, p_table, v_start, v_start + v_step
+                    );
+                    v_created := v_created + 1;
+                EXCEPTION
+                    WHEN duplicate_table OR unique_violation THEN
+                        -- created concurrently (catalog unique index on pg_type/pg_class)
+                        NULL;
+                    WHEN check_violation THEN
+                        -- rows for this range already landed in <table>_default
+                        RAISE WARNING 'partition % not created: % (move rows out of %_default)',
+                            v_name, SQLERRM, p_table;
+                END;
+            END IF;
+        END IF;
+        v_start := v_start + v_step;
+    END LOOP;
+
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detach + drop partitions whose upper bound is older than the retention window
+CREATE OR REPLACE FUNCTION partition_drop_expired(p_table TEXT)
+RETURNS TABLE (dropped_partition TEXT, upper_bound TIMESTAMP) AS $$
+DECLARE
+    cfg partition_config%ROWTYPE;
+    v_cutoff TIMESTAMP;
+    r RECORD;
+BEGIN
+    SELECT * INTO cfg FROM partition_config WHERE table_name = p_table;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'partition_config has no entry for %', p_table;
+    END IF;
+
+    -- DETACH needs ACCESS EXCLUSIVE on the parent: fail fast instead of
+    -- queueing every insert behind a long-running reader
+    PERFORM pg_advisory_xact_lock(hashtext('partition_maintain'));
+    PERFORM set_config('lock_timeout', '5s', true);
+    v_cutoff := LOCALTIMESTAMP - cfg.retention;
+
+    FOR r IN
+        SELECT c.relname::TEXT AS relname, b.upper_bound
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        CROSS JOIN LATERAL (
+            SELECT (regexp_match(pg_get_expr(c.relpartbound, c.oid), 'TO \(''([^'']+)''\)'))[1]::TIMESTAMP AS upper_bound
+        ) b
+        WHERE i.inhparent = to_regclass(p_table)
+          AND b.upper_bound IS NOT NULL      -- skips the DEFAULT partition
+          AND b.upper_bound <= v_cutoff
+        ORDER BY b.upper_bound
+    LOOP
+        EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', p_table, r.relname);
+        EXECUTE format('DROP TABLE %I', r.relname);
+        dropped_partition := r.relname;
+        upper_bound := r.upper_bound;
+        RETURN NEXT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Pre-create + drop expired for every converted table
+-- (no rows if another worker is already maintaining)
+CREATE OR REPLACE FUNCTION partition_maintain()
+RETURNS TABLE (relation TEXT, created INTEGER, dropped INTEGER) AS $$
+DECLARE
+    v_table TEXT;
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('partition_maintain')) THEN
+        RETURN;
+    END IF;
+
+    -- Abandoned online conversions (convert_online killed before the swap):
+    -- the bound CHECK on the still-plain table would reject every insert once
+    -- legacy_until passes, so drop it a step before that
+    FOR v_table IN
+        SELECT pc.table_name FROM partition_config pc
+        WHERE pc.converted_at IS NULL AND pc.legacy_until IS NOT NULL
+          AND pc.legacy_until <= LOCALTIMESTAMP + ('1 ' || pc.granularity)::INTERVAL
+          AND to_regclass(pc.table_name) IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(pc.table_name))
+    LOOP
+        BEGIN
+            PERFORM set_config('lock_timeout', '5s', true);
+            EXECUTE format('ALTER TABLE %I DROP CONSTRAINT IF EXISTS %I', v_table, v_table || '_partition_bound');
+            UPDATE partition_config SET legacy_until = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE table_name = v_table;
+            RAISE WARNING 'partition bound on unconverted % removed (conversion was not completed)', v_table;
+        EXCEPTION WHEN lock_not_available THEN
+            RAISE WARNING 'partition bound on unconverted % not removed: %', v_table, SQLERRM;
+        END;
+    END LOOP;
+    PERFORM set_config('lock_timeout', '0', true);
+
+    FOR v_table IN SELECT pc.table_name FROM partition_config pc WHERE pc.converted_at IS NOT NULL ORDER BY 1 LOOP
+        relation := v_table;
+        created := partition_ensure(v_table);
+        SELECT COUNT(*)::INTEGER INTO dropped FROM partition_drop_expired(v_table);
+        RETURN NEXT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Swap a plain heap for a partitioned parent with the heap attached as <table>_legacy
+CREATE OR REPLACE FUNCTION partition_convert(p_table TEXT)
+RETURNS TEXT AS $$
+DECLARE
+    cfg partition_config%ROWTYPE;
+    v_rel REGCLASS := to_regclass(p_table);
+    v_legacy TEXT := p_table || '_legacy';
+    v_bound TEXT := p_table || '_partition_bound';
+    v_step INTERVAL;
+    v_max TIMESTAMP;
+    v_until TIMESTAMP;
+    v_validated BOOLEAN;
+    v_attnum SMALLINT;
+    v_pk_name TEXT;
+    v_pk_cols TEXT[];
+    v_index_defs TEXT[] := '{}';
+    v_view_defs TEXT[] := '{}';
+    v_serials TEXT[] := '{}';
+    v_def TEXT;
+    r RECORD;
+BEGIN
+    SELECT * INTO cfg FROM partition_config WHERE table_name = p_table;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'partition_config has no entry for %', p_table;
+    END IF;
+    IF v_rel IS NULL THEN
+        RAISE EXCEPTION 'table % does not exist', p_table;
+    END IF;
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = v_rel) THEN
+        RETURN format('%s: already partitioned', p_table);
+    END IF;
+    IF to_regclass(v_legacy) IS NOT NULL THEN
+        RAISE EXCEPTION '% already exists', v_legacy;
+    END IF;
+
+    v_step := ('1 ' || cfg.granularity)::INTERVAL;
+    SELECT attnum INTO v_attnum FROM pg_attribute
+    WHERE attrelid = v_rel AND attname = cfg.partition_column AND NOT attisdropped;
+    IF v_attnum IS NULL THEN
+        RAISE EXCEPTION '%.% does not exist', p_table, cfg.partition_column;
+    END IF;
+
+    EXECUTE format('LOCK TABLE %I IN ACCESS EXCLUSIVE MODE', p_table);
+
+    -- 1. Partition bound as a validated CHECK (prepared online by the manager, or here)
+    SELECT convalidated INTO v_validated FROM pg_constraint
+    WHERE conrelid = v_rel AND conname = v_bound;
+
+    IF v_validated IS NULL THEN
+        EXECUTE format('UPDATE %I SET %I = %L WHERE %I IS NULL',
+                       p_table, cfg.partition_column, '-infinity', cfg.partition_column);
+        EXECUTE format('SELECT max(%I) FROM %I', cfg.partition_column, p_table) INTO v_max;
+        v_until := date_trunc(cfg.granularity, GREATEST(LOCALTIMESTAMP, COALESCE(v_max, LOCALTIMESTAMP))) + 2 * v_step;
+        EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I CHECK (%I IS NOT NULL AND %I < %L)',
+                       p_table, v_bound, cfg.partition_column, cfg.partition_column, v_until);
+    ELSE
+        v_until := cfg.legacy_until;
+        IF v_until IS NULL THEN
+            RAISE EXCEPTION '% exists but partition_config.legacy_until is not set', v_bound;
+        END IF;
+        IF NOT v_validated THEN
+            EXECUTE format('ALTER TABLE %I VALIDATE CONSTRAINT %I', p_table, v_bound);
+        END IF;
+    END IF;
+
+    -- uses the validated CHECK, no scan
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN %I SET NOT NULL', p_table, cfg.partition_column);
+
+    -- 2. Primary key must include the partition key
+    SELECT c.conname, array_agg(a.attname::TEXT ORDER BY k.ord)
+    INTO v_pk_name, v_pk_cols
+    FROM pg_constraint c
+    CROSS JOIN LATERAL unnest(c.conkey) WITH ORDINALITY AS k(attnum, ord)
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+    WHERE c.conrelid = v_rel AND c.contype = 'p'
+    GROUP BY c.conname;
+
+    IF v_pk_name IS NOT NULL AND NOT cfg.partition_column = ANY(v_pk_cols) THEN
+        v_pk_cols := v_pk_cols || cfg.partition_column::TEXT;
+        IF to_regclass(p_table || '_pkey_part') IS NULL THEN
+            EXECUTE format('CREATE UNIQUE INDEX %I ON %I (%s)', p_table || '_pkey_part', p_table,
+                           (SELECT string_agg(quote_ident(col), ', ') FROM unnest(v_pk_cols) col));
+        END IF;
+        EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', p_table, v_pk_name);
+        EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I PRIMARY KEY USING INDEX %I',
+                       p_table, v_pk_name, p_table || '_pkey_part');
+    END IF;
+
+    -- 3. Capture what has to follow the name: secondary indexes, views, serial sequences
+    FOR r IN
+        SELECT ic.relname::TEXT AS index_name, pg_get_indexdef(i.indexrelid) AS def,
+               i.indisprimary, i.indisunique, v_attnum = ANY(i.indkey::SMALLINT[]) AS has_key
+        FROM pg_index i JOIN pg_class ic ON ic.oid = i.indexrelid
+        WHERE i.indrelid = v_rel
+    LOOP
+        IF NOT r.indisprimary THEN
+            IF r.indisunique AND NOT r.has_key THEN
+                RAISE NOTICE '%: unique index % lacks %, kept on % only',
+                    p_table, r.index_name, cfg.partition_column, v_legacy;
+            ELSE
+                v_index_defs := v_index_defs || r.def;
+            END IF;
+        END IF;
+    END LOOP;
+
+    SELECT COALESCE(array_agg(format('CREATE OR REPLACE VIEW %s AS %s', v.oid::REGCLASS, rtrim(pg_get_viewdef(v.oid), E'; \n'))), '{}')
+    INTO v_view_defs
+    FROM (
+        SELECT DISTINCT rw.ev_class AS oid
+        FROM pg_depend d JOIN pg_rewrite rw ON rw.oid = d.objid
+        WHERE d.refobjid = v_rel AND rw.ev_class <> v_rel
+    ) v;
+
+    SELECT COALESCE(array_agg(format('ALTER SEQUENCE %s OWNED BY %I.%I', s.seq, p_table, s.attname)), '{}')
+    INTO v_serials
+    FROM (
+        SELECT a.attname, pg_get_serial_sequence(quote_ident(p_table), a.attname) AS seq
+        FROM pg_attribute a
+        WHERE a.attrelid = v_rel AND a.attnum > 0 AND NOT a.attisdropped
+    ) s
+    WHERE s.seq IS NOT NULL;
+
+    -- 4. Swap: rename heap + its indexes, create the parent under the old name
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', p_table, v_legacy);
+    FOR r IN
+        SELECT ic.relname::TEXT AS index_name
+        FROM pg_index i JOIN pg_class ic ON ic.oid = i.indexrelid
+        WHERE i.indrelid = v_rel
+    LOOP
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', r.index_name, left(r.index_name, 56) || '_legacy');
+    END LOOP;
+
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS) '
+        'PARTITION BY RANGE (%I)',
+        p_table, v_legacy, cfg.partition_column
+    );
+    EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', p_table, v_bound);
+
+    IF v_pk_name IS NOT NULL THEN
+        EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I PRIMARY KEY (%s)', p_table, v_pk_name,
+                       (SELECT string_agg(quote_ident(col), ', ') FROM unnest(v_pk_cols) col));
+    END IF;
+    FOREACH v_def IN ARRAY v_index_defs LOOP
+        EXECUTE v_def;
+    END LOOP;
+
+    -- matching indexes on the heap are attached, not rebuilt; the CHECK skips the scan
+    EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (MINVALUE) TO (%L)',
+                   p_table, v_legacy, v_until);
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', p_table || '_default', p_table);
+
+    FOREACH v_def IN ARRAY v_serials LOOP
+        EXECUTE v_def;
+    END LOOP;
+    FOREACH v_def IN ARRAY v_view_defs LOOP
+        EXECUTE v_def;
+    END LOOP;
+
+    UPDATE partition_config
+    SET legacy_until = v_until, converted_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+    WHERE table_name = p_table;
+
+    PERFORM partition_ensure(p_table);
+
+    RETURN format('%s: converted, existing rows in %s (< %s)', p_table, v_legacy, v_until);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Convert small / fresh tables now; large ones are left for the online path
+DO $$
+DECLARE
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT pc.table_name, c.reltuples
+        FROM partition_config pc
+        JOIN pg_class c ON c.oid = to_regclass(pc.table_name)
+        WHERE NOT EXISTS (SELECT 1 FROM pg_partitioned_table pt WHERE pt.partrelid = c.oid)
+        ORDER BY pc.table_name
+    LOOP
+        IF r.reltuples > 1000000 THEN
+            RAISE NOTICE '%: ~% rows, run python -m core.services.partition_manager --convert %',
+                r.table_name, r.reltuples::BIGINT, r.table_name;
+        ELSE
+            RAISE NOTICE '%', partition_convert(r.table_name);
+        END IF;
+    END LOOP;
+END;
+$$;
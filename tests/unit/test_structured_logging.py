@@ -0,0 +1,36 @@
+"""RateLimitFilter fingerprinting (app/utils/structured_logging.py)"""
+
+import logging
+
+from app.utils.structured_logging import RateLimitFilter
+
+
+def _record(msg, args=(), lineno=10, pathname="service.py"):
+    return logging.LogRecord("service", logging.ERROR, pathname, lineno, msg, args, None)
+
+
+def _filter():
+    return RateLimitFilter(burst=1, window=300, summary_interval=3600)
+
+
+def test_fstring_messages_from_same_call_site_are_throttled():
+    rate_filter = _filter()
+
+    assert rate_filter.filter(_record("DB error: connection refused (attempt 1)"))
+    assert not rate_filter.filter(_record("DB error: connection refused (attempt 2)"))
+
+
+def test_different_call_sites_are_counted_separately():
+    rate_filter = _filter()
+
+    assert rate_filter.filter(_record("same text", lineno=10))
+    assert rate_filter.filter(_record("same text", lineno=20))
+
+
+def test_different_templates_from_same_line_are_both_emitted():
+    rate_filter = _filter()
+
+    assert rate_filter.filter(_record("template A %s", (1,)))
+    assert rate_filter.filter(_record("template B %s", (1,)))
+    assert not rate_filter.filter(_record("template A %s", (2,)))
+    assert rate_filter.get_stats()["tracked_fingerprints"] == 2